@@ -2,4 +2,18 @@
 """
 Calibration
 """
-from .camera import *
+from ..core.lazy_loading import lazy_submodules
+
+__getattr__, __dir__, __all__ = lazy_submodules(
+    __name__,
+    attributes={
+        'camera': [
+            'NullR1Calibrator',
+            'HESSIOR1Calibrator',
+            'CameraR1Calibrator',
+            'CameraDL0Reducer',
+            'CameraDL1Calibrator',
+            'CameraCalibrator',
+        ],
+    },
+)
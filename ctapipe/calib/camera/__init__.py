@@ -2,8 +2,15 @@
 """
 Camera calibration module.
 """
+from ...core.lazy_loading import lazy_submodules
 
-from .r1 import *
-from .dl0 import *
-from .dl1 import *
-from .calibrator import *
+__getattr__, __dir__, __all__ = lazy_submodules(
+    __name__,
+    attributes={
+        'r1': ['NullR1Calibrator', 'HESSIOR1Calibrator', 'CameraR1Calibrator'],
+        'dl0': ['CameraDL0Reducer'],
+        'dl1': ['CameraDL1Calibrator'],
+        'calibrator': ['CameraCalibrator'],
+    },
+    submodules=['gainselection', 'lazy'],
+)
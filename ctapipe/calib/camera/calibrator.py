@@ -3,8 +3,18 @@ Conveniance calibrator to handle the full camera calibration.
 
 This calibrator will apply the calibrations found in r1.py, dl0.py and dl1.py.
 """
+import io
+import itertools
+import multiprocessing
+import os
+import pickle
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from copy import deepcopy
 
 from ctapipe.core import Component
+from ctapipe.core.traits import Int, CaselessStrEnum
 from ctapipe.calib.camera import (
     CameraR1Calibrator,
     CameraDL0Reducer,
@@ -16,6 +26,79 @@ from ctapipe.image import ImageExtractor
 __all__ = ['CameraCalibrator']
 
 
+# calibrator and instrument description of a worker process,
+# see CameraCalibrator.calibrate_events
+_worker_calibrator = None
+_worker_inst = None
+
+# calibrators of the worker threads of CameraCalibrator.calibrate_events
+_thread_state = threading.local()
+
+
+class _EventPickler(pickle.Pickler):
+    """
+    Pickles an event, but only stores a reference to the instrument
+    description ``inst``, which both sides of the pipe already have.
+    """
+    def __init__(self, file, inst):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.inst = inst
+
+    def persistent_id(self, obj):
+        return 'inst' if obj is self.inst else None
+
+
+class _EventUnpickler(pickle.Unpickler):
+    """ Counterpart of `_EventPickler` """
+    def __init__(self, file, inst):
+        super().__init__(file)
+        self.inst = inst
+
+    def persistent_load(self, pid):
+        return self.inst
+
+
+def _dumps_event(event, inst):
+    f = io.BytesIO()
+    _EventPickler(f, inst).dump(event)
+    return f.getvalue()
+
+
+def _loads_event(data, inst):
+    return _EventUnpickler(io.BytesIO(data), inst).load()
+
+
+def _init_worker(config, r1_product, extractor_name, inst):
+    global _worker_calibrator, _worker_inst
+    _worker_calibrator = CameraCalibrator(
+        config=config,
+        r1_product=r1_product,
+        extractor_name=extractor_name,
+        n_workers=1,
+    )
+    _worker_inst = inst
+
+
+def _calibrate_in_worker(data):
+    event = _loads_event(data, _worker_inst)
+    _worker_calibrator.calibrate(event)
+    return _dumps_event(event, _worker_inst)
+
+
+def _init_thread_worker(config, r1_product, extractor_name):
+    _thread_state.calibrator = CameraCalibrator(
+        config=config,
+        r1_product=r1_product,
+        extractor_name=extractor_name,
+        n_workers=1,
+    )
+
+
+def _calibrate_in_thread(event):
+    _thread_state.calibrator.calibrate(event)
+    return event
+
+
 class CameraCalibrator(Component):
     """
     Conveniance calibrator to handle the full camera calibration.
@@ -23,7 +106,37 @@ class CameraCalibrator(Component):
     This calibrator will apply the calibrations found in r1.py, dl0.py and
     dl1.py.
 
+    The work can be spread over several workers (see ``n_workers``):
+    `calibrate` then processes the telescopes of an event in parallel threads,
+    `calibrate_events` processes whole events in parallel threads or processes
+    (see ``parallel_backend``).
+    The threads of `calibrate` are kept until `close` is called, which
+    happens automatically when the calibrator is used as a context manager.
+    When using threads together with the numba-parallel extractors,
+    a thread-safe numba threading layer (``tbb`` or ``omp``) should be
+    selected, e.g. via the ``NUMBA_THREADING_LAYER`` environment variable.
+
+    With the ``lazy`` option of the R1 calibrator and the DL0 reducer
+    (``CameraR1Calibrator.lazy``, ``CameraDL0Reducer.lazy``), the R1 and DL0
+    waveforms are only computed when they are accessed. As the DL1
+    calibration accesses the DL0 waveforms of all telescopes it calibrates,
+    this only saves work for the telescopes excluded with the ``tel_ids``
+    argument of `calibrate`.
     """
+    profiled_methods = ('calibrate', )
+
+    n_workers = Int(
+        1,
+        help='Number of parallel workers. 1 calibrates everything in the '
+             'calling thread, 0 or negative values use one worker per CPU.'
+    ).tag(config=True)
+    parallel_backend = CaselessStrEnum(
+        ['thread', 'process'],
+        default_value='thread',
+        help='Type of the worker pool used by calibrate_events. '
+             'Telescopes of a single event are always calibrated in threads.'
+    ).tag(config=True)
+
     def __init__(self, config=None, parent=None,
                  r1_product=None,
                  extractor_name='NeighborPeakWindowSum',
@@ -68,23 +181,181 @@ class CameraCalibrator(Component):
                 parent=self,
             )
 
-        self.dl0 = CameraDL0Reducer(parent=parent)
+        self.dl0 = CameraDL0Reducer(parent=self)
         self.dl1 = CameraDL1Calibrator(
             parent=self,
             extractor=extractor,
         )
 
-    def calibrate(self, event):
+        self._telescope_executor = None
+
+    @property
+    def _n_workers(self):
+        return self.n_workers if self.n_workers > 0 else os.cpu_count()
+
+    def _calibrate_telescope(self, event, telid, r1=True, dl1=True):
+        if r1 and telid in event.r0.tels_with_data:
+            self.r1.calibrate_telescope(event, telid)
+        if telid in event.r1.tels_with_data:
+            self.dl0.reduce_telescope(event, telid)
+        if dl1 and telid in event.dl0.tels_with_data:
+            self.dl1.calibrate_telescope(event, telid)
+
+    def calibrate(self, event, tel_ids=None):
         """
         Perform the full camera calibration from R0 to DL1. Any calibration
         relating to data levels before the data level the file is read into
         will be skipped.
 
+        If ``n_workers`` is not 1, the telescopes of the event are
+        calibrated in parallel threads.
+
         Parameters
         ----------
         event : container
             A `ctapipe` event container
+        tel_ids : iterable or None
+            Only fill the dl1 containers of these telescopes,
+            None for all telescopes. The R1 and DL0 containers of the
+            other telescopes are still filled.
+        """
+        if self._n_workers == 1:
+            self.r1.calibrate(event)
+            self.dl0.reduce(event)
+            self.dl1.calibrate(event, tel_ids=tel_ids)
+            return
+
+        if self._telescope_executor is None:
+            self._telescope_executor = ThreadPoolExecutor(self._n_workers)
+
+        r1_per_telescope = self.r1.supports_per_telescope
+        if not r1_per_telescope:
+            self.r1.calibrate(event)
+
+        tels = sorted(
+            set(event.r0.tels_with_data)
+            | set(event.r1.tels_with_data)
+            | set(event.dl0.tels_with_data)
+        )
+        futures = [
+            self._telescope_executor.submit(
+                self._calibrate_telescope, event, telid, r1_per_telescope,
+                tel_ids is None or telid in tel_ids,
+            )
+            for telid in tels
+        ]
+        # propagate exceptions of the workers
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """
+        Shut down the threads used to calibrate the telescopes of an event
+        in parallel. They are started again if needed.
+        """
+        if self._telescope_executor is not None:
+            self._telescope_executor.shutdown()
+            self._telescope_executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def calibrate_events(self, events):
         """
-        self.r1.calibrate(event)
-        self.dl0.reduce(event)
-        self.dl1.calibrate(event)
+        Calibrate a stream of events, e.g. an `~ctapipe.io.EventSource`,
+        distributing whole events over ``n_workers`` parallel workers.
+
+        The calibrated events are yielded in the same order as the input.
+        As event sources reuse the same container for every event, each
+        event is copied before it is handed to a worker, so the
+        yielded events are independent of the input containers.
+        The instrument description is not copied, but shared with
+        the input events. At most ``2 * n_workers`` events are in flight
+        at the same time.
+
+        If ``n_workers`` is 1, the events are calibrated in place and yielded
+        directly.
+
+        Each worker thread or process builds its own `CameraCalibrator` from
+        the configuration of this one, as the calibration components keep
+        state between calls. So only options set through the config are
+        taken into account. Worker processes receive the instrument
+        description of the first event once, when they are started.
+
+        Parameters
+        ----------
+        events : iterable
+            `ctapipe` event containers
+
+        Yields
+        ------
+        event : container
+            calibrated event containers
+        """
+        n_workers = self._n_workers
+
+        if n_workers == 1:
+            for event in events:
+                self.calibrate(event)
+                yield event
+            return
+
+        events = iter(events)
+        try:
+            first_event = next(events)
+        except StopIteration:
+            return
+        # the instrument description is shared between events
+        worker_inst = first_event.inst
+
+        worker_args = (
+            self.config,
+            type(self.r1).__name__,
+            type(self.dl1.extractor).__name__,
+        )
+        if self.parallel_backend == 'process':
+            # forked children of a process that already ran numba's
+            # parallel kernels can hang, so always start fresh interpreters
+            executor = ProcessPoolExecutor(
+                n_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(*worker_args, worker_inst),
+            )
+        else:
+            executor = ThreadPoolExecutor(
+                n_workers,
+                initializer=_init_thread_worker,
+                initargs=worker_args,
+            )
+
+        with executor:
+            pending = deque()
+            for event in itertools.chain([first_event], events):
+                inst = event.inst
+                if self.parallel_backend == 'process':
+                    future = executor.submit(
+                        _calibrate_in_worker, _dumps_event(event, worker_inst)
+                    )
+                else:
+                    future = executor.submit(
+                        _calibrate_in_thread,
+                        deepcopy(event, memo={id(inst): inst}),
+                    )
+                pending.append((future, inst))
+
+                if len(pending) >= 2 * n_workers:
+                    yield self._collect(*pending.popleft(), worker_inst)
+
+            while pending:
+                yield self._collect(*pending.popleft(), worker_inst)
+
+    def _collect(self, future, inst, worker_inst):
+        event = future.result()
+        if self.parallel_backend == 'process':
+            event = _loads_event(event, worker_inst)
+        event.inst = inst
+        return event
@@ -9,6 +9,13 @@ if a reducer from `ctapipe.image.reducers` is passed to the
 `CameraDL0Reducer`, then the reduction will be applied.
 """
 from ctapipe.core import Component
+from ctapipe.core.traits import Bool
+from .lazy import (
+    LazyDL0CameraContainer,
+    LazyWaveform,
+    lazy_container,
+    waveform_exists,
+)
 
 __all__ = ['CameraDL0Reducer']
 
@@ -33,6 +40,15 @@ class CameraDL0Reducer(Component):
         will equal the r1 samples.
     kwargs
     """
+    profiled_methods = ('reduce', )
+
+    lazy = Bool(
+        False,
+        help='Only compute the DL0 waveforms when they are accessed. '
+             'Without reducer, the DL0 waveform is then the R1 waveform, '
+             'which is itself only computed on access if it is lazy.'
+    ).tag(config=True)
+
     def __init__(self, config=None, parent=None, reducer=None, **kwargs):
         super().__init__(config=config, parent=parent, **kwargs)
         if reducer is None:
@@ -60,8 +76,7 @@ class CameraDL0Reducer(Component):
         bool
             True if r1.tel[telid].waveform is not None, else false.
         """
-        r1 = event.r1.tel[telid].waveform
-        if r1 is not None:
+        if waveform_exists(event.r1.tel[telid]):
             return True
         else:
             if not self._r1_empty_warn:
@@ -82,10 +97,30 @@ class CameraDL0Reducer(Component):
         """
         tels = event.r1.tels_with_data
         for telid in tels:
-            r1 = event.r1.tel[telid].waveform
-            if self.check_r1_exists(event, telid):
-                if self._reducer is None:
-                    event.dl0.tel[telid].waveform = r1
-                else:
-                    reduction = self._reducer.reduce_waveforms(r1)
-                    event.dl0.tel[telid].waveform = reduction
+            self.reduce_telescope(event, telid)
+
+    def reduce_telescope(self, event, telid):
+        """
+        Perform the conversion from R1 to DL0 for a single telescope.
+
+        Parameters
+        ----------
+        event : container
+            A `ctapipe` event container
+        telid : int
+            The telescope id.
+        """
+        if not self.check_r1_exists(event, telid):
+            return
+
+        r1 = event.r1.tel[telid]
+        if self.lazy:
+            dl0 = lazy_container(event.dl0.tel, telid, LazyDL0CameraContainer)
+            dl0.waveform = LazyWaveform(self._reduce_waveforms, r1)
+        else:
+            event.dl0.tel[telid].waveform = self._reduce_waveforms(r1)
+
+    def _reduce_waveforms(self, r1):
+        if self._reducer is None:
+            return r1.waveform
+        return self._reducer.reduce_waveforms(r1.waveform)
@@ -96,6 +96,8 @@ class CameraDL1Calibrator(Component):
         is used.
     kwargs
     """
+    profiled_methods = ('calibrate', )
+
     radius = Float(None, allow_none=True,
                    help='Pixels within radius from a pixel are considered '
                         'neighbours to the pixel. Set to None for the default '
@@ -173,7 +175,7 @@ class CameraDL1Calibrator(Component):
             # a reference pulse shape
             return np.ones(event.dl0.tel[telid].waveform.shape[0])
 
-    def calibrate(self, event):
+    def calibrate(self, event, tel_ids=None):
         """
         Fill the dl1 container with the calibration data that results from the
         configuration of this calibrator.
@@ -182,32 +184,49 @@ class CameraDL1Calibrator(Component):
         ----------
         event : container
             A `ctapipe` event container
+        tel_ids : iterable or None
+            Only calibrate these telescopes, None for all telescopes
+            with dl0 data. The (lazy) dl0 waveforms of the other
+            telescopes are not accessed.
         """
         for telid in event.dl0.tels_with_data:
+            if tel_ids is None or telid in tel_ids:
+                self.calibrate_telescope(event, telid)
+
+    def calibrate_telescope(self, event, telid):
+        """
+        Fill the dl1 container of a single telescope.
 
-            if self.check_dl0_exists(event, telid):
-                waveforms = event.dl0.tel[telid].waveform
-                n_samples = waveforms.shape[2]
-                if n_samples == 1:
-                    # To handle ASTRI and dst
-                    corrected = waveforms[..., 0]
-                    pulse_time = np.zeros(waveforms.shape[0:2])
-                else:
-                    # Extract charge and pulse time
-                    if self.extractor.requires_neighbors():
-                        g = event.inst.subarray.tel[telid].camera
-                        self.extractor.neighbors = g.neighbor_matrix_where
-                    charge, pulse_time = self.extractor(waveforms)
-
-                    # Apply integration correction
-                    correction = self.get_correction(event, telid)[:, None]
-                    corrected = charge * correction
-
-                # Clip amplitude
-                if self.clip_amplitude:
-                    corrected[corrected > self.clip_amplitude] = \
-                        self.clip_amplitude
-
-                # Store into event container
-                event.dl1.tel[telid].image = corrected
-                event.dl1.tel[telid].pulse_time = pulse_time
+        Parameters
+        ----------
+        event : container
+            A `ctapipe` event container
+        telid : int
+            The telescope id.
+        """
+        if self.check_dl0_exists(event, telid):
+            waveforms = event.dl0.tel[telid].waveform
+            n_samples = waveforms.shape[2]
+            if n_samples == 1:
+                # To handle ASTRI and dst
+                corrected = waveforms[..., 0]
+                pulse_time = np.zeros(waveforms.shape[0:2])
+            else:
+                # Extract charge and pulse time
+                if self.extractor.requires_neighbors():
+                    g = event.inst.subarray.tel[telid].camera
+                    self.extractor.neighbors = g.neighbor_matrix_where
+                charge, pulse_time = self.extractor(waveforms)
+
+                # Apply integration correction
+                correction = self.get_correction(event, telid)[:, None]
+                corrected = charge * correction
+
+            # Clip amplitude
+            if self.clip_amplitude:
+                corrected[corrected > self.clip_amplitude] = \
+                    self.clip_amplitude
+
+            # Store into event container
+            event.dl1.tel[telid].image = corrected
+            event.dl1.tel[telid].pulse_time = pulse_time
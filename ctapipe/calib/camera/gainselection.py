@@ -4,6 +4,7 @@ Algorithms to select correct gain channel
 from abc import ABCMeta, abstractclassmethod
 
 import numpy as np
+from numba import njit, prange
 
 from ...core import Component, traits
 from ...utils import get_table_dataset
@@ -11,7 +12,8 @@ from ...utils import get_table_dataset
 __all__ = ['GainSelector',
            'ThresholdGainSelector',
            'SimpleGainSelector',
-           'pick_gain_channel']
+           'pick_gain_channel',
+           'pick_gain_channel_batch']
 
 
 def pick_gain_channel(waveforms, threshold, select_by_sample=False):
@@ -23,8 +25,9 @@ def pick_gain_channel(waveforms, threshold, select_by_sample=False):
     -----------
     waveforms: np.ndarray
         Array of shape (N_gain, N_pix, N_samp)
-    threshold: float
-        threshold (in PE/sample) of when to switch to low-gain channel
+    threshold: float or np.ndarray
+        threshold (in PE/sample) of when to switch to low-gain channel,
+        either a scalar or an array with one value per pixel
     select_by_sample: bool
         if true, select only low-gain *samples* when high-gain is over
         threshold
@@ -34,6 +37,10 @@ def pick_gain_channel(waveforms, threshold, select_by_sample=False):
     tuple:
         gain-selected intensity, boolean array of which channel was chosen
     """
+    threshold = np.asanyarray(threshold)
+    if threshold.ndim > 0:
+        # one threshold per pixel
+        threshold = threshold[..., np.newaxis]
 
     # if we have 2 channels:
     if waveforms.shape[0] == 2:
@@ -61,6 +68,118 @@ def pick_gain_channel(waveforms, threshold, select_by_sample=False):
     return new_waveforms, gain_mask
 
 
+@njit(parallel=True, cache=True)
+def _pick_gain_channel_by_waveform(waveforms, thresholds, out, gain_mask):
+    n_tels, _, n_pixels, n_samples = waveforms.shape
+    for i in prange(n_tels * n_pixels):
+        tel = i // n_pixels
+        pixel = i % n_pixels
+        threshold = thresholds[tel, pixel]
+
+        use_low_gain = False
+        for sample in range(n_samples):
+            if waveforms[tel, 0, pixel, sample] > threshold:
+                use_low_gain = True
+                break
+
+        gain_mask[tel, pixel] = use_low_gain
+        channel = 1 if use_low_gain else 0
+        for sample in range(n_samples):
+            out[tel, pixel, sample] = waveforms[tel, channel, pixel, sample]
+
+
+@njit(parallel=True, cache=True)
+def _pick_gain_channel_by_sample(waveforms, thresholds, out, gain_mask):
+    n_tels, _, n_pixels, n_samples = waveforms.shape
+    for i in prange(n_tels * n_pixels):
+        tel = i // n_pixels
+        pixel = i % n_pixels
+        threshold = thresholds[tel, pixel]
+
+        for sample in range(n_samples):
+            use_low_gain = waveforms[tel, 0, pixel, sample] > threshold
+            gain_mask[tel, pixel, sample] = use_low_gain
+            channel = 1 if use_low_gain else 0
+            out[tel, pixel, sample] = waveforms[tel, channel, pixel, sample]
+
+
+def _check_output(array, shape, dtype, name):
+    if array is None:
+        return np.empty(shape, dtype=dtype)
+    if array.shape != shape or array.dtype != dtype:
+        raise ValueError(
+            "{} must have shape {} and dtype {}".format(name, shape, dtype)
+        )
+    return array
+
+
+def pick_gain_channel_batch(
+        waveforms,
+        threshold,
+        select_by_sample=False,
+        out=None,
+        gain_mask=None,
+):
+    """
+    Gain selection of the waveforms of several telescopes at once,
+    see `pick_gain_channel`.
+
+    Each waveform is only read once and the selected samples are written
+    directly into the output, so no intermediate copies are made.
+
+    Parameters:
+    -----------
+    waveforms: np.ndarray
+        Array of shape (N_tel, N_gain, N_pix, N_samp), e.g. the stacked
+        waveforms of all telescopes with the same camera in an event
+    threshold: float or np.ndarray
+        threshold (in PE/sample) of when to switch to low-gain channel.
+        Either a scalar or an array broadcastable to (N_tel, N_pix),
+        e.g. a threshold per pixel.
+    select_by_sample: bool
+        if true, select only low-gain *samples* when high-gain is over
+        threshold
+    out: np.ndarray or None
+        Preallocated array of shape (N_tel, N_pix, N_samp) with the dtype of
+        the waveforms to store the gain-selected waveforms
+    gain_mask: np.ndarray or None
+        Preallocated boolean array of shape (N_tel, N_pix),
+        or (N_tel, N_pix, N_samp) if ``select_by_sample``,
+        to store which channel was chosen
+
+    Returns
+    -------
+    tuple:
+        gain-selected waveforms, boolean array of which channel was chosen
+    """
+    n_tels, n_gains, n_pixels, n_samples = waveforms.shape
+    mask_shape = (n_tels, n_pixels)
+    if select_by_sample:
+        mask_shape += (n_samples, )
+
+    out = _check_output(out, (n_tels, n_pixels, n_samples), waveforms.dtype, 'out')
+    gain_mask = _check_output(gain_mask, mask_shape, np.bool_, 'gain_mask')
+
+    if n_gains == 1:
+        out[:] = waveforms[:, 0]
+        gain_mask[:] = False
+    elif n_gains == 2:
+        thresholds = np.broadcast_to(
+            np.asarray(threshold, dtype=np.float64), (n_tels, n_pixels)
+        )
+        if select_by_sample:
+            _pick_gain_channel_by_sample(waveforms, thresholds, out, gain_mask)
+        else:
+            _pick_gain_channel_by_waveform(waveforms, thresholds, out, gain_mask)
+    else:
+        raise ValueError(
+            "input waveforms has shape {}. not sure what to do "
+            "with that.".format(waveforms.shape)
+        )
+
+    return out, gain_mask
+
+
 class GainSelector(Component, metaclass=ABCMeta):
     """
     Base class for algorithms that reduce a 2-gain-channel waveform to a
@@ -79,6 +198,46 @@ class GainSelector(Component, metaclass=ABCMeta):
         """
         pass
 
+    def select_gains_batch(self, cam_id, multi_gain_waveforms,
+                           out=None, gain_mask=None):
+        """
+        Gain selection of several telescopes with the same camera at once.
+
+        Parameters
+        ----------
+        cam_id: str
+            camera of the telescopes
+        multi_gain_waveforms: np.ndarray
+            waveforms of shape (n_tel, n_gain, n_pix, n_samples)
+        out: np.ndarray or None
+            Preallocated array of shape (n_tel, n_pix, n_samples) for the
+            selected waveforms, e.g. to reuse the same buffer for each event
+        gain_mask: np.ndarray or None
+            Preallocated boolean array for the gain mask
+
+        Returns
+        -------
+        tuple(ndarray, ndarray):
+            (waveforms, gain_mask) of all telescopes
+        """
+        results = [
+            self.select_gains(cam_id, waveforms)
+            for waveforms in multi_gain_waveforms
+        ]
+        if out is None:
+            out = np.stack([r[0] for r in results])
+        else:
+            for tel, (waveform, _) in enumerate(results):
+                out[tel] = waveform
+
+        if gain_mask is None:
+            gain_mask = np.stack([r[1] for r in results])
+        else:
+            for tel, (_, mask) in enumerate(results):
+                gain_mask[tel] = mask
+
+        return out, gain_mask
+
 
 class NullGainSelector(GainSelector):
     """
@@ -105,6 +264,20 @@ class SimpleGainSelector(GainSelector):
                 np.bool)
         )
 
+    def select_gains_batch(self, cam_id, multi_gain_waveforms,
+                           out=None, gain_mask=None):
+        n_tels, _, n_pixels, n_samples = multi_gain_waveforms.shape
+        out = _check_output(
+            out, (n_tels, n_pixels, n_samples),
+            multi_gain_waveforms.dtype, 'out'
+        )
+        gain_mask = _check_output(
+            gain_mask, (n_tels, n_pixels), np.bool_, 'gain_mask'
+        )
+        out[:] = multi_gain_waveforms[:, self.channel]
+        gain_mask[:] = bool(self.channel)
+        return out, gain_mask
+
 
 class ThresholdGainSelector(GainSelector):
     """
@@ -126,7 +299,8 @@ class ThresholdGainSelector(GainSelector):
     Attributes
     ----------
     thresholds: dict
-        mapping of cam_id to threshold value
+        mapping of cam_id to threshold value, which can be replaced by
+        an array with a threshold for each pixel of the camera
     """
 
     threshold_table_name = traits.Unicode(
@@ -154,16 +328,28 @@ class ThresholdGainSelector(GainSelector):
     def __str__(self):
         return f"{self.__class__.__name__}({self.thresholds})"
 
-    def select_gains(self, cam_id, multi_gain_waveform):
-
+    def _get_threshold(self, cam_id):
         try:
-            threshold = self.thresholds[cam_id]
+            return self.thresholds[cam_id]
         except KeyError:
             raise KeyError(
                 "Camera ID '{}' not found in the gain-threshold "
                 "table '{}'".format(cam_id, self.threshold_table_name)
             )
 
+    def select_gains_batch(self, cam_id, multi_gain_waveforms,
+                           out=None, gain_mask=None):
+        return pick_gain_channel_batch(
+            multi_gain_waveforms,
+            threshold=self._get_threshold(cam_id),
+            select_by_sample=self.select_by_sample,
+            out=out,
+            gain_mask=gain_mask,
+        )
+
+    def select_gains(self, cam_id, multi_gain_waveform):
+        threshold = self._get_threshold(cam_id)
+
         waveform, gain_mask = pick_gain_channel(
             waveforms=multi_gain_waveform,
             threshold=threshold,
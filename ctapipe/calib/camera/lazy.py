@@ -0,0 +1,132 @@
+"""
+Telescope containers with lazily computed waveforms.
+
+The R1 calibrators and the `~ctapipe.calib.camera.CameraDL0Reducer` can
+fill the R1 and DL0 containers with a recipe for the waveform instead of the
+waveform itself (see their ``lazy`` option). The waveform is then only
+computed, and stored in the container, when it is accessed for the first time,
+so telescopes whose waveforms are never used do not allocate them.
+"""
+from ...io.containers import R1CameraContainer, DL0CameraContainer
+
+__all__ = [
+    'LazyWaveform',
+    'LazyR1CameraContainer',
+    'LazyDL0CameraContainer',
+    'lazy_container',
+    'waveform_exists',
+]
+
+
+class LazyWaveform:
+    """
+    Recipe for a waveform that is computed as ``func(*args)``.
+
+    The arguments are stored as given, so the waveform is computed from
+    the input arrays of the moment the recipe was created.
+
+    Parameters
+    ----------
+    func: callable
+        function computing the waveform
+    args:
+        positional arguments of ``func``
+    """
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def compute(self):
+        """ Compute the waveform """
+        return self.func(*self.args)
+
+
+def _lazy_waveform_property(slot):
+    """
+    Property replacing the ``waveform`` field of a container, computing
+    a `LazyWaveform` stored in the ``slot`` of the field on first access.
+    """
+    def fget(self):
+        waveform = slot.__get__(self)
+        if isinstance(waveform, LazyWaveform):
+            waveform = waveform.compute()
+            slot.__set__(self, waveform)
+        return waveform
+
+    def fset(self, value):
+        slot.__set__(self, value)
+
+    return property(fget, fset, doc=slot.__doc__)
+
+
+def _waveform_pending_property(slot):
+    def fget(self):
+        return isinstance(slot.__get__(self), LazyWaveform)
+
+    return property(
+        fget, doc='True if the waveform was set lazily and not computed yet'
+    )
+
+
+class LazyR1CameraContainer(R1CameraContainer):
+    """
+    R1CameraContainer whose waveform can be a `LazyWaveform`,
+    which is computed when the waveform is accessed for the first time.
+    """
+    container_prefix = R1CameraContainer.container_prefix
+
+    waveform = _lazy_waveform_property(R1CameraContainer.waveform)
+    waveform_pending = _waveform_pending_property(R1CameraContainer.waveform)
+
+
+class LazyDL0CameraContainer(DL0CameraContainer):
+    """
+    DL0CameraContainer whose waveform can be a `LazyWaveform`,
+    which is computed when the waveform is accessed for the first time.
+    """
+    container_prefix = DL0CameraContainer.container_prefix
+
+    waveform = _lazy_waveform_property(DL0CameraContainer.waveform)
+    waveform_pending = _waveform_pending_property(DL0CameraContainer.waveform)
+
+
+def lazy_container(tel_map, tel_id, container_class):
+    """
+    The container of ``tel_id`` in ``tel_map``, replaced by an instance
+    of the lazy ``container_class`` with the same content if necessary.
+
+    Parameters
+    ----------
+    tel_map: ctapipe.core.Map
+        map of telescope id to container, e.g. ``event.r1.tel``
+    tel_id: int
+        telescope id
+    container_class: type
+        `LazyR1CameraContainer` or `LazyDL0CameraContainer`
+
+    Returns
+    -------
+    container: container_class
+    """
+    container = tel_map.get(tel_id)
+    if isinstance(container, container_class):
+        return container
+
+    lazy = container_class()
+    if container is not None:
+        lazy.update(**container.as_dict())
+        lazy.meta = container.meta
+    tel_map[tel_id] = lazy
+    return lazy
+
+
+def waveform_exists(container):
+    """
+    True if the waveform of ``container`` is set,
+    without computing it if it is lazy.
+    """
+    if getattr(container, 'waveform_pending', False):
+        return True
+    return container.waveform is not None
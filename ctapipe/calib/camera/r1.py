@@ -16,6 +16,8 @@ of the data.
 from abc import abstractmethod
 
 from ...core import Component
+from ...core.traits import Bool
+from .lazy import LazyR1CameraContainer, LazyWaveform, lazy_container
 
 __all__ = [
     'NullR1Calibrator',
@@ -44,6 +46,22 @@ class CameraR1Calibrator(Component):
         Set to None if no Tool to pass.
     kwargs
     """
+    profiled_methods = ('calibrate', )
+
+    #: Child classes that implement ``calibrate_telescope(event, telid)``,
+    #: the calibration of a single telescope, set this to True, so
+    #: `ctapipe.calib.CameraCalibrator` can calibrate the telescopes of an
+    #: event in parallel. Otherwise `calibrate` is called for the whole event.
+    supports_per_telescope = False
+
+    lazy = Bool(
+        False,
+        help='Only compute the R1 waveforms when they are accessed. '
+             'The r1 containers then hold a '
+             '`~ctapipe.calib.camera.lazy.LazyWaveform` computed from the '
+             'R0 data of the moment of the calibration.'
+    ).tag(config=True)
+
     def __init__(self, config=None, parent=None, **kwargs):
         """
         Parent class for the r1 calibrators. Fills the r1 container.
@@ -106,6 +124,28 @@ class CameraR1Calibrator(Component):
                 self._r0_empty_warn = True
             return False
 
+    def fill_waveform(self, event, telid, func, *args):
+        """
+        Set the R1 waveform of a telescope to ``func(*args)``,
+        computed right away or, if ``lazy`` is set, on first access.
+
+        Parameters
+        ----------
+        event : container
+            A `ctapipe` event container
+        telid : int
+            The telescope id.
+        func : callable
+            function computing the R1 waveform
+        args
+            positional arguments of ``func``
+        """
+        if self.lazy:
+            r1 = lazy_container(event.r1.tel, telid, LazyR1CameraContainer)
+            r1.waveform = LazyWaveform(func, *args)
+        else:
+            event.r1.tel[telid].waveform = func(*args)
+
     @classmethod
     def from_eventsource(cls, eventsource, **kwargs):
         """
@@ -151,6 +191,7 @@ class NullR1Calibrator(CameraR1Calibrator):
         Set to None if no Tool to pass.
     kwargs
     """
+    supports_per_telescope = True
 
     def __init__(self, config=None, parent=None, **kwargs):
         super().__init__(config, parent, **kwargs)
@@ -159,9 +200,15 @@ class NullR1Calibrator(CameraR1Calibrator):
 
     def calibrate(self, event):
         for telid in event.r0.tels_with_data:
-            if self.check_r0_exists(event, telid):
-                samples = event.r0.tel[telid].waveform
-                event.r1.tel[telid].waveform = samples.astype('float32')
+            self.calibrate_telescope(event, telid)
+
+    def calibrate_telescope(self, event, telid):
+        if self.check_r0_exists(event, telid):
+            samples = event.r0.tel[telid].waveform
+            # lazy waveforms share the memory of float32 r0 waveforms
+            self.fill_waveform(
+                event, telid, _as_float32, samples, not self.lazy
+            )
 
 
 class HESSIOR1Calibrator(CameraR1Calibrator):
@@ -183,6 +230,7 @@ class HESSIOR1Calibrator(CameraR1Calibrator):
         Set to None if no Tool to pass.
     kwargs
     """
+    supports_per_telescope = True
 
     calib_scale = 1.05
     """
@@ -199,16 +247,53 @@ class HESSIOR1Calibrator(CameraR1Calibrator):
     """
     # TODO: Handle calib_scale differently per simlated telescope
 
-    def calibrate(self, event):
+    @staticmethod
+    def check_origin(event):
         if event.meta['origin'] != 'hessio':
             raise ValueError('Using HESSIOR1Calibrator to calibrate a '
                              'non-hessio event.')
 
+    def calibrate(self, event):
+        self.check_origin(event)
+
         for telid in event.r0.tels_with_data:
-            if self.check_r0_exists(event, telid):
-                samples = event.r0.tel[telid].waveform
-                n_samples = samples.shape[2]
-                ped = event.mc.tel[telid].pedestal / n_samples
-                gain = event.mc.tel[telid].dc_to_pe * self.calib_scale
-                calibrated = (samples - ped[..., None]) * gain[..., None]
-                event.r1.tel[telid].waveform = calibrated
+            self.calibrate_telescope(event, telid)
+
+    def calibrate_telescope(self, event, telid):
+        self.check_origin(event)
+
+        if self.check_r0_exists(event, telid):
+            samples = event.r0.tel[telid].waveform
+            n_samples = samples.shape[2]
+            ped = event.mc.tel[telid].pedestal / n_samples
+            gain = event.mc.tel[telid].dc_to_pe * self.calib_scale
+            self.fill_waveform(event, telid, _calibrate_mc_waveform,
+                               samples, ped, gain)
+
+
+def _as_float32(samples, copy):
+    return samples.astype('float32', copy=copy)
+
+
+def _calibrate_mc_waveform(samples, pedestal, gain):
+    """
+    Subtract the pedestal from the R0 waveforms and convert them
+    to photoelectrons, allocating only the output array.
+
+    Parameters
+    ----------
+    samples : ndarray
+        R0 waveforms, shape (n_channels, n_pixels, n_samples)
+    pedestal : ndarray
+        pedestal per sample, shape (n_channels, n_pixels)
+    gain : ndarray
+        conversion to photoelectrons, shape (n_channels, n_pixels)
+
+    Returns
+    -------
+    ndarray
+        R1 waveforms
+    """
+    calibrated = samples - pedestal[..., None]
+    calibrated *= gain[..., None]
+    return calibrated
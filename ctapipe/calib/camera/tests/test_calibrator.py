@@ -1,3 +1,7 @@
+import pickle
+from copy import deepcopy
+
+import pytest
 from numpy.testing import assert_allclose
 
 from ctapipe.calib.camera import (
@@ -5,8 +9,10 @@ from ctapipe.calib.camera import (
     HESSIOR1Calibrator,
     NullR1Calibrator
 )
+from ctapipe.calib.camera.calibrator import _dumps_event, _loads_event
 from ctapipe.image.extractor import LocalPeakWindowSum
 from ctapipe.io import SimTelEventSource
+from ctapipe.io.containers import DataContainer
 from ctapipe.utils import get_dataset_path
 from traitlets.config.configurable import Config
 
@@ -62,3 +68,79 @@ def test_config():
     )
     assert calibrator.dl1.extractor.window_shift == window_shift
     assert calibrator.dl1.extractor.window_width == window_width
+
+
+def test_camera_calibrator_parallel_telescopes(example_event):
+    expected = deepcopy(example_event)
+    CameraCalibrator(r1_product="HESSIOR1Calibrator").calibrate(expected)
+
+    with CameraCalibrator(
+            r1_product="HESSIOR1Calibrator", n_workers=2
+    ) as calibrator:
+        calibrator.calibrate(example_event)
+
+    for telid in expected.dl0.tels_with_data:
+        assert_allclose(
+            example_event.dl1.tel[telid].image,
+            expected.dl1.tel[telid].image,
+        )
+        assert_allclose(
+            example_event.dl1.tel[telid].pulse_time,
+            expected.dl1.tel[telid].pulse_time,
+        )
+
+
+def test_camera_calibrator_close():
+    assert HESSIOR1Calibrator.supports_per_telescope
+    assert NullR1Calibrator.supports_per_telescope
+
+    with CameraCalibrator(r1_product="NullR1Calibrator", n_workers=2) as calibrator:
+        calibrator.calibrate(DataContainer())
+        executor = calibrator._telescope_executor
+        assert executor is not None
+
+    assert calibrator._telescope_executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_calibrate_events(example_event, backend):
+    events = [deepcopy(example_event) for _ in range(3)]
+    for event_id, event in enumerate(events):
+        event.count = event_id
+
+    config = Config({'CameraCalibrator': {
+        'n_workers': 2,
+        'parallel_backend': backend,
+    }})
+    calibrator = CameraCalibrator(r1_product="HESSIOR1Calibrator", config=config)
+    calibrated = list(calibrator.calibrate_events(iter(events)))
+
+    expected = deepcopy(example_event)
+    CameraCalibrator(r1_product="HESSIOR1Calibrator").calibrate(expected)
+
+    assert [event.count for event in calibrated] == [0, 1, 2]
+    for event, original in zip(calibrated, events):
+        # the instrument description is not copied
+        assert event.inst is original.inst
+        for telid in expected.dl0.tels_with_data:
+            assert_allclose(
+                event.dl1.tel[telid].image,
+                expected.dl1.tel[telid].image,
+            )
+
+
+def test_event_pickling_without_inst(example_event):
+    inst = example_event.inst
+    data = _dumps_event(example_event, inst)
+    # only the per-event data is pickled
+    assert len(data) < len(pickle.dumps(example_event)) - len(pickle.dumps(inst)) / 2
+
+    event = _loads_event(data, inst)
+    assert event.inst is inst
+    assert event.count == example_event.count
+    for telid in example_event.r0.tels_with_data:
+        assert_allclose(
+            event.r0.tel[telid].waveform, example_event.r0.tel[telid].waveform
+        )
@@ -4,6 +4,7 @@ import pytest
 from ctapipe.calib.camera.gainselection import ThresholdGainSelector
 from ctapipe.calib.camera.gainselection import SimpleGainSelector
 from ctapipe.calib.camera.gainselection import pick_gain_channel
+from ctapipe.calib.camera.gainselection import pick_gain_channel_batch
 
 
 def test_pick_gain_channel():
@@ -50,6 +51,33 @@ def test_pick_gain_channel():
     assert (new_waveforms[500:, 15:] == good_lg_value).all()
 
 
+@pytest.mark.parametrize('select_by_sample', [False, True])
+def test_pick_gain_channel_batch(select_by_sample):
+    rng = np.random.RandomState(0)
+    waveforms = rng.uniform(0, 120, (3, 2, 100, 30))
+    # per-pixel thresholds
+    threshold = rng.uniform(100, 130, 100)
+
+    out = np.empty((3, 100, 30))
+    new_waveforms, gain_mask = pick_gain_channel_batch(
+        waveforms, threshold, select_by_sample=select_by_sample, out=out,
+    )
+    assert new_waveforms is out
+
+    for tel in range(3):
+        expected_waveforms, expected_mask = pick_gain_channel(
+            waveforms[tel], threshold, select_by_sample=select_by_sample,
+        )
+        assert (new_waveforms[tel] == expected_waveforms).all()
+        assert (gain_mask[tel] == expected_mask).all()
+
+    with pytest.raises(ValueError):
+        pick_gain_channel_batch(waveforms, 100, out=np.empty((3, 100, 29)))
+
+    with pytest.raises(ValueError):
+        pick_gain_channel_batch(np.ones((3, 3, 100, 30)), 100)
+
+
 def test_pick_gain_channel_bad_input():
     input_waveforms = np.arange(10).reshape(1, 10)
     waveforms, gain_mask = pick_gain_channel(input_waveforms, threshold=4)
@@ -116,3 +144,9 @@ def test_simple_gain_selector():
         assert waveforms_1g.shape == (1000, 30)
         assert (waveforms_1g == waveforms_2g[chan]).all()
         assert mask.shape == (1000,)
+
+        stacked = np.stack([waveforms_2g, -waveforms_2g])
+        waveforms_1g, mask = gs.select_gains_batch("NectarCam", stacked)
+        assert (waveforms_1g == stacked[:, chan]).all()
+        assert mask.shape == (2, 1000)
+        assert (mask == bool(chan)).all()
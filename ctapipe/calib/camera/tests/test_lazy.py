@@ -0,0 +1,118 @@
+import numpy as np
+from numpy.testing import assert_allclose
+from traitlets.config import Config
+
+from ctapipe.calib.camera.calibrator import CameraCalibrator
+from ctapipe.calib.camera.dl0 import CameraDL0Reducer
+from ctapipe.calib.camera.lazy import (
+    LazyDL0CameraContainer,
+    LazyR1CameraContainer,
+    LazyWaveform,
+    waveform_exists,
+)
+from ctapipe.calib.camera.r1 import HESSIOR1Calibrator, NullR1Calibrator
+from ctapipe.io.containers import DataContainer
+
+
+def make_event(tel_ids=(1, 2), n_pixels=10, n_samples=25):
+    rng = np.random.RandomState(0)
+    event = DataContainer()
+    event.meta['origin'] = 'hessio'
+    for tel_id in tel_ids:
+        event.r0.tel[tel_id].waveform = rng.randint(
+            0, 1000, (1, n_pixels, n_samples)
+        ).astype(np.uint16)
+        event.r1.tel[tel_id].trigger_type = 3
+        event.mc.tel[tel_id].pedestal = rng.uniform(200, 300, (1, n_pixels))
+        event.mc.tel[tel_id].dc_to_pe = rng.uniform(0.5, 1.5, (1, n_pixels))
+    event.r0.tels_with_data = set(tel_ids)
+    event.r1.tels_with_data = set(tel_ids)
+    event.dl0.tels_with_data = set(tel_ids)
+    return event
+
+
+def test_lazy_waveform_container():
+    container = LazyR1CameraContainer()
+    assert not waveform_exists(container)
+
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.ones(3)
+
+    container.waveform = LazyWaveform(compute)
+    assert container.waveform_pending
+    assert waveform_exists(container)
+    assert len(calls) == 0
+
+    assert_allclose(container.waveform, 1)
+    assert_allclose(container.waveform, 1)
+    assert not container.waveform_pending
+    assert len(calls) == 1
+
+    container.waveform = LazyWaveform(compute)
+    container.reset()
+    assert container.waveform is None
+
+
+def test_lazy_r1_dl0():
+    eager = make_event()
+    HESSIOR1Calibrator().calibrate(eager)
+    CameraDL0Reducer().reduce(eager)
+
+    lazy = make_event()
+    HESSIOR1Calibrator(lazy=True).calibrate(lazy)
+    CameraDL0Reducer(lazy=True).reduce(lazy)
+
+    for tel_id in (1, 2):
+        r1 = lazy.r1.tel[tel_id]
+        dl0 = lazy.dl0.tel[tel_id]
+        assert isinstance(r1, LazyR1CameraContainer)
+        assert isinstance(dl0, LazyDL0CameraContainer)
+        # other fields are kept
+        assert r1.trigger_type == 3
+        assert r1.waveform_pending and dl0.waveform_pending
+
+    # accessing dl0 computes r1 of the same telescope only
+    waveform = lazy.dl0.tel[1].waveform
+    assert not lazy.r1.tel[1].waveform_pending
+    assert lazy.r1.tel[2].waveform_pending
+    assert waveform is lazy.r1.tel[1].waveform
+
+    for tel_id in (1, 2):
+        assert_allclose(
+            lazy.dl0.tel[tel_id].waveform, eager.dl0.tel[tel_id].waveform
+        )
+
+
+def test_lazy_null_r1():
+    event = make_event()
+    event.r0.tel[1].waveform = event.r0.tel[1].waveform.astype(np.float32)
+    NullR1Calibrator(lazy=True).calibrate(event)
+
+    assert event.r1.tel[2].waveform.dtype == np.float32
+    # float32 r0 data is not copied
+    assert np.shares_memory(event.r1.tel[1].waveform, event.r0.tel[1].waveform)
+
+
+def test_lazy_calibrator_tel_ids():
+    config = Config({
+        'CameraR1Calibrator': {'lazy': True},
+        'CameraDL0Reducer': {'lazy': True},
+    })
+    calibrator = CameraCalibrator(
+        config=config,
+        r1_product='HESSIOR1Calibrator',
+        extractor_name='FullWaveformSum',
+    )
+    event = make_event()
+    calibrator.calibrate(event, tel_ids={1})
+
+    assert event.dl1.tel[1].image is not None
+    assert not event.dl0.tel[1].waveform_pending
+
+    # telescope 2 is reduced, but its waveforms are never computed
+    assert 2 not in event.dl1.tel
+    assert event.r1.tel[2].waveform_pending
+    assert event.dl0.tel[2].waveform_pending
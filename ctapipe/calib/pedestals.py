@@ -4,6 +4,15 @@ Pedestal Calculation Functions
 
 import numpy as np
 
+from ctapipe.core import Component
+from ctapipe.core.traits import Int, Float, CaselessStrEnum
+from ctapipe.io.containers import PedestalContainer
+
+__all__ = [
+    'calc_pedestals_from_traces',
+    'StreamingPedestalEstimator',
+]
+
 
 def calc_pedestals_from_traces(traces, start_sample, end_sample):
     """A very simple algorithm to calculates pedestals and pedestal
@@ -37,3 +46,284 @@ def calc_pedestals_from_traces(traces, start_sample, end_sample):
 
 # PUT OTHER PEDESTAL CALCULATION FUNCTIONS HERE:
 # ----------------------------------------------
+
+
+class StreamingPedestalEstimator(Component):
+    """
+    Incremental pedestal and noise estimator for streams of events.
+
+    For each telescope, the mean and variance of the waveform samples in
+    ``[window_start, window_end)`` are tracked per channel and pixel, using
+    the update of Welford / Chan et al. to merge the samples of each event into
+    the running estimate. Only a fixed amount of memory per telescope is used,
+    so arbitrarily long runs can be processed, e.g. by iterating over an
+    `~ctapipe.io.EventSource` using `process`.
+
+    Three kinds of averaging are supported (``averaging``):
+
+    - ``cumulative``: all events since the start
+    - ``sliding``: the last ``window_size`` events, keeping the statistics
+      of each of these events
+    - ``exponential``: exponentially decaying weights, the newest event
+      has the weight ``smoothing_factor``
+
+    The events should only contain pedestal data, e.g. pedestal or
+    interleaved pedestal events of a run.
+    """
+    data_level = CaselessStrEnum(
+        ['r0', 'r1'],
+        default_value='r0',
+        help='Data level of the waveforms used for the estimate'
+    ).tag(config=True)
+    window_start = Int(
+        0, help='First sample of the waveforms used for the estimate'
+    ).tag(config=True)
+    window_end = Int(
+        None, allow_none=True,
+        help='End of the samples used for the estimate, None for all samples'
+    ).tag(config=True)
+    averaging = CaselessStrEnum(
+        ['cumulative', 'sliding', 'exponential'],
+        default_value='sliding',
+        help='How the events are averaged'
+    ).tag(config=True)
+    window_size = Int(
+        500,
+        help='Number of events of the sliding averaging. The statistics of '
+             'each event in the window are kept, 16 bytes per channel and '
+             'pixel, e.g. 16 MB per telescope for 500 events of a camera '
+             'with 1000 pixels and two gain channels. The buffers grow up '
+             'to this size as events arrive.'
+    ).tag(config=True)
+    smoothing_factor = Float(
+        0.01, help='Weight of the newest event in the exponential averaging'
+    ).tag(config=True)
+    update_interval = Int(
+        100, help='Number of events of a telescope between pedestal updates'
+    ).tag(config=True)
+
+    def __init__(self, config=None, parent=None, **kwargs):
+        """
+        Parameters
+        ----------
+        config : traitlets.loader.Config
+            Configuration specified by config file or cmdline arguments.
+            Used to set traitlet values.
+            Set to None if no configuration to pass.
+        tool : ctapipe.core.Tool or None
+            Tool executable that is calling this component.
+            Passes the correct logger to the component.
+            Set to None if no Tool to pass.
+        kwargs
+        """
+        super().__init__(config=config, parent=parent, **kwargs)
+        if self.window_size < 1 or self.update_interval < 1:
+            raise ValueError('window_size and update_interval must be >= 1')
+        if not 0 < self.smoothing_factor <= 1:
+            raise ValueError('smoothing_factor must be in (0, 1]')
+        self._states = {}
+
+    def reset(self, tel_id=None):
+        """ Forget the accumulated statistics of one or all telescopes """
+        if tel_id is None:
+            self._states.clear()
+        else:
+            self._states.pop(tel_id, None)
+
+    def update(self, tel_id, waveforms, event_id=-1):
+        """
+        Add the waveforms of one event of a telescope to the estimate.
+
+        Parameters
+        ----------
+        tel_id : int
+            telescope id
+        waveforms : ndarray
+            Waveforms of shape (n_channels, n_pixels, n_samples)
+        event_id : int
+            id of the event, stored in the emitted containers
+
+        Returns
+        -------
+        bool
+            True if an update of the pedestal is due, i.e. every
+            ``update_interval`` events of this telescope
+        """
+        samples = np.asanyarray(waveforms)[..., self.window_start:self.window_end]
+        n_samples = samples.shape[-1]
+        if n_samples == 0:
+            raise ValueError('The sample window of the waveforms is empty')
+
+        mean = samples.mean(axis=-1)
+        m2 = np.square(samples - mean[..., np.newaxis]).sum(axis=-1)
+
+        state = self._states.get(tel_id)
+        if state is None or state.shape != mean.shape or state.n_samples != n_samples:
+            state = _PedestalState(
+                self.averaging, mean.shape, n_samples, self.window_size
+            )
+            self._states[tel_id] = state
+
+        state.add(mean, m2, self.smoothing_factor)
+        state.last_event_id = event_id
+
+        return state.n_events_total % self.update_interval == 0
+
+    def get_pedestal(self, tel_id, container=None):
+        """
+        Current estimate of a telescope
+
+        Parameters
+        ----------
+        tel_id : int
+            telescope id
+        container : PedestalContainer or None
+            container to fill, a new one is created if None
+
+        Returns
+        -------
+        PedestalContainer
+        """
+        state = self._states[tel_id]
+        if container is None:
+            container = PedestalContainer()
+
+        container.tel_id = tel_id
+        container.n_events = state.n_events
+        container.n_events_total = state.n_events_total
+        container.last_event_id = state.last_event_id
+        container.pedestal_mean, variance = state.estimate()
+        container.pedestal_std = np.sqrt(variance)
+        return container
+
+    def process_event(self, event):
+        """
+        Add all telescopes of an event to the estimate.
+
+        Parameters
+        ----------
+        event : container
+            A `ctapipe` event container
+
+        Returns
+        -------
+        dict
+            Mapping of telescope id to new `PedestalContainer` for the
+            telescopes that reached ``update_interval`` events
+        """
+        data = event.r0 if self.data_level == 'r0' else event.r1
+        updates = {}
+        for tel_id in data.tels_with_data:
+            waveforms = data.tel[tel_id].waveform
+            if waveforms is None:
+                continue
+            if self.update(tel_id, waveforms, data.event_id):
+                updates[tel_id] = self.get_pedestal(tel_id)
+        return updates
+
+    def process(self, events):
+        """
+        Track the pedestals over a stream of events.
+
+        Parameters
+        ----------
+        events : iterable
+            `ctapipe` event containers, e.g. an `~ctapipe.io.EventSource`
+
+        Yields
+        ------
+        PedestalContainer
+            updated estimate of a telescope, every ``update_interval``
+            events of that telescope
+        """
+        for event in events:
+            yield from self.process_event(event).values()
+
+
+class _PedestalState:
+    """ Running statistics of one telescope, see StreamingPedestalEstimator """
+
+    def __init__(self, averaging, shape, n_samples, window_size):
+        self.averaging = averaging
+        self.shape = shape
+        self.n_samples = n_samples
+        self.n_events_total = 0
+        self.last_event_id = -1
+        self.window_size = window_size
+
+        if averaging == 'sliding':
+            # mean and sum of squared deviations of each event in the window,
+            # grown as needed up to window_size
+            self.event_means = np.empty((0, *shape))
+            self.event_m2 = np.empty((0, *shape))
+        else:
+            self.mean = np.zeros(shape)
+            # sum of squared deviations for cumulative, variance for exponential
+            self.spread = np.zeros(shape)
+
+    @property
+    def n_events(self):
+        if self.averaging == 'sliding':
+            return min(self.n_events_total, self.window_size)
+        return self.n_events_total
+
+    def _grow_window(self):
+        """ double the capacity of the sliding window buffers """
+        n_filled = len(self.event_means)
+        capacity = min(self.window_size, max(16, 2 * n_filled))
+        for name in ('event_means', 'event_m2'):
+            buffer = np.empty((capacity, *self.shape))
+            buffer[:n_filled] = getattr(self, name)
+            setattr(self, name, buffer)
+
+    def add(self, mean, m2, smoothing_factor):
+        if self.averaging == 'sliding':
+            # the window only wraps around once it has its full size
+            if self.n_events_total == len(self.event_means) < self.window_size:
+                self._grow_window()
+            position = self.n_events_total % self.window_size
+            self.event_means[position] = mean
+            self.event_m2[position] = m2
+
+        elif self.averaging == 'cumulative':
+            n_a = self.n_events_total * self.n_samples
+            n_b = self.n_samples
+            n = n_a + n_b
+            delta = mean - self.mean
+            self.mean += delta * n_b / n
+            self.spread += m2 + delta**2 * n_a * n_b / n
+
+        else:
+            variance = m2 / self.n_samples
+            if self.n_events_total == 0:
+                self.mean[:] = mean
+                self.spread[:] = variance
+            else:
+                alpha = smoothing_factor
+                delta = mean - self.mean
+                self.mean += alpha * delta
+                self.spread = (
+                    (1 - alpha) * (self.spread + alpha * delta**2)
+                    + alpha * variance
+                )
+
+        self.n_events_total += 1
+
+    def estimate(self):
+        """ mean and variance of the samples """
+        if self.averaging == 'sliding':
+            means = self.event_means[:self.n_events]
+            mean = means.mean(axis=0)
+            m2 = (
+                self.event_m2[:self.n_events].sum(axis=0)
+                + self.n_samples * np.square(means - mean).sum(axis=0)
+            )
+            return mean, m2 / (self.n_events * self.n_samples)
+
+        if self.averaging == 'cumulative':
+            return (
+                self.mean.copy(),
+                self.spread / (self.n_events_total * self.n_samples)
+            )
+
+        return self.mean.copy(), self.spread.copy()
@@ -27,3 +27,86 @@ def test_calc_pedestals_from_traces():
 
     assert np.all(peds == 1.0)
     assert np.all(pedvars == 0)
+
+
+def test_streaming_pedestal_estimator():
+    from ctapipe.io.containers import DataContainer
+
+    rng = np.random.RandomState(0)
+    n_events = 25
+    waveforms = rng.normal(100, 5, (n_events, 2, 10, 20))
+
+    def stats(wfs):
+        samples = np.moveaxis(wfs[..., 2:18], 0, -2).reshape(2, 10, -1)
+        return samples.mean(axis=-1), samples.std(axis=-1)
+
+    cumulative = pedestals.StreamingPedestalEstimator(
+        averaging='cumulative', window_start=2, window_end=18, update_interval=10,
+    )
+    sliding = pedestals.StreamingPedestalEstimator(
+        averaging='sliding', window_size=7, window_start=2, window_end=18,
+    )
+    exponential = pedestals.StreamingPedestalEstimator(
+        averaging='exponential', smoothing_factor=1, window_start=2, window_end=18,
+    )
+
+    updates = []
+    event = DataContainer()
+    for event_id, wfs in enumerate(waveforms):
+        event.r0.event_id = event_id
+        event.r0.tels_with_data = [1]
+        event.r0.tel[1].waveform = wfs
+        updates.extend(cumulative.process_event(event).values())
+        sliding.update(1, wfs, event_id)
+        exponential.update(1, wfs, event_id)
+
+    # updates every 10 events
+    assert [p.last_event_id for p in updates] == [9, 19]
+    assert updates[0].n_events == 10
+
+    mean, std = stats(waveforms[:10])
+    np.testing.assert_allclose(updates[0].pedestal_mean, mean)
+    np.testing.assert_allclose(updates[0].pedestal_std, std)
+
+    result = cumulative.get_pedestal(1)
+    mean, std = stats(waveforms)
+    assert result.n_events == n_events
+    np.testing.assert_allclose(result.pedestal_mean, mean)
+    np.testing.assert_allclose(result.pedestal_std, std)
+
+    result = sliding.get_pedestal(1)
+    mean, std = stats(waveforms[-7:])
+    assert result.n_events == 7
+    assert result.n_events_total == n_events
+    np.testing.assert_allclose(result.pedestal_mean, mean)
+    np.testing.assert_allclose(result.pedestal_std, std)
+
+    # only the last event counts with a smoothing factor of 1
+    result = exponential.get_pedestal(1)
+    mean, std = stats(waveforms[-1:])
+    np.testing.assert_allclose(result.pedestal_mean, mean)
+    np.testing.assert_allclose(result.pedestal_std, std)
+
+
+def test_sliding_window_grows():
+    rng = np.random.RandomState(1)
+    waveforms = rng.normal(100, 5, (100, 1, 5, 10))
+    sliding = pedestals.StreamingPedestalEstimator(
+        averaging='sliding', window_size=40,
+    )
+
+    for event_id, wfs in enumerate(waveforms):
+        sliding.update(1, wfs, event_id)
+        state = sliding._states[1]
+        # the buffers are only allocated as events arrive
+        assert min(event_id + 1, 40) <= len(state.event_means) <= 40
+        if event_id < 8:
+            assert len(state.event_means) == 16
+
+        if event_id in (20, 99):
+            window = waveforms[max(0, event_id - 39):event_id + 1]
+            samples = np.moveaxis(window, 0, -2).reshape(1, 5, -1)
+            result = sliding.get_pedestal(1)
+            assert result.n_events == len(window)
+            np.testing.assert_allclose(result.pedestal_mean, samples.mean(axis=-1))
+            np.testing.assert_allclose(result.pedestal_std, samples.std(axis=-1))
@@ -1,7 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
 from .component import Component, non_abstract_children
-from .container import Container, Field, Map
+from .container import Container, Field, Map, ArrayMap
 from .provenance import Provenance, get_module_version
 from .tool import Tool, ToolConfigurationError
 
@@ -11,6 +11,7 @@ __all__ = [
     'Tool',
     'Field',
     'Map',
+    'ArrayMap',
     'Provenance',
     'ToolConfigurationError',
     'non_abstract_children',
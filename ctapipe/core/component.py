@@ -5,6 +5,7 @@ from inspect import isabstract
 from traitlets.config import Configurable
 from traitlets import TraitError
 from ctapipe.core.plugins import detect_and_import_io_plugins
+from ctapipe.core.profiling import profiled
 
 
 def non_abstract_children(base):
@@ -76,8 +77,22 @@ class Component(Configurable, metaclass=AbstractConfigurableMeta):
         comp = MyComponent()
         comp.some_option = 6      # ok
         comp.some_option = 'test' # will fail validation
+
+    The methods named in ``profiled_methods`` are timed as stages
+    ``ClassName.method`` when profiling is enabled, including the
+    overriding methods of subclasses (see `ctapipe.core.profiling`).
     """
 
+    #: names of the methods timed when profiling is enabled
+    profiled_methods = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in cls.profiled_methods:
+            method = cls.__dict__.get(name)
+            if callable(method) and not getattr(method, '__isabstractmethod__', False):
+                setattr(cls, name, profiled(f'{cls.__name__}.{name}')(method))
+
     def __init__(self, config=None, parent=None, **kwargs):
         """
         Parameters
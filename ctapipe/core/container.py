@@ -1,8 +1,23 @@
 from collections import defaultdict
+from collections.abc import MutableMapping
 from copy import deepcopy
 from pprint import pformat
 from textwrap import wrap
 
+import numpy as np
+
+__all__ = ['Field', 'Container', 'Map', 'ArrayMap']
+
+
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, np.generic)
+
+
+def _is_immutable(value):
+    """ True if ``value`` can be shared instead of copied """
+    if isinstance(value, (tuple, frozenset)):
+        return all(_is_immutable(v) for v in value)
+    return isinstance(value, _IMMUTABLE_TYPES)
+
 
 class Field:
     """
@@ -44,13 +59,16 @@ class ContainerMeta(type):
 
     This makes sure, that the metadata is immutable,
     and no new fields can be added to a container by accident.
+
+    Slots given explicitly in ``__slots__`` are added to the field slots.
     '''
     def __new__(cls, name, bases, dct):
         field_names = [
             k for k, v in dct.items()
             if isinstance(v, Field)
         ]
-        dct['__slots__'] = tuple(field_names + ['meta', 'prefix'])
+        extra_slots = list(dct.get('__slots__', ()))
+        dct['__slots__'] = tuple(field_names + ['meta', 'prefix'] + extra_slots)
         dct['fields'] = {}
 
         # inherit fields from baseclasses
@@ -62,6 +80,11 @@ class ContainerMeta(type):
         for k in field_names:
             dct['fields'][k] = dct.pop(k)
 
+        # only mutable defaults need to be copied for every instance
+        dct['_copied_fields'] = frozenset(
+            k for k, v in dct['fields'].items() if not _is_immutable(v.default)
+        )
+
         new_cls = type.__new__(cls, name, bases, dct)
 
         # if prefix was not set as a class variable, build a default one
@@ -126,12 +149,20 @@ class Container(metaclass=ContainerMeta):
         # and an instance variable `prefix` in `__slots__`
         self.prefix = self.container_prefix
 
-        for k in set(self.fields).difference(fields):
-            setattr(self, k, deepcopy(self.fields[k].default))
+        for k in self.fields.keys() - fields.keys():
+            setattr(self, k, self._default(k))
 
         for k, v in fields.items():
             setattr(self, k, v)
 
+    @classmethod
+    def _default(cls, key):
+        """ The default value of field ``key``, a copy if it is mutable """
+        default = cls.fields[key].default
+        if key in cls._copied_fields:
+            return deepcopy(default)
+        return default
+
     def __getitem__(self, key):
         return getattr(self, key)
 
@@ -170,7 +201,7 @@ class Container(metaclass=ContainerMeta):
         else:
             d = dict()
             for key, val in self.items(add_prefix=add_prefix):
-                if isinstance(val, Container) or isinstance(val, Map):
+                if isinstance(val, (Container, Map, ArrayMap)):
                     if flatten:
                         d.update({
                             f"{key}_{k}": v
@@ -194,7 +225,7 @@ class Container(metaclass=ContainerMeta):
                 if recursive:
                     getattr(self, name).reset()
             else:
-                setattr(self, name, deepcopy(self.fields[name].default))
+                setattr(self, name, self._default(name))
 
     def update(self, **values):
         """
@@ -213,7 +244,7 @@ class Container(metaclass=ContainerMeta):
             extra = ""
             if isinstance(getattr(self, name), Container):
                 extra = ".*"
-            if isinstance(getattr(self, name), Map):
+            if isinstance(getattr(self, name), (Map, ArrayMap)):
                 extra = "[*]"
             desc = "{:>30s}: {}".format(name + extra, repr(item))
             lines = wrap(desc, 80, subsequent_indent=' ' * 32)
@@ -233,7 +264,7 @@ class Map(defaultdict):
         else:
             d = dict()
             for key, val in self.items():
-                if isinstance(val, Container) or isinstance(val, Map):
+                if isinstance(val, (Container, Map, ArrayMap)):
                     if flatten:
                         d.update({
                             f"{key}_{k}": v
@@ -255,3 +286,295 @@ class Map(defaultdict):
         for val in self.values():
             if isinstance(val, Container):
                 val.reset(recursive=recursive)
+
+
+#: marks an entry of an object column of an `ArrayMap`, whose mutable
+#: default is only copied when it is accessed
+_COPY_DEFAULT = object()
+
+_INT64_RANGE = (np.iinfo(np.int64).min, np.iinfo(np.int64).max)
+
+
+def _column_init(default):
+    """ dtype and initial entry of the `ArrayMap` column of a field """
+    if type(default) is bool:
+        return np.bool_, default
+    if type(default) is int and _INT64_RANGE[0] <= default <= _INT64_RANGE[1]:
+        return np.int64, default
+    if type(default) is float:
+        return np.float64, default
+    if _is_immutable(default):
+        return object, default
+    return object, _COPY_DEFAULT
+
+
+def _column_dtype_for(value, dtype):
+    """
+    The dtype of a numeric column needed to store ``value`` without
+    changing it: ``dtype`` itself, float64 for floats in an int column
+    and object for everything else.
+    """
+    if dtype == np.bool_:
+        return dtype if isinstance(value, (bool, np.bool_)) else object
+
+    if isinstance(value, (bool, np.bool_)):
+        return object
+
+    if dtype == np.int64:
+        if isinstance(value, np.signedinteger):
+            return dtype
+        if isinstance(value, int) and not isinstance(value, np.generic):
+            in_range = _INT64_RANGE[0] <= value <= _INT64_RANGE[1]
+            return dtype if in_range else object
+        if isinstance(value, (float, np.floating)):
+            return np.float64
+        return object
+
+    if isinstance(value, (float, np.floating)):
+        return dtype
+    return object
+
+
+def _array_view_property(name):
+    def fget(self):
+        column = self._map._columns[name]
+        value = column[self._row]
+        if column.dtype != object:
+            return value.item()
+        if value is _COPY_DEFAULT:
+            value = deepcopy(self.fields[name].default)
+            column[self._row] = value
+        return value
+
+    def fset(self, value):
+        array_map = self._map
+        column = array_map._columns[name]
+        if column.dtype != object:
+            dtype = _column_dtype_for(value, column.dtype)
+            if dtype != column.dtype:
+                column = column.astype(dtype)
+                array_map._columns[name] = column
+        column[self._row] = value
+
+    return property(fget, fset, doc=repr(name))
+
+
+def _restore_container(container_class, values, meta, prefix):
+    container = container_class(**values)
+    container.meta = meta
+    container.prefix = prefix
+    return container
+
+
+def _array_view_reduce(self):
+    # copies and pickles of a view are independent containers
+    base = type(self).__bases__[0]
+    return _restore_container, (base, self.as_dict(), self.meta, self.prefix)
+
+
+class ArrayMap(MutableMapping):
+    """
+    Map of keys, e.g. telescope ids, to containers of a single class,
+    storing the fields of all containers in columns.
+
+    Each key is assigned a row the first time it is used, which it keeps.
+    The containers of the map are views of their rows: instances of a
+    subclass of ``container_class``, that read and write their fields
+    directly from and to the columns. As for `Map`, accessing a missing key
+    adds a container with the default values.
+
+    Fields with a ``bool``, ``int`` or ``float`` default are stored in numpy
+    arrays of the corresponding type, all others in object arrays.
+    Storing a value that does not fit into a numeric column converts the
+    column to float64 (floats in an int column) or object (everything else),
+    so values are never changed. Values of numeric columns are returned as
+    Python scalars.
+
+    Removing entries (`clear`, `pop`) only forgets the keys,
+    the rows are filled with the default values when they are used again.
+    A key always gets the same container object, so a container kept
+    from before its key was removed shows the values stored afterwards.
+    Mutable defaults are only copied when a field is accessed.
+    Entries of the whole map can be read at once with `column`.
+
+    Containers of other classes than ``container_class``, e.g. subclasses,
+    can also be stored, they are kept as they are.
+
+    Parameters
+    ----------
+    container_class: type
+        Subclass of `Container`, the type of the entries
+    capacity: int
+        Initial number of rows, grown as needed
+    """
+    _view_classes = {}
+
+    def __init__(self, container_class, capacity=8):
+        self.default_factory = container_class
+        self._view_class = self._get_view_class(container_class)
+        self._entries = {}
+        self._rows = {}
+        self._views = []
+
+        self._init = {}
+        self._columns = {}
+        for name, field in container_class.fields.items():
+            dtype, init = _column_init(field.default)
+            self._init[name] = init
+            self._columns[name] = np.full(capacity, init, dtype=dtype)
+
+    @classmethod
+    def _get_view_class(cls, container_class):
+        view_class = cls._view_classes.get(container_class)
+        if view_class is None:
+            dct = {
+                '__slots__': ('_map', '_row'),
+                '__reduce__': _array_view_reduce,
+                'container_prefix': container_class.container_prefix,
+            }
+            for name in container_class.fields:
+                dct[name] = _array_view_property(name)
+
+            view_class = type(container_class)(
+                container_class.__name__ + 'View', (container_class, ), dct
+            )
+            view_class.__module__ = container_class.__module__
+            cls._view_classes[container_class] = view_class
+        return view_class
+
+    @property
+    def capacity(self):
+        """ Number of allocated rows """
+        return len(next(iter(self._columns.values()), ()))
+
+    def _grow(self):
+        capacity = max(2 * self.capacity, 8)
+        for name, column in self._columns.items():
+            grown = np.full(capacity, self._init[name], dtype=column.dtype)
+            grown[:len(column)] = column
+            self._columns[name] = grown
+
+    def _reset_rows(self, rows):
+        for name, column in self._columns.items():
+            column[rows] = self._init[name]
+
+    def _new_view(self, key):
+        """ Add ``key`` with a view of its row filled with the defaults """
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._views)
+            if self._columns and row >= self.capacity:
+                self._grow()
+
+            view = self._view_class.__new__(self._view_class)
+            view._map = self
+            view._row = row
+            self._rows[key] = row
+            self._views.append(view)
+        else:
+            self._reset_rows(row)
+
+        view = self._views[row]
+        view.meta = {}
+        view.prefix = self.default_factory.container_prefix
+        self._entries[key] = view
+        return view
+
+    def __getitem__(self, key):
+        try:
+            return self._entries[key]
+        except KeyError:
+            return self._new_view(key)
+
+    def __setitem__(self, key, value):
+        if isinstance(value, self._view_class) and value._map is self:
+            if self._rows.get(key) == value._row:
+                self._entries[key] = value
+                return
+
+        if type(value) is self.default_factory or isinstance(value, self._view_class):
+            view = self._new_view(key)
+            for name, val in value.items():
+                setattr(view, name, val)
+            view.meta = value.meta
+            view.prefix = value.prefix
+        else:
+            self._entries[key] = value
+
+    def __delitem__(self, key):
+        del self._entries[key]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """ The entry of ``key`` or ``default``, without adding ``key`` """
+        return self._entries.get(key, default)
+
+    def pop(self, key, *default):
+        """ Remove ``key`` and return its entry """
+        return self._entries.pop(key, *default)
+
+    def clear(self):
+        """ Remove all entries, the rows are only reset when used again """
+        self._entries.clear()
+
+    def column(self, name):
+        """
+        The values of field ``name`` of all entries, in the order of the keys.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        column = self._columns[name]
+        views = self._entries.values()
+        if column.dtype != object and all(
+            isinstance(v, self._view_class) and v._map is self for v in views
+        ):
+            return column[[v._row for v in views]]
+
+        values = np.empty(len(views), dtype=object)
+        values[:] = [getattr(v, name) for v in views]
+        return values
+
+    def reset(self, recursive=True):
+        """ Reset all entries to the default values """
+        rows = [
+            v._row for v in self._entries.values()
+            if isinstance(v, self._view_class) and v._map is self
+        ]
+        self._reset_rows(rows)
+        for val in self._entries.values():
+            if isinstance(val, Container) and not (
+                isinstance(val, self._view_class) and val._map is self
+            ):
+                val.reset(recursive=recursive)
+
+    as_dict = Map.as_dict
+
+    def __reduce__(self):
+        # copies and pickles of the map contain independent rows
+        return _restore_array_map, (
+            self.default_factory, list(self._entries.items())
+        )
+
+    def __repr__(self):
+        return '{}({}, keys={})'.format(
+            self.__class__.__name__,
+            self.default_factory.__name__,
+            list(self._entries),
+        )
+
+
+def _restore_array_map(container_class, items):
+    array_map = ArrayMap(container_class)
+    for key, value in items:
+        array_map[key] = value
+    return array_map
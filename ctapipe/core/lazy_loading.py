@@ -0,0 +1,107 @@
+"""
+Lazy loading of the submodules of a package, so importing the package
+only imports the submodules that are actually used.
+"""
+import importlib
+import sys
+import types
+
+__all__ = ['lazy_submodules']
+
+
+def lazy_submodules(package_name, attributes, submodules=()):
+    """
+    Module level ``__getattr__``, ``__dir__`` and ``__all__`` (see PEP 562)
+    of a package, that import a submodule the first time one of its
+    attributes is accessed.
+
+    Used in the ``__init__.py`` of a package like this::
+
+        __getattr__, __dir__, __all__ = lazy_submodules(__name__, {
+            'hillas': ['hillas_parameters', 'HillasParameterizationError'],
+        })
+
+    so ``from ctapipe.image import hillas_parameters`` only imports
+    ``ctapipe.image.hillas``.
+
+    An attribute can have the name of a submodule, like the function
+    ``concentration`` of ``ctapipe.image.concentration``. Importing the
+    submodule then does not replace the attribute of the package.
+
+    Attributes and submodules that can not be imported, e.g. because an
+    optional dependency is not installed, raise an `AttributeError`
+    caused by the `ImportError`, so ``hasattr`` and tools walking ``dir()``
+    treat them as missing.
+
+    Parameters
+    ----------
+    package_name: str
+        ``__name__`` of the package
+    attributes: dict
+        names of the attributes exported by the package for each submodule,
+        as ``{submodule: [attribute, ...]}``
+    submodules: iterable
+        submodules that are accessible as attributes of the package
+        without importing them explicitly, in addition to those in ``attributes``
+
+    Returns
+    -------
+    __getattr__: function
+    __dir__: function
+    __all__: list
+    """
+    origin = {
+        attribute: submodule
+        for submodule, names in attributes.items()
+        for attribute in names
+    }
+    submodules = set(submodules) | set(attributes)
+    names = [name for names in attributes.values() for name in names]
+
+    shadowed = submodules & set(origin)
+    if shadowed:
+        sys.modules[package_name].__class__ = _shadowing_package(shadowed)
+
+    def __getattr__(name):
+        if name in origin:
+            module = _import_submodule(name, origin[name])
+            value = getattr(module, name)
+            # store it in the package, so __getattr__ is only called once
+            setattr(sys.modules[package_name], name, value)
+            return value
+
+        if name in submodules:
+            return _import_submodule(name, name)
+
+        raise AttributeError(
+            f'module {package_name!r} has no attribute {name!r}'
+        )
+
+    def _import_submodule(name, submodule):
+        try:
+            return importlib.import_module(f'{package_name}.{submodule}')
+        except ImportError as e:
+            raise AttributeError(
+                f'module {package_name!r} has no attribute {name!r}, '
+                f'importing {submodule!r} failed: {e}'
+            ) from e
+
+    def __dir__():
+        package = sys.modules[package_name]
+        return sorted(set(vars(package)) | set(names) | submodules)
+
+    return __getattr__, __dir__, names
+
+
+def _shadowing_package(shadowed):
+    """
+    Module class of a package whose attributes ``shadowed`` are not
+    replaced by the submodules of the same name when they are imported
+    """
+    class ShadowingPackage(types.ModuleType):
+        def __setattr__(self, name, value):
+            if name in shadowed and isinstance(value, types.ModuleType):
+                return
+            super().__setattr__(name, value)
+
+    return ShadowingPackage
@@ -1,16 +1,77 @@
+'''
+Discovery of plugins, which are either modules with a given name prefix
+or entry points of a given group.
+
+Both are only looked up once per process, as scanning the installed
+packages is slow, use `clear_plugin_cache` to look them up again,
+e.g. after installing a plugin.
+'''
 import importlib
 import pkgutil
 
+__all__ = [
+    'detect_and_import_plugins',
+    'detect_and_import_io_plugins',
+    'plugin_entry_points',
+    'clear_plugin_cache',
+]
+
+
+_plugin_modules = {}
+_entry_points = {}
+
 
 def detect_and_import_plugins(prefix):
     ''' detect and import  plugin modules with given prefix, '''
-    return {
-        name: importlib.import_module(name)
-        for finder, name, ispkg
-        in pkgutil.iter_modules()
-        if name.startswith(prefix)
-    }
+    if prefix not in _plugin_modules:
+        _plugin_modules[prefix] = {
+            name: importlib.import_module(name)
+            for finder, name, ispkg
+            in pkgutil.iter_modules()
+            if name.startswith(prefix)
+        }
+    return _plugin_modules[prefix]
 
 
 def detect_and_import_io_plugins():
     return detect_and_import_plugins(prefix='ctapipe_io_')
+
+
+def plugin_entry_points(group):
+    '''
+    Entry points of the installed packages in ``group``, without loading them.
+
+    Parameters
+    ----------
+    group: str
+        name of the entry point group, e.g. ``'ctapipe_io'``
+
+    Returns
+    -------
+    list of `importlib.metadata.EntryPoint`
+    '''
+    if group not in _entry_points:
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:  # python < 3.8
+            try:
+                from importlib_metadata import entry_points
+            except ImportError:
+                entry_points = None
+
+        if entry_points is None:
+            _entry_points[group] = []
+        else:
+            installed = entry_points()
+            if hasattr(installed, 'select'):
+                _entry_points[group] = list(installed.select(group=group))
+            else:
+                _entry_points[group] = list(installed.get(group, []))
+
+    return _entry_points[group]
+
+
+def clear_plugin_cache():
+    ''' Forget the detected plugins, so they are looked up again '''
+    _plugin_modules.clear()
+    _entry_points.clear()
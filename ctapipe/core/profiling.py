@@ -0,0 +1,245 @@
+"""
+Timing and memory profiling of the stages of a Tool and its Components.
+
+Profiling is switched on with the ``profile`` option of `~ctapipe.core.Tool`
+(``--profile`` on the command line), or with `Profiler.enable`.
+Methods are timed as a *stage* if they are decorated with `profiled`, or
+listed in the ``profiled_methods`` of a `~ctapipe.core.Component`::
+
+    class MyExtractor(Component):
+        profiled_methods = ('__call__', )
+
+When profiling is switched off, a timed method only costs one check
+of `Profiler.enabled` per call.
+"""
+import logging
+import random
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+import numpy as np
+
+from .provenance import Provenance, _sample_cpu_and_memory, current_rss
+
+log = logging.getLogger(__name__)
+
+__all__ = ['Profiler', 'profiler', 'profiled']
+
+
+#: number of call durations per stage kept to estimate the 99th percentile
+RESERVOIR_SIZE = 10000
+
+
+class _StageStatistics:
+    """
+    Number, total and maximum of the call durations of a stage, a uniform
+    random sample of at most ``RESERVOIR_SIZE`` of the durations
+    and the largest memory seen, so the memory used does not grow
+    with the number of calls.
+    """
+    __slots__ = ('calls', 'total', 'max', 'reservoir', 'peak_rss', '_rng')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.reservoir = []
+        self.peak_rss = 0
+        self._rng = random.Random(0)
+
+    def add(self, duration):
+        self.calls += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+        # reservoir sampling, each call ends up in the sample
+        # with the same probability
+        if len(self.reservoir) < RESERVOIR_SIZE:
+            self.reservoir.append(duration)
+        else:
+            i = self._rng.randrange(self.calls)
+            if i < RESERVOIR_SIZE:
+                self.reservoir[i] = duration
+
+
+class Profiler:
+    """
+    Collects the durations of the calls of each stage and samples the CPU and
+    memory usage of the process in a background thread.
+
+    The samples are stored in the current `Provenance` activity, and the
+    largest resident memory seen in a sample is attributed to all stages
+    running at that time. A process wide instance is ``profiler``.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.stages = {}
+        self._active = Counter()
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+
+    def enable(self, sample_interval=None):
+        """
+        Start profiling.
+
+        Parameters
+        ----------
+        sample_interval: float or None
+            interval of the CPU and memory samples in seconds,
+            None to not sample periodically
+        """
+        self.enabled = True
+        if sample_interval and self._sampler is None:
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(
+                target=self._sample, args=(sample_interval, ), daemon=True,
+            )
+            self._sampler.start()
+
+    def disable(self):
+        """ Stop profiling, the statistics are kept until `reset` """
+        self.enabled = False
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def reset(self):
+        """ Forget all statistics """
+        with self._lock:
+            self.stages = {}
+            self._active = Counter()
+
+    def _sample(self, interval):
+        while not self._stop_sampling.wait(interval):
+            sample = _sample_cpu_and_memory()
+            self._update_peak(sample['memory']['rss'])
+            provenance = Provenance()
+            if provenance.active_activity_names:
+                provenance.current_activity.add_sample(sample)
+
+    def _update_peak(self, rss):
+        with self._lock:
+            for name, count in self._active.items():
+                if count > 0:
+                    stats = self.stages[name]
+                    stats.peak_rss = max(stats.peak_rss, rss)
+
+    def _enter(self, name):
+        with self._lock:
+            if name not in self.stages:
+                self.stages[name] = _StageStatistics()
+            self._active[name] += 1
+
+    def _exit(self, name, duration):
+        with self._lock:
+            self.stages[name].add(duration)
+            self._active[name] -= 1
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Context manager timing its body as a call of stage ``name``.
+        The memory is sampled at the start and end of the stage, so use it
+        for long stages and `profiled` for frequently called methods.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        self._enter(name)
+        self._update_peak(current_rss())
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            duration = perf_counter() - start
+            self._update_peak(current_rss())
+            self._exit(name, duration)
+
+    def summary(self):
+        """
+        Statistics of each stage, in order of their first call.
+
+        Returns
+        -------
+        dict
+            for each stage, a dict with the number of calls, the total, mean,
+            maximum and 99th percentile of the call durations in seconds and
+            the peak resident memory in bytes (0 if it was not sampled).
+            The percentile is estimated from a random sample of
+            ``RESERVOIR_SIZE`` calls for stages with more calls.
+        """
+        with self._lock:
+            summary = {}
+            for name, stats in self.stages.items():
+                if stats.calls == 0:
+                    continue
+                summary[name] = dict(
+                    calls=stats.calls,
+                    total=stats.total,
+                    mean=stats.total / stats.calls,
+                    max=stats.max,
+                    p99=float(np.percentile(stats.reservoir, 99)),
+                    peak_rss=int(stats.peak_rss),
+                )
+        return summary
+
+    def format_summary(self):
+        """ `summary` as a table for printing """
+        summary = self.summary()
+        width = max([len('stage')] + [len(name) for name in summary])
+        header = '{:<{w}s} {:>9s}' + ' {:>10s}' * 5
+        row = '{:<{w}s} {:>9d}' + ' {:>10.3f}' * 4 + ' {:>10.1f}'
+        lines = [
+            header.format(
+                'stage', 'calls', 'total [s]', 'mean [ms]', 'p99 [ms]',
+                'max [ms]', 'peak [MB]', w=width,
+            )
+        ]
+        lines.append('-' * len(lines[0]))
+        for name, stats in summary.items():
+            lines.append(
+                row.format(
+                    name,
+                    stats['calls'],
+                    stats['total'],
+                    1e3 * stats['mean'],
+                    1e3 * stats['p99'],
+                    1e3 * stats['max'],
+                    stats['peak_rss'] / 1024**2,
+                    w=width,
+                )
+            )
+        return '\n'.join(lines)
+
+
+#: the process wide profiler, used by `profiled` and `~ctapipe.core.Tool`
+profiler = Profiler()
+
+
+def profiled(name):
+    """
+    Decorator timing each call of the decorated function
+    as a call of stage ``name`` while profiling is enabled.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+
+            profiler._enter(name)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler._exit(name, perf_counter() - start)
+
+        return wrapper
+    return decorator
@@ -120,6 +120,17 @@ class Provenance(metaclass=Singleton):
         """
         self.current_activity.register_config(config)
 
+    def add_profile(self, profile):
+        """
+        add the timing and memory summary of the stages to the current activity
+
+        Parameters
+        ----------
+        profile: dict
+            summary of the stages, see `ctapipe.core.profiling.Profiler.summary`
+        """
+        self.current_activity.register_profile(profile)
+
     def finish_activity(self, status='completed', activity_name=None):
         """ end the current activity """
         activity = self._activities.pop()
@@ -253,9 +264,15 @@ class _ActivityProvenance:
         """
         Record a snapshot of current CPU and memory information.
         """
-        if 'samples' not in self._prov:
-            self._prov['samples'] = []
-        self._prov['samples'].append(_sample_cpu_and_memory())
+        self.add_sample(_sample_cpu_and_memory())
+
+    def add_sample(self, sample):
+        """ add a snapshot of CPU and memory information to this activity """
+        self._prov.setdefault('samples', []).append(sample)
+
+    def register_profile(self, profile):
+        """ add the timing and memory summary of the stages of this activity """
+        self._prov['profile'] = profile
 
     @property
     def provenance(self):
@@ -307,20 +324,36 @@ def _get_env_vars():
     return envvars
 
 
+_process = None
+
+
+def _current_process():
+    """ psutil.Process of this process, renewed in forked processes """
+    global _process
+    if _process is None or _process.pid != os.getpid():
+        _process = psutil.Process()
+    return _process
+
+
+def current_rss():
+    """ resident memory of this process in bytes """
+    return _current_process().memory_info().rss
+
+
 def _sample_cpu_and_memory():
-    # times = np.asarray(psutil.cpu_times(percpu=True))
-    # mem = psutil.virtual_memory()
+    process = _current_process()
+    memory = process.memory_info()
+    system_memory = psutil.virtual_memory()
+    times = process.cpu_times()
 
     return dict(
         time_utc=Time.now().utc.isot,
-        # memory=dict(total=mem.total,
-        #             inactive=mem.inactive,
-        #             available=mem.available,
-        #             free=mem.free,
-        #             wired=mem.wired),
-        # cpu=dict(ncpu=psutil.cpu_count(),
-        #          user=list(times[:, 0]),
-        #          nice=list(times[:, 1]),
-        #          system=list(times[:, 2]),
-        #          idle=list(times[:, 3])),
+        memory=dict(rss=memory.rss,
+                    vms=memory.vms,
+                    total=system_memory.total,
+                    available=system_memory.available),
+        # cpu times in seconds and usage in percent since the last sample
+        cpu=dict(user=times.user,
+                 system=times.system,
+                 percent=process.cpu_percent()),
     )
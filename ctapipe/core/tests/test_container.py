@@ -1,6 +1,10 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import pickle
+from copy import deepcopy
+
+import numpy as np
 import pytest
-from ctapipe.core import Container, Field, Map
+from ctapipe.core import Container, Field, Map, ArrayMap
 
 
 def test_prefix():
@@ -182,3 +186,112 @@ def test_container_brackets():
 
     with pytest.raises(AttributeError):
         t['foo'] = 5
+
+
+def test_mutable_defaults_are_copied():
+
+    class ExampleContainer(Container):
+        x = Field(-1, "x value")
+        values = Field([], "list value")
+
+    a = ExampleContainer()
+    b = ExampleContainer()
+    a.values.append(1)
+    assert b.values == []
+
+    a.reset()
+    assert a.values == []
+    assert ExampleContainer.fields['values'].default == []
+
+
+class ArrayMapChildContainer(Container):
+    flag = Field(False, "bool")
+    count = Field(0, "int")
+    value = Field(1.0, "float")
+    name = Field(None, "object")
+    entries = Field([], "mutable")
+
+
+def test_array_map():
+    ChildContainer = ArrayMapChildContainer
+
+    tel_map = ArrayMap(ChildContainer, capacity=2)
+    for tel_id in range(5):
+        child = tel_map[tel_id]
+        assert isinstance(child, ChildContainer)
+        assert child.count == 0 and child.entries == []
+        child.count = tel_id
+        child.value = 2.0 * tel_id
+        child.entries.append(tel_id)
+
+    assert tel_map.capacity >= 5
+    assert list(tel_map) == list(range(5))
+    assert tel_map[3].entries == [3]
+    assert isinstance(tel_map[3].count, int)
+    np.testing.assert_array_equal(tel_map.column('count'), np.arange(5))
+    np.testing.assert_array_equal(tel_map.column('value'), 2.0 * np.arange(5))
+
+    # values that do not fit the column type are kept
+    tel_map[1].count = 1.5
+    tel_map[2].flag = 'yes'
+    assert tel_map[1].count == 1.5
+    assert tel_map[2].flag == 'yes'
+
+    assert tel_map.get(10) is None
+    assert 10 not in tel_map
+    assert tel_map.pop(10, None) is None
+
+    # copies are independent
+    for copy in (deepcopy(tel_map), pickle.loads(pickle.dumps(tel_map))):
+        assert list(copy) == list(tel_map)
+        copy[3].entries.append(5)
+        copy[4].count = 10
+        assert tel_map[3].entries == [3]
+        assert tel_map[4].count == 4
+
+    plain = deepcopy(tel_map[4])
+    assert type(plain) is ChildContainer
+    assert plain.count == 4
+
+    # rows of removed keys are reset when they are used again,
+    # containers kept from before are the same objects
+    kept = tel_map[3]
+    tel_map.clear()
+    assert len(tel_map) == 0
+    assert tel_map[3].entries == []
+    assert tel_map[3].count == 0
+    assert tel_map[3] is kept
+
+    # containers of the map can be assigned to other keys
+    tel_map[3].count = 3
+    tel_map[20] = tel_map[3]
+    assert tel_map[20].count == 3
+    tel_map[20].count = 4
+    assert tel_map[3].count == 3
+
+    tel_map[3].count = 7
+    tel_map.reset()
+    assert tel_map[3].count == 0
+
+    # other containers are stored as given
+    other = ChildContainer(count=5)
+    tel_map[8] = other
+    assert tel_map[8].count == 5
+    assert tel_map.as_dict(recursive=True)[8]['count'] == 5
+
+
+def test_array_map_field():
+
+    class ChildContainer(Container):
+        z = Field(1, "sub-item")
+
+    class ParentContainer(Container):
+        children = Field(ArrayMap(ChildContainer), "map of tel_id to child")
+
+    a = ParentContainer()
+    b = ParentContainer()
+    a.children[1].z = 5
+    assert 1 not in b.children
+
+    d = a.as_dict(recursive=True, flatten=True)
+    assert d['children_1'] == {'z': 5}
@@ -0,0 +1,102 @@
+import importlib
+import subprocess
+import sys
+import types
+
+import pytest
+
+LAZY_PACKAGES = [
+    'ctapipe.image',
+    'ctapipe.image.muon',
+    'ctapipe.io',
+    'ctapipe.reco',
+    'ctapipe.calib',
+    'ctapipe.calib.camera',
+    'ctapipe.visualization',
+]
+
+
+def test_lazy_submodules(tmp_path, monkeypatch):
+    from ctapipe.core.lazy_loading import lazy_submodules
+
+    package = tmp_path / 'lazy_test_package'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'first.py').write_text('a = 1\nb = 2\n')
+    (package / 'second.py').write_text('c = 3\n')
+    (package / 'third.py').write_text('def third():\n    return 3\n')
+    (package / 'broken.py').write_text('import not_installed_module\nd = 4\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    module = importlib.import_module('lazy_test_package')
+    module.__getattr__, module.__dir__, module.__all__ = lazy_submodules(
+        'lazy_test_package',
+        {'first': ['a', 'b'], 'third': ['third'], 'broken': ['d']},
+        submodules=['second'],
+    )
+
+    assert module.__all__ == ['a', 'b', 'third', 'd']
+    assert 'lazy_test_package.first' not in sys.modules
+    assert {'a', 'b', 'first', 'second'} <= set(dir(module))
+
+    assert module.a == 1
+    assert 'lazy_test_package.first' in sys.modules
+    assert 'lazy_test_package.second' not in sys.modules
+    assert module.second.c == 3
+
+    with pytest.raises(AttributeError):
+        module.c
+
+    # importing a submodule does not replace the attribute of the same name
+    from lazy_test_package.third import third
+    assert module.third is third
+
+    # missing dependencies make the attributes missing
+    assert not hasattr(module, 'd')
+    assert not hasattr(module, 'broken')
+    with pytest.raises(ImportError):
+        from lazy_test_package import d
+
+
+@pytest.mark.parametrize('package_name', LAZY_PACKAGES)
+def test_lazy_package_attributes(package_name):
+    """ all exported names of the lazy packages can be imported """
+    package = importlib.import_module(package_name)
+    assert len(package.__all__) == len(set(package.__all__))
+
+    for name in package.__all__:
+        value = getattr(package, name)
+        assert not isinstance(value, types.ModuleType)
+        assert name in dir(package)
+
+    # walking dir() only finds missing attributes for optional dependencies
+    for name in dir(package):
+        hasattr(package, name)
+
+
+def test_import_does_not_load_submodules():
+    """
+    Guard against regressions of the import time: importing the
+    packages must not import their expensive submodules or dependencies.
+    """
+    code = (
+        'import sys\n'
+        'import {}\n'
+        'print(" ".join(sys.modules))\n'
+    ).format(', '.join(LAZY_PACKAGES))
+    modules = set(subprocess.check_output([sys.executable, '-c', code]).decode().split())
+
+    for module in [
+            'ctapipe.image.extractor',
+            'ctapipe.image.hillas',
+            'ctapipe.image.muon.fitting',
+            'ctapipe.io.hdf5tableio',
+            'ctapipe.reco.ImPACT',
+            'ctapipe.calib.camera.calibrator',
+            'ctapipe.visualization.mpl_camera',
+            'numba',
+            'tables',
+            'matplotlib',
+            'sklearn',
+    ]:
+        assert module not in modules
@@ -0,0 +1,110 @@
+import time
+
+import numpy as np
+import pytest
+
+from ctapipe.core import Component, Provenance
+from ctapipe.core.profiling import RESERVOIR_SIZE, Profiler, profiler, profiled
+
+
+@pytest.fixture
+def clean_profiler():
+    profiler.reset()
+    yield profiler
+    profiler.disable()
+    profiler.reset()
+
+
+def test_profiled(clean_profiler):
+
+    @profiled('test.add')
+    def add(a, b):
+        return a + b
+
+    # nothing is recorded while profiling is disabled
+    assert add(1, 2) == 3
+    assert profiler.summary() == {}
+
+    profiler.enable()
+    for i in range(10):
+        add(i, i)
+    profiler.disable()
+    add(1, 2)
+
+    summary = profiler.summary()
+    assert summary['test.add']['calls'] == 10
+    assert summary['test.add']['total'] >= 0
+    assert summary['test.add']['p99'] >= summary['test.add']['mean']
+    assert summary['test.add']['max'] >= summary['test.add']['p99']
+
+
+def test_bounded_statistics():
+    local_profiler = Profiler()
+    n_calls = 5 * RESERVOIR_SIZE
+    durations = np.random.RandomState(0).uniform(0, 1, n_calls)
+    for duration in durations:
+        local_profiler._enter('stage')
+        local_profiler._exit('stage', duration)
+
+    assert len(local_profiler.stages['stage'].reservoir) == RESERVOIR_SIZE
+
+    summary = local_profiler.summary()['stage']
+    assert summary['calls'] == n_calls
+    assert np.isclose(summary['total'], durations.sum())
+    assert summary['max'] == durations.max()
+    # estimated from the reservoir
+    assert abs(summary['p99'] - np.percentile(durations, 99)) < 0.005
+
+
+def test_stage(clean_profiler):
+    profiler.enable()
+    with profiler.stage('outer'):
+        with profiler.stage('inner'):
+            time.sleep(0.01)
+
+    summary = profiler.summary()
+    assert list(summary) == ['outer', 'inner']
+    assert summary['outer']['total'] >= summary['inner']['total'] >= 0.01
+    assert summary['inner']['peak_rss'] > 0
+
+    table = profiler.format_summary()
+    assert 'outer' in table and 'inner' in table
+    assert len(table.splitlines()) == 4
+
+
+def test_sampling():
+    local_profiler = Profiler()
+    Provenance().start_activity('test_sampling')
+    local_profiler.enable(sample_interval=0.01)
+    with local_profiler.stage('sleep'):
+        time.sleep(0.1)
+    local_profiler.disable()
+    Provenance().finish_activity('test_sampling')
+
+    samples = Provenance().provenance[-1]['samples']
+    Provenance().clear()
+    assert len(samples) > 0
+    assert samples[0]['memory']['rss'] > 0
+    assert local_profiler.summary()['sleep']['peak_rss'] > 0
+
+
+def test_component_profiled_methods(clean_profiler):
+
+    class Base(Component):
+        profiled_methods = ('run', )
+
+        def run(self):
+            return 1
+
+    class Derived(Base):
+
+        def run(self):
+            return super().run() + 1
+
+    profiler.enable()
+    assert Derived().run() == 2
+    assert Base().run() == 1
+
+    summary = profiler.summary()
+    assert summary['Derived.run']['calls'] == 1
+    assert summary['Base.run']['calls'] == 2
@@ -31,3 +31,31 @@ def test_tool_version():
 
     tool = MyTool()
     assert tool.version_string != ""
+
+
+def test_tool_profile():
+    from ctapipe.core import Provenance
+    from ctapipe.core.profiling import profiler
+
+    class MyTool(Tool):
+        name = 'profiled_tool'
+        description = "test"
+
+        def setup(self):
+            pass
+
+        def start(self):
+            pass
+
+        def finish(self):
+            pass
+
+    MyTool().run(['--profile'])
+
+    assert not profiler.enabled
+    provenance = Provenance().provenance[-1]
+    assert provenance['activity_name'] == 'profiled_tool'
+    assert set(provenance['profile']) == {
+        'profiled_tool.setup', 'profiled_tool.start', 'profiled_tool.finish',
+    }
+    assert len(provenance['samples']) > 0
@@ -1,12 +1,13 @@
 import logging
 from abc import abstractmethod
 
-from traitlets import Unicode
+from traitlets import Unicode, Bool, Float
 from traitlets.config import Application
 
 from ctapipe import __version__ as version
 from .logging import ColoredFormatter
 from . import Provenance
+from .profiling import profiler
 
 logging.basicConfig(level=logging.WARNING)
 
@@ -98,11 +99,25 @@ class Tool(Application):
     *entry_points*, it will become a command-line tool (see examples
     in the `ctapipe/tools` subdirectory).
 
+    With the ``profile`` option (``--profile`` on the command line), the
+    time spent in `setup()`, `start()` and `finish()` and in the profiled
+    methods of the components (see `ctapipe.core.profiling`) is recorded.
+    The CPU and memory usage is sampled every ``profile_interval`` seconds
+    into the provenance, and a summary of the stages is logged at the end.
     """
 
     config_file = Unicode('', help=("name of a configuration file with "
                                      "parameters to load in addition to "
                                      "command-line parameters")).tag(config=True)
+    profile = Bool(
+        False,
+        help='Record the time and memory used by the stages of the tool and '
+             'its components and print a summary at the end',
+    ).tag(config=True)
+    profile_interval = Float(
+        1.0,
+        help='Interval in seconds of the CPU and memory samples while profiling',
+    ).tag(config=True)
 
     _log_formatter_cls = ColoredFormatter
 
@@ -112,6 +127,11 @@ class Tool(Application):
             self.aliases['log-level'] = 'Application.log_level'
             self.aliases['config'] = 'Tool.config_file'
 
+        self.flags['profile'] = (
+            {'Tool': {'profile': True}},
+            'Print a summary of the time and memory used by the stages of the tool'
+        )
+
         super().__init__(**kwargs)
         self.log_format = ('%(levelname)8s [%(name)s] '
                            '(%(module)s/%(funcName)s): %(message)s')
@@ -162,10 +182,17 @@ class Tool(Application):
             self.log.debug(f"CONFIG: {self.config}")
             Provenance().start_activity(self.name)
             Provenance().add_config(self.config)
-            self.setup()
+            if self.profile:
+                profiler.reset()
+                profiler.enable(sample_interval=self.profile_interval)
+            with profiler.stage(f'{self.name}.setup'):
+                self.setup()
             self.is_setup = True
-            self.start()
-            self.finish()
+            with profiler.stage(f'{self.name}.start'):
+                self.start()
+            with profiler.stage(f'{self.name}.finish'):
+                self.finish()
+            self._finish_profiling()
             self.log.info(f"Finished: {self.name}")
             Provenance().finish_activity(activity_name=self.name)
         except ToolConfigurationError as err:
@@ -173,20 +200,34 @@ class Tool(Application):
         except RuntimeError as err:
             self.log.error(f'Caught unexpected exception: {err}')
             self.finish()
+            self._finish_profiling()
             Provenance().finish_activity(activity_name=self.name,
                                          status='error')
         except KeyboardInterrupt:
             self.log.warning("WAS INTERRUPTED BY CTRL-C")
             self.finish()
+            self._finish_profiling()
             Provenance().finish_activity(activity_name=self.name,
                                          status='interrupted')
         finally:
+            if self.profile:
+                profiler.disable()
             for activity in Provenance().finished_activities:
                 output_str = ' '.join([x['url'] for x in activity.output])
                 self.log.info("Output: %s", output_str)
 
             self.log.debug("PROVENANCE: '%s'", Provenance().as_json(indent=3))
 
+    def _finish_profiling(self):
+        """ stop profiling, log the summary and add it to the provenance """
+        if not self.profile:
+            return
+
+        profiler.disable()
+        Provenance().current_activity.sample_cpu_and_memory()
+        Provenance().add_profile(profiler.summary())
+        self.log.info("Profile of %s:\n%s", self.name, profiler.format_summary())
+
     @property
     def version_string(self):
         """ a formatted version string with version, release, and git hash"""
@@ -1,9 +1,82 @@
-from .hillas import *
-from .cleaning import *
-from .pixel_likelihood import *
-from .extractor import *
-from .reducers import *
-from .muon import *
-from .geometry_converter import *
-from .leakage import *
-from .concentration import concentration
+"""
+Image processing, the submodules are only imported once they are used.
+"""
+from ..core.lazy_loading import lazy_submodules
+
+__getattr__, __dir__, __all__ = lazy_submodules(
+    __name__,
+    attributes={
+        'hillas': [
+            'hillas_parameters',
+            'hillas_parameters_batch',
+            'HillasParameterizationError',
+        ],
+        'cleaning': ['tailcuts_clean', 'dilate', 'NeighborCleaner', 'IslandFinder'],
+        'pixel_likelihood': [
+            'poisson_likelihood_gaussian',
+            'poisson_likelihood_full',
+            'poisson_likelihood',
+            'mean_poisson_likelihood_gaussian',
+            'mean_poisson_likelihood_full',
+            'PixelLikelihoodError',
+            'chi_squared',
+            'poisson_likelihood_exact',
+            'mean_poisson_likelihood_exact',
+            'PoissonLikelihoodTable',
+            'get_likelihood_table',
+            'poisson_likelihood_table',
+            'mean_poisson_likelihood_table',
+        ],
+        'extractor': [
+            'ImageExtractor',
+            'FullWaveformSum',
+            'FixedWindowSum',
+            'GlobalPeakWindowSum',
+            'LocalPeakWindowSum',
+            'NeighborPeakWindowSum',
+            'BaselineSubtractedNeighborPeakWindowSum',
+            'sum_samples_around_peak',
+            'neighbor_average_waveform',
+            'extract_pulse_time_around_peak',
+            'subtract_baseline',
+        ],
+        'reducers': ['DataVolumeReducer'],
+        'muon': [
+            'kundu_chaudhuri_circle_fit',
+            'kundu_chaudhuri_circle_fit_batch',
+            'psf_likelihood_fit',
+            'impact_parameter_chisq_fit',
+            'mirror_integration_distance',
+            'expected_pixel_light_content',
+            'radial_light_intensity',
+            'efficiency_fit',
+            'mean_squared_error',
+            'photon_ratio_inside_ring',
+            'ring_completeness',
+            'ring_containment',
+            'npix_above_threshold',
+            'npix_composing_ring',
+            'ChaudhuriKunduRingFitter',
+            'MuonLineIntegrate',
+        ],
+        'geometry_converter': [
+            'ResamplingPlan',
+            'get_resampling_plan',
+            'convert_geometry_hex1d_to_rect2d',
+            'convert_geometry_rect2d_back_to_hexe1d',
+            'astri_to_2d_array',
+            'array_2d_to_astri',
+            'chec_to_2d_array',
+            'array_2d_to_chec',
+        ],
+        'leakage': ['leakage'],
+        'concentration': ['concentration'],
+    },
+    submodules=[
+        'geometry_converter_hex',
+        'geometry_converter_astri',
+        'geometry_converter_chec',
+        'timing_parameters',
+        'toymodel',
+    ],
+)
@@ -2,9 +2,10 @@
 Image Cleaning Algorithms (identification of noisy pixels)
 """
 
-__all__ = ['tailcuts_clean', 'dilate']
+__all__ = ['tailcuts_clean', 'dilate', 'NeighborCleaner', 'IslandFinder']
 
 import numpy as np
+from numba import njit, prange
 from scipy.sparse.csgraph import connected_components
 
 
@@ -255,3 +256,577 @@ def fact_image_cleaning(geom, image, arrival_times, picture_threshold=4,
                                                min_number_neighbors,
                                                time_limit)
     return pixels_to_keep
+
+
+def fixed_width_neighbors(geom):
+    """
+    Convert the sparse neighbor matrix of a camera into a dense
+    index table of fixed width, as needed by compiled kernels.
+
+    Parameters
+    ----------
+    geom: `ctapipe.instrument.CameraGeometry`
+        Camera geometry information
+
+    Returns
+    -------
+    neighbors: ndarray
+        Shape (n_pixels, max_neighbors), the indices of the neighbors
+        of each pixel, rows are padded with -1
+    n_neighbors: ndarray
+        Shape (n_pixels, ), number of neighbors of each pixel
+    """
+    matrix = geom.neighbor_matrix_sparse.tocsr(copy=True)
+    matrix.eliminate_zeros()
+    matrix.sort_indices()
+
+    n_neighbors = np.diff(matrix.indptr).astype(np.int32)
+    width = max(n_neighbors.max(initial=0), 1)
+
+    rows = np.repeat(np.arange(geom.n_pixels), n_neighbors)
+    columns = np.arange(len(rows)) - matrix.indptr[rows]
+
+    neighbors = np.full((geom.n_pixels, width), -1, dtype=np.int32)
+    neighbors[rows, columns] = matrix.indices
+
+    return neighbors, n_neighbors
+
+
+@njit(parallel=True, cache=True)
+def _count_neighbors(neighbors, n_neighbors, masks, out):
+    for event in prange(masks.shape[0]):
+        for pixel in range(masks.shape[1]):
+            count = 0
+            for i in range(n_neighbors[pixel]):
+                if masks[event, neighbors[pixel, i]]:
+                    count += 1
+            out[event, pixel] = count
+
+
+@njit(parallel=True, cache=True)
+def _dilate(neighbors, n_neighbors, masks, out):
+    for event in prange(masks.shape[0]):
+        for pixel in range(masks.shape[1]):
+            selected = masks[event, pixel]
+            i = 0
+            while not selected and i < n_neighbors[pixel]:
+                selected = masks[event, neighbors[pixel, i]]
+                i += 1
+            out[event, pixel] = selected
+
+
+@njit(parallel=True, cache=True)
+def _min_neighbors(neighbors, n_neighbors, masks, min_number_neighbors, out):
+    for event in prange(masks.shape[0]):
+        for pixel in range(masks.shape[1]):
+            if not masks[event, pixel]:
+                out[event, pixel] = False
+                continue
+
+            count = 0
+            for i in range(n_neighbors[pixel]):
+                if masks[event, neighbors[pixel, i]]:
+                    count += 1
+            out[event, pixel] = count >= min_number_neighbors
+
+
+@njit(parallel=True, cache=True)
+def _tailcuts_clean(
+        neighbors,
+        n_neighbors,
+        images,
+        picture_thresh,
+        boundary_thresh,
+        keep_isolated_pixels,
+        min_number_picture_neighbors,
+        workspace,
+        out,
+):
+    n_pixels = images.shape[1]
+    check_neighbors = (
+        not keep_isolated_pixels and min_number_picture_neighbors > 0
+    )
+
+    for event in prange(images.shape[0]):
+        image = images[event]
+        in_picture = workspace[event, 0]
+        above_boundary = workspace[event, 1]
+
+        # first pass: threshold comparisons
+        for pixel in range(n_pixels):
+            in_picture[pixel] = image[pixel] >= picture_thresh[pixel]
+            above_boundary[pixel] = image[pixel] >= boundary_thresh[pixel]
+
+        if check_neighbors:
+            # the output is used as scratch space for the pixels above
+            # the picture threshold before the neighbor requirement
+            above_picture = out[event]
+            above_picture[:] = in_picture
+
+            for pixel in range(n_pixels):
+                if above_picture[pixel]:
+                    count = 0
+                    for i in range(n_neighbors[pixel]):
+                        if above_picture[neighbors[pixel, i]]:
+                            count += 1
+                    if count < min_number_picture_neighbors:
+                        in_picture[pixel] = False
+
+        # second pass: boundary pixels next to picture pixels and
+        # picture pixels next to boundary pixels
+        for pixel in range(n_pixels):
+            picture_neighbor = False
+            boundary_neighbor = False
+            for i in range(n_neighbors[pixel]):
+                neighbor = neighbors[pixel, i]
+                picture_neighbor |= in_picture[neighbor]
+                boundary_neighbor |= above_boundary[neighbor]
+
+            if keep_isolated_pixels:
+                out[event, pixel] = (
+                    (above_boundary[pixel] and picture_neighbor)
+                    or in_picture[pixel]
+                )
+            else:
+                out[event, pixel] = (
+                    (above_boundary[pixel] and picture_neighbor)
+                    or (in_picture[pixel] and boundary_neighbor)
+                )
+
+
+@njit(parallel=True, cache=True)
+def _time_delta_cleaning(
+        neighbors,
+        n_neighbors,
+        masks,
+        arrival_times,
+        min_number_neighbors,
+        time_limit,
+        out,
+):
+    for event in prange(masks.shape[0]):
+        for pixel in range(masks.shape[1]):
+            if not masks[event, pixel]:
+                out[event, pixel] = False
+                continue
+
+            time = arrival_times[event, pixel]
+            count = 0
+            for i in range(n_neighbors[pixel]):
+                neighbor = neighbors[pixel, i]
+                if abs(arrival_times[event, neighbor] - time) < time_limit:
+                    count += 1
+            out[event, pixel] = count >= min_number_neighbors
+
+
+class NeighborCleaner:
+    """
+    Compiled cleaning kernels for a single camera.
+
+    The neighbor relations of the camera are converted once into a
+    fixed-width index table (see `fixed_width_neighbors`), which the
+    kernels then use instead of the generic sparse neighbor matrix.
+    All methods accept either a single image (shape ``(n_pixels, )``)
+    or a stack of images (shape ``(n_images, n_pixels)``), in which case
+    the images are processed in parallel.
+    Results are written into the ``out`` array if given, so that
+    the same buffers can be reused for every event.
+
+    The results are identical to `tailcuts_clean`, `dilate` and
+    `apply_time_delta_cleaning`.
+
+    >>> from ctapipe.instrument import CameraGeometry
+    >>> geom = CameraGeometry.make_rectangular(3, 1, (-1, 1))
+    >>> cleaner = NeighborCleaner(geom)
+    >>> cleaner.tailcuts_clean(np.array([15, 7, 0]), 15, 5)
+    array([ True,  True, False])
+
+    Parameters
+    ----------
+    geom: `ctapipe.instrument.CameraGeometry`
+        Camera geometry information
+    """
+
+    def __init__(self, geom):
+        self.geom = geom
+        self.n_pixels = geom.n_pixels
+        self.neighbors, self.n_neighbors = fixed_width_neighbors(geom)
+        self._workspace = np.empty((0, 2, self.n_pixels), dtype=bool)
+
+    def _get_workspace(self, n_images):
+        if self._workspace.shape[0] < n_images:
+            self._workspace = np.empty((n_images, 2, self.n_pixels), dtype=bool)
+        return self._workspace[:n_images]
+
+    def _as_2d(self, array, name, dtype=None):
+        array = np.asanyarray(array, dtype=dtype)
+        if array.shape[-1] != self.n_pixels or array.ndim not in (1, 2):
+            raise ValueError(
+                '{} must have shape (n_pixels, ) or (n_images, n_pixels)'
+                ' with n_pixels={}, got {}'.format(
+                    name, self.n_pixels, array.shape
+                )
+            )
+        return np.ascontiguousarray(np.atleast_2d(array))
+
+    def _prepare_output(self, out, shape, dtype):
+        if out is None:
+            return np.empty(shape, dtype=dtype)
+
+        if (out.shape != shape or out.dtype != dtype
+                or not out.flags.c_contiguous):
+            raise ValueError(
+                'out must be a contiguous array of shape {} and dtype {}'.format(
+                    shape, np.dtype(dtype)
+                )
+            )
+        return out
+
+    def _per_pixel(self, value):
+        return np.ascontiguousarray(
+            np.broadcast_to(np.asanyarray(value, dtype=np.float64), self.n_pixels)
+        )
+
+    def tailcuts_clean(
+            self,
+            images,
+            picture_thresh=7,
+            boundary_thresh=5,
+            keep_isolated_pixels=False,
+            min_number_picture_neighbors=0,
+            out=None,
+    ):
+        """
+        Two-threshold tail-cuts cleaning, see `tailcuts_clean`.
+
+        Parameters
+        ----------
+        images: array
+            pixel values, shape (n_pixels, ) or (n_images, n_pixels)
+        picture_thresh: float or array
+            threshold above which all pixels are retained
+        boundary_thresh: float or array
+            threshold above which pixels are retained if they have a neighbor
+            already above the picture_thresh
+        keep_isolated_pixels: bool
+            If True, pixels above the picture threshold will be included always,
+            if not they are only included if a neighbor is in the picture or
+            boundary
+        min_number_picture_neighbors: int
+            A picture pixel survives cleaning only if it has at least this
+            number of picture neighbors. This has no effect in case
+            keep_isolated_pixels is True
+        out: array or None
+            boolean output array of the same shape as images
+
+        Returns
+        -------
+        A boolean mask of *clean* pixels with the same shape as images
+        """
+        images_2d = self._as_2d(images, 'images', dtype=np.float64)
+        out = self._prepare_output(out, np.shape(images), bool)
+
+        _tailcuts_clean(
+            self.neighbors,
+            self.n_neighbors,
+            images_2d,
+            self._per_pixel(picture_thresh),
+            self._per_pixel(boundary_thresh),
+            bool(keep_isolated_pixels),
+            int(min_number_picture_neighbors),
+            self._get_workspace(images_2d.shape[0]),
+            out.reshape(images_2d.shape),
+        )
+        return out
+
+    def dilate(self, masks, out=None):
+        """
+        Add one row of neighbors to the True values of the pixel masks,
+        see `dilate`.
+
+        Parameters
+        ----------
+        masks: array
+            boolean masks, shape (n_pixels, ) or (n_images, n_pixels)
+        out: array or None
+            boolean output array of the same shape as masks,
+            must not be the same array as masks
+        """
+        masks_2d = self._as_2d(masks, 'masks', dtype=bool)
+        out = self._prepare_output(out, np.shape(masks), bool)
+        _dilate(
+            self.neighbors, self.n_neighbors, masks_2d,
+            out.reshape(masks_2d.shape)
+        )
+        return out
+
+    def number_of_neighbors(self, masks, out=None):
+        """
+        Count the neighbors of each pixel that are True in the masks.
+
+        Parameters
+        ----------
+        masks: array
+            boolean masks, shape (n_pixels, ) or (n_images, n_pixels)
+        out: array or None
+            integer (int32) output array of the same shape as masks
+        """
+        masks_2d = self._as_2d(masks, 'masks', dtype=bool)
+        out = self._prepare_output(out, np.shape(masks), np.int32)
+        _count_neighbors(
+            self.neighbors, self.n_neighbors, masks_2d,
+            out.reshape(masks_2d.shape)
+        )
+        return out
+
+    def min_neighbors(self, masks, min_number_neighbors, out=None):
+        """
+        Remove all pixels from the masks that have less than
+        ``min_number_neighbors`` neighbors in the masks.
+
+        Parameters
+        ----------
+        masks: array
+            boolean masks, shape (n_pixels, ) or (n_images, n_pixels)
+        min_number_neighbors: int
+            Minimal number of selected neighbors for a pixel to survive
+        out: array or None
+            boolean output array of the same shape as masks,
+            must not be the same array as masks
+        """
+        masks_2d = self._as_2d(masks, 'masks', dtype=bool)
+        out = self._prepare_output(out, np.shape(masks), bool)
+        _min_neighbors(
+            self.neighbors,
+            self.n_neighbors,
+            masks_2d,
+            int(min_number_neighbors),
+            out.reshape(masks_2d.shape),
+        )
+        return out
+
+    def time_delta_cleaning(
+            self, masks, arrival_times, min_number_neighbors, time_limit, out=None
+    ):
+        """
+        Remove all pixels from the masks that have less than
+        ``min_number_neighbors`` neighbors that arrived within ``time_limit``,
+        see `apply_time_delta_cleaning`.
+        In contrast to `apply_time_delta_cleaning`,
+        the input masks are not modified.
+
+        Parameters
+        ----------
+        masks: array
+            boolean masks, shape (n_pixels, ) or (n_images, n_pixels)
+        arrival_times: array
+            pixel timing information, same shape as masks
+        min_number_neighbors: int
+            Threshold to determine if a pixel survives cleaning steps.
+        time_limit: int or float
+            arrival time limit for neighboring pixels
+        out: array or None
+            boolean output array of the same shape as masks
+        """
+        masks_2d = self._as_2d(masks, 'masks', dtype=bool)
+        times_2d = self._as_2d(arrival_times, 'arrival_times', dtype=np.float64)
+        if times_2d.shape != masks_2d.shape:
+            raise ValueError('masks and arrival_times must have the same shape')
+
+        out = self._prepare_output(out, np.shape(masks), bool)
+        _time_delta_cleaning(
+            self.neighbors,
+            self.n_neighbors,
+            masks_2d,
+            times_2d,
+            int(min_number_neighbors),
+            float(time_limit),
+            out.reshape(masks_2d.shape),
+        )
+        return out
+
+
+@njit(parallel=True, cache=True)
+def _label_islands(neighbors, n_neighbors, masks, stack, labels, n_islands):
+    """
+    Flood fill starting from every selected pixel not yet assigned to
+    an island, only selected pixels are ever pushed on the stack.
+    Islands are numbered in the order of their lowest pixel index,
+    like `scipy.sparse.csgraph.connected_components`.
+    """
+    for event in prange(masks.shape[0]):
+        mask = masks[event]
+        label = labels[event]
+        pixel_stack = stack[event]
+        label[:] = 0
+
+        current = 0
+        for seed in range(mask.shape[0]):
+            if not mask[seed] or label[seed] != 0:
+                continue
+
+            current += 1
+            label[seed] = current
+            pixel_stack[0] = seed
+            stack_size = 1
+
+            while stack_size > 0:
+                stack_size -= 1
+                pixel = pixel_stack[stack_size]
+                for i in range(n_neighbors[pixel]):
+                    neighbor = neighbors[pixel, i]
+                    if mask[neighbor] and label[neighbor] == 0:
+                        label[neighbor] = current
+                        pixel_stack[stack_size] = neighbor
+                        stack_size += 1
+
+        n_islands[event] = current
+
+
+@njit(parallel=True, cache=True)
+def _island_sums(labels, images, sizes, intensities):
+    for event in prange(labels.shape[0]):
+        sizes[event, :] = 0
+        intensities[event, :] = 0
+        for pixel in range(labels.shape[1]):
+            label = labels[event, pixel]
+            if label != 0:
+                sizes[event, label] += 1
+                intensities[event, label] += images[event, pixel]
+
+
+class IslandFinder:
+    """
+    Find connected clusters of pixels ("islands") in cleaning masks.
+
+    Like `NeighborCleaner`, the neighbor relations of the camera are
+    precomputed once, and a stack of masks is labelled in one parallel call.
+    Only the selected pixels are visited, so the cost scales with the number
+    of pixels that survived the cleaning.
+    In addition to the labels, the number of pixels and the summed
+    intensity of each island are computed, so that e.g. selecting the
+    largest island needs no additional pass over the image.
+
+    Parameters
+    ----------
+    geom: `ctapipe.instrument.CameraGeometry`
+        Camera geometry information
+    """
+
+    def __init__(self, geom):
+        self.geom = geom
+        self.n_pixels = geom.n_pixels
+        self.neighbors, self.n_neighbors = fixed_width_neighbors(geom)
+        self._stack = np.empty((0, self.n_pixels), dtype=np.int32)
+
+    def _get_stack(self, n_images):
+        if self._stack.shape[0] < n_images:
+            self._stack = np.empty((n_images, self.n_pixels), dtype=np.int32)
+        return self._stack[:n_images]
+
+    def label(self, masks, images=None):
+        """
+        Label the islands in the given masks.
+
+        Parameters
+        ----------
+        masks: array
+            boolean masks, shape (n_pixels, ) or (n_images, n_pixels)
+        images: array or None
+            pixel values of the same shape as masks, used to compute
+            the intensity of each island. If None, all intensities are 0.
+
+        Returns
+        -------
+        n_islands: int or ndarray
+            Number of islands in each mask
+        island_labels: ndarray
+            Same shape as masks, entries range from 0 (not in the mask)
+            to n_islands.
+        island_sizes: ndarray
+            Number of pixels of each island, shape (n_islands + 1, ) or
+            (n_images, max(n_islands) + 1), so that it can be indexed
+            with the island labels. Index 0 is always 0.
+        island_intensities: ndarray
+            Summed pixel values of each island, same shape as island_sizes.
+        """
+        masks = np.asanyarray(masks, dtype=bool)
+        if masks.shape[-1] != self.n_pixels or masks.ndim not in (1, 2):
+            raise ValueError(
+                'masks must have shape (n_pixels, ) or (n_images, n_pixels)'
+                ' with n_pixels={}, got {}'.format(self.n_pixels, masks.shape)
+            )
+        masks_2d = np.ascontiguousarray(np.atleast_2d(masks))
+        n_images = masks_2d.shape[0]
+
+        if images is None:
+            images_2d = np.zeros(masks_2d.shape)
+        else:
+            images_2d = np.ascontiguousarray(
+                np.atleast_2d(np.asanyarray(images, dtype=np.float64))
+            )
+            if images_2d.shape != masks_2d.shape:
+                raise ValueError('masks and images must have the same shape')
+
+        labels = np.empty(masks_2d.shape, dtype=np.int32)
+        n_islands = np.empty(n_images, dtype=np.int32)
+        _label_islands(
+            self.neighbors,
+            self.n_neighbors,
+            masks_2d,
+            self._get_stack(n_images),
+            labels,
+            n_islands,
+        )
+
+        n_columns = n_islands.max(initial=0) + 1
+        sizes = np.empty((n_images, n_columns), dtype=np.int32)
+        intensities = np.empty((n_images, n_columns), dtype=np.float64)
+        _island_sums(labels, images_2d, sizes, intensities)
+
+        if masks.ndim == 1:
+            return n_islands[0], labels[0], sizes[0], intensities[0]
+
+        return n_islands, labels, sizes, intensities
+
+    def largest_island(self, masks, images=None, by='intensity'):
+        """
+        Reduce the masks to their largest island.
+
+        Parameters
+        ----------
+        masks: array
+            boolean masks, shape (n_pixels, ) or (n_images, n_pixels)
+        images: array or None
+            pixel values of the same shape as masks,
+            required if ``by='intensity'``
+        by: str
+            'intensity' to select the island with the largest summed pixel
+            values, 'size' to select the island with the most pixels
+
+        Returns
+        -------
+        A boolean mask of the same shape as masks,
+        empty masks stay empty
+        """
+        if by not in ('intensity', 'size'):
+            raise ValueError("by must be one of 'intensity' or 'size'")
+
+        if by == 'intensity' and images is None:
+            raise ValueError("images are required to select by intensity")
+
+        n_islands, labels, sizes, intensities = self.label(masks, images)
+        if sizes.shape[-1] == 1:
+            # no islands at all
+            return np.zeros(labels.shape, dtype=bool)
+
+        values = intensities if by == 'intensity' else sizes
+        values = values.astype(np.float64)
+
+        # label 0 and the padding beyond n_islands are not islands
+        island_ids = np.arange(values.shape[-1])
+        values[..., 0] = -np.inf
+        values[island_ids > np.expand_dims(n_islands, -1)] = -np.inf
+
+        largest = np.argmax(values, axis=-1)
+        return (labels == np.expand_dims(largest, -1)) & (labels != 0)
@@ -18,9 +18,11 @@ __all__ = [
 
 
 from abc import abstractmethod
+import threading
 import numpy as np
 from traitlets import Int
 from ctapipe.core import Component
+from ctapipe.utils.lru_cache import LRUCache
 from numba import njit, prange, guvectorize, float64, float32, int64
 
 
@@ -31,6 +33,7 @@ from numba import njit, prange, guvectorize, float64, float32, int64
     ],
     '(s),(),(),()->()',
     nopython=True,
+    cache=True,
 )
 def sum_samples_around_peak(waveforms, peak_index, width, shift, ret):
     """
@@ -80,7 +83,7 @@ def sum_samples_around_peak(waveforms, peak_index, width, shift, ret):
 @njit([
     float64[:, :, :](float64[:, :, :], int64[:, :], int64),
     float64[:, :, :](float32[:, :, :], int64[:, :], int64),
-], parallel=True)
+], parallel=True, cache=True)
 def neighbor_average_waveform(waveforms, neighbors, lwt):
     """
     Obtain the average waveform built from the neighbors of each pixel
@@ -125,6 +128,7 @@ def neighbor_average_waveform(waveforms, neighbors, lwt):
     ],
     '(s),(),(),()->()',
     nopython=True,
+    cache=True,
 )
 def extract_pulse_time_around_peak(waveforms, peak_index, width, shift, ret):
     """
@@ -198,14 +202,113 @@ def subtract_baseline(waveforms, baseline_start, baseline_end):
         Waveform with the baseline subtracted
     """
     baseline_corrected = waveforms - np.mean(
-        waveforms[..., baseline_start:baseline_end], axis=2
+        waveforms[..., baseline_start:baseline_end], axis=-1
     )[..., None]
 
     return baseline_corrected
 
 
+# number of pixels processed by a thread with the same scratch buffer
+_PIXEL_BLOCK_SIZE = 64
+
+
+@njit(cache=True)
+def _sum_and_time_around_peak(waveform, peak_index, width, shift):
+    """
+    Charge and pulse time of a single waveform in one pass over the window,
+    see `sum_samples_around_peak` and `extract_pulse_time_around_peak`
+    """
+    n_samples = waveform.size
+    start = max(peak_index - shift, 0)
+    end = min(peak_index - shift + width, n_samples)
+
+    num = 0.0
+    den = 0.0
+    for sample in range(start, end):
+        num += waveform[sample] * sample
+        den += waveform[sample]
+
+    pulse_time = num / den if den > 0 else float(peak_index)
+    return den, pulse_time
+
+
+@njit(parallel=True, cache=True)
+def _extract_around_peak(waveforms, peak_index, width, shift, charge, pulse_time):
+    """
+    Fused charge and pulse time extraction of waveforms with shape
+    (n_waveforms, n_samples) and known peak positions, written into
+    the preallocated ``charge`` and ``pulse_time`` arrays.
+    """
+    for i in prange(waveforms.shape[0]):
+        charge[i], pulse_time[i] = _sum_and_time_around_peak(
+            waveforms[i], peak_index[i], width, shift
+        )
+
+
+@njit(parallel=True, cache=True)
+def _extract_around_local_peak(waveforms, width, shift, charge, pulse_time):
+    """
+    Like `_extract_around_peak`, but with the peak of each waveform
+    """
+    for i in prange(waveforms.shape[0]):
+        charge[i], pulse_time[i] = _sum_and_time_around_peak(
+            waveforms[i], np.argmax(waveforms[i]), width, shift
+        )
+
+
+@njit(parallel=True, cache=True)
+def _extract_around_neighbor_peak(
+        waveforms,
+        neighbor_ptr,
+        neighbor_index,
+        lwt,
+        width,
+        shift,
+        charge,
+        pulse_time,
+):
+    """
+    Like `_extract_around_peak`, with the peak of the average waveform of the
+    neighbors of each pixel (see `neighbor_average_waveform`). The average
+    waveforms are not stored, each block of pixels reuses a single scratch
+    waveform.
+
+    waveforms has the shape (n_images, n_pix, n_samples), the neighbors of
+    pixel ``i`` are ``neighbor_index[neighbor_ptr[i]:neighbor_ptr[i + 1]]``.
+    """
+    n_images, n_pix, n_samples = waveforms.shape
+    n_total = n_images * n_pix
+    n_blocks = (n_total + _PIXEL_BLOCK_SIZE - 1) // _PIXEL_BLOCK_SIZE
+
+    for block in prange(n_blocks):
+        # scratch space for the average waveform, shared by the pixels of a block
+        average = np.empty(n_samples)
+        for k in range(block * _PIXEL_BLOCK_SIZE,
+                       min((block + 1) * _PIXEL_BLOCK_SIZE, n_total)):
+            image = k // n_pix
+            pixel = k % n_pix
+            start = neighbor_ptr[pixel]
+            end = neighbor_ptr[pixel + 1]
+
+            for sample in range(n_samples):
+                average[sample] = waveforms[image, pixel, sample] * lwt
+            for i in range(start, end):
+                neighbor = waveforms[image, neighbor_index[i]]
+                for sample in range(n_samples):
+                    average[sample] += neighbor[sample]
+            if end > start:
+                average /= end - start
+
+            peak_index = np.argmax(average)
+            charge[image, pixel], pulse_time[image, pixel] = _sum_and_time_around_peak(
+                waveforms[image, pixel], peak_index, width, shift
+            )
+
+
 class ImageExtractor(Component):
 
+    profiled_methods = ('__call__', )
+
     def __init__(self, config=None, parent=None, **kwargs):
         """
         Base component to handle the extraction of charge and pulse time
@@ -234,7 +337,27 @@ class ImageExtractor(Component):
         """
         super().__init__(config=config, parent=parent, **kwargs)
 
-        self.neighbors = None
+        self._thread_local = threading.local()
+        self._neighbors = None
+        self._neighbor_lists = LRUCache(maxsize=16)
+        self._neighbor_lists_lock = threading.Lock()
+
+    @property
+    def neighbors(self):
+        """
+        The pixel neighbors set for the extractor.
+
+        The value is stored per thread, so that the same extractor can
+        be used for telescopes with different cameras in parallel threads.
+        Threads that did not set the neighbors themselves see the last value
+        set by any thread.
+        """
+        return getattr(self._thread_local, 'neighbors', self._neighbors)
+
+    @neighbors.setter
+    def neighbors(self, value):
+        self._thread_local.neighbors = value
+        self._neighbors = value
 
     @staticmethod
     def requires_neighbors():
@@ -262,6 +385,89 @@ class ImageExtractor(Component):
                 self.log.exception("neighbors attribute must be set")
                 raise ValueError()
 
+    def _get_neighbor_lists(self, n_pixels):
+        """
+        Neighbors of each pixel in compressed form, see
+        `_extract_around_neighbor_peak`. These are cached per camera, i.e.
+        per ``neighbors`` array.
+        """
+        neighbors = self.neighbors
+        key = (id(neighbors), n_pixels)
+        with self._neighbor_lists_lock:
+            cached = self._neighbor_lists.get(key)
+        # the neighbors array is part of the value, so the id is not reused
+        if cached is not None and cached[0] is neighbors:
+            return cached[1], cached[2]
+
+        order = np.argsort(neighbors[:, 0], kind='stable')
+        neighbor_index = np.ascontiguousarray(neighbors[order, 1], dtype=np.int64)
+        neighbor_ptr = np.zeros(n_pixels + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(neighbors[:, 0], minlength=n_pixels),
+            out=neighbor_ptr[1:],
+        )
+
+        with self._neighbor_lists_lock:
+            self._neighbor_lists.put(key, (neighbors, neighbor_ptr, neighbor_index))
+        return neighbor_ptr, neighbor_index
+
+    def extract_batch(self, waveforms, charge=None, pulse_time=None):
+        """
+        Extract the charge and pulse time of several telescopes with the
+        same camera at once, e.g. all telescopes of one type in an event.
+
+        Extractors with compiled kernels process the whole stack in
+        a single parallel pass, others call the extractor for each telescope.
+
+        Parameters
+        ----------
+        waveforms : ndarray
+            Waveforms of all telescopes stored in a numpy array of shape
+            (n_tel, n_chan, n_pix, n_samples).
+        charge : ndarray or None
+            Preallocated C-contiguous float64 array of shape
+            (n_tel, n_chan, n_pix) to store the charge,
+            e.g. to reuse it for each event.
+        pulse_time : ndarray or None
+            Preallocated C-contiguous float64 array of shape
+            (n_tel, n_chan, n_pix) to store the pulse time.
+
+        Returns
+        -------
+        charge : ndarray
+            Extracted charge.
+            Shape: (n_tel, n_chan, n_pix)
+        pulse_time : ndarray
+            Floating point pulse time in each pixel.
+            Shape: (n_tel, n_chan, n_pix)
+        """
+        shape = waveforms.shape[:-1]
+        if charge is None:
+            charge = np.empty(shape)
+        if pulse_time is None:
+            pulse_time = np.empty(shape)
+        for out in (charge, pulse_time):
+            if out.shape != shape or not out.flags.c_contiguous:
+                raise ValueError(
+                    'Output arrays must be C-contiguous with shape {}'.format(shape)
+                )
+
+        self._extract_batch(waveforms, charge, pulse_time)
+        return charge, pulse_time
+
+    def _extract_batch(self, waveforms, charge, pulse_time):
+        """
+        Fill ``charge`` and ``pulse_time`` for the waveforms of several
+        telescopes, overwritten by extractors with batched implementations.
+        """
+        for tel in range(waveforms.shape[0]):
+            charge[tel], pulse_time[tel] = self(waveforms[tel])
+
+    def _extract_single(self, waveforms):
+        """ Run `extract_batch` on the waveforms of a single telescope """
+        charge, pulse_time = self.extract_batch(waveforms[np.newaxis])
+        return charge[0], pulse_time[0]
+
     @abstractmethod
     def __call__(self, waveforms):
         """
@@ -291,11 +497,16 @@ class FullWaveformSum(ImageExtractor):
     """
 
     def __call__(self, waveforms):
-        charge = waveforms.sum(2)
-        pulse_time = extract_pulse_time_around_peak(
-            waveforms, 0, waveforms.shape[-1], 0
+        return self._extract_single(waveforms)
+
+    def _extract_batch(self, waveforms, charge, pulse_time):
+        n_samples = waveforms.shape[-1]
+        _extract_around_peak(
+            waveforms.reshape(-1, n_samples),
+            np.zeros(charge.size, dtype=np.int64),
+            n_samples, 0,
+            charge.reshape(-1), pulse_time.reshape(-1),
         )
-        return charge, pulse_time
 
 
 class FixedWindowSum(ImageExtractor):
@@ -310,13 +521,15 @@ class FixedWindowSum(ImageExtractor):
     ).tag(config=True)
 
     def __call__(self, waveforms):
-        start = self.window_start
-        end = self.window_start + self.window_width
-        charge = waveforms[..., start:end].sum(2)
-        pulse_time = extract_pulse_time_around_peak(
-            waveforms, self.window_start, self.window_width, 0
+        return self._extract_single(waveforms)
+
+    def _extract_batch(self, waveforms, charge, pulse_time):
+        _extract_around_peak(
+            waveforms.reshape(-1, waveforms.shape[-1]),
+            np.full(charge.size, self.window_start, dtype=np.int64),
+            self.window_width, 0,
+            charge.reshape(-1), pulse_time.reshape(-1),
         )
-        return charge, pulse_time
 
 
 class GlobalPeakWindowSum(ImageExtractor):
@@ -333,16 +546,18 @@ class GlobalPeakWindowSum(ImageExtractor):
     ).tag(config=True)
 
     def __call__(self, waveforms):
-        peak_index = waveforms.mean(1).argmax(1)
-        charge = sum_samples_around_peak(
-            waveforms, peak_index[:, np.newaxis],
-            self.window_width, self.window_shift
-        )
-        pulse_time = extract_pulse_time_around_peak(
-            waveforms, peak_index[:, np.newaxis],
-            self.window_width, self.window_shift
+        return self._extract_single(waveforms)
+
+    def _extract_batch(self, waveforms, charge, pulse_time):
+        # peak of the average waveform of each telescope and channel
+        peak_index = waveforms.mean(axis=-2).argmax(axis=-1)
+        peak_index = np.broadcast_to(peak_index[..., np.newaxis], charge.shape)
+        _extract_around_peak(
+            waveforms.reshape(-1, waveforms.shape[-1]),
+            peak_index.astype(np.int64).reshape(-1),
+            self.window_width, self.window_shift,
+            charge.reshape(-1), pulse_time.reshape(-1),
         )
-        return charge, pulse_time
 
 
 class LocalPeakWindowSum(ImageExtractor):
@@ -359,14 +574,14 @@ class LocalPeakWindowSum(ImageExtractor):
     ).tag(config=True)
 
     def __call__(self, waveforms):
-        peak_index = waveforms.argmax(2).astype(np.int)
-        charge = sum_samples_around_peak(
-            waveforms, peak_index, self.window_width, self.window_shift
-        )
-        pulse_time = extract_pulse_time_around_peak(
-            waveforms, peak_index, self.window_width, self.window_shift
+        return self._extract_single(waveforms)
+
+    def _extract_batch(self, waveforms, charge, pulse_time):
+        _extract_around_local_peak(
+            waveforms.reshape(-1, waveforms.shape[-1]),
+            self.window_width, self.window_shift,
+            charge.reshape(-1), pulse_time.reshape(-1),
         )
-        return charge, pulse_time
 
 
 class NeighborPeakWindowSum(ImageExtractor):
@@ -390,17 +605,17 @@ class NeighborPeakWindowSum(ImageExtractor):
         return True
 
     def __call__(self, waveforms):
-        average_wfs = neighbor_average_waveform(
-            waveforms, self.neighbors, self.lwt
+        return self._extract_single(waveforms)
+
+    def _extract_batch(self, waveforms, charge, pulse_time):
+        n_pixels, n_samples = waveforms.shape[-2:]
+        neighbor_ptr, neighbor_index = self._get_neighbor_lists(n_pixels)
+        _extract_around_neighbor_peak(
+            waveforms.reshape(-1, n_pixels, n_samples),
+            neighbor_ptr, neighbor_index, self.lwt,
+            self.window_width, self.window_shift,
+            charge.reshape(-1, n_pixels), pulse_time.reshape(-1, n_pixels),
         )
-        peak_index = average_wfs.argmax(2)
-        charge = sum_samples_around_peak(
-            waveforms, peak_index, self.window_width, self.window_shift
-        )
-        pulse_time = extract_pulse_time_around_peak(
-            waveforms, peak_index, self.window_width, self.window_shift
-        )
-        return charge, pulse_time
 
 
 class BaselineSubtractedNeighborPeakWindowSum(NeighborPeakWindowSum):
@@ -415,8 +630,8 @@ class BaselineSubtractedNeighborPeakWindowSum(NeighborPeakWindowSum):
         10, help='End sample for baseline estimation'
     ).tag(config=True)
 
-    def __call__(self, waveforms):
+    def _extract_batch(self, waveforms, charge, pulse_time):
         baseline_corrected = subtract_baseline(
             waveforms, self.baseline_start, self.baseline_end
         )
-        return super().__call__(baseline_corrected)
+        super()._extract_batch(baseline_corrected, charge, pulse_time)
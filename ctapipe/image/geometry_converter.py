@@ -2,7 +2,9 @@
 common module"""
 
 
-from .geometry_converter_hex import (convert_geometry_hex1d_to_rect2d,
+from .geometry_converter_hex import (ResamplingPlan,
+                                     get_resampling_plan,
+                                     convert_geometry_hex1d_to_rect2d,
                                      convert_geometry_rect2d_back_to_hexe1d)
 
 from .geometry_converter_astri import astri_to_2d_array, array_2d_to_astri
@@ -7,10 +7,13 @@ from astropy import units as u
 from numba import jit
 
 from ctapipe.instrument import CameraGeometry
+from ctapipe.utils.lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
+    "ResamplingPlan",
+    "get_resampling_plan",
     "convert_geometry_hex1d_to_rect2d",
     "convert_geometry_rect2d_back_to_hexe1d"
 ]
@@ -210,7 +213,7 @@ def reskew_hex_pixel_grid(pix_x, pix_y, cam_angle=0 * u.deg,
     return rot_x, rot_y
 
 
-@jit
+@jit(cache=True)
 def reskew_hex_pixel_from_orthogonal_edges(x_edges, y_edges, square_mask):
     """extracts and skews the pixel coordinates from a 2D orthogonal
     histogram (i.e. the bin-edges) and skews them into the hexagonal
@@ -240,18 +243,17 @@ def reskew_hex_pixel_from_orthogonal_edges(x_edges, y_edges, square_mask):
     return unrot_x, unrot_y
 
 
-@jit
 def get_orthogonal_grid_edges(pix_x, pix_y, scale_aspect=True):
     """calculate the bin edges of the slanted, orthogonal pixel grid to
     resample the pixel signals with np.histogramdd right after.
 
     Parameters
     ----------
-    pix_x, pix_y : 1D numpy arrays
+    pix_x, pix_y : 1D astropy.Quantity arrays
         the list of x and y coordinates of the slanted, orthogonal pixel grid
     scale_aspect : boolean (default: True)
         if True, rescales the x-coordinates to create square pixels
-        (instead of rectangular ones)
+        (instead of rectangular ones). Note that `pix_x` is scaled in place.
 
     Returns
     --------
@@ -260,90 +262,95 @@ def get_orthogonal_grid_edges(pix_x, pix_y, scale_aspect=True):
     x_scale : float
         factor by which the x-coordinates have been scaled
     """
-
-    # finding the size of the square patches
-    d_x = 99 * u.meter  # TODO: @jit may have troubles interpreting astropy.Quantities
-    d_y = 99 * u.meter
-    x_base = pix_x[0]
-    y_base = pix_y[0]
-    for x, y in zip(pix_x, pix_y):
-        if abs(y - y_base) < abs(x - x_base):
-            d_x = min(d_x, abs(x - x_base))
-        if abs(y - y_base) > abs(x - x_base):
-            d_y = min(d_y, abs(y - y_base))
-
-    # for x, y in zip(pix_x, pix_y):
-    #    if abs(y - y_base) > abs(x - x_base):
-    #        d_y = min(d_y, abs(y - y_base))
+    unit = pix_x.unit
+    # copy, as pix_x is scaled in place below
+    x = pix_x.to_value(unit).copy()
+    y = pix_y.to_value(unit)
+
+    # finding the size of the square patches: the closest pixel to the first
+    # one along the x- and along the y-axis
+    max_distance = u.Quantity(99, u.meter).to_value(unit)
+    dist_x = np.abs(x - x[0])
+    dist_y = np.abs(y - y[0])
+    d_x = dist_x[dist_y < dist_x].min(initial=max_distance)
+    d_y = dist_y[dist_y > dist_x].min(initial=max_distance)
 
     x_scale = 1
     if scale_aspect:
         x_scale = d_y / d_x
         pix_x *= x_scale
+        x = x * x_scale
         d_x = d_y
 
     # with the maximal extension of the axes and the size of the pixels,
     # determine the number of bins in each direction
-    n_bins_x = (np.around(abs(max(pix_x) - min(pix_x)) / d_x) + 2).astype(int)
-    n_bins_y = (np.around(abs(max(pix_y) - min(pix_y)) / d_y) + 2).astype(int)
-    x_edges = np.linspace(min(pix_x).value, max(pix_x).value, n_bins_x)
-    y_edges = np.linspace(min(pix_y).value, max(pix_y).value, n_bins_y)
+    n_bins_x = int(np.around(abs(x.max() - x.min()) / d_x)) + 2
+    n_bins_y = int(np.around(abs(y.max() - y.min()) / d_y)) + 2
+    x_edges = np.linspace(x.min(), x.max(), n_bins_x)
+    y_edges = np.linspace(y.min(), y.max(), n_bins_y)
 
     return x_edges, y_edges, x_scale
 
 
-rot_buffer = {}
+def _bin_index(values, edges):
+    """index of the bin of each value, with the same convention
+    as `numpy.histogramdd` (the last bin includes its right edge)"""
+    index = np.searchsorted(edges, values, side='right') - 1
+    index[values == edges[-1]] -= 1
+    return index
 
 
-def convert_geometry_hex1d_to_rect2d(geom, signal, key=None, add_rot=0):
-    """converts the geometry object of a camera with a hexagonal grid into
-    a square grid by slanting and stretching the 1D arrays of pixel x
-    and y positions and signal intensities are converted to 2D
-    arrays. If the signal array contains a time-dimension it is
-    conserved.
+class ResamplingPlan:
+    """
+    Precomputed mapping between the pixels of a camera with a hexagonal grid
+    and the bins of a rectangular 2D grid, obtained by slanting and
+    stretching the pixel positions (see `unskew_hex_pixel_grid`).
+
+    A plan is built once per camera with `from_geometry` (or loaded from
+    disk with `read`) and then converts any number of images or waveforms
+    with a single gather per call, e.g. an array of shape
+    ``(n_events, n_pixels, n_samples)`` into one of shape
+    ``(n_events, n_rows, n_cols, n_samples)`` and back.
 
     Parameters
     ----------
-    geom : CameraGeometry object
-        geometry object of hexagonal cameras
-    signal : ndarray
-        1D (no timing) or 2D (with timing) array of the pmt signals
-    key : (default: None)
-        arbitrary key (float, string) to store the transformed geometry in a buffer
-        The geometries (hex and rect) will be stored in a buffer.
-        The key is necessary to make the conversion back from rect to hex.
-    add_rot : int/float (default: 0)
-        parameter to apply an additional rotation of `add_rot` times 60°
-
-    Returns
-    -------
-    new_geom : CameraGeometry object
-        geometry object of the slanted picture now with a rectangular
-        grid and a 2D grid for the pixel positions. contains now a 2D
-        masking array signifying which of the pixels came from the
-        original geometry and which are simply fillers from the
-        rectangular grid
-    rot_img : ndarray 2D (no timing) or 3D (with timing)
-        the rectangular signal image
-
-    Examples
-    --------
-    camera = event.inst.subarray.tel[tel_id].camera
-    image = event.r0.tel[tel_id].image[0]
-    key = camera.cam_id
-    square_geom, square_image = convert_geometry_hex1d_to_rect2d(camera, image, key=key)
+    rect_index : np.ndarray
+        2D integer array with the index of the pixel in each bin
+        of the rectangular grid, -1 for bins without a pixel
+    pixel_index : np.ndarray
+        position of each pixel in the flattened rectangular grid
+    x_edges, y_edges : np.ndarray
+        bin edges of the rectangular grid in meter
+    cam_id : str
+        id of the camera the plan was built for
     """
-
-    if key in rot_buffer:
-
-        # if the conversion with this key was done before and stored,
-        # just read it in
-        (geom, new_geom, hex_to_rect_map) = rot_buffer[key]
-    else:
-
-        # otherwise, we have to do the conversion first now,
-        # skew all the coordinates of the original geometry
-
+    version = 1
+
+    def __init__(self, rect_index, pixel_index, x_edges, y_edges, cam_id=''):
+        self.rect_index = rect_index
+        self.pixel_index = pixel_index
+        self.x_edges = x_edges
+        self.y_edges = y_edges
+        self.cam_id = cam_id
+
+        self.mask = rect_index >= 0
+        flat_index = rect_index.ravel()
+        self._gather_index = np.where(flat_index >= 0, flat_index, 0)
+        self._empty_bins = np.flatnonzero(flat_index < 0)
+        self._rect_geometry = (None, None)
+
+    @classmethod
+    def from_geometry(cls, geom, add_rot=0):
+        """
+        Create the plan for a camera with a hexagonal pixel grid.
+
+        Parameters
+        ----------
+        geom : CameraGeometry
+            geometry of the hexagonal camera
+        add_rot : int/float (default: 0)
+            parameter to apply an additional rotation of `add_rot` times 60°
+        """
         # extra_rot is the angle to get back to aligned hexagons with flat
         # tops. Note that the pixel rotation angle brings the camera so that
         # hexagons have a point at the top, so need to go 30deg back to
@@ -360,97 +367,302 @@ def convert_geometry_hex1d_to_rect2d(geom, signal, key=None, add_rot=0):
                                              cam_angle=rot_angle)
 
         # with all the coordinate points, we can define the bin edges
-        # of a 2D histogram
-        x_edges, y_edges, x_scale = get_orthogonal_grid_edges(rot_x, rot_y)
-
-        # this histogram will introduce bins that do not correspond to
-        # any pixel from the original geometry. so we create a mask to
-        # remember the true camera pixels by simply throwing all pixel
-        # positions into numpy.histogramdd: proper pixels contain the
-        # value 1, false pixels the value 0.
-        square_mask = np.histogramdd([rot_y, rot_x],
-                                     bins=(y_edges, x_edges))[0].astype(bool)
+        # of a 2D histogram, this also scales rot_x to obtain square bins
+        x_edges, y_edges, _ = get_orthogonal_grid_edges(rot_x, rot_y)
+
+        col = _bin_index(rot_x.to_value(u.m), x_edges)
+        row = _bin_index(rot_y.to_value(u.m), y_edges)
+
+        shape = (len(y_edges) - 1, len(x_edges) - 1)
+        pixel_index = np.ravel_multi_index((row, col), shape)
+
+        # bins that do not correspond to a pixel of the original image
+        # get an entry of `-1`
+        rect_index = np.full(shape, -1, dtype=np.int64)
+        rect_index.flat[pixel_index] = np.arange(geom.n_pixels)
+
+        return cls(rect_index, pixel_index, x_edges, y_edges, geom.cam_id)
+
+    @property
+    def n_pixels(self):
+        """ number of pixels of the hexagonal camera """
+        return len(self.pixel_index)
+
+    @property
+    def shape(self):
+        """ shape ``(n_rows, n_cols)`` of the rectangular grid """
+        return self.rect_index.shape
+
+    def to_rect(self, signal, pixel_axis=-1, fill_value=np.nan, out=None):
+        """
+        Resample hexagonal camera data onto the rectangular grid.
+
+        Parameters
+        ----------
+        signal : array-like
+            data with the pixels along `pixel_axis`, e.g. an image of shape
+            ``(n_pixels, )``, a batch of images ``(n_events, n_pixels)``
+            or waveforms ``(n_events, n_pixels, n_samples)`` with
+            ``pixel_axis=-2``
+        pixel_axis : int
+            axis of `signal` along the pixels
+        fill_value : scalar
+            value of the bins that do not correspond to a pixel
+        out : np.ndarray or None
+            C-contiguous array to store the result in
+
+        Returns
+        -------
+        rect : np.ndarray
+            the pixel axis of `signal` replaced by the two axes
+            ``(n_rows, n_cols)`` of the grid
+        """
+        signal = np.asanyarray(signal)
+        axis = self._check_axis(signal.shape, pixel_axis, self.n_pixels)
+
+        flat_shape = (
+            signal.shape[:axis] + (self._gather_index.size, )
+            + signal.shape[axis + 1:]
+        )
+        shape = signal.shape[:axis] + self.shape + signal.shape[axis + 1:]
+
+        if out is None:
+            out = np.empty(shape, dtype=np.result_type(signal, fill_value))
+        elif out.shape != shape or not out.flags.c_contiguous:
+            raise ValueError(
+                f'out must be a C-contiguous array of shape {shape}'
+            )
+
+        flat = out.reshape(flat_shape)
+        if flat.dtype == signal.dtype:
+            np.take(signal, self._gather_index, axis=axis, out=flat, mode='clip')
+        else:
+            flat[...] = np.take(signal, self._gather_index, axis=axis)
+
+        flat[(slice(None), ) * axis + (self._empty_bins, )] = fill_value
+        return out
+
+    def to_hex(self, rect, pixel_axis=-1):
+        """
+        Resample data on the rectangular grid back to the hexagonal pixels.
+
+        Parameters
+        ----------
+        rect : array-like
+            data as returned by `to_rect`
+        pixel_axis : int
+            axis of the pixels in the result, the grid axes of `rect` are
+            the axes at this position of the result and the one following it
+
+        Returns
+        -------
+        signal : np.ndarray
+            the two grid axes of `rect` replaced by a single pixel axis
+        """
+        rect = np.asanyarray(rect)
+        if rect.ndim < 2:
+            raise ValueError('rect needs at least the two grid axes')
+
+        axis = self._check_axis(rect.shape[:-1], pixel_axis)
+        if rect.shape[axis:axis + 2] != self.shape:
+            raise ValueError(
+                f'Expected grid axes of shape {self.shape}, '
+                f'got {rect.shape[axis:axis + 2]}'
+            )
+
+        flat = rect.reshape(
+            rect.shape[:axis] + (self._gather_index.size, ) + rect.shape[axis + 2:]
+        )
+        return np.take(flat, self.pixel_index, axis=axis)
+
+    @staticmethod
+    def _check_axis(shape, pixel_axis, n_pixels=None):
+        ndim = len(shape)
+        if not -ndim <= pixel_axis < ndim:
+            raise ValueError(f'pixel_axis {pixel_axis} out of range for {ndim} dims')
+        axis = pixel_axis % ndim
+
+        if n_pixels is not None and shape[axis] != n_pixels:
+            raise ValueError(
+                f'Expected {n_pixels} pixels along axis {pixel_axis}, '
+                f'got {shape[axis]}'
+            )
+        return axis
+
+    def rect_geometry(self, geom):
+        """
+        The geometry of the rectangular grid, for the hexagonal `geom`
+        the plan was built from.
+
+        Parameters
+        ----------
+        geom : CameraGeometry
+            geometry of the hexagonal camera
+
+        Returns
+        -------
+        new_geom : CameraGeometry
+            geometry object of the slanted picture now with a rectangular
+            grid and a 2D grid for the pixel positions. contains a 2D
+            `mask` signifying which of the pixels came from the original
+            geometry and which are simply fillers from the rectangular grid
+        """
+        source, new_geom = self._rect_geometry
+        if source is geom:
+            return new_geom
+
+        x_edges, y_edges = self.x_edges, self.y_edges
 
         # to be consistent with the pixel intensity, instead of saving
-        # only the rotated positions of the true pixels (rot_x and
-        # rot_y), create 2D arrays of all x and y positions (also the
-        # false ones).
+        # only the rotated positions of the true pixels, create 2D arrays
+        # of all x and y positions (also the false ones).
         grid_x, grid_y = np.meshgrid((x_edges[:-1] + x_edges[1:]) / 2.,
                                      (y_edges[:-1] + y_edges[1:]) / 2.)
 
-        ids = []
-        # instead of blindly enumerating all pixels, let's instead
-        # store a list of all valid -- i.e. picked by the mask -- 2D
-        # indices
-        for i, row in enumerate(square_mask):
-            for j, val in enumerate(row):
-                if val is True:
-                    ids.append((i, j))
-
         # the area of the pixels (note that this is still a deformed
         # image)
         pix_area = (np.ones_like(grid_x)
                     * (x_edges[1] - x_edges[0])
                     * (y_edges[1] - y_edges[0]))
 
-        # creating a new geometry object with the attributes we just determined
         new_geom = CameraGeometry(
             cam_id=geom.cam_id + "_rect",
-            pix_id=ids,  # this is a list of all the valid coordinate pairs now
-            pix_x=u.Quantity(grid_x.ravel(),  u.meter),
-            pix_y=u.Quantity(grid_y.ravel(),  u.meter),
+            # a list of all the valid 2D indices
+            pix_id=[tuple(ij) for ij in np.argwhere(self.mask)],
+            pix_x=u.Quantity(grid_x.ravel(), u.meter),
+            pix_y=u.Quantity(grid_y.ravel(), u.meter),
             pix_area=pix_area * u.meter ** 2,
             neighbors=geom.neighbors,
             pix_type='rectangular', apply_derotation=False)
 
         # storing the pixel mask for later use
-        new_geom.mask = square_mask
-
-        # create a transfer map by enumerating all pixel positions in a 2D histogram
-        hex_to_rect_map = np.histogramdd([rot_y, rot_x],
-                                         bins=(y_edges, x_edges),
-                                         weights=np.arange(len(signal)))[
-            0].astype(int)
-        # bins that do not correspond to the original image get an entry of `-1`
-        hex_to_rect_map[~square_mask] = -1
-
-        if signal.ndim > 1:
-            long_map = []
-            for i in range(signal.shape[-1]):
-                tmp_map = hex_to_rect_map + i * (np.max(hex_to_rect_map) + 1)
-                tmp_map[~square_mask] = -1
-                long_map.append(tmp_map)
-            hex_to_rect_map = np.array(long_map)
+        new_geom.mask = self.mask
+        self._rect_geometry = (geom, new_geom)
+        return new_geom
+
+    def write(self, path):
+        """ Store the plan in the npz file at ``path`` """
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                version=self.version,
+                rect_index=self.rect_index,
+                pixel_index=self.pixel_index,
+                x_edges=self.x_edges,
+                y_edges=self.y_edges,
+                cam_id=self.cam_id,
+            )
+
+    @classmethod
+    def read(cls, path):
+        """ Load a plan stored with `write` """
+        with np.load(path, allow_pickle=False) as data:
+            if data['version'] != cls.version:
+                raise ValueError(
+                    'Resampling plan {} has version {}, expected {}'.format(
+                        path, data['version'], cls.version
+                    )
+                )
+            return cls(
+                data['rect_index'],
+                data['pixel_index'],
+                data['x_edges'],
+                data['y_edges'],
+                str(data['cam_id']),
+            )
+
+    def __repr__(self):
+        return '{}(cam_id={!r}, n_pixels={}, shape={})'.format(
+            self.__class__.__name__, self.cam_id, self.n_pixels, self.shape
+        )
+
+
+#: maximum number of plans kept by `get_resampling_plan`
+#: and of keyed conversions kept in `rot_buffer`
+RESAMPLING_CACHE_SIZE = 32
+
+resampling_plans = LRUCache(RESAMPLING_CACHE_SIZE)
+rot_buffer = LRUCache(RESAMPLING_CACHE_SIZE)
+
+
+def get_resampling_plan(geom, add_rot=0):
+    """
+    The `ResamplingPlan` for `geom`, created on first use and kept in
+    the bounded cache `resampling_plans`.
 
+    Parameters
+    ----------
+    geom : CameraGeometry
+        geometry of the hexagonal camera
+    add_rot : int/float (default: 0)
+        parameter to apply an additional rotation of `add_rot` times 60°
+    """
+    key = (geom, add_rot)
+    plan = resampling_plans.get(key)
+    if plan is None:
+        plan = ResamplingPlan.from_geometry(geom, add_rot=add_rot)
+        resampling_plans.put(key, plan)
+    return plan
+
+
+def _buffered_conversion(geom, key, add_rot):
+    """(geom, new_geom, plan) of a conversion, from `rot_buffer` if `key`
+    was used before, storing it there otherwise"""
+    buffered = rot_buffer.get(key) if key is not None else None
+    if buffered is None:
+        plan = get_resampling_plan(geom, add_rot=add_rot)
+        buffered = (geom, plan.rect_geometry(geom), plan)
         if key is not None:
-            # if a key is given, store the essential objects in a buffer
-            rot_buffer[key] = (geom, new_geom, hex_to_rect_map)
+            rot_buffer.put(key, buffered)
+    return buffered
 
-    # done `if key in rot_buffer`
 
-    # create the rotated rectangular image by applying `hex_to_rect_map` to the flat,
-    # extended input image
-    # `input_img_ext` is the flattened input image extended by one entry that contains NaN
-    # since `hex_to_rect_map` contains `-1` for "fake" pixels, it maps this extra NaN
-    # value at the last array position to any bin that does not correspond to a pixel of
-    # the original image
-    input_img_ext = np.full(np.prod(signal.shape) + 1, np.nan)
+def convert_geometry_hex1d_to_rect2d(geom, signal, key=None, add_rot=0):
+    """converts the geometry object of a camera with a hexagonal grid into
+    a square grid by slanting and stretching the 1D arrays of pixel x
+    and y positions and signal intensities are converted to 2D
+    arrays. If the signal array contains a time-dimension it is
+    conserved.
 
-    # the way the map is produced, it has the time dimension as axis=0;
-    # but `signal` has it as axis=-1, so we need to roll the axes back and forth a bit.
-    # if there is no time dimension, `signal` is a 1d array and `rollaxis` has no effect.
-    input_img_ext[:-1] = np.rollaxis(signal, axis=-1, start=0).ravel()
+    Parameters
+    ----------
+    geom : CameraGeometry object
+        geometry object of hexagonal cameras
+    signal : ndarray
+        1D (no timing) or 2D (with timing) array of the pmt signals
+    key : (default: None)
+        arbitrary key (float, string) to store the transformed geometry in a buffer
+        The geometries (hex and rect) will be stored in a buffer.
+        The key is necessary to make the conversion back from rect to hex.
+    add_rot : int/float (default: 0)
+        parameter to apply an additional rotation of `add_rot` times 60°
 
-    # now apply the transfer map
-    rot_img = input_img_ext[hex_to_rect_map]
+    Returns
+    -------
+    new_geom : CameraGeometry object
+        geometry object of the slanted picture now with a rectangular
+        grid and a 2D grid for the pixel positions. contains now a 2D
+        masking array signifying which of the pixels came from the
+        original geometry and which are simply fillers from the
+        rectangular grid
+    rot_img : ndarray 2D (no timing) or 3D (with timing)
+        the rectangular signal image
 
-    # if there is a time dimension, roll the time axis back to the last position
-    try:
-        rot_img = np.rollaxis(rot_img, 0, 3)
-    except ValueError:
-        pass
+    Notes
+    -----
+    To convert many images of the same camera, use the `ResamplingPlan`
+    of the camera (see `get_resampling_plan`) directly.
 
-    return new_geom, rot_img
+    Examples
+    --------
+    camera = event.inst.subarray.tel[tel_id].camera
+    image = event.r0.tel[tel_id].image[0]
+    key = camera.cam_id
+    square_geom, square_image = convert_geometry_hex1d_to_rect2d(camera, image, key=key)
+    """
+    geom, new_geom, plan = _buffered_conversion(geom, key, add_rot)
+    rot_img = plan.to_rect(signal, pixel_axis=0)
+    return new_geom, rot_img.astype(float, copy=False)
 
 
 def convert_geometry_rect2d_back_to_hexe1d(geom, signal, key=None,
@@ -469,7 +681,7 @@ def convert_geometry_rect2d_back_to_hexe1d(geom, signal, key=None,
         key to retrieve buffered geometry information
         (see `convert_geometry_hex1d_to_rect2d`)
     add_rot:
-        not used -- only here for backwards compatibility
+        only used for the mock conversion, see Notes
 
     Returns
     -------
@@ -509,39 +721,12 @@ def convert_geometry_rect2d_back_to_hexe1d(geom, signal, key=None,
                 "could not deduce `CameraGeometry` from given `geom`...\n"
                 "please provide a `geom`, so that "
                 "`geom.cam_id.split('_')[0]` is a known `cam_id`")
+    else:
+        orig_geom = None
+
+    old_geom, new_geom, plan = _buffered_conversion(
+        orig_geom, key, add_rot or 0
+    )
 
-        orig_signal = np.zeros(len(orig_geom.pix_x))
-        convert_geometry_hex1d_to_rect2d(geom=orig_geom, signal=orig_signal,
-                                         key=key, add_rot=add_rot)
-
-    (old_geom, new_geom, hex_square_map) = rot_buffer[key]
-
-    # the output image has as many entries as there are non-negative values in the
-    # transfer map (this accounts for time as well)
-    unrot_img = np.zeros(np.count_nonzero(hex_square_map >= 0))
-
-    # rearrange input `signal` according to the mask and map
-    # (the dots in the brackets expand the mask to account for a possible time dimension)
-    # `atleast_3d` ensures that there is a third axis that we can roll to the front
-    # even if there is no time; if we'd use `axis=-1` instead, in cas of no time
-    # dimensions, we would rotate the x and y axes, resulting in a mirrored image
-    # `squeeze` reduces the added axis again in the no-time-slices cases
-    unrot_img[hex_square_map[..., new_geom.mask]] = \
-        np.squeeze(np.rollaxis(np.atleast_3d(signal), 2, 0))[..., new_geom.mask]
-
-    # if `signal` has a third dimension, that is the time
-    # and we need to roll some axes again...
-    if signal.ndim == 3:
-        # unrot_img[hex_square_map[..., new_geom.mask]] = \
-        # np.rollaxis(signal, -1, 0)[..., new_geom.mask]
-
-        # reshape the image so that the time is the first axis
-        # and then roll the time to the back
-        unrot_img = unrot_img.reshape((signal.shape[2],
-                                       np.count_nonzero(new_geom.mask)))
-        unrot_img = np.rollaxis(unrot_img, -1, 0)
-    # else:
-    #     unrot_img[hex_square_map[new_geom.mask]] = \
-    #         signal[new_geom.mask]
-
-    return old_geom, unrot_img
+    unrot_img = plan.to_hex(signal, pixel_axis=0)
+    return old_geom, unrot_img.astype(float, copy=False)
@@ -7,15 +7,28 @@ Hillas-style moment-based shower image parametrization.
 import astropy.units as u
 import numpy as np
 from astropy.coordinates import Angle
+from astropy.table import QTable
 from astropy.units import Quantity
+from scipy.special import comb
 from ..io.containers import HillasParametersContainer
 
 
 __all__ = [
     'hillas_parameters',
+    'hillas_parameters_batch',
     'HillasParameterizationError',
 ]
 
+# order of the raw moments in the rows of CameraGeometry.pixel_moment_matrix
+# as (power of x, power of y), the zeroth moment (the size) is prepended
+_MOMENT_POWERS = [
+    (0, 0),
+    (1, 0), (0, 1),
+    (2, 0), (1, 1), (0, 2),
+    (3, 0), (2, 1), (1, 2), (0, 3),
+    (4, 0), (3, 1), (2, 2), (1, 3), (0, 4),
+]
+
 
 def camera_to_shower_coordinates(x, y, cog_x, cog_y, psi):
     '''
@@ -164,3 +177,156 @@ def hillas_parameters(geom, image):
         skewness=skewness_long,
         kurtosis=kurtosis_long,
     )
+
+
+def _central_moment(raw, cog_x, cog_y, p, q):
+    """
+    Central moment E[(x - cog_x)^p (y - cog_y)^q] computed from the
+    normalized raw moments ``raw[(i, j)] = E[x^i y^j]`` by binomial expansion.
+    """
+    result = 0
+    for i in range(p + 1):
+        for j in range(q + 1):
+            result = result + (
+                comb(p, i, exact=True) * comb(q, j, exact=True)
+                * (-cog_x)**(p - i) * (-cog_y)**(q - j)
+                * raw[(i, j)]
+            )
+    return result
+
+
+def _longitudinal_moment(central, cos_psi, sin_psi, order):
+    """
+    Moment of the longitudinal coordinate
+    ``l = delta_x * cos(psi) + delta_y * sin(psi)``
+    from the central moments of delta_x and delta_y.
+    """
+    result = 0
+    for k in range(order + 1):
+        result = result + (
+            comb(order, k, exact=True)
+            * cos_psi**(order - k) * sin_psi**k
+            * central[(order - k, k)]
+        )
+    return result
+
+
+def hillas_parameters_batch(geom, images, masks=None):
+    """
+    Compute Hillas parameters for a stack of shower images of the same camera
+    in one vectorized pass.
+
+    The raw image moments of all images are obtained with a single
+    matrix product with `CameraGeometry.pixel_moment_matrix`, the
+    covariance eigen-decomposition is done in closed form for all 2x2
+    matrices at once.
+    The results are the same as calling `hillas_parameters` for each
+    image separately, but much faster for many images.
+
+    >>> from ctapipe.image.tests.test_hillas import create_sample_image
+    >>> geom, image, clean_mask = create_sample_image(psi='0d')
+    >>> images = np.stack([image, image])
+    >>> masks = np.stack([clean_mask, clean_mask])
+    >>> table = hillas_parameters_batch(geom, images, masks)
+    >>> len(table)
+    2
+
+    Parameters
+    ----------
+    geom: ctapipe.instrument.CameraGeometry
+        Camera geometry
+    images: array_like
+        Charge in each pixel, shape (n_images, n_pixels)
+    masks: array_like or None
+        Boolean cleaning masks of the same shape as ``images``,
+        pixels not in the mask are ignored. If None, all pixels are used.
+
+    Returns
+    -------
+    astropy.table.QTable:
+        one row per image, columns named like the fields of
+        `~ctapipe.io.containers.HillasParametersContainer`.
+        Images with zero total intensity, for which `hillas_parameters`
+        would raise a `HillasParameterizationError`, give rows filled with nan.
+    """
+    unit = geom.pix_x.unit
+    images = np.asanyarray(images, dtype=np.float64)
+    images = np.ma.filled(images, 0)
+
+    if images.ndim != 2 or images.shape[1] != geom.n_pixels:
+        raise ValueError(
+            'images must have shape (n_images, {}), got {}'.format(
+                geom.n_pixels, images.shape
+            )
+        )
+
+    if masks is not None:
+        masks = np.asanyarray(masks, dtype=bool)
+        if masks.shape != images.shape:
+            raise ValueError('masks and images must have the same shape')
+        images = np.where(masks, images, 0.0)
+
+    size = images.sum(axis=1)
+    valid = size != 0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # one row per raw moment, one column per image
+        moments = geom.pixel_moment_matrix @ images.T / size
+
+        raw = {(0, 0): 1.0}
+        for row, powers in enumerate(_MOMENT_POWERS[1:]):
+            raw[powers] = moments[row]
+
+        cog_x = raw[(1, 0)]
+        cog_y = raw[(0, 1)]
+
+        cog_r = np.hypot(cog_x, cog_y)
+        cog_phi = np.arctan2(cog_y, cog_x)
+
+        central = {
+            (p, q): _central_moment(raw, cog_x, cog_y, p, q)
+            for p, q in _MOMENT_POWERS
+            if p + q >= 2
+        }
+
+        # closed form eigen-decomposition of the covariance matrix
+        cov_xx = central[(2, 0)]
+        cov_xy = central[(1, 1)]
+        cov_yy = central[(0, 2)]
+
+        half_trace = 0.5 * (cov_xx + cov_yy)
+        root = np.hypot(0.5 * (cov_xx - cov_yy), cov_xy)
+
+        # rounding can make the smaller eigenvalue slightly negative
+        length = np.sqrt(half_trace + root)
+        width = np.sqrt(np.clip(half_trace - root, 0, None))
+
+        # same range (-pi/2, pi/2] as the arctan in hillas_parameters
+        psi = 0.5 * np.arctan2(2 * cov_xy, cov_xx - cov_yy)
+
+        cos_psi = np.cos(psi)
+        sin_psi = np.sin(psi)
+
+        m3_long = _longitudinal_moment(central, cos_psi, sin_psi, 3)
+        m4_long = _longitudinal_moment(central, cos_psi, sin_psi, 4)
+        skewness_long = m3_long / length**3
+        kurtosis_long = m4_long / length**4
+
+    columns = dict(
+        intensity=size,
+        x=u.Quantity(cog_x, unit),
+        y=u.Quantity(cog_y, unit),
+        r=u.Quantity(cog_r, unit),
+        phi=u.Quantity(cog_phi, u.rad),
+        length=u.Quantity(length, unit),
+        width=u.Quantity(width, unit),
+        psi=u.Quantity(psi, u.rad),
+        skewness=skewness_long,
+        kurtosis=kurtosis_long,
+    )
+
+    for name, column in columns.items():
+        if name != 'intensity':
+            column[~valid] = np.nan
+
+    return QTable(columns)
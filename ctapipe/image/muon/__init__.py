@@ -1,4 +1,33 @@
-from .fitting import *
-from .features import *
-from .muon_ring_finder import *
-from .muon_integrator import *
+from ...core.lazy_loading import lazy_submodules
+
+__getattr__, __dir__, __all__ = lazy_submodules(
+    __name__,
+    attributes={
+        'fitting': [
+            'kundu_chaudhuri_circle_fit',
+            'kundu_chaudhuri_circle_fit_batch',
+            'psf_likelihood_fit',
+            'impact_parameter_chisq_fit',
+            'mirror_integration_distance',
+            'expected_pixel_light_content',
+            'radial_light_intensity',
+            'efficiency_fit',
+        ],
+        'features': [
+            'mean_squared_error',
+            'photon_ratio_inside_ring',
+            'ring_completeness',
+            'ring_containment',
+            'npix_above_threshold',
+            'npix_composing_ring',
+        ],
+        'muon_ring_finder': ['ChaudhuriKunduRingFitter'],
+        'muon_integrator': ['MuonLineIntegrate'],
+    },
+    submodules=[
+        'intensity_fitter',
+        'muon_diagnostic_plots',
+        'muon_reco_functions',
+        'ring_fitter',
+    ],
+)
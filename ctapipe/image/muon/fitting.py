@@ -6,6 +6,7 @@ from astropy.units import Quantity
 
 __all__ = [
     'kundu_chaudhuri_circle_fit',
+    'kundu_chaudhuri_circle_fit_batch',
     'psf_likelihood_fit',
     'impact_parameter_chisq_fit',
     'mirror_integration_distance',
@@ -59,6 +60,61 @@ def kundu_chaudhuri_circle_fit(x, y, weights):
     return radius, center_x, center_y
 
 
+def kundu_chaudhuri_circle_fit_batch(x, y, weights):
+    """
+    `kundu_chaudhuri_circle_fit` for many images of the same camera at once.
+
+    Parameters
+    ----------
+    x: array-like
+        x coordinates of the points, shape (n_points, )
+        or (n_images, n_points)
+    y: array-like
+        y coordinates of the points, shape (n_points, )
+        or (n_images, n_points)
+    weights: array-like
+        weights of the points of each image, shape (n_images, n_points)
+
+    Returns
+    -------
+    radius, center_x, center_y: np.ndarray
+        fit results of each image, shape (n_images, )
+    """
+    x = np.asanyarray(x)
+    y = np.asanyarray(y)
+    weights = np.asanyarray(weights)
+
+    weights_sum = np.sum(weights, axis=-1)
+    mean_x = np.sum(x * weights, axis=-1) / weights_sum
+    mean_y = np.sum(y * weights, axis=-1) / weights_sum
+
+    delta_x = weights * (x - mean_x[..., np.newaxis])
+    delta_y = weights * (y - mean_y[..., np.newaxis])
+    r2 = x**2 + y**2
+
+    a1 = np.sum(delta_x * x, axis=-1)
+    a2 = np.sum(delta_y * x, axis=-1)
+
+    b1 = np.sum(delta_x * y, axis=-1)
+    b2 = np.sum(delta_y * y, axis=-1)
+
+    c1 = 0.5 * np.sum(delta_x * r2, axis=-1)
+    c2 = 0.5 * np.sum(delta_y * r2, axis=-1)
+
+    center_x = (b2 * c1 - b1 * c2) / (a1 * b2 - a2 * b1)
+    center_y = (a2 * c1 - a1 * c2) / (a2 * b1 - a1 * b2)
+
+    radius = np.sqrt(np.sum(
+        weights * (
+            (center_x[..., np.newaxis] - x)**2
+            + (center_y[..., np.newaxis] - y)**2
+        ),
+        axis=-1,
+    ) / weights_sum)
+
+    return radius, center_x, center_y
+
+
 def _psf_neg_log_likelihood(params, x, y, weights):
     """
     Negative log-likelihood for a gaussian ring profile
@@ -13,7 +13,6 @@ from iminuit import Minuit
 from astropy import units as u
 from astropy.constants import alpha
 from ...io.containers import MuonIntensityParameter
-from scipy.stats import norm
 
 import logging
 
@@ -22,6 +21,13 @@ __all__ = ['MuonLineIntegrate']
 logger = logging.getLogger(__name__)
 
 
+def _to_value(value, unit):
+    """ ``value`` in ``unit`` if it is a quantity, else as given """
+    if isinstance(value, u.Quantity):
+        return value.to_value(unit)
+    return value
+
+
 class MuonLineIntegrate:
     """
     Object for calculating the expected 2D shape of muon image for a given
@@ -124,13 +130,16 @@ class MuonLineIntegrate:
         float: length from impact point to mirror edge
 
         """
+        mirror_radius = _to_value(self.mirror_radius, u.m)
+        hole_radius = _to_value(self.hole_radius, u.m)
+
         mirror_length = self.chord_length(
-            self.mirror_radius, r / self.mirror_radius.value, angle
+            mirror_radius, r / mirror_radius, angle
         )
         hole_length = 0 * mirror_length  # .unit
-        if self.hole_radius > 0:
+        if hole_radius > 0:
             hole_length = self.chord_length(
-                self.hole_radius, r / self.hole_radius.value, angle
+                hole_radius, r / hole_radius, angle
             )
 
         if self.sct_flag:
@@ -168,7 +177,8 @@ class MuonLineIntegrate:
             Chord length for each angle
         """
 
-        bins = int((2 * np.pi * radius) / self.pixel_width.value) * self.oversample_bins
+        pixel_width = _to_value(self.pixel_width, u.deg)
+        bins = int((2 * np.pi * radius) / pixel_width) * self.oversample_bins
         # ang = np.linspace(-np.pi * u.rad + phi, np.pi * u.rad + phi, bins)
         ang = np.linspace(-np.pi + phi, np.pi + phi, bins)
         l = self.intersect_circle(impact_parameter, ang)
@@ -231,6 +241,9 @@ class MuonLineIntegrate:
         ndarray:
             Predicted signal
 
+        All parameters are plain numbers, angles in degrees
+        (except ``phi`` in radians) and distances in meters,
+        so no units are handled while fitting.
         """
 
         # First produce angular position of each pixel w.r.t muon centre
@@ -242,20 +255,21 @@ class MuonLineIntegrate:
         ang_prof, profile = self.plot_pos(impact_parameter, radius, phi)
         # Produce gaussian weight for each pixel give ring width
         radial_dist = np.sqrt((pixel_x - centre_x)**2 + (pixel_y - centre_y)**2)
-        gauss = norm.pdf(radial_dist, radius, ring_width)
+        gauss = np.exp(-0.5 * ((radial_dist - radius) / ring_width)**2)
+        gauss /= np.sqrt(2 * np.pi) * ring_width
 
         # interpolate profile to find prediction for each pixel
-        pred = np.interp(ang, ang_prof, profile) * u.m
+        pred = np.interp(ang, ang_prof, profile)
 
         # Multiply by integrated emissivity between 300 and 600 nm
-        photval = self.photemit / u.deg
-        pred *= 0.5 * photval
+        pred *= 0.5 * self.photemit.to_value(1 / u.m)
 
         # weight by pixel width
-        pred *= (self.pixel_width.value / radius)
+        pixel_width = _to_value(self.pixel_width, u.deg)
+        pred *= (pixel_width / radius)
         pred *= np.sin(2 * radius)
         # weight by gaussian width
-        pred *= self.pixel_width.value * gauss
+        pred *= pixel_width * gauss
 
         return pred
 
@@ -298,13 +312,13 @@ class MuonLineIntegrate:
             centre_y,
             radius,
             ring_width,
-            self.pixel_x.value,
-            self.pixel_y.value,
+            self._pixel_x,
+            self._pixel_y,
         )
         # TEST: extra scaling factor, HESS style (ang pix size /2piR)
 
-        scalenpix = self.pixel_width / (2.*np.pi * radius)
-        self.prediction *= scalenpix.value
+        scalenpix = _to_value(self.pixel_width, u.deg) / (2. * np.pi * radius)
+        self.prediction *= scalenpix
 
         # scale prediction by optical efficiency of array
         self.prediction *= optical_efficiency_muon
@@ -335,19 +349,12 @@ class MuonLineIntegrate:
         ndarray: likelihood for each pixel
 
         """
-        #ped = ped * u.deg
-        #image = image * u.deg
-        pred = pred * u.deg
-        sq = 1 / np.sqrt(2 * np.pi * (ped**2 + pred * (1 + spe_width**2) ))
+        variance = ped**2 + pred * (1 + spe_width**2)
+        sq = 1 / np.sqrt(2 * np.pi * variance)
         diff = (image - pred)**2
-        denom = 2 * (ped**2 + pred * (1 + spe_width**2) )
-        expo = np.exp(-diff / denom) * u.m
-        sm = expo < 1e-300 * u.m
-        expo[sm] = 1e-300 * u.m
-
-        log_value = sq * expo / u.m
+        expo = np.maximum(np.exp(-diff / (2 * variance)), 1e-300)
 
-        likelihood_value = -2 * np.log(log_value)
+        likelihood_value = -2 * np.log(sq * expo)
 
         return likelihood_value
 
@@ -375,10 +382,13 @@ class MuonLineIntegrate:
         """
 
         # First store these parameters in the class so we can use them in minimisation
-        self.image = image
+        self.image = np.asanyarray(image, dtype=float)
         self.pixel_x = pixel_x.to(u.deg)
         self.pixel_y = pixel_y.to(u.deg)
         self.unit = pixel_x.unit
+        # plain values used by the likelihood
+        self._pixel_x = self.pixel_x.value
+        self._pixel_y = self.pixel_y.value
 
         radius.to(u.deg)
         centre_x.to(u.deg)
@@ -1,10 +1,11 @@
 import logging
-import warnings
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 from astropy import log
 from astropy import units as u
-from astropy.coordinates import Angle, SkyCoord, AltAz
+from astropy.coordinates import SkyCoord, AltAz
 from astropy.utils.decorators import deprecated
 
 from ctapipe.coordinates import CameraFrame, NominalFrame
@@ -13,12 +14,152 @@ from ctapipe.image.muon.features import ring_containment
 from ctapipe.image.muon.features import ring_completeness
 from ctapipe.image.muon.features import npix_above_threshold
 from ctapipe.image.muon.features import npix_composing_ring
+from ctapipe.image.muon.fitting import kundu_chaudhuri_circle_fit_batch
 from ctapipe.image.muon.muon_integrator import MuonLineIntegrate
 from ctapipe.image.muon.muon_ring_finder import ChaudhuriKunduRingFitter
 
+__all__ = [
+    'analyze_muon_event',
+    'analyze_muon_events',
+    'analyze_muon_source',
+    'fit_muon_rings',
+    'nominal_pixel_coordinates',
+]
+
 logger = logging.getLogger(__name__)
 
 
+# All these options should go to an input card
+muon_cuts = {
+    'Name': ['LST:LSTCam', 'MST:NectarCam', 'MST:FlashCam', 'MST-SCT:SCTCam',
+             '1M:DigiCam', 'GCT:CHEC', 'ASTRI:ASTRICam', 'ASTRI:CHEC'],
+    'tail_cuts': [(5, 7), (5, 7), (10, 12), (5, 7),
+                  (5, 7), (5, 7), (5, 7), (5, 7)],  # 10, 12?
+    'Impact': [(0.2, 0.9), (0.1, 0.95), (0.2, 0.9), (0.2, 0.9),
+               (0.1, 0.95), (0.1, 0.95), (0.1, 0.95), (0.1, 0.95)] * u.m,
+    'RingWidth': [(0.04, 0.08), (0.02, 0.1), (0.01, 0.1), (0.02, 0.1),
+                  (0.01, 0.5), (0.02, 0.2), (0.02, 0.2), (0.02, 0.2)] * u.deg,
+    'total_pix': [1855., 1855., 1764., 11328., 1296., 2048., 2368., 2048],
+    # 8% (or 6%) as limit
+    'min_pix': [148., 148., 141., 680., 104., 164., 142., 164],
+    # Above found from the field of view calculation
+    'CamRad': [2.26, 3.96, 3.87, 4., 4.45, 2.86, 5.25, 2.86] * u.deg,
+    'SecRad': [0. * u.m, 0. * u.m, 0. * u.m, 2.7 * u.m,
+               0. * u.m, 1. * u.m, 1.8 * u.m, 1.8 * u.m],
+    'SCT': [False, False, False, True, False, True, True, True],
+    # Need to either convert from the pixel area in m^2 or check the camera specs
+    'AngPixW': [0.1, 0.2, 0.18, 0.067, 0.24, 0.2, 0.17, 0.2, 0.163] * u.deg,
+    # Found from TDRs (or the pixel area)
+    # Assuming approximately spherical hole
+    'HoleRad': [0.308 * u.m, 0.244 * u.m, 0.244 * u.m,
+                4.3866 * u.m, 0.160 * u.m, 0.130 * u.m,
+                0.171 * u.m, 0.171 * u.m],
+}
+
+# nominal pixel coordinates of the cameras, see nominal_pixel_coordinates
+_nominal_coordinates = {}
+
+
+def nominal_pixel_coordinates(telescope):
+    """
+    Pixel positions of a telescope in the nominal frame
+    centred on its pointing direction.
+
+    They do not depend on the pointing direction itself, so they are only
+    computed once for each camera geometry and focal length.
+
+    Parameters
+    ----------
+    telescope: ctapipe.instrument.TelescopeDescription
+
+    Returns
+    -------
+    x, y: np.ndarray
+        pixel positions in degrees, read-only
+    """
+    geom = telescope.camera
+    focal_length = telescope.optics.equivalent_focal_length
+    key = (
+        geom.cam_id,
+        focal_length.to_value(u.m),
+        geom.pix_rotation.to_value(u.deg),
+        geom.pix_x.to_value(u.m).tobytes(),
+        geom.pix_y.to_value(u.m).tobytes(),
+    )
+
+    coordinates = _nominal_coordinates.get(key)
+    if coordinates is None:
+        telescope_pointing = SkyCoord(alt=70 * u.deg, az=0 * u.deg, frame=AltAz())
+        camera_coord = SkyCoord(
+            x=geom.pix_x, y=geom.pix_y,
+            frame=CameraFrame(
+                focal_length=focal_length,
+                rotation=geom.pix_rotation,
+                telescope_pointing=telescope_pointing,
+            )
+        )
+        nom_coord = camera_coord.transform_to(
+            NominalFrame(origin=telescope_pointing)
+        )
+        coordinates = (
+            nom_coord.delta_az.to_value(u.deg),
+            nom_coord.delta_alt.to_value(u.deg),
+        )
+        for c in coordinates:
+            c.flags.writeable = False
+        _nominal_coordinates[key] = coordinates
+
+    return coordinates
+
+
+def fit_muon_rings(x, y, images):
+    """
+    Fit the muon rings of many cleaned images of the same camera at once.
+
+    The ring is fitted three times, the second and third time only using
+    the pixels closer to the previous ring than 40 % of its radius.
+
+    Parameters
+    ----------
+    x: np.ndarray
+        pixel x positions, shape (n_pixels, )
+    y: np.ndarray
+        pixel y positions, shape (n_pixels, )
+    images: np.ndarray
+        cleaned images, shape (n_images, n_pixels)
+
+    Returns
+    -------
+    radius, center_x, center_y: np.ndarray
+        ring parameters of the final fit, shape (n_images, )
+    dist: np.ndarray
+        distance of the pixels from the ring centre of the second fit,
+        used for the pixel selection of the final fit,
+        shape (n_images, n_pixels)
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        radius, center_x, center_y = kundu_chaudhuri_circle_fit_batch(
+            x, y, images
+        )
+        for _ in range(2):
+            dist = np.sqrt(
+                (x - center_x[:, np.newaxis])**2
+                + (y - center_y[:, np.newaxis])**2
+            )
+            mask = np.abs(dist - radius[:, np.newaxis]) < radius[:, np.newaxis] * 0.4
+            radius, center_x, center_y = kundu_chaudhuri_circle_fit_batch(
+                x, y, images * mask
+            )
+
+    return radius, center_x, center_y, dist
+
+
+def _fit_muon_intensity(args):
+    """ intensity fit of a single ring, run in the worker processes """
+    integrator_kwargs, ring_args = args
+    return MuonLineIntegrate(**integrator_kwargs).fit_muon(*ring_args)
+
+
 def analyze_muon_event(event):
     """
     Generic muon event analyzer.
@@ -34,45 +175,75 @@ def analyze_muon_event(event):
     and MuonIntensityParameter container event
 
     """
+    return next(analyze_muon_events([event]))
 
-    names = ['LST:LSTCam', 'MST:NectarCam', 'MST:FlashCam', 'MST-SCT:SCTCam',
-             '1M:DigiCam', 'GCT:CHEC', 'ASTRI:ASTRICam', 'ASTRI:CHEC']
-    tail_cuts = [(5, 7), (5, 7), (10, 12), (5, 7),
-                (5, 7), (5, 7), (5, 7), (5, 7)]  # 10, 12?
-    impact = [(0.2, 0.9), (0.1, 0.95), (0.2, 0.9), (0.2, 0.9),
-              (0.1, 0.95), (0.1, 0.95), (0.1, 0.95), (0.1, 0.95)] * u.m
-    ringwidth = [(0.04, 0.08), (0.02, 0.1), (0.01, 0.1), (0.02, 0.1),
-                 (0.01, 0.5), (0.02, 0.2), (0.02, 0.2), (0.02, 0.2)] * u.deg
-    total_pix = [1855., 1855., 1764., 11328., 1296., 2048., 2368., 2048]
-    # 8% (or 6%) as limit
-    min_pix = [148., 148., 141., 680., 104., 164., 142., 164]
-    # Need to either convert from the pixel area in m^2 or check the camera specs
-    ang_pixel_width = [0.1, 0.2, 0.18, 0.067, 0.24, 0.2, 0.17, 0.2, 0.163] * u.deg
-    # Found from TDRs (or the pixel area)
-    hole_rad = [0.308 * u.m, 0.244 * u.m, 0.244 * u.m,
-                4.3866 * u.m, 0.160 * u.m, 0.130 * u.m,
-                0.171 * u.m, 0.171 * u.m]  # Assuming approximately spherical hole
-    cam_rad = [2.26, 3.96, 3.87, 4., 4.45, 2.86, 5.25, 2.86] * u.deg
-    # Above found from the field of view calculation
-    sec_rad = [0. * u.m, 0. * u.m, 0. * u.m, 2.7 * u.m,
-               0. * u.m, 1. * u.m, 1.8 * u.m, 1.8 * u.m]
-    sct = [False, False, False, True, False, True, True, True]
-    # Added cleaning here. All these options should go to an input card
-    cleaning = True
-
-    muon_cuts = {'Name': names, 'tail_cuts': tail_cuts, 'Impact': impact,
-                 'RingWidth': ringwidth, 'total_pix': total_pix,
-                 'min_pix': min_pix, 'CamRad': cam_rad, 'SecRad': sec_rad,
-                 'SCT': sct, 'AngPixW': ang_pixel_width, 'HoleRad': hole_rad}
+
+def analyze_muon_events(events, n_workers=1, batch_size=100):
+    """
+    Muon analysis of a stream of events, see `analyze_muon_event`.
+
+    The events are processed in batches of ``batch_size`` events.
+    The rings of all images of the same camera type in a batch are fitted
+    at once and the intensity fits of a batch are distributed over
+    ``n_workers`` worker processes.
+
+    Only the DL1 images and the instrument description are taken from the
+    events, so event sources reusing the same container can be passed.
+
+    Parameters
+    ----------
+    events : iterable
+        calibrated (DL1) event containers
+    n_workers : int
+        number of worker processes for the intensity fits,
+        1 fits in the calling process
+    batch_size : int
+        number of events processed together
+
+    Yields
+    ------
+    muon_event_param : dict
+        result of `analyze_muon_event` for each event, in the same order
+    """
     logger.debug(muon_cuts)
 
-    muonringlist = []  # [None] * len(event.dl0.tels_with_data)
-    muonintensitylist = []  # [None] * len(event.dl0.tels_with_data)
-    tellist = []
-    muon_event_param = {'TelIds': tellist,
-                        'MuonRingParams': muonringlist,
-                        'MuonIntensityParams': muonintensitylist}
+    if n_workers == 1:
+        yield from _analyze_muon_batches(events, batch_size, map)
+        return
+
+    executor = ProcessPoolExecutor(
+        n_workers, mp_context=multiprocessing.get_context('spawn'),
+    )
+    with executor:
+        yield from _analyze_muon_batches(events, batch_size, executor.map)
+
+
+def _analyze_muon_batches(events, batch_size, map_function):
+    batch = []
+    for event in events:
+        batch.append(_muon_candidates(event))
+        if len(batch) == batch_size:
+            yield from _analyze_muon_batch(batch, map_function)
+            batch = []
+    if batch:
+        yield from _analyze_muon_batch(batch, map_function)
+
 
+class _MuonCandidate:
+    """ Cleaned image of a single telescope with its ring fit """
+    __slots__ = (
+        'tel_id', 'obs_id', 'event_id', 'n_tels', 'telescope', 'dict_index',
+        'image', 'clean_image', 'x', 'y', 'ring', 'dist',
+    )
+
+    def __init__(self, **kwargs):
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+
+def _muon_candidates(event):
+    """ Cleaned images of an event that are passed on to the ring fit """
+    candidates = []
     for telid in event.dl0.tels_with_data:
 
         logger.debug("Analysing muon event for tel %d", telid)
@@ -81,7 +252,6 @@ def analyze_muon_event(event):
         # Get geometry
         teldes = event.inst.subarray.tel[telid]
         geom = teldes.camera
-        x, y = geom.pix_x, geom.pix_y
 
         dict_index = muon_cuts['Name'].index(str(teldes))
         logger.debug('found an index of %d for camera %d',
@@ -93,171 +263,206 @@ def analyze_muon_event(event):
         clean_mask = tailcuts_clean(geom, image, picture_thresh=tailcuts[0],
                                     boundary_thresh=tailcuts[1])
 
-        # TODO: correct this hack for values over 90
-        altval = event.mcheader.run_array_direction[1]
-        if altval > Angle(90, unit=u.deg):
-            warnings.warn('Altitude over 90 degrees')
-            altval = Angle(90, unit=u.deg)
-
-        telescope_pointing = SkyCoord(
-            alt=altval,
-            az=event.mcheader.run_array_direction[0],
-            frame=AltAz()
-        )
-        camera_coord = SkyCoord(
-            x=x, y=y,
-            frame=CameraFrame(
-                focal_length=teldes.optics.equivalent_focal_length,
-                rotation=geom.pix_rotation,
-                telescope_pointing=telescope_pointing,
-            )
-        )
-
-        nom_coord = camera_coord.transform_to(
-            NominalFrame(origin=telescope_pointing)
-        )
-        x = nom_coord.delta_az.to(u.deg)
-        y = nom_coord.delta_alt.to(u.deg)
-
-        if(cleaning):
-            img = image * clean_mask
-        else:
-            img = image
-
-        muonring = ChaudhuriKunduRingFitter(None)
+        x, y = nominal_pixel_coordinates(teldes)
+        img = image * clean_mask
 
-        logger.debug("img: %s mask: %s, x=%s y= %s", np.sum(image),
-                     np.sum(clean_mask), x, y)
+        logger.debug("img: %s mask: %s", np.sum(image), np.sum(clean_mask))
 
         if not sum(img):  # Nothing left after tail cuts
             continue
 
-        muonringparam = muonring.fit(x, y, image * clean_mask)
-
-        dist = np.sqrt(np.power(x - muonringparam. ring_center_x, 2)
-                       + np.power(y - muonringparam.ring_center_y, 2))
-        ring_dist = np.abs(dist - muonringparam.ring_radius)
-
-        muonringparam = muonring.fit(
-            x, y, img * (ring_dist < muonringparam.ring_radius * 0.4)
+        candidates.append(_MuonCandidate(
+            tel_id=telid,
+            obs_id=event.dl0.obs_id,
+            event_id=event.dl0.event_id,
+            n_tels=len(event.dl0.tels_with_data),
+            telescope=teldes,
+            dict_index=dict_index,
+            image=image,
+            clean_image=img,
+            x=x,
+            y=y,
+        ))
+    return candidates
+
+
+def _analyze_muon_batch(batch, map_function):
+    # fit the rings of all images with the same pixel coordinates together
+    groups = {}
+    for candidate in (c for candidates in batch for c in candidates):
+        groups.setdefault(id(candidate.x), []).append(candidate)
+
+    for group in groups.values():
+        radius, center_x, center_y, dist = fit_muon_rings(
+            group[0].x, group[0].y,
+            np.array([c.clean_image for c in group]),
         )
+        for i, candidate in enumerate(group):
+            candidate.ring = ChaudhuriKunduRingFitter.ring_parameter(
+                center_x[i] * u.deg, center_y[i] * u.deg, radius[i] * u.deg,
+            )
+            candidate.dist = dist[i] * u.deg
+
+    results = []
+    jobs = []
+    for candidates in batch:
+        tellist = []
+        muonringlist = []
+        muonintensitylist = []
+        results.append({
+            'TelIds': tellist,
+            'MuonRingParams': muonringlist,
+            'MuonIntensityParams': muonintensitylist,
+        })
+        for candidate in candidates:
+            job = _select_ring(candidate)
+            if job is None:
+                continue
+            tellist.append(candidate.tel_id)
+            muonringlist.append(candidate.ring)
+            muonintensitylist.append(None)
+            if job is not True:
+                jobs.append(
+                    (candidate, muonintensitylist, len(muonintensitylist) - 1, job)
+                )
 
-        dist = np.sqrt(np.power(x - muonringparam.ring_center_x, 2) +
-                       np.power(y - muonringparam.ring_center_y, 2))
-        ring_dist = np.abs(dist - muonringparam.ring_radius)
+    fits = map_function(_fit_muon_intensity, [job[-1] for job in jobs])
+    for (candidate, muonintensitylist, idx, _), fit in zip(jobs, fits):
+        muonintensitylist[idx] = _intensity_parameters(candidate, fit)
 
-        muonringparam = muonring.fit(
-            x, y, img * (ring_dist < muonringparam.ring_radius * 0.4)
-        )
+    return results
 
-        muonringparam.tel_id = telid
-        muonringparam.obs_id = event.dl0.obs_id
-        muonringparam.event_id = event.dl0.event_id
-        dist_mask = np.abs(dist - muonringparam.
-                           ring_radius) < muonringparam.ring_radius * 0.4
-        pix_im = image * dist_mask
-        nom_dist = np.sqrt(np.power(muonringparam.ring_center_x,
-                                    2) + np.power(muonringparam.ring_center_y, 2))
-
-        minpix = muon_cuts['min_pix'][dict_index]  # 0.06*numpix #or 8%
-
-        mir_rad = np.sqrt(teldes.optics.mirror_area.to("m2") / np.pi)
-
-        # Camera containment radius -  better than nothing - guess pixel
-        # diameter of 0.11, all cameras are perfectly circular   cam_rad =
-        # np.sqrt(numpix*0.11/(2.*np.pi))
-
-        if(npix_above_threshold(pix_im, tailcuts[0]) > 0.1 * minpix
-           and npix_composing_ring(pix_im) > minpix
-           and nom_dist < muon_cuts['CamRad'][dict_index]
-           and muonringparam.ring_radius < 1.5 * u.deg
-           and muonringparam.ring_radius > 1. * u.deg):
-            muonringparam.ring_containment = ring_containment(
-                muonringparam.ring_radius,
-                muon_cuts['CamRad'][dict_index],
-                muonringparam.ring_center_x,
-                muonringparam.ring_center_y)
-
-            # Guess HESS is 0.16
-            # sec_rad = 0.*u.m
-            # sct = False
-            # if numpix == 2048 and mir_rad > 2.*u.m and mir_rad < 2.1*u.m:
-            #     sec_rad = 1.*u.m
-            #     sct = True
-            #
-            # Store muon ring parameters (passing cuts stage 1)
-            # muonringlist[idx] = muonringparam
-
-            tellist.append(telid)
-            muonringlist.append(muonringparam)
-            muonintensitylist.append(None)
 
-            ctel = MuonLineIntegrate(
-                mir_rad, hole_radius=muon_cuts['HoleRad'][dict_index],
-                pixel_width=muon_cuts['AngPixW'][dict_index],
-                sct_flag=muon_cuts['SCT'][dict_index],
-                secondary_radius=muon_cuts['SecRad'][dict_index]
-            )
+def _select_ring(candidate):
+    """
+    Apply the ring cuts to a fitted candidate.
 
-            if image.shape[0] == muon_cuts['total_pix'][dict_index]:
-                muonintensityoutput = ctel.fit_muon(muonringparam.ring_center_x,
-                                                    muonringparam.ring_center_y,
-                                                    muonringparam.ring_radius,
-                                                    x[dist_mask], y[dist_mask],
-                                                    image[dist_mask])
-
-                muonintensityoutput.tel_id = telid
-                muonintensityoutput.obs_id = event.dl0.obs_id
-                muonintensityoutput.event_id = event.dl0.event_id
-                muonintensityoutput.mask = dist_mask
-
-                idx_ring = np.nonzero(pix_im)
-                muonintensityoutput.ring_completeness = ring_completeness(
-                    x[idx_ring], y[idx_ring], pix_im[idx_ring],
-                    muonringparam.ring_radius,
-                    muonringparam.ring_center_x,
-                    muonringparam.ring_center_y,
-                    threshold=30,
-                    bins=30)
-                muonintensityoutput.ring_size = np.sum(pix_im)
-
-                dist_ringwidth_mask = np.abs(dist - muonringparam.ring_radius
-                                             ) < (muonintensityoutput.ring_width)
-                pix_ringwidth_im = image * dist_ringwidth_mask
-                idx_ringwidth = np.nonzero(pix_ringwidth_im)
-
-                muonintensityoutput.ring_pix_completeness = npix_above_threshold(
-                    pix_ringwidth_im[idx_ringwidth], tailcuts[0]) / len(
-                    pix_im[idx_ringwidth])
-
-                logger.debug("Tel %d Impact parameter = %s mir_rad=%s "
-                             "ring_width=%s", telid,
-                             muonintensityoutput.impact_parameter, mir_rad,
-                             muonintensityoutput.ring_width)
-                conditions = [
-                    muonintensityoutput.impact_parameter * u.m <
-                    muon_cuts['Impact'][dict_index][1] * mir_rad,
-
-                    muonintensityoutput.impact_parameter
-                    > muon_cuts['Impact'][dict_index][0],
-
-                    muonintensityoutput.ring_width
-                    < muon_cuts['RingWidth'][dict_index][1],
-
-                    muonintensityoutput.ring_width
-                    > muon_cuts['RingWidth'][dict_index][0]
-                ]
-
-                if all(conditions):
-                    muonintensityparam = muonintensityoutput
-                    idx = tellist.index(telid)
-                    muonintensitylist[idx] = muonintensityparam
-                    logger.debug("Muon found in tel %d,  tels in event=%d",
-                                 telid, len(event.dl0.tels_with_data))
-                else:
-                    continue
-
-    return muon_event_param
+    Returns None if the ring does not pass, the arguments of
+    `_fit_muon_intensity` if the intensity is to be fitted
+    and True otherwise.
+    """
+    dict_index = candidate.dict_index
+    muonringparam = candidate.ring
+    muonringparam.tel_id = candidate.tel_id
+    muonringparam.obs_id = candidate.obs_id
+    muonringparam.event_id = candidate.event_id
+
+    image = candidate.image
+    dist = candidate.dist
+    dist_mask = np.abs(dist - muonringparam.
+                       ring_radius) < muonringparam.ring_radius * 0.4
+    pix_im = image * dist_mask
+    nom_dist = np.sqrt(np.power(muonringparam.ring_center_x,
+                                2) + np.power(muonringparam.ring_center_y, 2))
+
+    minpix = muon_cuts['min_pix'][dict_index]  # 0.06*numpix #or 8%
+    tailcuts = muon_cuts['tail_cuts'][dict_index]
+
+    # Camera containment radius -  better than nothing - guess pixel
+    # diameter of 0.11, all cameras are perfectly circular   cam_rad =
+    # np.sqrt(numpix*0.11/(2.*np.pi))
+
+    if not (npix_above_threshold(pix_im, tailcuts[0]) > 0.1 * minpix
+            and npix_composing_ring(pix_im) > minpix
+            and nom_dist < muon_cuts['CamRad'][dict_index]
+            and muonringparam.ring_radius < 1.5 * u.deg
+            and muonringparam.ring_radius > 1. * u.deg):
+        return None
+
+    muonringparam.ring_containment = ring_containment(
+        muonringparam.ring_radius,
+        muon_cuts['CamRad'][dict_index],
+        muonringparam.ring_center_x,
+        muonringparam.ring_center_y)
+
+    if image.shape[0] != muon_cuts['total_pix'][dict_index]:
+        return True
+
+    mir_rad = np.sqrt(candidate.telescope.optics.mirror_area.to("m2") / np.pi)
+    integrator_kwargs = dict(
+        mirror_radius=mir_rad,
+        hole_radius=muon_cuts['HoleRad'][dict_index],
+        pixel_width=muon_cuts['AngPixW'][dict_index],
+        sct_flag=muon_cuts['SCT'][dict_index],
+        secondary_radius=muon_cuts['SecRad'][dict_index],
+    )
+    x = candidate.x * u.deg
+    y = candidate.y * u.deg
+    ring_args = (
+        muonringparam.ring_center_x,
+        muonringparam.ring_center_y,
+        muonringparam.ring_radius,
+        x[dist_mask], y[dist_mask],
+        image[dist_mask],
+    )
+    return integrator_kwargs, ring_args
+
+
+def _intensity_parameters(candidate, muonintensityoutput):
+    """
+    Complete the intensity fit result of a candidate,
+    None if it does not pass the cuts.
+    """
+    telid = candidate.tel_id
+    dict_index = candidate.dict_index
+    muonringparam = candidate.ring
+    image = candidate.image
+    dist = candidate.dist
+
+    dist_mask = np.abs(dist - muonringparam.
+                       ring_radius) < muonringparam.ring_radius * 0.4
+    pix_im = image * dist_mask
+    tailcuts = muon_cuts['tail_cuts'][dict_index]
+    mir_rad = np.sqrt(candidate.telescope.optics.mirror_area.to("m2") / np.pi)
+
+    muonintensityoutput.tel_id = telid
+    muonintensityoutput.obs_id = candidate.obs_id
+    muonintensityoutput.event_id = candidate.event_id
+    muonintensityoutput.mask = dist_mask
+
+    idx_ring = np.nonzero(pix_im)
+    muonintensityoutput.ring_completeness = ring_completeness(
+        candidate.x[idx_ring], candidate.y[idx_ring], pix_im[idx_ring],
+        muonringparam.ring_radius.to_value(u.deg),
+        muonringparam.ring_center_x.to_value(u.deg),
+        muonringparam.ring_center_y.to_value(u.deg),
+        threshold=30,
+        bins=30)
+    muonintensityoutput.ring_size = np.sum(pix_im)
+
+    dist_ringwidth_mask = np.abs(dist - muonringparam.ring_radius
+                                 ) < (muonintensityoutput.ring_width)
+    pix_ringwidth_im = image * dist_ringwidth_mask
+    idx_ringwidth = np.nonzero(pix_ringwidth_im)
+
+    muonintensityoutput.ring_pix_completeness = npix_above_threshold(
+        pix_ringwidth_im[idx_ringwidth], tailcuts[0]) / len(
+        pix_im[idx_ringwidth])
+
+    logger.debug("Tel %d Impact parameter = %s mir_rad=%s "
+                 "ring_width=%s", telid,
+                 muonintensityoutput.impact_parameter, mir_rad,
+                 muonintensityoutput.ring_width)
+    conditions = [
+        muonintensityoutput.impact_parameter * u.m <
+        muon_cuts['Impact'][dict_index][1] * mir_rad,
+
+        muonintensityoutput.impact_parameter
+        > muon_cuts['Impact'][dict_index][0],
+
+        muonintensityoutput.ring_width
+        < muon_cuts['RingWidth'][dict_index][1],
+
+        muonintensityoutput.ring_width
+        > muon_cuts['RingWidth'][dict_index][0]
+    ]
+
+    if not all(conditions):
+        return None
+
+    logger.debug("Muon found in tel %d,  tels in event=%d",
+                 telid, candidate.n_tels)
+    return muonintensityoutput
 
 
 @deprecated('0.6')
@@ -59,6 +59,28 @@ class ChaudhuriKunduRingFitter(RingFitter):
             sum_weight
         )
 
+        return self.ring_parameter(centre_x, centre_y, radius)
+
+    @staticmethod
+    def ring_parameter(centre_x, centre_y, radius):
+        """
+        Fill a `~ctapipe.io.containers.MuonRingParameter` from
+        the fitted circle, e.g. as computed by
+        `~ctapipe.image.muon.kundu_chaudhuri_circle_fit_batch`.
+
+        Parameters
+        ----------
+        centre_x: astropy.units.Quantity
+            X position of the circle centre
+        centre_y: astropy.units.Quantity
+            Y position of the circle centre
+        radius: astropy.units.Quantity
+            radius of the circle
+
+        Returns
+        -------
+        MuonRingParameter
+        """
         output = MuonRingParameter()
         output.ring_center_x = centre_x  # *u.deg
         output.ring_center_y = centre_y  # *u.deg
@@ -1,7 +1,10 @@
 import numpy as np
 import astropy.units as u
 
-from ctapipe.image.muon import kundu_chaudhuri_circle_fit
+from ctapipe.image.muon import (
+    kundu_chaudhuri_circle_fit,
+    kundu_chaudhuri_circle_fit_batch,
+)
 
 np.random.seed(0)
 
@@ -28,6 +31,18 @@ def test_kundu_chaudhuri():
         assert np.isclose(fit_radius, radius)
 
 
+def test_kundu_chaudhuri_batch():
+    x, y = np.random.uniform(-2, 2, (2, 500))
+    weights = np.random.exponential(1, (8, 500))
+
+    radius, center_x, center_y = kundu_chaudhuri_circle_fit_batch(x, y, weights)
+    assert radius.shape == (8, )
+
+    for i in range(len(weights)):
+        expected = kundu_chaudhuri_circle_fit(x, y, weights[i])
+        assert np.allclose(expected, (radius[i], center_x[i], center_y[i]))
+
+
 def test_kundu_chaudhuri_with_units():
 
     center_x = 0.5 * u.meter
@@ -11,5 +11,22 @@ def test_chord_length():
     chord_length = muon_integrator.MuonLineIntegrate.chord_length(radius, rho, phi)
     assert(chord_length is not np.nan)
 
+
+def test_likelihood_without_units():
+    integrator = muon_integrator.MuonLineIntegrate(
+        6.5 * u.m, 0.5 * u.m, pixel_width=0.1 * u.deg
+    )
+    phi = np.linspace(0, 2 * np.pi, 200, endpoint=False)
+    integrator.image = np.full(len(phi), 5.0)
+    integrator._pixel_x = 1.2 * np.cos(phi)
+    integrator._pixel_y = 1.2 * np.sin(phi)
+
+    likelihood = integrator.likelihood(4., 0., 0., 0., 1.2, 0.05, 0.1)
+    assert np.isfinite(likelihood)
+    assert not isinstance(likelihood, u.Quantity)
+    assert not isinstance(integrator.prediction, u.Quantity)
+    assert np.all(integrator.prediction >= 0)
+
+
 if __name__ == '__main__':
     test_chord_length()
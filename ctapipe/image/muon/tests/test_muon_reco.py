@@ -1,3 +1,5 @@
+import numpy as np
+
 from ctapipe.calib import CameraCalibrator
 from ctapipe.image.muon import muon_reco_functions as muon
 
@@ -19,3 +21,20 @@ def test_basic_muon_reco(example_event):
 
     muon_params = muon.analyze_muon_event(example_event)
     assert muon_params is not None
+
+
+def test_fit_muon_rings():
+    rng = np.random.RandomState(0)
+    x, y = rng.uniform(-3, 3, (2, 2000))
+
+    centers = rng.uniform(-0.5, 0.5, (5, 2))
+    radii = rng.uniform(1, 1.5, 5)
+    dist = np.hypot(x - centers[:, [0]], y - centers[:, [1]])
+    images = 50 * np.exp(-0.5 * ((dist - radii[:, np.newaxis]) / 0.05)**2)
+    # light far from the rings is removed by the iterations
+    images[:, np.flatnonzero(np.hypot(x, y) > 2.8)[:10]] += 5
+
+    radius, center_x, center_y, _ = muon.fit_muon_rings(x, y, images)
+    assert np.allclose(radius, radii, rtol=0.02)
+    assert np.allclose(center_x, centers[:, 0], atol=0.02)
+    assert np.allclose(center_y, centers[:, 1], atol=0.02)
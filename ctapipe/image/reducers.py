@@ -41,6 +41,8 @@ class DataVolumeReducer(Component):
 
     """
 
+    profiled_methods = ('reduce_waveforms', )
+
     def __init__(self, config=None, parent=None, **kwargs):
         super().__init__(config=config, parent=parent, **kwargs)
 
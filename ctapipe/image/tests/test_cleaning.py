@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 from numpy.testing import assert_allclose
 from ctapipe.image import cleaning
 from ctapipe.instrument import CameraGeometry
@@ -196,3 +197,158 @@ def test_fact_image_cleaning():
     expected_mask = np.zeros(len(geom)).astype(bool)
     expected_mask[expected_pixels] = 1
     assert_allclose(mask, expected_mask)
+
+
+def test_neighbor_cleaner_tailcuts():
+    """ the compiled kernels must give the same results as tailcuts_clean """
+    geom = CameraGeometry.from_name("LSTCam")
+    cleaner = cleaning.NeighborCleaner(geom)
+
+    np.random.seed(0)
+    images = np.random.exponential(3, size=(10, geom.n_pixels))
+
+    for keep_isolated_pixels in (False, True):
+        for min_neighbors in (0, 1, 2):
+            kwargs = dict(
+                picture_thresh=10,
+                boundary_thresh=5,
+                keep_isolated_pixels=keep_isolated_pixels,
+                min_number_picture_neighbors=min_neighbors,
+            )
+            expected = np.array([
+                cleaning.tailcuts_clean(geom, image, **kwargs)
+                for image in images
+            ])
+
+            assert np.all(cleaner.tailcuts_clean(images, **kwargs) == expected)
+            assert np.all(cleaner.tailcuts_clean(images[0], **kwargs) == expected[0])
+
+    # per pixel thresholds and output buffer
+    out = np.empty(images.shape, dtype=bool)
+    picture_thresh = np.full(geom.n_pixels, 10.0)
+    result = cleaner.tailcuts_clean(images, picture_thresh, 5, out=out)
+    assert result is out
+    for image, mask in zip(images, out):
+        assert np.all(mask == cleaning.tailcuts_clean(geom, image, 10, 5))
+
+    with pytest.raises(ValueError):
+        cleaner.tailcuts_clean(images, out=np.empty(geom.n_pixels, dtype=bool))
+
+
+def test_neighbor_cleaner_simple_camera():
+    geom = CameraGeometry.make_rectangular(3, 1, (-1, 1))
+    cleaner = cleaning.NeighborCleaner(geom)
+
+    p = 15  # picture value
+    b = 7  # boundary value
+    images = np.array([(p, p, 0), (p, 0, p), (p, b, p), (0, p, 0)])
+
+    masks = cleaner.tailcuts_clean(images, 15, 5)
+    assert_allclose(masks, [
+        [True, True, False],
+        [False, False, False],
+        [True, True, True],
+        [False, False, False],
+    ])
+
+    masks = cleaner.tailcuts_clean(images, 15, 5, min_number_picture_neighbors=1)
+    assert_allclose(masks, [
+        [True, True, False],
+        [False, False, False],
+        [False, False, False],
+        [False, False, False],
+    ])
+
+
+def test_neighbor_cleaner_dilate():
+    geom = CameraGeometry.from_name("LSTCam")
+    cleaner = cleaning.NeighborCleaner(geom)
+
+    masks = np.zeros((2, geom.n_pixels), dtype=bool)
+    masks[0, 100] = True
+    # second mask is left empty
+
+    out = np.empty_like(masks)
+    cleaner.dilate(masks, out=out)
+    for mask, dilated in zip(masks, out):
+        assert np.all(dilated == cleaning.dilate(geom, mask))
+
+    counts = cleaner.number_of_neighbors(out)
+    assert counts[0, 100] == 6
+    for mask, count in zip(out, counts):
+        assert np.all(count == geom.neighbor_matrix_sparse.dot(mask.view(np.byte)))
+
+    # the central pixels are the only ones with all neighbors selected
+    assert np.all(cleaner.min_neighbors(out, 6) == masks)
+
+
+def test_neighbor_cleaner_time_delta():
+    geom = CameraGeometry.from_name("LSTCam")
+    cleaner = cleaning.NeighborCleaner(geom)
+
+    np.random.seed(1)
+    masks = np.random.uniform(size=(5, geom.n_pixels)) > 0.5
+    times = np.random.uniform(0, 10, size=(5, geom.n_pixels))
+
+    result = cleaner.time_delta_cleaning(masks, times, 2, 3)
+    for mask, time, cleaned in zip(masks, times, result):
+        expected = cleaning.apply_time_delta_cleaning(geom, mask.copy(), time, 2, 3)
+        assert np.all(cleaned == expected)
+
+
+def test_island_finder():
+    geom = CameraGeometry.from_name("LSTCam")
+    finder = cleaning.IslandFinder(geom)
+
+    np.random.seed(2)
+    masks = np.random.uniform(size=(10, geom.n_pixels)) > 0.7
+    masks[0] = False
+    images = np.random.uniform(0, 10, size=masks.shape)
+
+    n_islands, labels, sizes, intensities = finder.label(masks, images)
+    assert n_islands[0] == 0
+    assert sizes.shape == intensities.shape == (10, n_islands.max() + 1)
+
+    for mask, image, n, label, size, intensity in zip(
+            masks, images, n_islands, labels, sizes, intensities
+    ):
+        expected_n, expected_labels = cleaning.number_of_islands(geom, mask)
+        assert n == expected_n
+        assert_allclose(label, expected_labels)
+
+        for island in range(1, n + 1):
+            assert size[island] == np.count_nonzero(label == island)
+            assert intensity[island] == pytest.approx(image[label == island].sum())
+        assert np.all(size[n + 1:] == 0)
+
+    # single mask
+    n, label, size, intensity = finder.label(masks[1], images[1])
+    assert n == n_islands[1]
+    assert_allclose(label, labels[1])
+    assert_allclose(size, sizes[1, :n + 1])
+
+
+def test_island_finder_largest_island():
+    geom = CameraGeometry.from_name("LSTCam")
+    finder = cleaning.IslandFinder(geom)
+
+    masks = np.zeros((3, geom.n_pixels), dtype=bool)
+    images = np.zeros(masks.shape)
+
+    # two islands: a bright single pixel and a faint island of 7 pixels
+    big_island = cleaning.dilate(geom, np.arange(geom.n_pixels) == 100)
+    masks[1:, big_island] = True
+    masks[1:, 1500] = True
+    images[1:, big_island] = 1
+    images[1:, 1500] = 100
+    assert finder.label(masks[1])[0] == 2
+
+    largest = finder.largest_island(masks, images, by='size')
+    assert not largest[0].any()
+    assert np.all(largest[1] == big_island)
+
+    largest = finder.largest_island(masks, images, by='intensity')
+    assert np.flatnonzero(largest[1]).tolist() == [1500]
+
+    with pytest.raises(ValueError):
+        finder.largest_island(masks, by='intensity')
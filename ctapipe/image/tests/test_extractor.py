@@ -246,3 +246,47 @@ def test_waveform_extractor_factory_args():
             'FullWaveformSum',
             config=config,
         )
+
+
+@pytest.mark.parametrize('name', [
+    'FullWaveformSum',
+    'FixedWindowSum',
+    'GlobalPeakWindowSum',
+    'LocalPeakWindowSum',
+    'NeighborPeakWindowSum',
+    'BaselineSubtractedNeighborPeakWindowSum',
+])
+def test_extract_batch(camera_waveforms, name):
+    waveforms, camera = camera_waveforms
+    extractor = ImageExtractor.from_name(name)
+    extractor.neighbors = camera.neighbor_matrix_where
+
+    stacked = np.stack([waveforms, 2 * waveforms, waveforms[::-1]])
+    charge = np.empty(stacked.shape[:-1])
+    pulse_time = np.empty(stacked.shape[:-1])
+    result = extractor.extract_batch(stacked, charge, pulse_time)
+    assert result[0] is charge
+    assert result[1] is pulse_time
+
+    for tel, tel_waveforms in enumerate(stacked):
+        tel_charge, tel_pulse_time = extractor(tel_waveforms)
+        assert_allclose(charge[tel], tel_charge)
+        assert_allclose(pulse_time[tel], tel_pulse_time)
+
+    with pytest.raises(ValueError):
+        extractor.extract_batch(stacked, charge[:2], pulse_time)
+
+
+def test_neighbor_peak_matches_average_waveform(camera_waveforms):
+    waveforms, camera = camera_waveforms
+    neighbors = camera.neighbor_matrix_where
+    extractor = NeighborPeakWindowSum(lwt=1)
+    extractor.neighbors = neighbors
+
+    peak_index = neighbor_average_waveform(waveforms, neighbors, 1).argmax(2)
+    charge, pulse_time = extractor(waveforms)
+
+    assert_allclose(charge, sum_samples_around_peak(waveforms, peak_index, 7, 3))
+    assert_allclose(
+        pulse_time, extract_pulse_time_around_peak(waveforms, peak_index, 7, 3)
+    )
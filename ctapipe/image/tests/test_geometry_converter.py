@@ -1,6 +1,8 @@
 import pytest
 import numpy as np
-from ctapipe.image.geometry_converter import (convert_geometry_hex1d_to_rect2d,
+from ctapipe.image.geometry_converter import (ResamplingPlan,
+                                              get_resampling_plan,
+                                              convert_geometry_hex1d_to_rect2d,
                                               convert_geometry_rect2d_back_to_hexe1d,
                                               astri_to_2d_array, array_2d_to_astri,
                                               chec_to_2d_array, array_2d_to_chec)
@@ -108,6 +110,94 @@ def test_convert_geometry_mock(cam_id, rot):
     assert np.abs(hillas_1.phi - hillas_0.phi).deg < 1.0
 
 
+def test_resampling_plan_batch():
+    geom = CameraGeometry.from_name('LSTCam')
+    plan = ResamplingPlan.from_geometry(geom, add_rot=3)
+    n_rows, n_cols = plan.shape
+    assert plan.mask.sum() == geom.n_pixels
+
+    rng = np.random.RandomState(0)
+    images = rng.uniform(size=(5, geom.n_pixels)).astype(np.float32)
+    rect = plan.to_rect(images)
+    assert rect.shape == (5, n_rows, n_cols)
+    assert rect.dtype == np.float32
+    assert np.all(np.isnan(rect[:, ~plan.mask]))
+    assert np.array_equal(plan.to_hex(rect), images)
+
+    # same result as the single image conversion
+    _, image2d = convert_geometry_hex1d_to_rect2d(geom, images[2], add_rot=3)
+    np.testing.assert_array_equal(image2d, rect[2])
+
+    # waveforms, with the pixels along the second to last axis
+    waveforms = rng.randint(0, 100, size=(3, geom.n_pixels, 4))
+    cube = plan.to_rect(waveforms, pixel_axis=-2, fill_value=-1)
+    assert cube.shape == (3, n_rows, n_cols, 4)
+    assert cube.dtype == waveforms.dtype
+    assert np.all(cube[:, ~plan.mask] == -1)
+    assert np.array_equal(plan.to_hex(cube, pixel_axis=-2), waveforms)
+
+    out = np.empty_like(cube)
+    assert plan.to_rect(waveforms, pixel_axis=-2, fill_value=-1, out=out) is out
+    assert np.array_equal(out, cube)
+
+    with pytest.raises(ValueError):
+        plan.to_rect(images, pixel_axis=0)
+
+
+def test_resampling_plan_hex_grid():
+    """ a hexagonal camera is resampled to a square grid without empty columns """
+    n_rings = 20
+    q, r = np.meshgrid(np.arange(-n_rings, n_rings + 1),
+                       np.arange(-n_rings, n_rings + 1))
+    in_camera = np.abs(q + r) <= n_rings
+    q, r = q[in_camera], r[in_camera]
+    pix_x = u.Quantity((q + r / 2) * 0.05, u.m)
+    pix_y = u.Quantity(r * np.sqrt(3) / 2 * 0.05, u.m)
+    geom = CameraGeometry('HexTest', np.arange(len(pix_x)), pix_x, pix_y,
+                          np.full(len(pix_x), 0.002) * u.m**2,
+                          pix_type='hexagonal')
+    assert geom.n_pixels == 1261
+
+    plan = ResamplingPlan.from_geometry(geom)
+    assert plan.shape == (2 * n_rings + 1, 2 * n_rings + 1)
+    assert plan.mask.sum() == geom.n_pixels
+    assert np.all(plan.mask.any(axis=0))
+    assert np.all(plan.mask.any(axis=1))
+
+    _, image2d = convert_geometry_hex1d_to_rect2d(geom, np.ones(geom.n_pixels))
+    assert image2d.shape == plan.shape
+
+
+def test_resampling_plan_write_read(tmpdir):
+    geom = CameraGeometry.from_name('NectarCam')
+    plan = ResamplingPlan.from_geometry(geom)
+
+    path = str(tmpdir.join('plan.npz'))
+    plan.write(path)
+    loaded = ResamplingPlan.read(path)
+
+    assert loaded.cam_id == 'NectarCam'
+    assert np.array_equal(loaded.rect_index, plan.rect_index)
+    image = np.arange(geom.n_pixels)
+    np.testing.assert_array_equal(loaded.to_rect(image), plan.to_rect(image))
+
+
+def test_resampling_plan_cache():
+    from ctapipe.image import geometry_converter_hex
+
+    cache = geometry_converter_hex.resampling_plans
+    cache.clear()
+    geom = CameraGeometry.from_name('FlashCam')
+
+    plan = get_resampling_plan(geom)
+    assert get_resampling_plan(geom) is plan
+    assert get_resampling_plan(geom, add_rot=1) is not plan
+
+    for add_rot in range(cache.maxsize + 1):
+        get_resampling_plan(geom, add_rot=add_rot)
+    assert len(cache) == cache.maxsize
+
+
 # def plot_cam(geom, geom2d, geom1d, image, image2d, image1d):
 #     # plt.viridis()
 #     plt.figure(figsize=(12, 4))
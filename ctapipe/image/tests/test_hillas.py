@@ -1,6 +1,10 @@
 from ctapipe.instrument import CameraGeometry
 from ctapipe.image import tailcuts_clean, toymodel
-from ctapipe.image.hillas import hillas_parameters, HillasParameterizationError
+from ctapipe.image.hillas import (
+    hillas_parameters,
+    hillas_parameters_batch,
+    HillasParameterizationError,
+)
 from ctapipe.io.containers import HillasParametersContainer
 from astropy.coordinates import Angle
 from astropy import units as u
@@ -207,3 +211,54 @@ def test_skewness():
             assert result.skewness == approx(-skew, abs=0.3)
 
         assert signal.sum() == result.intensity
+
+
+def test_hillas_batch():
+    """
+    the batched version must give the same results as the single image one
+    """
+    np.random.seed(0)
+    geom = CameraGeometry.from_name('LSTCam')
+
+    images = []
+    masks = []
+    for psi in ['-60d', '-30d', '0d', '45d', '90d']:
+        model = toymodel.SkewedGaussian(
+            x=0.3 * u.m, y=-0.2 * u.m,
+            width=0.03 * u.m, length=0.15 * u.m,
+            psi=psi, skewness=0.3,
+        )
+        image, _, _ = model.generate_image(
+            geom, intensity=1000, nsb_level_pe=5,
+        )
+        images.append(image)
+        masks.append(tailcuts_clean(geom, image, 10, 5))
+
+    table = hillas_parameters_batch(geom, np.array(images), np.array(masks))
+    assert len(table) == len(images)
+
+    for row, image, mask in zip(table, images, masks):
+        expected = hillas_parameters(geom[mask], image[mask])
+
+        assert row['intensity'] == approx(expected.intensity)
+        for key in ['x', 'y', 'r', 'length', 'width']:
+            assert quantity_approx(row[key], expected[key], rel=1e-7)
+        for key in ['phi', 'psi']:
+            assert quantity_approx(row[key], expected[key].to(u.rad), abs=1e-9)
+        for key in ['skewness', 'kurtosis']:
+            assert row[key] == approx(expected[key], rel=1e-6)
+
+
+def test_hillas_batch_empty_image():
+    geom, image, clean_mask = create_sample_image()
+
+    images = np.array([image, np.zeros_like(image)])
+    table = hillas_parameters_batch(geom, images)
+
+    assert np.isfinite(table['length'][0])
+    assert table['intensity'][1] == 0
+    assert np.isnan(table['length'][1])
+    assert np.isnan(table['psi'][1])
+
+    with pytest.raises(ValueError):
+        hillas_parameters_batch(geom, image)
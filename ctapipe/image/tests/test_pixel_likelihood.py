@@ -1,5 +1,15 @@
 import numpy as np
-from ctapipe.image import poisson_likelihood_full, poisson_likelihood_gaussian
+import pytest
+from ctapipe.image import (
+    poisson_likelihood_full,
+    poisson_likelihood_gaussian,
+    poisson_likelihood_exact,
+    mean_poisson_likelihood_exact,
+    mean_poisson_likelihood_gaussian,
+    PoissonLikelihoodTable,
+    poisson_likelihood_table,
+    mean_poisson_likelihood_table,
+)
 
 
 def test_full_likelihood():
@@ -41,3 +51,85 @@ def test_full_likelihood():
     # gaussian approximation (to 5%)
     assert np.all(np.abs((full_like_large - gaus_like_large) / full_like_large)
                   < 0.05)
+
+
+def test_exact_likelihood():
+    """
+    Test the exact likelihood against known values and
+    check that the mean is normalised and approaches the gaussian one.
+    """
+    spe = 0.5
+    pedestal = 1
+
+    like = poisson_likelihood_exact([0, 1, 2], [1, 1, 1], spe, pedestal)
+    assert np.allclose(like, [2.75630505, 2.62168656, 3.39248449], rtol=1e-6)
+
+    like = poisson_likelihood_exact([40, 50, 60], [50, 50, 50], spe, pedestal)
+    assert np.allclose(like, [7.45489137, 5.99305388, 7.66226007], rtol=1e-6)
+
+    # far beyond the range of poisson_likelihood_full
+    like = poisson_likelihood_exact(3000, 3000, spe, pedestal)
+    gaus_like = poisson_likelihood_gaussian(3000, 3000, spe, pedestal)
+    assert np.isfinite(like)
+    assert np.isclose(like, gaus_like, rtol=1e-3)
+
+    # the mean of the likelihood of a normal distribution of width w
+    # is 1 + ln(2 pi w^2)
+    mean_like = mean_poisson_likelihood_exact(0, spe, pedestal)
+    assert np.isclose(mean_like, 1 + np.log(2 * np.pi))
+
+    mean_like = mean_poisson_likelihood_exact(1000, spe, pedestal)
+    gaus_mean_like = mean_poisson_likelihood_gaussian(1000, spe, pedestal)
+    assert np.isclose(mean_like, gaus_mean_like, rtol=1e-3)
+
+
+def test_likelihood_table():
+    """ Test the interpolated likelihood against the exact one """
+    spe = 0.5
+    pedestal = 1
+    table = PoissonLikelihoodTable(
+        spe, pedestal, max_prediction=20, max_signal=30
+    )
+
+    rng = np.random.RandomState(0)
+    prediction = rng.uniform(0, 25, 1000)
+    width = np.sqrt(pedestal**2 + prediction * (1 + spe**2))
+    image = prediction + width * rng.normal(size=1000)
+
+    like = table.likelihood(image, prediction)
+    exact = poisson_likelihood_exact(image, prediction, spe, pedestal)
+    assert np.allclose(like, exact, atol=1e-2)
+
+    mean_like = table.mean_likelihood(prediction)
+    exact = mean_poisson_likelihood_exact(prediction, spe, pedestal)
+    inside = prediction <= table.max_prediction
+    assert np.allclose(mean_like[inside], exact[inside], atol=1e-3)
+    # gaussian approximation above the table
+    assert np.allclose(mean_like[~inside], exact[~inside], atol=2e-2)
+
+    with pytest.raises(ValueError):
+        PoissonLikelihoodTable(spe, 0)
+
+
+def test_likelihood_table_batch():
+    """ Test the batch functions with pixels of different pedestal widths """
+    options = dict(max_prediction=10, max_signal=10)
+    ped = np.array([1.0, 2.8])
+    image = np.array([[0, 1, 2], [5, 10, 100]])
+    prediction = np.array([[1, 1, 1], [4, 8, 80]])
+
+    like = poisson_likelihood_table(
+        image, prediction, 0.5, ped[:, np.newaxis], **options
+    )
+    assert like.shape == (2, 3)
+    for i in range(2):
+        single = poisson_likelihood_table(image[i], prediction[i], 0.5, ped[i], **options)
+        assert np.all(like[i] == single)
+        exact = poisson_likelihood_exact(image[i], prediction[i], 0.5, ped[i])
+        assert np.allclose(like[i], exact, atol=1e-2)
+
+    mean_like = mean_poisson_likelihood_table(
+        prediction, 0.5, ped[:, np.newaxis], **options
+    )
+    exact = mean_poisson_likelihood_exact(prediction, 0.5, ped[:, np.newaxis])
+    assert np.allclose(mean_like, exact, atol=1e-2)
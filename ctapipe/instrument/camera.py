@@ -2,7 +2,9 @@
 """
 Utilities for reading or working with Camera geometry files
 """
+import hashlib
 import logging
+import os
 
 import numpy as np
 from astropy import units as u
@@ -38,8 +40,13 @@ class CameraGeometry:
     You can construct a CameraGeometry either by specifying all data,
     or using the `CameraGeometry.guess()` constructor, which takes metadata
     like the pixel positions and telescope focal length to look up the rest
-    of the data. Note that this function is memoized, so calling it multiple
-    times with the same inputs will give back the same object (for speed).
+    of the data.
+
+    Geometries loaded with `CameraGeometry.from_name` or passed to
+    `CameraGeometry.register` share their derived structures (neighbor matrix
+    and border masks) with all identical geometries, so these are only
+    computed once per process. If `CameraGeometry.disk_cache_dir` is set, the
+    neighbor matrices are also stored there and reused by later processes.
 
     Parameters
     ----------
@@ -64,7 +71,14 @@ class CameraGeometry:
     cam_rotation: overall camera rotation with units
     """
 
-    _geometry_cache = {}  # dictionary CameraGeometry instances for speed
+    _geometry_cache = {}  # registered CameraGeometry instances, see register
+    _name_cache = {}  # CameraGeometry instances loaded by from_name
+
+    #: directory to store the neighbor matrices of camera geometries in,
+    #: so they are only computed once. Disabled if None, defaults to the
+    #: ``CTAPIPE_GEOMETRY_CACHE`` environment variable.
+    disk_cache_dir = os.getenv('CTAPIPE_GEOMETRY_CACHE')
+    _disk_cache_version = 1
 
     def __init__(self, cam_id, pix_id, pix_x, pix_y, pix_area, pix_type,
                  pix_rotation="0d", cam_rotation="0d",
@@ -84,6 +98,7 @@ class CameraGeometry:
         self.pix_rotation = Angle(pix_rotation)
         self.cam_rotation = Angle(cam_rotation)
         self._neighbors = neighbors
+        self._registered = None
 
         if neighbors is not None:
             if isinstance(neighbors, list):
@@ -255,8 +270,75 @@ class CameraGeometry:
 
         tabname = "{camera_id}{verstr}.camgeom".format(camera_id=camera_id,
                                                        verstr=verstr)
-        table = get_table_dataset(tabname, role='dl0.tel.svc.camera')
-        return CameraGeometry.from_table(table)
+
+        # the table is only read once, every call returns a copy
+        # so callers can modify their geometry
+        geometry = CameraGeometry._name_cache.get(tabname)
+        if geometry is None:
+            table = get_table_dataset(tabname, role='dl0.tel.svc.camera')
+            geometry = CameraGeometry.register(CameraGeometry.from_table(table))
+            CameraGeometry._name_cache[tabname] = geometry
+
+        return geometry.copy()
+
+    @classmethod
+    def register(cls, geometry):
+        """
+        Register ``geometry`` in the process-wide geometry registry.
+
+        All registered geometries that are identical (see ``__eq__``) share
+        their neighbor matrix and border pixel masks, which are computed
+        only once for the first of them (or loaded from `disk_cache_dir`).
+        These do not change when a geometry is rotated, so registered
+        geometries can still be modified independently.
+
+        Parameters
+        ----------
+        geometry: CameraGeometry
+            the geometry to register
+
+        Returns
+        -------
+        geometry: CameraGeometry
+            the same instance, for convenience
+        """
+        registered = CameraGeometry._geometry_cache.get(geometry)
+        if registered is None:
+            # store a private copy, so the registry is not changed
+            # if the given instance is rotated
+            registered = geometry.copy()
+            registered._registered = None
+            CameraGeometry._geometry_cache[registered] = registered
+
+        if registered is not geometry:
+            geometry._registered = registered
+        return geometry
+
+    @classmethod
+    def clear_registry(cls):
+        """ Forget all registered geometries and geometries loaded by name """
+        CameraGeometry._geometry_cache.clear()
+        CameraGeometry._name_cache.clear()
+
+    def copy(self):
+        """
+        Copy of this geometry with its own pixel arrays. If this geometry
+        is registered, the copy shares its derived structures, see `register`.
+        """
+        geometry = CameraGeometry(
+            cam_id=self.cam_id,
+            pix_id=self.pix_id.copy(),
+            pix_x=self.pix_x.copy(),
+            pix_y=self.pix_y.copy(),
+            pix_area=self.pix_area.copy(),
+            pix_type=self.pix_type,
+            pix_rotation=self.pix_rotation,
+            cam_rotation=self.cam_rotation,
+            neighbors=self._neighbors,
+            apply_derotation=False,
+        )
+        geometry._registered = self._registered
+        return geometry
 
     def to_table(self):
         """ convert this to an `astropy.table.Table` """
@@ -322,7 +404,9 @@ class CameraGeometry:
     @lazyproperty
     def neighbors(self):
         '''A list of the neighbors pixel_ids for each pixel'''
-        return [np.where(r)[0].tolist() for r in self.neighbor_matrix]
+        pixel, neighbor = self.neighbor_matrix_where.T
+        splits = np.searchsorted(pixel, np.arange(1, self.n_pixels))
+        return [n.tolist() for n in np.split(neighbor, splits)]
 
     @lazyproperty
     def neighbor_matrix(self):
@@ -332,9 +416,64 @@ class CameraGeometry:
     def neighbor_matrix_sparse(self):
         if self._neighbors is not None:
             return self._neighbors
-        else:
+
+        if self._registered is not None:
+            return self._registered.neighbor_matrix_sparse
+
+        return self._load_or_calc_pixel_neighbors()
+
+    def _disk_cache_path(self):
+        """ path of the neighbor matrix in `disk_cache_dir`, if enabled """
+        if not self.disk_cache_dir:
+            return None
+
+        digest = hashlib.sha1()
+        digest.update(f'{self.cam_id}|{self.pix_type}'.encode())
+        for coordinate in (self.pix_x, self.pix_y):
+            digest.update(np.ascontiguousarray(
+                coordinate.to_value(u.m), dtype=np.float64
+            ).tobytes())
+
+        return os.path.join(
+            os.path.expandvars(os.path.expanduser(self.disk_cache_dir)),
+            'neighbors-v{}-{}.npz'.format(
+                self._disk_cache_version, digest.hexdigest()
+            ),
+        )
+
+    def _load_or_calc_pixel_neighbors(self):
+        """
+        The neighbor matrix, read from `disk_cache_dir` or calculated
+        and stored there, if the disk cache is enabled.
+        """
+        path = self._disk_cache_path()
+        if path is None:
             return self.calc_pixel_neighbors(diagonal=False)
 
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                indices = data['indices']
+                return csr_matrix(
+                    (np.ones(len(indices), dtype=bool), indices, data['indptr']),
+                    shape=(self.n_pixels, self.n_pixels),
+                )
+        except (OSError, ValueError, KeyError):
+            pass
+
+        neighbors = self.calc_pixel_neighbors(diagonal=False)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write to a temporary file first, so concurrent processes
+            # never read an incomplete file
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, indptr=neighbors.indptr, indices=neighbors.indices)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            warnings.warn(f'Could not store neighbor matrix: {e}')
+
+        return neighbors
+
     def calc_pixel_neighbors(self, diagonal=False):
         '''
         Calculate the neighbors of pixels using
@@ -345,8 +484,6 @@ class CameraGeometry:
         diagonal: bool
             If rectangular geometry, also add diagonal neighbors
         '''
-        neighbors = lil_matrix((self.n_pixels, self.n_pixels), dtype=bool)
-
         if self.pix_type.startswith('hex'):
             max_neighbors = 6
             # on a hexgrid, the closest pixel in the second circle is
@@ -371,19 +508,27 @@ class CameraGeometry:
                 radius = 1.5
                 norm = 1
 
-        for i, pixel in enumerate(self._kdtree.data):
-            # as the pixel itself is in the tree, look for max_neighbors + 1
-            distances, neighbor_candidates = self._kdtree.query(
-                pixel, k=max_neighbors + 1, p=norm
-            )
+        # as the pixels themselves are in the tree, look for max_neighbors + 1
+        distances, neighbor_candidates = self._kdtree.query(
+            self._kdtree.data, k=max_neighbors + 1, p=norm
+        )
 
-            # remove self-reference
-            distances = distances[1:]
-            neighbor_candidates = neighbor_candidates[1:]
+        # remove self-reference
+        distances = distances[:, 1:]
+        neighbor_candidates = neighbor_candidates[:, 1:]
 
-            # remove too far away pixels
-            inside_max_distance = distances < radius * np.min(distances)
-            neighbors[i, neighbor_candidates[inside_max_distance]] = True
+        # remove too far away pixels
+        inside_max_distance = (
+            distances < radius * np.min(distances, axis=1, keepdims=True)
+        )
+        pixels, _ = np.nonzero(inside_max_distance)
+        neighbors = csr_matrix(
+            (
+                np.ones(len(pixels), dtype=bool),
+                (pixels, neighbor_candidates[inside_max_distance]),
+            ),
+            shape=(self.n_pixels, self.n_pixels),
+        )
 
         # filter annoying deprecation warning from within scipy
         # scipy still uses np.matrix in scipy.sparse, but we do not
@@ -395,7 +540,7 @@ class CameraGeometry:
                     'Neighbor matrix is not symmetric. Is camera geometry irregular?'
                 )
 
-        return neighbors.tocsr()
+        return neighbors
 
     @lazyproperty
     def neighbor_matrix_where(self):
@@ -407,7 +552,9 @@ class CameraGeometry:
         -------
         ndarray
         """
-        return np.ascontiguousarray(np.array(np.where(self.neighbor_matrix)).T)
+        pixel, neighbor = self.neighbor_matrix_sparse.nonzero()
+        order = np.lexsort((neighbor, pixel))
+        return np.column_stack([pixel[order], neighbor[order]]).astype(np.intp)
 
     @lazyproperty
     def pixel_moment_matrix(self):
@@ -538,6 +685,12 @@ class CameraGeometry:
         if width in self.border_cache:
             return self.border_cache[width]
 
+        # registered geometries share the border masks, see register
+        if self._neighbors is None and self._registered is not None:
+            mask = self._registered.get_border_pixel_mask(width)
+            self.border_cache[width] = mask
+            return mask
+
         # filter annoying deprecation warning from within scipy
         # scipy still uses np.matrix in scipy.sparse, but we do not
         # explicitly use any feature of np.matrix, so we can ignore this here
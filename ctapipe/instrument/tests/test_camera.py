@@ -263,3 +263,53 @@ def test_hashing():
     cam3 = CameraGeometry.from_name("ASTRICam")
 
     assert len(set([cam1, cam2, cam3])) == 2
+
+
+def test_from_name_shares_derived_structures():
+    cam1 = CameraGeometry.from_name("NectarCam")
+    cam2 = CameraGeometry.from_name("NectarCam")
+
+    assert cam1.neighbor_matrix_sparse is cam2.neighbor_matrix_sparse
+    assert cam1.get_border_pixel_mask(1) is cam2.get_border_pixel_mask(1)
+
+    # instances are still independent
+    cam1.rotate('10d')
+    cam3 = CameraGeometry.from_name("NectarCam")
+    assert cam3 == cam2
+    assert cam3 != cam1
+
+
+def test_register():
+    def make_geometry():
+        return CameraGeometry(
+            cam_id='Registered',
+            pix_id=np.arange(25),
+            pix_x=np.repeat(np.arange(5), 5) * u.cm,
+            pix_y=np.tile(np.arange(5), 5) * u.cm,
+            pix_area=None,
+            pix_type='rectangular',
+        )
+
+    geom1 = CameraGeometry.register(make_geometry())
+    geom2 = CameraGeometry.register(make_geometry())
+    assert geom1 is not geom2
+    assert geom1.neighbor_matrix_sparse is geom2.neighbor_matrix_sparse
+    assert geom1.neighbor_matrix_sparse.sum() == 80
+
+    CameraGeometry.clear_registry()
+    geom3 = CameraGeometry.register(make_geometry())
+    assert geom3.neighbor_matrix_sparse is not geom1.neighbor_matrix_sparse
+
+
+def test_neighbor_disk_cache(tmpdir, monkeypatch):
+    monkeypatch.setattr(CameraGeometry, 'disk_cache_dir', str(tmpdir))
+
+    geom = CameraGeometry.make_rectangular(10, 10)
+    neighbors = geom.neighbor_matrix_sparse
+    assert len(tmpdir.listdir()) == 1
+
+    geom = CameraGeometry.make_rectangular(10, 10)
+    monkeypatch.setattr(
+        CameraGeometry, 'calc_pixel_neighbors', pytest.fail
+    )
+    assert (geom.neighbor_matrix_sparse != neighbors).nnz == 0
@@ -1,20 +1,26 @@
-from .array import get_array_layout
-from .eventseeker import EventSeeker
-from .eventsource import EventSource, event_source
-from .hdf5tableio import HDF5TableReader, HDF5TableWriter
-from .tableio import TableWriter, TableReader
+from ..core.lazy_loading import lazy_submodules
 
 # import event sources to make them visible to EventSource.from_url
+# and EventSource.from_name, all other submodules are imported on first use
 from .simteleventsource import SimTelEventSource
 
-__all__ = [
-    'get_array_layout',
-    'HDF5TableWriter',
-    'HDF5TableReader',
-    'TableWriter',
-    'TableReader',
-    'EventSeeker',
-    'EventSource',
-    'event_source',
-    'SimTelEventSource',
-]
+__getattr__, __dir__, __all__ = lazy_submodules(
+    __name__,
+    attributes={
+        'array': ['get_array_layout'],
+        'hdf5tableio': ['HDF5TableWriter', 'HDF5TableReader'],
+        'tableio': ['TableWriter', 'TableReader'],
+        'eventseeker': ['EventSeeker'],
+        'eventindex': ['SimTelEventIndex'],
+        'eventsource': ['EventSource', 'event_source'],
+        'sourceregistry': ['EventSourceRegistry'],
+        'simteleventsource': ['SimTelEventSource'],
+    },
+    submodules=[
+        'containers',
+        'files',
+        'hessioeventsource',
+        'sources',
+        'toymodel',
+    ],
+)
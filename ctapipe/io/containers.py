@@ -26,6 +26,7 @@ __all__ = [
     'MCHeaderContainer',
     'MCCameraEventContainer',
     'CameraCalibrationContainer',
+    'PedestalContainer',
     'CentralTriggerContainer',
     'ReconstructedContainer',
     'ReconstructedShowerContainer',
@@ -110,6 +111,20 @@ class CameraCalibrationContainer(Container):
     pedestal = Field(None, "pedestal calibration arrays from MC file")
 
 
+class PedestalContainer(Container):
+    """
+    Pedestal and noise estimate of a single telescope from a stream of events
+    """
+    tel_id = Field(-1, "telescope id")
+    n_events = Field(0, "number of events contributing to the estimate")
+    n_events_total = Field(0, "number of events processed for this telescope")
+    last_event_id = Field(-1, "id of the last event included in the estimate")
+    pedestal_mean = Field(None, "mean of the samples (n_channels x n_pixels)")
+    pedestal_std = Field(
+        None, "standard deviation of the samples (n_channels x n_pixels)"
+    )
+
+
 class DL1Container(Container):
     """ DL1 Calibrated Camera Images and associated data"""
     tel = Field(Map(DL1CameraContainer), "map of tel_id to DL1CameraContainer")
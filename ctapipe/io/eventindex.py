@@ -0,0 +1,276 @@
+"""
+Index of the event positions in simtel files, used for random event access.
+"""
+import os
+import warnings
+
+import numpy as np
+from eventio.base import EventIOFile
+from eventio.simtel.objects import (
+    ArrayEvent,
+    CalibrationEvent,
+    CameraMonitoring,
+    LaserCalibration,
+    MCEvent,
+    MCShower,
+    MCPhotoelectronSum,
+    TelescopeEvent,
+)
+from eventio.iact import TelescopeData
+
+__all__ = ['SimTelEventIndex']
+
+
+INDEX_DTYPE = np.dtype([
+    ('offset', np.int64),
+    ('event_id', np.int64),
+    ('calibration', np.bool_),
+    ('mc_shower_offset', np.int64),
+    ('mc_event_offset', np.int64),
+    ('photoelectrons_offset', np.int64),
+    ('photoelectron_sum_offset', np.int64),
+])
+
+#: index columns with the positions of the objects an event depends on
+STATE_OFFSET_COLUMNS = (
+    'mc_shower_offset',
+    'mc_event_offset',
+    'photoelectrons_offset',
+    'photoelectron_sum_offset',
+)
+
+
+class SimTelEventIndex:
+    """
+    Byte positions, event ids and telescopes of all events in a simtel file.
+
+    The index is built by scanning the top level objects of the file once,
+    without decoding the events, and can be stored as a sidecar file next
+    to the simtel file, so it is only built once.
+
+    For each array or calibration event, the position of the event object
+    and the positions of the last MC shower, MC event and photoelectron
+    objects preceding it are stored. Together with the positions of the
+    camera monitoring and laser calibration objects, which can be spread
+    over the events, this is all `~eventio.simtel.simtelfile.SimTelFile`
+    needs to read an event.
+
+    Parameters
+    ----------
+    events: np.ndarray
+        structured array with one row per event, see ``INDEX_DTYPE``
+    tel_ids: np.ndarray
+        ids of the telescopes with a telescope event in each event,
+        concatenated. These are the telescopes ``SimTelFile`` selects
+        events by, which can differ from the telescopes with data
+        of the trigger information.
+    tel_ptr: np.ndarray
+        the telescopes of event ``i`` are ``tel_ids[tel_ptr[i]:tel_ptr[i + 1]]``
+    calibration_offsets: np.ndarray
+        positions of the camera monitoring and laser calibration objects,
+        in file order
+    file_size: int
+        size of the indexed file, to detect changed files
+    file_mtime_ns: int
+        modification time of the indexed file, to detect changed files
+    """
+    version = 3
+
+    def __init__(
+            self, events, tel_ids, tel_ptr, calibration_offsets,
+            file_size, file_mtime_ns,
+    ):
+        self.events = events
+        self.tel_ids = tel_ids
+        self.tel_ptr = tel_ptr
+        self.calibration_offsets = calibration_offsets
+        self.file_size = file_size
+        self.file_mtime_ns = file_mtime_ns
+
+    def __len__(self):
+        return len(self.events)
+
+    def telescopes(self, index):
+        """ ids of the telescopes with data of the event at row ``index`` """
+        return self.tel_ids[self.tel_ptr[index]:self.tel_ptr[index + 1]]
+
+    def select(self, allowed_tels=None, skip_calibration=True):
+        """
+        Rows of the events that are read from the file for the given
+        options, in file order, so the ``i``-th entry is the row of
+        the event with ``event.count == i``.
+
+        Parameters
+        ----------
+        allowed_tels: set or None
+            only events with data of at least one of these telescopes are
+            read, None or an empty set for no restriction
+        skip_calibration: bool
+            if calibration events are skipped
+
+        Returns
+        -------
+        rows: np.ndarray
+            indices into ``events``
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if skip_calibration:
+            mask &= ~self.events['calibration']
+
+        if allowed_tels:
+            allowed = np.isin(self.tel_ids, list(allowed_tels))
+            event_of_tel = np.repeat(
+                np.arange(len(self)), np.diff(self.tel_ptr)
+            )
+            has_allowed = np.zeros(len(self), dtype=bool)
+            has_allowed[event_of_tel[allowed]] = True
+            mask &= has_allowed
+
+        return np.flatnonzero(mask)
+
+    @staticmethod
+    def _file_stats(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def build(cls, path):
+        """
+        Create the index by scanning the simtel file at ``path``.
+        """
+        events = []
+        tel_ids = []
+        tel_ptr = [0]
+        calibration_offsets = []
+
+        state = dict.fromkeys(STATE_OFFSET_COLUMNS, -1)
+        event_id = -1
+
+        with EventIOFile(path) as f:
+            try:
+                for o in f:
+                    offset = o.header.content_address - o.header.header_size
+
+                    if isinstance(o, MCShower):
+                        state['mc_shower_offset'] = offset
+                    elif isinstance(o, MCEvent):
+                        state['mc_event_offset'] = offset
+                        event_id = o.header.id
+                    elif isinstance(o, TelescopeData):
+                        state['photoelectrons_offset'] = offset
+                    elif isinstance(o, MCPhotoelectronSum):
+                        state['photoelectron_sum_offset'] = offset
+                    elif isinstance(o, (CameraMonitoring, LaserCalibration)):
+                        calibration_offsets.append(offset)
+                    elif isinstance(o, (ArrayEvent, CalibrationEvent)):
+                        calibration = isinstance(o, CalibrationEvent)
+                        array_event = next(o) if calibration else o
+                        event_tel_ids = [
+                            sub.telescope_id for sub in array_event
+                            if isinstance(sub, TelescopeEvent)
+                        ]
+
+                        # the event of a truncated file is not read completely
+                        o.seek(1, 2)
+                        if len(o.read(1)) == 0:
+                            raise EOFError
+
+                        events.append((
+                            offset,
+                            -1 if calibration else event_id,
+                            calibration,
+                            *(state[col] for col in STATE_OFFSET_COLUMNS),
+                        ))
+                        tel_ids.extend(event_tel_ids)
+                        tel_ptr.append(len(tel_ids))
+            except EOFError:
+                warnings.warn(
+                    f'File {path} seems to be truncated, '
+                    f'only indexed {len(events)} events'
+                )
+
+        return cls(
+            np.array(events, dtype=INDEX_DTYPE),
+            np.array(tel_ids, dtype=np.int16),
+            np.array(tel_ptr, dtype=np.int64),
+            np.array(calibration_offsets, dtype=np.int64),
+            *cls._file_stats(path),
+        )
+
+    def write(self, path):
+        """ Store the index in the npz file at ``path`` """
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                version=self.version,
+                events=self.events,
+                tel_ids=self.tel_ids,
+                tel_ptr=self.tel_ptr,
+                calibration_offsets=self.calibration_offsets,
+                file_stats=[self.file_size, self.file_mtime_ns],
+            )
+
+    @classmethod
+    def read(cls, path):
+        """ Load an index stored with `write` """
+        with np.load(path, allow_pickle=False) as data:
+            if data['version'] != cls.version:
+                raise ValueError(
+                    'Index {} has version {}, expected {}'.format(
+                        path, data['version'], cls.version
+                    )
+                )
+            file_size, file_mtime_ns = data['file_stats'].tolist()
+            return cls(
+                data['events'],
+                data['tel_ids'],
+                data['tel_ptr'],
+                data['calibration_offsets'],
+                file_size,
+                file_mtime_ns,
+            )
+
+    def matches(self, path):
+        """ Check that the file at ``path`` was not changed since indexing """
+        return self._file_stats(path) == (self.file_size, self.file_mtime_ns)
+
+    @staticmethod
+    def sidecar_path(path):
+        """ Default location of the index of the simtel file at ``path`` """
+        return str(path) + '.index.npz'
+
+    @classmethod
+    def for_file(cls, path, index_path=None, write=True):
+        """
+        Load the index of the simtel file at ``path`` from its sidecar
+        file, building it if the sidecar does not exist or is outdated.
+
+        Parameters
+        ----------
+        path: str
+            path of the simtel file
+        index_path: str or None
+            path of the sidecar file, defaults to `sidecar_path`
+        write: bool
+            store a newly built index in the sidecar file.
+            If the location is not writable, the index is only kept in memory.
+        """
+        if index_path is None:
+            index_path = cls.sidecar_path(path)
+
+        if os.path.exists(index_path):
+            try:
+                index = cls.read(index_path)
+                if index.matches(path):
+                    return index
+            except (OSError, ValueError, KeyError):
+                pass
+
+        index = cls.build(path)
+        if write:
+            try:
+                index.write(index_path)
+            except OSError as e:
+                warnings.warn(f'Could not store event index: {e}')
+
+        return index
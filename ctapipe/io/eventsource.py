@@ -4,10 +4,10 @@ Handles reading of different event/waveform containing files
 from abc import abstractmethod
 from os.path import exists
 from traitlets import Unicode, Int, Set, TraitError
-from ctapipe.core import Component, non_abstract_children
+from ctapipe.core import Component
 from ctapipe.core import Provenance
 from traitlets.config.loader import LazyConfigValue
-from ctapipe.core.plugins import detect_and_import_io_plugins
+from .sourceregistry import EventSourceRegistry
 
 __all__ = [
     'EventSource',
@@ -93,6 +93,11 @@ class EventSource(Component):
     change the data pointed to by "event". If you wish to ensure a particular
     event is kept, you should perform a `event_copy = copy.deepcopy(event)`.
 
+    Subclasses can declare the ``magic_bytes`` the files they read start
+    with, so `from_url` only asks them whether they are compatible with files
+    starting with these bytes. Sources of other packages are found through
+    the ``ctapipe_io`` entry point group, see `EventSourceRegistry`.
+
 
     Attributes
     ----------
@@ -124,6 +129,10 @@ class EventSource(Component):
               'will be included')
     ).tag(config=True)
 
+    #: byte strings one of which the files this source can read start with,
+    #: empty if the source does not restrict the first bytes
+    magic_bytes = ()
+
     def __init__(self, config=None, parent=None, **kwargs):
         """
         Class to handle generic input files. Enables obtaining the "source"
@@ -227,7 +236,9 @@ class EventSource(Component):
     def from_url(cls, input_url, **kwargs):
         """
         Find compatible EventSource for input_url via the `is_compatible`
-        method of the EventSource
+        method of the EventSource.
+        Only the sources that can read files starting with the first bytes of
+        the input file are tried, see `EventSourceRegistry.candidates`.
 
         Parameters
         ----------
@@ -241,19 +252,8 @@ class EventSource(Component):
         instance
             Instance of a compatible EventSource subclass
         """
-        detect_and_import_io_plugins()
-        available_classes = non_abstract_children(cls)
-
-        for subcls in available_classes:
-            if subcls.is_compatible(input_url):
-                return subcls(input_url=input_url, **kwargs)
-
-        raise ValueError(
-            'Cannot find compatible EventSource for \n'
-            '\turl:{}\n'
-            'in available EventSources:\n'
-            '\t{}'.format(input_url, [c.__name__ for c in available_classes])
-        )
+        subcls = event_sources.find(input_url, base=cls)
+        return subcls(input_url=input_url, **kwargs)
 
     @classmethod
     def from_config(cls, config=None, parent=None, **kwargs):
@@ -288,3 +288,7 @@ class EventSource(Component):
             config=config,
             **kwargs
         )
+
+
+#: the sources `EventSource.from_url` chooses from
+event_sources = EventSourceRegistry(EventSource)
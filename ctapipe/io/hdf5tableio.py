@@ -1,9 +1,11 @@
 '''Implementations of TableWriter and -Reader for HDF5 files'''
 import enum
+from copy import deepcopy
 from functools import partial
 
 import numpy as np
 import tables
+from astropy.table import QTable
 from astropy.time import Time
 from astropy.units import Quantity
 
@@ -55,6 +57,15 @@ class HDF5TableWriter(TableWriter):
     To append to existing files, pass the `mode='a'`  option to the
     constructor.
 
+    By default each call to `write()` appends a single row through pytables.
+    When writing many small rows, pass a ``buffer_size`` to collect the rows
+    of each table in a preallocated numpy structured array, which is then
+    appended to the table as one block every ``buffer_size`` rows (and when
+    calling `flush()` or `close()`).
+    The HDF5 chunk size of new tables can be set with ``chunk_size``,
+    compression with the ``filters`` keyword argument, e.g.
+    ``filters=tables.Filters(complevel=5, complib='blosc:zstd')``.
+
     Parameters
     ----------
     filename: str
@@ -69,6 +80,12 @@ class HDF5TableWriter(TableWriter):
         'a' if you want to append data to the file
     root_uep : str
         root location of the `group_name`
+    buffer_size : int or None
+        number of rows to collect per table before writing them as one block,
+        None to append every row directly
+    chunk_size : int or None
+        number of rows per HDF5 chunk of new tables,
+        None to let pytables choose
     kwargs:
         any other arguments that will be passed through to `pytables.open()`.
         e.g. to set the compression level to 7 pass : `filters=tables.Filters(
@@ -83,12 +100,24 @@ class HDF5TableWriter(TableWriter):
         add_prefix=False,
         mode='w',
         root_uep='/',
+        buffer_size=None,
+        chunk_size=None,
         **kwargs
     ):
 
         super().__init__(add_prefix=add_prefix)
         self._schemas = {}
         self._tables = {}
+        self._column_maps = {}
+        self._buffers = {}
+        self._buffer_columns = {}
+        self._buffer_positions = {}
+
+        if buffer_size is not None and buffer_size < 1:
+            raise ValueError('buffer_size must be a positive integer or None')
+
+        self.buffer_size = buffer_size
+        self.chunk_size = chunk_size
 
         if mode not in ['a', 'w', 'r+']:
             raise IOError('The mode {} is not supported for writing'.
@@ -115,8 +144,31 @@ class HDF5TableWriter(TableWriter):
 
     def close(self):
 
+        if self._h5file.isopen:
+            self.flush()
         self._h5file.close()
 
+    def flush(self):
+        """
+        Write all buffered rows to the file.
+        """
+        for table_name in self._buffers:
+            self._flush_buffer(table_name)
+        self._h5file.flush()
+
+    def add_column_transform(self, table_name, col_name, transform):
+        super().add_column_transform(table_name, col_name, transform)
+
+        # update the transforms cached for an existing table,
+        # they are applied to the rows written from now on
+        column_map = self._column_maps.get(table_name)
+        if column_map is not None:
+            transforms = self._transforms[table_name]
+            self._column_maps[table_name] = [
+                [(colname, key, transforms.get(colname)) for colname, key, _ in columns]
+                for columns in column_map
+            ]
+
     def _create_hdf5_table_schema(self, table_name, containers):
         """
         Creates a pytables description class for the given containers
@@ -212,41 +264,100 @@ class HDF5TableWriter(TableWriter):
         for container in containers:
             meta.update(container.meta)  # copy metadata from container
 
+        chunkshape = None
+        if self.chunk_size is not None:
+            chunkshape = (self.chunk_size, )
+
         table = self._h5file.create_table(
             where=self._group,
             name=table_name,
             title="Storage of {}".format(
                 ",".join(c.__class__.__name__ for c in containers)
             ),
-            description=self._schemas[table_name]
+            description=self._schemas[table_name],
+            chunkshape=chunkshape,
         )
         for key, val in meta.items():
             table.attrs[key] = val
 
         self._tables[table_name] = table
+        self._column_maps[table_name] = self._create_column_map(
+            table_name, containers
+        )
 
-    def _append_row(self, table_name, containers):
+        if self.buffer_size is not None:
+            buffer = np.zeros(self.buffer_size, dtype=table.dtype)
+            self._buffers[table_name] = buffer
+            self._buffer_columns[table_name] = [
+                buffer[colname]
+                for columns in self._column_maps[table_name]
+                for colname, _, _ in columns
+            ]
+            self._buffer_positions[table_name] = 0
+
+    def _create_column_map(self, table_name, containers):
         """
-        append a row to an already initialized table. This is called
-        automatically by `write()`
+        Precompute for each container the list of
+        (column name, field name, transform) of the columns in the table,
+        so the container items do not have to be matched on every row.
+        The transform is None for columns without a transform.
         """
-        table = self._tables[table_name]
-        row = table.row
+        colnames = set(self._tables[table_name].colnames)
+        transforms = self._transforms[table_name]
 
+        column_map = []
         for container in containers:
-            selected_fields = filter(
-                lambda kv: kv[0] in table.colnames,
-                container.items(add_prefix=self.add_prefix)
-            )
-            for colname, value in selected_fields:
+            columns = []
+            prefixed_names = container.items(add_prefix=self.add_prefix)
+            for (colname, _), key in zip(prefixed_names, container.keys()):
+                if colname in colnames:
+                    columns.append((colname, key, transforms.get(colname)))
+            column_map.append(columns)
 
-                value = self._apply_col_transform(
-                    table_name, colname, value
-                )
+        return column_map
+
+    def _append_row(self, table_name, containers):
+        """
+        append a row to an already initialized table. This is called
+        automatically by `write()`
+        """
+        row = self._tables[table_name].row
+        column_map = self._column_maps[table_name]
 
+        for container, columns in zip(containers, column_map):
+            for colname, key, transform in columns:
+                value = getattr(container, key)
+                if transform is not None:
+                    value = transform(value)
                 row[colname] = value
         row.append()
 
+    def _append_row_to_buffer(self, table_name, containers):
+        """
+        store a row in the buffer of the table, writing the buffer
+        to the file when it is full. This is called automatically by `write()`
+        """
+        position = self._buffer_positions[table_name]
+        buffer_columns = iter(self._buffer_columns[table_name])
+        column_map = self._column_maps[table_name]
+
+        for container, columns in zip(containers, column_map):
+            for (_, key, transform), column in zip(columns, buffer_columns):
+                value = getattr(container, key)
+                if transform is not None:
+                    value = transform(value)
+                column[position] = value
+
+        self._buffer_positions[table_name] = position + 1
+        if position + 1 == self.buffer_size:
+            self._flush_buffer(table_name)
+
+    def _flush_buffer(self, table_name):
+        n_rows = self._buffer_positions[table_name]
+        if n_rows > 0:
+            self._tables[table_name].append(self._buffers[table_name][:n_rows])
+            self._buffer_positions[table_name] = 0
+
     def write(self, table_name, containers):
         """
         Write the contents of the given container or containers to a table.
@@ -268,7 +379,10 @@ class HDF5TableWriter(TableWriter):
         if table_name not in self._schemas:
             self._setup_new_table(table_name, containers)
 
-        self._append_row(table_name, containers)
+        if self.buffer_size is None:
+            self._append_row(table_name, containers)
+        else:
+            self._append_row_to_buffer(table_name, containers)
 
 
 class HDF5TableReader(TableReader):
@@ -286,11 +400,13 @@ class HDF5TableReader(TableReader):
     transforms applied, will have the units re-applied when reading (the
     unit used is stored in the header attributes).
 
-    Note that this is only useful if you want to read all information *one
-    event at a time* into a container, which is not very I/O efficient. For
-    some other use cases, it may be much more efficient to access the
-    table data directly, for example to read an entire column or table at
-    once (which means not using the Container data structure).
+    Note that `read` is only useful if you want to read all information *one
+    event at a time* into a container, which is not very I/O efficient.
+    To access larger parts of a table at once, use `read_table` (an astropy
+    table with units and enums re-applied), `read_array` (the raw numpy
+    structured array), `iter_chunks` (tables of ``chunk_size`` rows) or
+    `read_batches` (a reusable list of containers, filled one chunk at
+    a time).
 
     Todo:
     - add ability to synchronize reading of multiple tables on a key
@@ -417,6 +533,184 @@ class HDF5TableReader(TableReader):
             yield container
             row_count += 1
 
+    def _column_transforms(self, table):
+        """
+        Transforms that re-apply units and enums to whole columns,
+        the array equivalent of `_map_transforms_from_table_header`.
+        """
+        transforms = {}
+        for attr in table.attrs._f_list():
+            if attr.endswith("_UNIT"):
+                transforms[attr[:-5]] = partial(
+                    tr_add_unit, unitname=table.attrs[attr]
+                )
+            elif attr.endswith("_ENUM"):
+                transforms[attr[:-5]] = partial(
+                    tr_int_array_to_enum, enum_class=table.attrs[attr]
+                )
+        return transforms
+
+    @staticmethod
+    def _select_columns(table, columns):
+        if columns is None:
+            return list(table.colnames)
+
+        missing = set(columns) - set(table.colnames)
+        if missing:
+            raise KeyError('Table {} has no columns {}'.format(
+                table._v_pathname, sorted(missing)
+            ))
+        return list(columns)
+
+    def read_array(self, table_name, columns=None, start=None, stop=None):
+        """
+        Read a range of rows of a table into a numpy structured array.
+        No transforms are applied, the values are the ones stored in the file.
+
+        Parameters
+        ----------
+        table_name: str
+            name of table to read from
+        columns: list or None
+            names of the columns to read, None for all columns
+        start: int or None
+            index of the first row to read
+        stop: int or None
+            index after the last row to read
+
+        Returns
+        -------
+        array: np.ndarray
+            structured array with one field per column
+        """
+        table = self._h5file.get_node(table_name)
+        if columns is None:
+            return table.read(start=start, stop=stop)
+
+        columns = self._select_columns(table, columns)
+        start, stop, _ = slice(start, stop).indices(table.nrows)
+        dtype = np.dtype([(name, table.dtype[name]) for name in columns])
+        array = np.empty(len(range(start, stop)), dtype=dtype)
+        for name in columns:
+            array[name] = table.read(start=start, stop=stop, field=name)
+        return array
+
+    def read_table(self, table_name, columns=None, start=None, stop=None):
+        """
+        Read a range of rows of a table into an astropy table.
+        Columns written with a unit become `~astropy.units.Quantity` columns,
+        columns written from enums contain the enum members again.
+        Column transforms added with `add_column_transform` are not applied,
+        as they work on single values.
+
+        Parameters
+        ----------
+        table_name: str
+            name of table to read from
+        columns: list or None
+            names of the columns to read, None for all columns
+        start: int or None
+            index of the first row to read
+        stop: int or None
+            index after the last row to read
+
+        Returns
+        -------
+        table: astropy.table.QTable
+            the selected rows and columns
+        """
+        table = self._h5file.get_node(table_name)
+        columns = self._select_columns(table, columns)
+        transforms = self._column_transforms(table)
+
+        result = QTable()
+        for name in columns:
+            values = table.read(start=start, stop=stop, field=name)
+            if name in transforms:
+                values = transforms[name](values)
+            result[name] = values
+
+        for key in table.attrs._f_list():
+            if not key.endswith(('_UNIT', '_ENUM')):
+                result.meta[key] = table.attrs[key]
+
+        return result
+
+    def iter_chunks(self, table_name, chunk_size=10000, columns=None,
+                    start=None, stop=None):
+        """
+        Returns a generator that reads the table in chunks of ``chunk_size``
+        rows, see `read_table`.
+
+        Parameters
+        ----------
+        table_name: str
+            name of table to read from
+        chunk_size: int
+            number of rows per chunk, the last chunk can be shorter
+        columns: list or None
+            names of the columns to read, None for all columns
+        start: int or None
+            index of the first row to read
+        stop: int or None
+            index after the last row to read
+        """
+        table = self._h5file.get_node(table_name)
+        start, stop, _ = slice(start, stop).indices(table.nrows)
+
+        for chunk_start in range(start, stop, chunk_size):
+            yield self.read_table(
+                table_name,
+                columns=columns,
+                start=chunk_start,
+                stop=min(chunk_start + chunk_size, stop),
+            )
+
+    def read_batches(self, table_name, container, batch_size=1000,
+                     start=None, stop=None):
+        """
+        Returns a generator that reads ``batch_size`` rows at once
+        into a list of containers. The list is created once from copies of
+        ``container`` and the same containers are filled and returned for
+        every batch, the last batch is a shorter list.
+
+        Only the columns with a matching container field are read.
+        Units and enums are re-applied as in `read_table`.
+
+        Parameters
+        ----------
+        table_name: str
+            name of table to read from
+        container : ctapipe.core.Container
+            template for the containers to fill
+        batch_size: int
+            number of containers per batch
+        start: int or None
+            index of the first row to read
+        stop: int or None
+            index after the last row to read
+        """
+        table = self._h5file.get_node(table_name)
+        columns = [name for name in table.colnames if name in container.fields]
+
+        for key in table.attrs._f_list():
+            container.meta[key] = table.attrs[key]
+        batch = [deepcopy(container) for _ in range(batch_size)]
+
+        chunks = self.iter_chunks(
+            table_name,
+            chunk_size=batch_size,
+            columns=columns,
+            start=start,
+            stop=stop,
+        )
+        for chunk in chunks:
+            n_rows = len(chunk)
+            for name in columns:
+                for batch_container, value in zip(batch, chunk[name]):
+                    batch_container[name] = value
+            yield batch[:n_rows]
+
 
 def tr_convert_and_strip_unit(quantity, unit):
     return quantity.to(unit).value
@@ -435,3 +729,11 @@ def tr_time_to_float(thetime):
 
 def tr_add_unit(value, unitname):
     return Quantity(value, unitname)
+
+
+def tr_int_array_to_enum(values, enum_class):
+    """ transform an array of integer codes into an array of enum members"""
+    members = {code: enum_class(code) for code in np.unique(values)}
+    result = np.empty(len(values), dtype=object)
+    result[:] = [members[code] for code in values]
+    return result
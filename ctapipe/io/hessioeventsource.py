@@ -228,7 +228,7 @@ class HESSIOEventSource(EventSource):
         cam_rot = file.get_camera_rotation_angle(tel_id)
         num_mirrors = file.get_mirror_number(tel_id)
 
-        camera = CameraGeometry(
+        camera = CameraGeometry.register(CameraGeometry(
             telescope.camera_name,
             pix_id=np.arange(n_pixels),
             pix_x=pix_x,
@@ -238,7 +238,7 @@ class HESSIOEventSource(EventSource):
             pix_rotation=pix_rot,
             cam_rotation=-Angle(cam_rot, u.rad),
             apply_derotation=True,
-        )
+        ))
 
         optics = OpticsDescription(
             name=telescope.name,
@@ -1,7 +1,11 @@
 import warnings
 import numpy as np
 from ctapipe.io.eventsource import EventSource
-from ctapipe.io.containers import DataContainer
+from ctapipe.core import ArrayMap
+from ctapipe.core.provenance import get_module_version
+from ctapipe.io.containers import (
+    DataContainer, R0CameraContainer, MCCameraEventContainer,
+)
 from astropy import units as u
 from astropy.coordinates import Angle
 from astropy.time import Time
@@ -15,14 +19,102 @@ from ctapipe.instrument.camera import UnknownPixelShapeWarning
 from ctapipe.instrument.guess import guess_telescope, UNKNOWN_TELESCOPE
 from traitlets import Bool
 
+from .eventindex import SimTelEventIndex, STATE_OFFSET_COLUMNS
+
 from eventio.simtel.simtelfile import SimTelFile
 from eventio.file_types import is_eventio
+from eventio.constants import SYNC_MARKER_LITTLE_ENDIAN, SYNC_MARKER_BIG_ENDIAN
 
 __all__ = ['SimTelEventSource']
 
+# Reading a single event at a known position uses internals of SimTelFile,
+# so it is only done with the eventio versions it was tested with.
+# Otherwise events are found by reading the file from the start.
+SEEK_EVENTIO_VERSIONS = ('0.18', )
+_SEEK_ATTRIBUTES = (
+    '_next_header_pos',
+    'next_low_level',
+    'try_build_event',
+    'current_mc_shower',
+    'current_mc_event',
+    'current_photoelectrons',
+    'current_photoelectron_sum',
+    'current_array_event',
+    'current_calibration_event',
+    'camera_monitorings',
+    'laser_calibrations',
+)
+
+
+def _can_seek(simtel_file):
+    """ if events of ``simtel_file`` can be read at their index position """
+    major_minor = '.'.join(get_module_version('eventio').split('.')[:2])
+    return (
+        major_minor in SEEK_EVENTIO_VERSIONS
+        and all(hasattr(simtel_file, attr) for attr in _SEEK_ATTRIBUTES)
+    )
+
+
+# slot of the image field, used by _LazyR0CameraContainer
+_r0_image = R0CameraContainer.image
+
+
+class _LazyR0CameraContainer(R0CameraContainer):
+    """
+    R0CameraContainer that computes the (deprecated) ``image`` field
+    from the waveform only when it is accessed.
+    Setting the image to None marks it as outdated.
+    """
+    container_prefix = R0CameraContainer.container_prefix
+
+    @property
+    def image(self):
+        image = _r0_image.__get__(self)
+        if image is None and self.waveform is not None:
+            image = self.waveform.sum(axis=-1)
+            _r0_image.__set__(self, image)
+        return image
+
+    @image.setter
+    def image(self, value):
+        _r0_image.__set__(self, value)
+
 
 class SimTelEventSource(EventSource):
+    """
+    EventSource for simtel files, read using ``eventio``.
+
+    Random access to single events (see `~ctapipe.io.EventSeeker`) and the
+    number of events are provided through a `SimTelEventIndex`, which is
+    built by scanning the file once on first use and can be stored next to
+    the input file (see ``write_event_index``).
+    Reading an event at its index position relies on internals of
+    ``eventio``, so with untested ``eventio`` versions (see
+    ``SEEK_EVENTIO_VERSIONS``) the file is read from the start instead.
+    """
     skip_calibration_events = Bool(True, help='Skip calibration events').tag(config=True)
+    recycle_containers = Bool(
+        False,
+        help='Keep the per-telescope containers between events and fill them '
+             'in place instead of creating new ones for every event. '
+             'The yielded event must then be copied to keep it beyond the '
+             'next iteration, including its telescope containers. '
+             'The MC telescope containers are stored in an ArrayMap, which '
+             'gives the same container to a telescope in every event.'
+    ).tag(config=True)
+    write_event_index = Bool(
+        False,
+        help='Store the event index built for random event access next to '
+             'the input file, so it can be reused',
+    ).tag(config=True)
+
+    # eventio sync markers, and the gzip and zstd markers of compressed files
+    magic_bytes = (
+        SYNC_MARKER_LITTLE_ENDIAN,
+        SYNC_MARKER_BIG_ENDIAN,
+        b'\x1f\x8b',
+        b'\x28\xb5\x2f\xfd',
+    )
 
     def __init__(self, config=None, parent=None, **kwargs):
         super().__init__(config=config, parent=parent, **kwargs)
@@ -44,6 +136,25 @@ class SimTelEventSource(EventSource):
         )
         self.start_pos = self.file_.tell()
 
+        tel_ids = self.file_.header['tel_id'].tolist()
+        self._tel_index = {
+            tel_id: index for index, tel_id in enumerate(tel_ids)
+        }
+        # per-telescope values that do not change between events
+        self._reference_pulse_shapes = {}
+        # telescope containers kept for reuse, see recycle_containers
+        self._container_pools = {
+            level: {} for level in ('r0', 'r1', 'dl0', 'dl1', 'mc')
+        }
+
+        self._event_index = None
+        self._selected_events = None
+        self._event_id_to_count = None
+        self._seek_file = None
+        self._can_seek = False
+        # number of calibration objects of the event index read by _seek_file
+        self._n_calibrations_read = 0
+
     @staticmethod
     def prepare_subarray_info(telescope_descriptions, header):
         """
@@ -88,7 +199,7 @@ class SimTelEventSource(EventSource):
                 pix_type = 'hexagon'
                 pix_rotation = '0d'
 
-            camera = CameraGeometry(
+            camera = CameraGeometry.register(CameraGeometry(
                 telescope.camera_name,
                 pix_id=np.arange(n_pixels),
                 pix_x=u.Quantity(cam_settings['pixel_x'], u.m),
@@ -98,8 +209,7 @@ class SimTelEventSource(EventSource):
                 pix_rotation=pix_rotation,
                 cam_rotation=-Angle(cam_settings['cam_rot'], u.rad),
                 apply_derotation=True,
-
-            )
+            ))
 
             optics = OpticsDescription(
                 name=telescope.name,
@@ -143,111 +253,309 @@ class SimTelEventSource(EventSource):
             self.log.warning(msg)
             warnings.warn(msg)
 
-    def __generator(self):
+    def _create_data_container(self):
         data = DataContainer()
         data.meta['origin'] = 'hessio'
         data.meta['input_url'] = self.input_url
         data.meta['max_events'] = self.max_events
+        if self.recycle_containers:
+            data.mc.tel = ArrayMap(MCCameraEventContainer)
+        return data
+
+    def __generator(self):
+        data = self._create_data_container()
 
         for counter, array_event in enumerate(self.file_):
-            # next lines are just for debugging
-            self.array_event = array_event
-            data.event_type = array_event['type']
+            if self._fill_event(data, counter, array_event):
+                yield data
 
-            # calibration events do not have an event id
-            if data.event_type == 'calibration':
-                event_id = -1
-            else:
-                event_id = array_event['event_id']
-
-            data.inst.subarray = self._subarray_info
-
-            obs_id = self.file_.header['run']
-            tels_with_data = set(array_event['telescope_events'].keys())
-            data.count = counter
-            data.r0.obs_id = obs_id
-            data.r0.event_id = event_id
-            data.r0.tels_with_data = tels_with_data
-            data.r1.obs_id = obs_id
-            data.r1.event_id = event_id
-            data.r1.tels_with_data = tels_with_data
-            data.dl0.obs_id = obs_id
-            data.dl0.event_id = event_id
-            data.dl0.tels_with_data = tels_with_data
-
-            # handle telescope filtering by taking the intersection of
-            # tels_with_data and allowed_tels
-            if len(self.allowed_tels) > 0:
-                selected = tels_with_data & self.allowed_tels
-                if len(selected) == 0:
-                    continue  # skip event
-                data.r0.tels_with_data = selected
-                data.r1.tels_with_data = selected
-                data.dl0.tels_with_data = selected
-
-            trigger_information = array_event['trigger_information']
-
-            data.trig.tels_with_trigger = trigger_information['triggered_telescopes']
-            time_s, time_ns = trigger_information['gps_time']
-            data.trig.gps_time = Time(time_s * u.s, time_ns * u.ns,
-                                      format='unix', scale='utc')
-
-            if data.event_type == 'data':
-                self.fill_mc_information(data, array_event)
-
-            # this should be done in a nicer way to not re-allocate the
-            # data each time (right now it's just deleted and garbage
-            # collected)
+    def _fill_event(self, data, counter, array_event):
+        """
+        Fill ``data`` with the ``array_event`` read by ``SimTelFile``.
+        Returns False if the event contains none of the allowed telescopes.
+        """
+        # next lines are just for debugging
+        self.array_event = array_event
+        data.event_type = array_event['type']
+
+        # calibration events do not have an event id
+        if data.event_type == 'calibration':
+            event_id = -1
+        else:
+            event_id = array_event['event_id']
+
+        data.inst.subarray = self._subarray_info
+
+        obs_id = self.file_.header['run']
+        tels_with_data = set(array_event['telescope_events'].keys())
+        data.count = counter
+        data.r0.obs_id = obs_id
+        data.r0.event_id = event_id
+        data.r0.tels_with_data = tels_with_data
+        data.r1.obs_id = obs_id
+        data.r1.event_id = event_id
+        data.r1.tels_with_data = tels_with_data
+        data.dl0.obs_id = obs_id
+        data.dl0.event_id = event_id
+        data.dl0.tels_with_data = tels_with_data
+
+        # handle telescope filtering by taking the intersection of
+        # tels_with_data and allowed_tels
+        if len(self.allowed_tels) > 0:
+            selected = tels_with_data & self.allowed_tels
+            if len(selected) == 0:
+                return False  # skip event
+            data.r0.tels_with_data = selected
+            data.r1.tels_with_data = selected
+            data.dl0.tels_with_data = selected
+
+        trigger_information = array_event['trigger_information']
+
+        data.trig.tels_with_trigger = trigger_information['triggered_telescopes']
+        time_s, time_ns = trigger_information['gps_time']
+        data.trig.gps_time = Time(time_s * u.s, time_ns * u.ns,
+                                  format='unix', scale='utc')
+
+        if data.event_type == 'data':
+            self.fill_mc_information(data, array_event)
+
+        telescope_events = array_event['telescope_events']
+        tracking_positions = array_event['tracking_positions']
+
+        if self.recycle_containers:
+            self._recycle_telescope_containers(data, telescope_events.keys())
+        else:
             data.r0.tel.clear()
             data.r1.tel.clear()
             data.dl0.tel.clear()
             data.dl1.tel.clear()
             data.mc.tel.clear()  # clear the previous telescopes
 
-            telescope_events = array_event['telescope_events']
-            tracking_positions = array_event['tracking_positions']
-            for tel_id, telescope_event in telescope_events.items():
-                tel_index = self.file_.header['tel_id'].tolist().index(tel_id)
-                telescope_description = self.file_.telescope_descriptions[tel_id]
-
-                adc_samples = telescope_event.get('adc_samples')
-                if adc_samples is None:
-                    adc_samples = telescope_event['adc_sums'][:, :, np.newaxis]
-
-                r0 = data.r0.tel[tel_id]
-                r0.waveform = adc_samples
-                r0.num_samples = adc_samples.shape[-1]
-                # We should not calculate stuff in an event source
-                # if this is not needed, we calculate it for nothing
-                r0.image = adc_samples.sum(axis=-1)
-
-                pixel_lists = telescope_event['pixel_lists']
-                r0.num_trig_pix = pixel_lists.get(0, {'pixels': 0})['pixels']
-                if r0.num_trig_pix > 0:
-                    r0.trig_pix_id = pixel_lists[0]['pixel_list']
-
-                pixel_settings = telescope_description['pixel_settings']
-                n_pixel = r0.waveform.shape[-2]
-
-                mc = data.mc.tel[tel_id]
-                mc.dc_to_pe = array_event['laser_calibrations'][tel_id]['calib']
-                mc.pedestal = array_event['camera_monitorings'][tel_id]['pedestal']
-                mc.reference_pulse_shape = pixel_settings['ref_shape'].astype('float64')
-                mc.meta['refstep'] = float(pixel_settings['ref_step'])
-                mc.time_slice = float(pixel_settings['time_slice'])
-                mc.photo_electron_image = (
-                    array_event
-                    .get('photoelectrons', {})
-                    .get(tel_index, {})
-                    .get('photoelectrons', np.zeros(n_pixel, dtype='float32'))
+        photoelectrons = array_event.get('photoelectrons', {})
+        for tel_id, telescope_event in telescope_events.items():
+            telescope_description = self.file_.telescope_descriptions[tel_id]
+
+            adc_samples = telescope_event.get('adc_samples')
+            if adc_samples is None:
+                adc_samples = telescope_event['adc_sums'][:, :, np.newaxis]
+
+            if tel_id not in data.r0.tel:
+                data.r0.tel[tel_id] = _LazyR0CameraContainer()
+            r0 = data.r0.tel[tel_id]
+            r0.waveform = adc_samples
+            r0.num_samples = adc_samples.shape[-1]
+            # only computed when accessed
+            r0.image = None
+
+            pixel_lists = telescope_event['pixel_lists']
+            r0.num_trig_pix = pixel_lists.get(0, {'pixels': 0})['pixels']
+            if r0.num_trig_pix > 0:
+                r0.trig_pix_id = pixel_lists[0]['pixel_list']
+            else:
+                r0.trig_pix_id = None
+
+            pixel_settings = telescope_description['pixel_settings']
+            n_pixel = r0.waveform.shape[-2]
+
+            mc = data.mc.tel[tel_id]
+            mc.dc_to_pe = array_event['laser_calibrations'][tel_id]['calib']
+            mc.pedestal = array_event['camera_monitorings'][tel_id]['pedestal']
+            mc.reference_pulse_shape = self._get_reference_pulse_shape(tel_id)
+            mc.meta['refstep'] = float(pixel_settings['ref_step'])
+            mc.time_slice = float(pixel_settings['time_slice'])
+
+            tel_photoelectrons = photoelectrons.get(self._tel_index[tel_id])
+            if tel_photoelectrons is not None:
+                mc.photo_electron_image = tel_photoelectrons['photoelectrons']
+            else:
+                mc.photo_electron_image = np.zeros(n_pixel, dtype='float32')
+
+            tracking_position = tracking_positions[tel_id]
+            mc.azimuth_raw = tracking_position['azimuth_raw']
+            mc.altitude_raw = tracking_position['altitude_raw']
+            mc.azimuth_cor = tracking_position.get('azimuth_cor', 0)
+            mc.altitude_cor = tracking_position.get('altitude_cor', 0)
+
+        return True
+
+    def _get_reference_pulse_shape(self, tel_id):
+        """
+        The reference pulse shape of a telescope, converted only once.
+        It is shared by all events and therefore read-only.
+        """
+        if tel_id not in self._reference_pulse_shapes:
+            pixel_settings = (
+                self.file_.telescope_descriptions[tel_id]['pixel_settings']
+            )
+            shape = pixel_settings['ref_shape'].astype('float64')
+            shape.flags.writeable = False
+            self._reference_pulse_shapes[tel_id] = shape
+        return self._reference_pulse_shapes[tel_id]
+
+    def _recycle_telescope_containers(self, data, tel_ids):
+        """
+        Make the telescope maps of ``data`` contain exactly ``tel_ids``,
+        taking the containers from the pools of previously used containers.
+        R0 and MC containers are completely refilled by the event source,
+        the containers of the higher data levels are reset.
+        """
+        tel_ids = set(tel_ids)
+        maps = {
+            'r0': data.r0.tel,
+            'r1': data.r1.tel,
+            'dl0': data.dl0.tel,
+            'dl1': data.dl1.tel,
+            'mc': data.mc.tel,
+        }
+        for level, tel_map in maps.items():
+            pool = self._container_pools[level]
+            for tel_id in tel_map.keys() - tel_ids:
+                pool[tel_id] = tel_map.pop(tel_id)
+
+            for tel_id in tel_ids:
+                container = tel_map.get(tel_id)
+                if container is None:
+                    container = pool.pop(tel_id, None)
+                if container is None:
+                    if level == 'r0':
+                        container = _LazyR0CameraContainer()
+                    else:
+                        container = tel_map.default_factory()
+                elif level in ('r1', 'dl0', 'dl1'):
+                    container.reset()
+                tel_map[tel_id] = container
+
+    @property
+    def event_index(self):
+        """
+        The `SimTelEventIndex` of the input file,
+        loaded or built on first access.
+        """
+        if self._event_index is None:
+            self._event_index = SimTelEventIndex.for_file(
+                self.input_url, write=self.write_event_index,
+            )
+        return self._event_index
+
+    def _get_selected_events(self):
+        """ index rows of the events read with the current options """
+        if self._selected_events is None:
+            self._selected_events = self.event_index.select(
+                allowed_tels=self.allowed_tels,
+                skip_calibration=self.skip_calibration_events,
+            )
+        return self._selected_events
+
+    def __len__(self):
+        n_events = len(self._get_selected_events())
+        if self.max_events:
+            return min(n_events, self.max_events)
+        return n_events
+
+    def _get_event_by_index(self, index):
+        """
+        Read the event with ``event.count == index`` directly,
+        using the `event_index`.
+        """
+        selected_events = self._get_selected_events()
+        if index < 0 or index >= len(self):
+            raise IndexError(f'Event index {index} not found in file')
+
+        return self._read_indexed_event(selected_events[index], index)
+
+    def _get_event_by_id(self, event_id):
+        """
+        Read the event with ``event.r0.event_id == event_id`` directly,
+        using the `event_index`.
+        """
+        selected_events = self._get_selected_events()
+        if self._event_id_to_count is None:
+            event_ids = self.event_index.events['event_id'][selected_events]
+            # calibration events have no event id
+            self._event_id_to_count = {
+                event_id: count
+                for count, event_id in enumerate(event_ids.tolist())
+                if event_id != -1
+            }
+
+        count = self._event_id_to_count.get(event_id)
+        if count is None or count >= len(self):
+            raise IndexError(f'Event id {event_id} not found in file')
+
+        return self._read_indexed_event(selected_events[count], count)
+
+    def _open_seek_file(self):
+        return SimTelFile(
+            self.input_url,
+            allowed_telescopes=self.allowed_tels if self.allowed_tels else None,
+            skip_calibration=self.skip_calibration_events
+        )
+
+    def _read_indexed_event(self, row, counter):
+        # a second file, so seeking does not disturb a running iteration
+        if self._seek_file is None:
+            self._seek_file = self._open_seek_file()
+            self._can_seek = _can_seek(self._seek_file)
+            if not self._can_seek:
+                warnings.warn(
+                    'Reading single events at their position is not supported '
+                    'with this version of eventio, reading from the start'
                 )
+        f = self._seek_file
+
+        if not self._can_seek:
+            return self._read_event_sequentially(counter)
+
+        f.current_mc_shower = None
+        f.current_mc_event = None
+        f.current_photoelectrons = {}
+        f.current_photoelectron_sum = None
+        f.current_array_event = None
+        f.current_calibration_event = None
+
+        # read the camera monitoring and laser calibration objects
+        # preceding the event, starting over when seeking backwards
+        event = self.event_index.events[row]
+        calibration_offsets = self.event_index.calibration_offsets
+        n_calibrations = np.searchsorted(calibration_offsets, event['offset'])
+        if n_calibrations < self._n_calibrations_read:
+            f.camera_monitorings.clear()
+            f.laser_calibrations.clear()
+            self._n_calibrations_read = 0
+        for offset in calibration_offsets[self._n_calibrations_read:n_calibrations]:
+            f._next_header_pos = int(offset)
+            f.next_low_level()
+        self._n_calibrations_read = n_calibrations
+
+        # replay the objects the event depends on, then the event itself
+        offsets = [event[col] for col in STATE_OFFSET_COLUMNS]
+        for offset in sorted(o for o in offsets if o >= 0) + [event['offset']]:
+            f._next_header_pos = int(offset)
+            f.next_low_level()
+
+        array_event = f.try_build_event()
+        data = self._create_data_container()
+        if array_event is None or not self._fill_event(data, counter, array_event):
+            raise ValueError(
+                f'Event {counter} of the event index of {self.input_url} '
+                'contains none of the allowed telescopes, the index does '
+                'not match the file'
+            )
+        return data
 
-                tracking_position = tracking_positions[tel_id]
-                mc.azimuth_raw = tracking_position['azimuth_raw']
-                mc.altitude_raw = tracking_position['altitude_raw']
-                mc.azimuth_cor = tracking_position.get('azimuth_cor', 0)
-                mc.altitude_cor = tracking_position.get('altitude_cor', 0)
-            yield data
+    def _read_event_sequentially(self, counter):
+        """
+        Read the ``counter``-th of the selected events by reading the file
+        from the start. SimTelFile yields exactly the selected events.
+        """
+        with self._open_seek_file() as f:
+            for i, array_event in enumerate(f):
+                if i == counter:
+                    data = self._create_data_container()
+                    self._fill_event(data, counter, array_event)
+                    return data
+
+        raise IndexError(f'Event index {counter} not found in file')
 
     def fill_mc_information(self, data, array_event):
         mc_event = array_event['mc_event']
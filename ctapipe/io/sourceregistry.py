@@ -0,0 +1,169 @@
+"""
+Registry of the event sources `~ctapipe.io.EventSource.from_url` chooses from.
+"""
+from ..core import non_abstract_children
+from ..core.plugins import detect_and_import_io_plugins, plugin_entry_points
+
+__all__ = ['EventSourceRegistry', 'read_header']
+
+
+def read_header(path, size):
+    """
+    The first ``size`` bytes of the file at ``path``,
+    None if it is not a readable file, e.g. a URL.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(size)
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _matches_header(cls, header):
+    """ True if the `magic_bytes` of ``cls`` allow it to read ``header`` """
+    magic_bytes = getattr(cls, 'magic_bytes', ())
+    if header is None or not magic_bytes:
+        return True
+    return header.startswith(tuple(magic_bytes))
+
+
+class EventSourceRegistry:
+    """
+    Event sources that can be chosen for a file, and the order they are
+    tried in.
+
+    The sources are the non-abstract subclasses of ``base`` that are
+    imported and the sources of plugins, registered as entry points
+    in the ``entry_point_group``, e.g. in the ``setup.py`` of the plugin::
+
+        entry_points={
+            'ctapipe_io': ['MyEventSource = ctapipe_io_mine:MyEventSource'],
+        }
+
+    The first bytes of a file are compared to the `magic_bytes` of the
+    sources, and only the sources that can read a file starting with these
+    bytes, or do not declare their magic bytes, are asked whether they are
+    compatible with the file.
+
+    The installed entry points are looked up once per process and a plugin
+    is only imported when no imported source is compatible with a file.
+    Its magic bytes are then known and used for all following files.
+    As a last resort, the modules named ``ctapipe_io_*`` are imported once,
+    for plugins that do not register an entry point.
+
+    Parameters
+    ----------
+    base: type
+        base class of the event sources, e.g. `~ctapipe.io.EventSource`
+    entry_point_group: str
+        entry point group of the plugins
+    header_size: int
+        number of bytes read from a file to compare to the magic bytes
+    """
+
+    def __init__(self, base, entry_point_group='ctapipe_io', header_size=64):
+        self.base = base
+        self.entry_point_group = entry_point_group
+        self.header_size = header_size
+        self._registered = {}
+
+    def register(self, name, target):
+        """
+        Add a source that is imported only once it is needed.
+
+        Parameters
+        ----------
+        name: str
+            name of the source class
+        target: str
+            import path of the source class, ``'module:ClassName'``
+        """
+        self._registered[name] = target
+
+    def _pending(self):
+        """ import paths of the plugin sources that were not imported yet """
+        pending = dict(self._registered)
+        for entry_point in plugin_entry_points(self.entry_point_group):
+            pending.setdefault(entry_point.name, entry_point.value)
+
+        loaded = {cls.__name__ for cls in non_abstract_children(self.base)}
+        return {
+            name: target for name, target in pending.items()
+            if name not in loaded
+        }
+
+    def available(self, base=None):
+        """
+        Names of all sources, including plugins that were not imported yet
+        """
+        base = base or self.base
+        names = [cls.__name__ for cls in non_abstract_children(base)]
+        names.extend(name for name in self._pending() if name not in names)
+        return names
+
+    def _imported_candidates(self, base, header, tried):
+        classes = [
+            cls for cls in non_abstract_children(base)
+            if cls not in tried and _matches_header(cls, header)
+        ]
+        # sources recognising the file by its magic bytes first
+        classes.sort(key=lambda cls: not getattr(cls, 'magic_bytes', ()))
+        return classes
+
+    def candidates(self, path, base=None):
+        """
+        Sources that might be able to read the file at ``path``,
+        in the order they should be tried.
+
+        This is a generator, plugins are only imported when the
+        sources before them have been tried.
+
+        Parameters
+        ----------
+        path: str
+            path of the file
+        base: type
+            only return subclasses of ``base``, defaults to the base
+            of the registry
+        """
+        base = base or self.base
+        header = read_header(path, self.header_size)
+        tried = set()
+
+        for cls in self._imported_candidates(base, header, tried):
+            tried.add(cls)
+            yield cls
+
+        for target in self._pending().values():
+            module_name, _, class_name = target.partition(':')
+            module = __import__(module_name, fromlist=[class_name])
+            cls = getattr(module, class_name)
+            if cls in tried or not issubclass(cls, base):
+                continue
+            tried.add(cls)
+            if _matches_header(cls, header):
+                yield cls
+
+        detect_and_import_io_plugins()
+        yield from self._imported_candidates(base, header, tried)
+
+    def find(self, path, base=None):
+        """
+        The first source compatible with the file at ``path``.
+
+        Raises
+        ------
+        ValueError
+            if no source is compatible with the file
+        """
+        base = base or self.base
+        for cls in self.candidates(path, base):
+            if cls.is_compatible(path):
+                return cls
+
+        raise ValueError(
+            'Cannot find compatible EventSource for \n'
+            '\turl:{}\n'
+            'in available EventSources:\n'
+            '\t{}'.format(path, self.available(base))
+        )
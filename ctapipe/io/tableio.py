@@ -18,6 +18,8 @@ class TableWriter(Component, metaclass=ABCMeta):
     ctapipe.io.HDF5TableWriter: Implementation of this base class for writing HDF5 files
     """
 
+    profiled_methods = ('write', )
+
     def __init__(self, parent=None, add_prefix=False, **kwargs):
         super().__init__(parent=parent, **kwargs)
         self._transforms = defaultdict(dict)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from ctapipe.io.eventindex import SimTelEventIndex, INDEX_DTYPE
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / 'events.simtel'
+    path.write_bytes(b'not really a simtel file')
+
+    events = np.zeros(4, dtype=INDEX_DTYPE)
+    events['offset'] = [100, 200, 300, 400]
+    events['event_id'] = [10, -1, 20, 30]
+    events['calibration'] = [False, True, False, False]
+    tel_ids = np.array([1, 2, 1, 3, 4], dtype=np.int16)
+    tel_ptr = np.array([0, 2, 3, 3, 5])
+    calibration_offsets = np.array([50, 60, 250])
+
+    return path, SimTelEventIndex(
+        events, tel_ids, tel_ptr, calibration_offsets,
+        *SimTelEventIndex._file_stats(path)
+    )
+
+
+def test_select(index):
+    _, index = index
+
+    assert len(index) == 4
+    assert list(index.telescopes(0)) == [1, 2]
+    assert list(index.telescopes(2)) == []
+
+    assert list(index.select()) == [0, 2, 3]
+    assert list(index.select(skip_calibration=False)) == [0, 1, 2, 3]
+    assert list(index.select(allowed_tels={1})) == [0]
+    selected = index.select(allowed_tels={1}, skip_calibration=False)
+    assert list(selected) == [0, 1]
+    assert list(index.select(allowed_tels={2, 4})) == [0, 3]
+    assert list(index.select(allowed_tels={5})) == []
+
+
+def test_write_read(index):
+    path, index = index
+    index_path = SimTelEventIndex.sidecar_path(path)
+    index.write(index_path)
+
+    loaded = SimTelEventIndex.read(index_path)
+    assert loaded.matches(path)
+    assert np.all(loaded.events == index.events)
+    assert np.all(loaded.tel_ids == index.tel_ids)
+    assert np.all(loaded.tel_ptr == index.tel_ptr)
+    assert np.all(loaded.calibration_offsets == index.calibration_offsets)
+
+    # the sidecar is used as long as the file is unchanged
+    assert np.all(SimTelEventIndex.for_file(path).events == index.events)
+
+    path.write_bytes(b'changed')
+    assert not loaded.matches(path)
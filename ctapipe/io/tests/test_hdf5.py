@@ -356,6 +356,170 @@ def test_read_write_container_with_int_enum(tmp_path):
                 )
 
 
+def test_buffered_writer(tmp_path):
+    """ buffered writing must give the same tables as row-wise writing """
+    mc = MCEventContainer()
+    mc.reset()
+    hillas = HillasParametersContainer()
+
+    rng = np.random.RandomState(0)
+    energies = 10**rng.uniform(-1, 2, 25) * u.TeV
+    widths = rng.uniform(0, 1, 25) * u.m
+    skewnesses = rng.normal(size=25)
+
+    paths = {}
+    for buffer_size in (None, 7):
+        path = tmp_path / 'buffer_{}.h5'.format(buffer_size)
+        paths[buffer_size] = path
+        with HDF5TableWriter(
+            path,
+            group_name='data',
+            add_prefix=True,
+            buffer_size=buffer_size,
+            chunk_size=10,
+            filters=tables.Filters(complevel=5),
+        ) as writer:
+            writer.exclude('mc', 'mcevent_tel_.*')
+            writer.add_column_transform(
+                'events', 'hillas_skewness', lambda skewness: 2 * skewness
+            )
+
+            for energy, width, skewness in zip(energies, widths, skewnesses):
+                mc.energy = energy
+                hillas.width = width
+                hillas.skewness = skewness
+                writer.write('mc', mc)
+                writer.write('events', [mc, hillas])
+
+            if buffer_size is not None:
+                # 3 full buffers were written, the last 4 rows still buffered
+                assert writer._tables['mc'].nrows == 21
+
+    with tables.open_file(paths[None]) as unbuffered, \
+            tables.open_file(paths[7]) as buffered:
+        for table_name in ('mc', 'events'):
+            expected = unbuffered.root.data[table_name]
+            table = buffered.root.data[table_name]
+            assert table.nrows == 25
+            assert table.chunkshape == (10, )
+            assert table.filters.complevel == 5
+            for colname in expected.colnames:
+                np.testing.assert_array_equal(
+                    table.col(colname), expected.col(colname)
+                )
+
+        assert np.allclose(
+            buffered.root.data.mc.col('mcevent_energy'),
+            energies.to_value(u.TeV),
+        )
+        assert np.allclose(
+            buffered.root.data.events.col('hillas_width'), widths.to_value(u.m)
+        )
+        assert np.allclose(
+            buffered.root.data.events.col('hillas_skewness'), 2 * skewnesses
+        )
+
+
+@pytest.mark.parametrize('buffer_size', [None, 3])
+def test_transform_after_first_write(tmp_path, buffer_size):
+    """ transforms added for an existing table apply to the following rows """
+    tmp_file = tmp_path / 'transform.h5'
+    hillas = HillasParametersContainer()
+
+    with HDF5TableWriter(
+        tmp_file, group_name='data', buffer_size=buffer_size
+    ) as writer:
+        for skewness in range(4):
+            hillas.skewness = skewness
+            writer.write('hillas', hillas)
+            if skewness == 1:
+                writer.add_column_transform(
+                    'hillas', 'skewness', lambda value: 10 * value
+                )
+
+    with tables.open_file(tmp_file) as f:
+        skewness = f.root.data.hillas.col('skewness')
+    np.testing.assert_array_equal(skewness, [0, 1, 20, 30])
+
+
+def test_buffered_writer_flush(tmp_path):
+    tmp_file = tmp_path / 'flush.h5'
+    container = WithIntEnum()
+
+    with HDF5TableWriter(tmp_file, group_name='data', buffer_size=100) as h5:
+        for i in range(10):
+            container.event_type = container.EventType(i % 3 + 1)
+            h5.write('table', container)
+
+        assert h5._tables['table'].nrows == 0
+        h5.flush()
+        assert h5._tables['table'].nrows == 10
+
+    with HDF5TableReader(tmp_file) as h5:
+        event_types = [
+            c.event_type for c in h5.read('/data/table', WithIntEnum())
+        ]
+    assert event_types == [WithIntEnum.EventType(i % 3 + 1) for i in range(10)]
+
+    with pytest.raises(ValueError):
+        HDF5TableWriter(tmp_file, group_name='data', buffer_size=0)
+
+
+def test_bulk_read(tmp_path):
+    tmp_file = tmp_path / 'bulk.h5'
+    mc = MCEventContainer()
+    mc.reset()
+    data = WithIntEnum()
+
+    energies = np.logspace(-1, 2, 25) * u.TeV
+    with HDF5TableWriter(tmp_file, group_name='data') as writer:
+        for i, energy in enumerate(energies):
+            mc.energy = energy
+            mc.core_x = i * u.m
+            data.event_type = data.EventType(i % 3 + 1)
+            writer.write('mc', mc)
+            writer.write('types', data)
+
+    with HDF5TableReader(tmp_file) as reader:
+        array = reader.read_array('/data/mc', columns=['energy'], stop=10)
+        assert array.dtype.names == ('energy', )
+        assert np.all(array['energy'] == energies[:10].to_value(u.TeV))
+
+        table = reader.read_table('/data/mc', start=5, stop=15)
+        assert len(table) == 10
+        assert table['energy'].unit == u.TeV
+        assert u.allclose(table['energy'], energies[5:15])
+        assert u.allclose(table['core_x'], np.arange(5, 15) * u.m)
+
+        table = reader.read_table('/data/types')
+        assert all(isinstance(t, WithIntEnum.EventType)
+                   for t in table['event_type'])
+        assert list(table['event_type']) == [
+            WithIntEnum.EventType(i % 3 + 1) for i in range(25)
+        ]
+
+        with pytest.raises(KeyError):
+            reader.read_table('/data/mc', columns=['foo'])
+
+        chunks = list(reader.iter_chunks(
+            '/data/mc', chunk_size=4, columns=['energy'], start=3
+        ))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 4, 4, 4, 2]
+        assert chunks[0].colnames == ['energy']
+        assert u.allclose(
+            np.concatenate([c['energy'] for c in chunks]), energies[3:]
+        )
+
+        energies_read = []
+        containers = set()
+        for batch in reader.read_batches('/data/mc', mc, batch_size=10):
+            containers.update(id(c) for c in batch)
+            energies_read.extend(c.energy for c in batch)
+        # the same 10 containers are used for all batches
+        assert len(containers) == 10
+        assert u.allclose(u.Quantity(energies_read), energies)
+
+
 if __name__ == '__main__':
 
     import logging
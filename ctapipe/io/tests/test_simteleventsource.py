@@ -1,8 +1,12 @@
 import numpy as np
 import pytest
 import copy
+from shutil import copy2
+from ctapipe.core import ArrayMap
 from ctapipe.utils import get_dataset_path
+from ctapipe.io import simteleventsource
 from ctapipe.io.simteleventsource import SimTelEventSource
+from ctapipe.io.eventindex import SimTelEventIndex
 from ctapipe.io.hessioeventsource import HESSIOEventSource
 from itertools import zip_longest
 
@@ -196,3 +200,148 @@ def test_calibration_events():
     ) as reader:
         for e in reader:
             pass
+
+
+@pytest.mark.parametrize('seek', [True, False])
+def test_event_index(tmp_path, monkeypatch, seek):
+    # copy the file, so the index sidecar file is written to tmp_path
+    path = tmp_path / 'gamma_test.simtel.gz'
+    copy2(gamma_test_path, path)
+    if not seek:
+        # reading from the start, as with untested eventio versions
+        monkeypatch.setattr(simteleventsource, 'SEEK_EVENTIO_VERSIONS', ())
+
+    for allowed_tels in (None, {3, 4}):
+        kwargs = dict(input_url=str(path))
+        if allowed_tels:
+            kwargs['allowed_tels'] = allowed_tels
+
+        with SimTelEventSource(**kwargs) as source:
+            expected = [copy.deepcopy(event) for event in source]
+
+        with SimTelEventSource(write_event_index=True, **kwargs) as source:
+            assert len(source) == len(expected)
+
+            for index in (len(expected) - 1, 0, len(expected) // 2):
+                event = source._get_event_by_index(index)
+                assert event.count == index
+                assert event.r0.event_id == expected[index].r0.event_id
+                assert (
+                    event.r0.tels_with_data == expected[index].r0.tels_with_data
+                )
+                assert event.mc.energy == expected[index].mc.energy
+                for tel_id in event.r0.tels_with_data:
+                    assert np.all(
+                        event.r0.tel[tel_id].waveform
+                        == expected[index].r0.tel[tel_id].waveform
+                    )
+                    assert np.all(
+                        event.mc.tel[tel_id].dc_to_pe
+                        == expected[index].mc.tel[tel_id].dc_to_pe
+                    )
+
+            event = source._get_event_by_id(expected[-1].r0.event_id)
+            assert event.count == len(expected) - 1
+
+            with pytest.raises(IndexError):
+                source._get_event_by_index(len(expected))
+            with pytest.raises(IndexError):
+                source._get_event_by_id(-5)
+
+        # max_events limits the random access like the iteration
+        max_events = len(expected) - 1
+        with SimTelEventSource(max_events=max_events, **kwargs) as source:
+            assert len(source) == max_events
+            assert source._get_event_by_index(max_events - 1).count == max_events - 1
+            with pytest.raises(IndexError):
+                source._get_event_by_index(max_events)
+            with pytest.raises(IndexError):
+                source._get_event_by_id(expected[-1].r0.event_id)
+
+    sidecar = SimTelEventIndex.sidecar_path(path)
+    index = SimTelEventIndex.read(sidecar)
+    assert index.matches(path)
+    assert len(index.select()) == len(SimTelEventIndex.build(path).select())
+
+
+def test_event_index_allowed_tels():
+    # select by a telescope of the first event, so other events are excluded
+    index = SimTelEventIndex.build(gamma_test_path)
+    allowed_tels = {int(index.telescopes(index.select()[0])[0])}
+
+    with SimTelEventSource(
+            input_url=gamma_test_path, allowed_tels=allowed_tels
+    ) as source:
+        expected = [copy.deepcopy(event) for event in source]
+        rows = source.event_index.select(allowed_tels=allowed_tels)
+        assert len(rows) == len(expected) == len(source)
+
+        for count, (row, expected_event) in enumerate(zip(rows, expected)):
+            tels = set(source.event_index.telescopes(row).tolist())
+            assert tels & allowed_tels == expected_event.r0.tels_with_data
+
+            event = source._get_event_by_index(count)
+            assert event.r0.event_id == expected_event.r0.event_id
+            assert event.r0.tels_with_data == expected_event.r0.tels_with_data
+
+        # an event without the allowed telescopes is not read silently
+        excluded = np.setdiff1d(source.event_index.select(), rows)
+        assert len(excluded) > 0
+        with pytest.raises(ValueError):
+            source._read_indexed_event(excluded[0], 0)
+
+
+def test_event_index_not_written_by_default(tmp_path):
+    path = tmp_path / 'gamma_test.simtel.gz'
+    copy2(gamma_test_path, path)
+
+    with SimTelEventSource(input_url=str(path)) as source:
+        assert len(source) > 0
+
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_recycle_containers():
+    with SimTelEventSource(input_url=gamma_test_path, max_events=10) as source:
+        expected = [copy.deepcopy(event) for event in source]
+
+    containers = {}
+    with SimTelEventSource(
+            input_url=gamma_test_path,
+            max_events=10,
+            recycle_containers=True,
+    ) as source:
+        for event, expected_event in zip_longest(source, expected):
+            assert event.count == expected_event.count
+            assert set(event.r0.tel) == event.r0.tels_with_data
+            assert set(event.mc.tel) == event.r0.tels_with_data
+            assert isinstance(event.mc.tel, ArrayMap)
+
+            for tel_id in event.r0.tels_with_data:
+                r0 = event.r0.tel[tel_id]
+                expected_r0 = expected_event.r0.tel[tel_id]
+                assert np.all(r0.waveform == expected_r0.waveform)
+                assert np.all(r0.image == expected_r0.image)
+                assert np.all(
+                    event.mc.tel[tel_id].photo_electron_image
+                    == expected_event.mc.tel[tel_id].photo_electron_image
+                )
+
+                # telescope containers are reused
+                if tel_id in containers:
+                    assert r0 is containers[tel_id]
+                containers[tel_id] = r0
+
+
+def test_mc_containers_not_reused():
+    """ without recycle_containers, containers of earlier events are kept """
+    kept = []
+    with SimTelEventSource(input_url=gamma_test_path, max_events=10) as source:
+        for event in source:
+            assert not isinstance(event.mc.tel, ArrayMap)
+            for mc in event.mc.tel.values():
+                kept.append((mc, mc.photo_electron_image.copy()))
+
+    assert len({id(mc) for mc, _ in kept}) == len(kept)
+    for mc, photo_electron_image in kept:
+        assert np.all(mc.photo_electron_image == photo_electron_image)
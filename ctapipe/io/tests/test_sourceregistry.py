@@ -0,0 +1,100 @@
+import pytest
+from ctapipe.io.eventsource import EventSource
+from ctapipe.io.sourceregistry import EventSourceRegistry, read_header
+
+
+class RegistryTestSource(EventSource):
+    """ Base of the sources in this test, keeping them out of other tests """
+    asked = []
+
+    def _generator(self):
+        return iter([])
+
+
+class FirstSource(RegistryTestSource):
+    magic_bytes = (b'TEST1', )
+
+    @classmethod
+    def is_compatible(cls, file_path):
+        RegistryTestSource.asked.append(cls)
+        return True
+
+
+class SecondSource(RegistryTestSource):
+    magic_bytes = (b'TEST2', b'TEST3')
+
+    @classmethod
+    def is_compatible(cls, file_path):
+        RegistryTestSource.asked.append(cls)
+        return True
+
+
+PLUGIN = '''
+from ctapipe.io.tests.test_sourceregistry import RegistryTestSource
+
+
+class PluginSource(RegistryTestSource):
+    magic_bytes = (b'PLUGIN', )
+
+    @classmethod
+    def is_compatible(cls, file_path):
+        RegistryTestSource.asked.append(cls)
+        return True
+'''
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = {}
+    for name in ('TEST1', 'TEST3', 'PLUGIN', 'OTHER'):
+        path = tmp_path / name
+        path.write_bytes(name.encode() + b'\0' * 100)
+        paths[name] = str(path)
+    return paths
+
+
+def test_read_header(files):
+    assert read_header(files['TEST1'], 5) == b'TEST1'
+    assert read_header('/fake_path/fake_file', 5) is None
+
+
+def test_magic_bytes(files):
+    registry = EventSourceRegistry(RegistryTestSource)
+
+    RegistryTestSource.asked.clear()
+    assert registry.find(files['TEST1']) is FirstSource
+    assert registry.find(files['TEST3']) is SecondSource
+    # sources are only asked about files starting with their magic bytes
+    assert RegistryTestSource.asked == [FirstSource, SecondSource]
+
+    with pytest.raises(ValueError):
+        registry.find(files['OTHER'])
+
+    # without a header, all sources are candidates
+    assert list(registry.candidates('/fake_path/fake_file')) == [
+        FirstSource, SecondSource
+    ]
+
+
+def test_lazy_plugin(files, tmp_path, monkeypatch):
+    plugin_dir = tmp_path / 'plugins'
+    plugin_dir.mkdir()
+    (plugin_dir / 'registry_test_plugin.py').write_text(PLUGIN)
+    monkeypatch.syspath_prepend(str(plugin_dir))
+
+    registry = EventSourceRegistry(RegistryTestSource)
+    registry.register('PluginSource', 'registry_test_plugin:PluginSource')
+    assert 'PluginSource' in registry.available()
+
+    # the plugin is not imported while an imported source is compatible
+    assert registry.find(files['TEST1']) is FirstSource
+    assert 'registry_test_plugin' not in __import__('sys').modules
+
+    cls = registry.find(files['PLUGIN'])
+    assert cls.__name__ == 'PluginSource'
+    assert cls.__module__ == 'registry_test_plugin'
+
+    # imported plugins are used like any other source
+    RegistryTestSource.asked.clear()
+    assert registry.find(files['PLUGIN']) is cls
+    assert RegistryTestSource.asked == [cls]
@@ -6,6 +6,7 @@ Contact: Tino Michael <Tino.Michael@cea.fr>
 
 
 from ctapipe.reco.reco_algorithms import Reconstructor
+from ctapipe.reco.batch import group_events, event_pairs, sum_by_event
 from ctapipe.io.containers import ReconstructedShowerContainer
 from itertools import combinations
 
@@ -27,6 +28,7 @@ import warnings
 import numpy as np
 
 from astropy import units as u
+from astropy.table import QTable
 
 
 __all__ = ['HillasReconstructor', 'TooFewTelescopesException', 'HillasPlane']
@@ -89,6 +91,117 @@ def line_line_intersection_3d(uvw_vectors, origins):
     return np.linalg.inv(S) @ C
 
 
+def line_line_intersection_3d_batch(uvw_vectors, origins, event, n_events):
+    '''
+    Intersection of many lines in 3d for many events at once,
+    see `line_line_intersection_3d`.
+
+    Parameters
+    ----------
+    uvw_vectors: np.ndarray of shape (n, 3)
+        unit direction vectors of the lines
+    origins: np.ndarray of shape (n, 3)
+        a point on each line
+    event: np.ndarray of shape (n, )
+        index of the event of each line
+    n_events: int
+        number of events
+
+    Returns
+    -------
+    np.ndarray of shape (n_events, 3)
+    '''
+    norm_matrices = (
+        uvw_vectors[:, :, np.newaxis] * uvw_vectors[:, np.newaxis, :]
+        - np.eye(3)
+    )
+    S = sum_by_event(norm_matrices, event, n_events)
+    C = sum_by_event(
+        np.einsum('nij,nj->ni', norm_matrices, origins), event, n_events
+    )
+    return np.linalg.solve(S, C[:, :, np.newaxis])[:, :, 0]
+
+
+def _rotation_matrices(angle, axis):
+    '''
+    Stack of rotation matrices with the same convention as
+    `astropy.coordinates.matrix_utilities.rotation_matrix`
+    '''
+    c = np.cos(angle)
+    s = np.sin(angle)
+    zero = np.zeros_like(c)
+    one = np.ones_like(c)
+    if axis == 'y':
+        rows = [[c, zero, -s], [zero, one, zero], [s, zero, c]]
+    elif axis == 'z':
+        rows = [[c, s, zero], [-s, c, zero], [zero, zero, one]]
+    else:
+        raise ValueError('Unsupported axis {}'.format(axis))
+    return np.stack([np.stack(row, axis=-1) for row in rows], axis=-2)
+
+
+def camera_to_horizon_vectors(x, y, focal_length, pointing_alt, pointing_az):
+    '''
+    Cartesian direction vectors of camera positions, as used by
+    `HillasPlane`, i.e. with the azimuth counting clockwise.
+
+    This is the same transformation as going from the `CameraFrame`
+    to `AltAz` using astropy, but uses plain numpy rotation matrices,
+    so it can be applied to many positions with different pointings at once.
+
+    Parameters
+    ----------
+    x, y: np.ndarray
+        positions in the camera in meter
+    focal_length: np.ndarray
+        focal length of the telescope in meter
+    pointing_alt, pointing_az: np.ndarray
+        pointing direction of the telescope in radians
+
+    Returns
+    -------
+    np.ndarray of shape (n, 3)
+    '''
+    # small angle approximation, see ctapipe.coordinates.camera_frame
+    delta_alt = x / focal_length
+    delta_az = y / focal_length
+    telescope_vectors = np.column_stack([
+        np.cos(delta_alt) * np.cos(delta_az),
+        np.cos(delta_alt) * np.sin(delta_az),
+        np.sin(delta_alt),
+    ])
+
+    # TelescopeFrame -> AltAz, the transposed rotation of AltAz -> TelescopeFrame
+    rotation = np.einsum(
+        'nij,njk->nik',
+        _rotation_matrices(-pointing_alt, 'y'),
+        _rotation_matrices(pointing_az, 'z'),
+    )
+    horizon_vectors = np.einsum('nji,nj->ni', rotation, telescope_vectors)
+
+    # astropy's coordinates system rotates counter clockwise.
+    horizon_vectors[:, 1] *= -1
+    return horizon_vectors
+
+
+def _shower_trans_matrices(azimuth, altitude):
+    '''
+    Stack of the matrices of `ctapipe.coordinates.ground_frames.get_shower_trans_matrix`
+    '''
+    cos_z = np.sin(altitude)
+    sin_z = np.cos(altitude)
+    cos_az = np.cos(azimuth)
+    sin_az = np.sin(azimuth)
+    zero = np.zeros_like(cos_z)
+
+    rows = [
+        [cos_z * cos_az, -cos_z * sin_az, -sin_z],
+        [sin_az, cos_az, zero],
+        [sin_z * cos_az, -sin_z * sin_az, cos_z],
+    ]
+    return np.stack([np.stack(row, axis=-1) for row in rows], axis=-2)
+
+
 class HillasReconstructor(Reconstructor):
     """
     class that reconstructs the direction of an atmospheric shower
@@ -352,6 +465,174 @@ class HillasReconstructor(Reconstructor):
         # not sure if its better to return the length of the vector of the z component
         return np.linalg.norm(line_line_intersection_3d(uvw_vectors, positions)) * u.m
 
+    def predict_table(
+        self,
+        hillas_table,
+        subarray,
+        pointing_alt,
+        pointing_az,
+        event_column='event_id',
+    ):
+        '''
+        Reconstruct many events at once from a table of hillas parameters.
+
+        This gives the same results as calling `predict` for each event,
+        but does all coordinate transformations with numpy rotation matrices
+        instead of astropy frames, and processes all events in vectorized
+        operations, which is orders of magnitude faster for large tables,
+        e.g. read using `ctapipe.io.HDF5TableReader.read_table`.
+
+        For the core position, the pointing of the first telescope of an event
+        is used as pointing of the array.
+
+        Parameters
+        ----------
+        hillas_table: astropy.table.Table
+            table with one row per telescope image, needs the columns
+            ``tel_id``, ``event_column`` and the fields of
+            `~ctapipe.io.containers.HillasParametersContainer`
+            ``x``, ``y``, ``psi``, ``intensity``, ``length``, ``width``.
+            Columns without unit are assumed to be in meter and radian.
+        subarray : ctapipe.instrument.SubarrayDescription
+            subarray information
+        pointing_alt: astropy.units.Quantity
+            pointing altitude of the telescopes, a scalar or one entry per row
+        pointing_az: astropy.units.Quantity
+            pointing azimuth of the telescopes, a scalar or one entry per row
+        event_column: str
+            name of the column identifying the events
+
+        Returns
+        -------
+        astropy.table.QTable
+            one row per event, sorted by ``event_column``, with the
+            reconstructed ``alt``, ``az``, ``alt_uncert``, ``core_x``,
+            ``core_y``, ``h_max``, ``average_intensity``, the number of
+            telescopes ``n_tels`` and ``is_valid``. Events with less than
+            two telescopes are not valid and have nan entries.
+        '''
+        order, events, starts, counts = group_events(hillas_table[event_column])
+        n_events = len(events)
+        n_rows = len(order)
+
+        def column(name, unit):
+            return u.Quantity(hillas_table[name], unit).to_value(unit)[order]
+
+        def per_row(angle):
+            angle = u.Quantity(angle, u.rad).to_value(u.rad)
+            return np.broadcast_to(angle, (n_rows, ))[order]
+
+        tel_ids = np.asarray(hillas_table['tel_id'])[order]
+        x = column('x', u.m)
+        y = column('y', u.m)
+        psi = column('psi', u.rad)
+        intensity = np.asarray(hillas_table['intensity'], dtype=float)[order]
+        length = column('length', u.m)
+        width = column('width', u.m)
+        alt = per_row(pointing_alt)
+        az = per_row(pointing_az)
+
+        unique_tels, tel_index = np.unique(tel_ids, return_inverse=True)
+        focal_lengths = u.Quantity([
+            subarray.tel[tel_id].optics.equivalent_focal_length
+            for tel_id in unique_tels
+        ]).to_value(u.m)[tel_index]
+        positions = u.Quantity([
+            subarray.positions[tel_id] for tel_id in unique_tels
+        ]).to_value(u.m)[tel_index]
+
+        valid = counts >= 2
+        row_valid = np.repeat(valid, counts)
+        row_event = np.repeat(np.arange(n_events), counts)
+
+        # hillas planes
+        a = camera_to_horizon_vectors(x, y, focal_lengths, alt, az)
+        b = camera_to_horizon_vectors(
+            x + 0.1 * np.cos(psi), y + 0.1 * np.sin(psi), focal_lengths, alt, az
+        )
+        c = np.cross(np.cross(a, b), a)
+        norm = np.cross(a, c)
+        norm /= np.linalg.norm(norm, axis=1)[:, np.newaxis]
+        weight = intensity * (length / width)
+
+        # direction
+        first, second, pair_event = event_pairs(starts, counts)
+        crossings = np.cross(norm[first], norm[second])
+        crossings[crossings[:, 2] < 0] *= -1
+        crossings *= (weight[first] * weight[second])[:, np.newaxis]
+
+        # events with a single telescope have no crossings
+        with np.errstate(invalid='ignore', divide='ignore'):
+            direction = sum_by_event(crossings, pair_event, n_events)
+            direction /= np.linalg.norm(direction, axis=1)[:, np.newaxis]
+
+            cos_angle = (
+                np.einsum('ij,ij->i', direction[pair_event], crossings)
+                / np.linalg.norm(crossings, axis=1)
+            )
+            off_angles = np.arccos(np.clip(cos_angle, -1.0, 1.0))
+            n_pairs = np.bincount(pair_event, minlength=n_events)
+            alt_uncert = np.bincount(
+                pair_event, weights=off_angles, minlength=n_events
+            ) / n_pairs
+
+        reco_alt = np.arctan2(direction[:, 2], np.hypot(direction[:, 0], direction[:, 1]))
+        reco_az = -np.mod(np.arctan2(direction[:, 1], direction[:, 0]), 2 * np.pi)
+
+        # the lines are only solvable for at least two telescopes
+        valid_event = np.cumsum(valid) - 1
+        line_event = valid_event[row_event[row_valid]]
+        n_valid = np.count_nonzero(valid)
+
+        # core position in the tilted frame of the array pointing
+        trans = _shower_trans_matrices(az[starts], alt[starts])
+        tilted = np.einsum('nij,nj->ni', trans[row_event, :2], positions)
+        tilted_origins = np.column_stack([tilted, np.zeros(n_rows)])
+        uvw_vectors = np.column_stack([np.cos(psi), np.sin(psi), np.zeros(n_rows)])
+
+        core_x = np.full(n_events, np.nan)
+        core_y = np.full(n_events, np.nan)
+        h_max = np.full(n_events, np.nan)
+        if n_valid > 0:
+            core_tilted = line_line_intersection_3d_batch(
+                uvw_vectors[row_valid], tilted_origins[row_valid],
+                line_event, n_valid,
+            )
+            trans_valid = trans[valid]
+            ground = np.einsum(
+                'nji,nj->ni', trans_valid[:, :2], core_tilted[:, :2]
+            )
+            core_x[valid] = (
+                ground[:, 0] - trans_valid[:, 2, 0] * ground[:, 2] / trans_valid[:, 2, 2]
+            )
+            core_y[valid] = (
+                ground[:, 1] - trans_valid[:, 2, 1] * ground[:, 2] / trans_valid[:, 2, 2]
+            )
+
+            h_max[valid] = np.linalg.norm(line_line_intersection_3d_batch(
+                a[row_valid], positions[row_valid], line_event, n_valid,
+            ), axis=1)
+
+        for values in (reco_alt, reco_az, alt_uncert):
+            values[~valid] = np.nan
+
+        average_intensity = np.bincount(
+            row_event, weights=intensity, minlength=n_events
+        ) / counts
+
+        return QTable({
+            event_column: events,
+            'alt': u.Quantity(reco_alt, u.rad),
+            'az': u.Quantity(reco_az, u.rad),
+            'alt_uncert': u.Quantity(alt_uncert, u.rad),
+            'core_x': u.Quantity(core_x, u.m),
+            'core_y': u.Quantity(core_y, u.m),
+            'h_max': u.Quantity(h_max, u.m),
+            'average_intensity': average_intensity,
+            'n_tels': counts,
+            'is_valid': valid,
+        })
+
 
 class HillasPlane:
     """
@@ -3,6 +3,7 @@
 
 """
 import math
+import os
 
 import numpy as np
 import numpy.ma as ma
@@ -18,13 +19,18 @@ from ctapipe.coordinates import (
     GroundFrame,
     project_to_ground,
 )
-from ctapipe.image import poisson_likelihood_gaussian, mean_poisson_likelihood_gaussian
+from ctapipe.image import (
+    poisson_likelihood_gaussian,
+    mean_poisson_likelihood_gaussian,
+    poisson_likelihood_table,
+    mean_poisson_likelihood_table,
+)
 from ctapipe.instrument import get_atmosphere_profile_functions
 from ctapipe.io.containers import (ReconstructedShowerContainer,
                                    ReconstructedEnergyContainer)
 from ctapipe.reco.reco_algorithms import Reconstructor
 from ctapipe.utils.template_network_interpolator import TemplateNetworkInterpolator, \
-    TimeGradientInterpolator
+    TimeGradientInterpolator, template_store_path
 
 __all__ = ['ImPACTReconstructor', 'energy_prior', 'xmax_prior', 'guess_shower_depth']
 
@@ -75,6 +81,24 @@ class ImPACTReconstructor(Reconstructor):
     - Distance units in metres
     - Energy units in TeV
 
+    The template interpolation can be sped up by caching: ``template_cache_size``
+    sets the number of cached simplex lookups and, if also
+    ``template_cache_precision`` (in energy, impact and xmax) is given, the
+    number of cached interpolated templates. Cached templates are interpolated
+    for the shower parameters rounded to that precision. The statistics of the
+    caches are available via ``self.prediction[tel_type].cache_info()``.
+
+    If a template file in ``root_dir`` was converted to a template store with
+    `~ctapipe.utils.template_network_interpolator.convert_template_file`
+    (or ``ctapipe-convert-templates``), the store next to it is used instead.
+    It is opened memory-mapped, so it loads in a few milliseconds and all
+    processes reconstructing in parallel share one copy of the templates.
+
+    With ``full_goodness_of_fit``, the goodness of fit of the result is
+    calculated with the full poissonian likelihood instead of its gaussian
+    approximation, interpolated from tables that are computed once per
+    telescope type (see `~ctapipe.image.poisson_likelihood_table`).
+
     References
     ----------
     .. [parsons14] Parsons & Hinton, Astroparticle Physics 56 (2014), pp. 26-34
@@ -93,7 +117,9 @@ class ImPACTReconstructor(Reconstructor):
     spe = 0.5  # Also hard code single p.e. distribution width
 
     def __init__(self, root_dir=".", minimiser="minuit", prior="",
-                 template_scale=1., xmax_offset=0, use_time_gradient=False):
+                 template_scale=1., xmax_offset=0, use_time_gradient=False,
+                 template_cache_size=0, template_cache_precision=None,
+                 full_goodness_of_fit=False):
 
         # First we create a dictionary of image template interpolators
         # for each telescope type
@@ -135,11 +161,26 @@ class ImPACTReconstructor(Reconstructor):
         self.array_direction = None
         self.array_return = False
 
+        # event properties prepared for the likelihood evaluation,
+        # see set_event_properties
+        self._masked = None
+        self._pixel_x, self._pixel_y = None, None
+        self._image, self._time, self._ped = None, None, None
+        self._type_rows = None
+        self._zenith = None
+
         # For now these factors are required to fix problems in templates
         self.template_scale = template_scale
         self.xmax_offset = xmax_offset
         self.use_time_gradient = use_time_gradient
 
+        # Caching of the interpolated templates, which are evaluated for
+        # similar shower parameters many times during the minimisation
+        self.template_cache_size = template_cache_size
+        self.template_cache_precision = template_cache_precision
+
+        self.full_goodness_of_fit = full_goodness_of_fit
+
     def initialise_templates(self, tel_type):
         """Check if templates for a given telescope type has been initialised
         and if not do it and add to the dictionary
@@ -159,15 +200,31 @@ class ImPACTReconstructor(Reconstructor):
                 continue
 
             self.prediction[tel_type[t]] = \
-                TemplateNetworkInterpolator(self.root_dir + "/" +
-                                            self.file_names[tel_type[t]][0])
+                TemplateNetworkInterpolator(
+                    self._template_path(self.file_names[tel_type[t]][0]),
+                    simplex_cache_size=self.template_cache_size,
+                    template_cache_size=(
+                        self.template_cache_size
+                        if self.template_cache_precision is not None else 0
+                    ),
+                    cache_precision=self.template_cache_precision,
+                )
             if self.use_time_gradient:
                 self.time_prediction[tel_type[t]] = \
-                    TimeGradientInterpolator(self.root_dir + "/" +
-                                             self.file_names[tel_type[t]][1])
+                    TimeGradientInterpolator(
+                        self._template_path(self.file_names[tel_type[t]][1])
+                    )
 
         return True
 
+    def _template_path(self, file_name):
+        """Path of a template file, or of its converted template store if it exists"""
+        path = self.root_dir + "/" + file_name
+        store_path = template_store_path(path)
+        if os.path.isdir(store_path):
+            return store_path
+        return path
+
     def get_hillas_mean(self):
         """This is a simple function to find the peak position of each image
         in an event which will be used later in the Xmax calculation. Peak is
@@ -212,25 +269,31 @@ class ImPACTReconstructor(Reconstructor):
 
         Parameters
         ----------
-        source_x: float
+        source_x: float or ndarray
             Event source position in nominal frame
-        source_y: float
+        source_y: float or ndarray
             Event source position in nominal frame
-        core_x: float
+        core_x: float or ndarray
             Event core position in telescope tilted frame
-        core_y: float
+        core_y: float or ndarray
             Event core position in telescope tilted frame
         zen: float
             Zenith angle of event
 
         Returns
         -------
-        float: Depth of maximum of air shower
+        float or ndarray: Depth of maximum of air shower for each test position
 
         """
 
         # Calculate displacement of image centroid from source position (in
-        # rad)
+        # rad), the last axis are the telescopes, so arrays of test
+        # positions can be passed
+        source_x = np.asarray(source_x)[..., np.newaxis]
+        source_y = np.asarray(source_y)[..., np.newaxis]
+        core_x = np.asarray(core_x)[..., np.newaxis]
+        core_y = np.asarray(core_y)[..., np.newaxis]
+
         disp = np.sqrt(np.power(self.peak_x - source_x, 2) +
                        np.power(self.peak_y - source_y, 2))
         # Calculate impact parameter of the shower
@@ -243,7 +306,7 @@ class ImPACTReconstructor(Reconstructor):
         # sqrt may not be the best option...
 
         # Take weighted mean of estimates
-        mean_height = np.sum(height * weight) / np.sum(weight)
+        mean_height = np.sum(height * weight, axis=-1) / np.sum(weight)
         # This value is height above telescope in the tilted system,
         # we should convert to height above ground
         mean_height *= np.cos(zen)
@@ -251,8 +314,8 @@ class ImPACTReconstructor(Reconstructor):
         # Add on the height of the detector above sea level
         mean_height += 2150
 
-        if mean_height > 100000 or np.isnan(mean_height):
-            mean_height = 100000
+        invalid = (mean_height > 100000) | np.isnan(mean_height)
+        mean_height = np.where(invalid, 100000, mean_height)
 
         # Lookup this height in the depth tables, the convert Hmax to Xmax
         x_max = self.thickness_profile(mean_height)
@@ -344,115 +407,120 @@ class ImPACTReconstructor(Reconstructor):
         """
         return self.time_prediction[tel_type](energy, impact, x_max)
 
-    def get_likelihood(self, source_x, source_y, core_x, core_y,
-                       energy, x_max_scale, goodness_of_fit=False):
-        """Get the likelihood that the image predicted at the given test
-        position matches the camera image.
+    def _get_zenith(self):
+        if self._zenith is None:
+            self._zenith = (np.pi / 2) - self.array_direction.alt.to_value(u.rad)
+        return self._zenith
+
+    def _evaluate(self, params):
+        """Evaluate the per-pixel likelihood of the event images for a batch
+        of test positions at once, using the pixel geometry prepared in
+        `set_event_properties`.
 
         Parameters
         ----------
-        source_x: float
-            Source position of shower in the nominal system (in deg)
-        source_y: float
-            Source position of shower in the nominal system (in deg)
-        core_x: float
-            Core position of shower in tilted telescope system (in m)
-        core_y: float
-            Core position of shower in tilted telescope system (in m)
-        energy: float
-            Shower energy (in TeV)
-        x_max_scale: float
-            Scaling factor applied to geometrically calculated Xmax
-        goodness_of_fit: boolean
-            Determines whether expected likelihood should be subtracted from result
+        params: ndarray
+            Test positions, shape (n_positions, 6), columns are
+            source_x, source_y, core_x, core_y, energy, x_max_scale
+            (see `get_likelihood`)
+
         Returns
         -------
-        float: Likelihood the model represents the camera image at this position
-
+        like: ndarray
+            Likelihood per position, telescope and pixel,
+            zero for masked pixels
+        prediction: ndarray
+            Predicted amplitudes per position, telescope and pixel
+        x_max: ndarray
+            Depth of shower maximum for each position
+        chi2: ndarray or None
+            Time gradient chi2 per position and telescope,
+            None if ``use_time_gradient`` is not set
         """
-        # First we add units back onto everything.  Currently not
-        # handled very well, maybe in future we could just put
-        # everything in the correct units when loading in the class
-        # and ignore them from then on
-
-        zenith = (np.pi / 2) - self.array_direction.alt.to(u.rad).value
-        azimuth = self.array_direction.az
+        params = np.atleast_2d(np.asarray(params, dtype=float))
+        source_x, source_y, core_x, core_y, energy, x_max_scale = params.T
 
-        # Geometrically calculate the depth of maximum given this test position
+        # Geometrically calculate the depth of maximum given the test positions
         x_max = self.get_shower_max(source_x, source_y,
                                     core_x, core_y,
-                                    zenith)
+                                    self._get_zenith())
         x_max *= x_max_scale
 
-        # Calculate expected Xmax given this energy
-        x_max_exp = guess_shower_depth(energy)  # / np.cos(20*u.deg)
+        # Convert to binning of Xmax, relative to the expectation for this
+        # energy, and check for range
+        x_max_bin = np.clip(x_max - guess_shower_depth(energy), -100, 200)
 
-        # Convert to binning of Xmax
-        x_max_bin = x_max - x_max_exp
-
-        # Check for range
-        if x_max_bin > 200:
-            x_max_bin = 200
-        if x_max_bin < -100:
-            x_max_bin = -100
-
-        # Calculate impact distance for all telescopes
-        impact = np.sqrt(np.power(self.tel_pos_x - core_x, 2)
-                         + np.power(self.tel_pos_y - core_y, 2))
-        # And the expected rotation angle
-        phi = np.arctan2((self.tel_pos_x - core_x),
-                         (self.tel_pos_y - core_y)) * u.rad
+        # Calculate impact distance and expected rotation angle for
+        # all positions and telescopes
+        diff_x = self.tel_pos_x - core_x[:, np.newaxis]
+        diff_y = self.tel_pos_y - core_y[:, np.newaxis]
+        impact = np.sqrt(diff_x**2 + diff_y**2)
+        phi = np.arctan2(diff_x, diff_y)
 
         # Rotate and translate all pixels such that they match the
         # template orientation
         pix_y_rot, pix_x_rot = self.rotate_translate(
-            self.pixel_x,
-            self.pixel_y,
-            source_x, source_y, phi
+            self._pixel_x, self._pixel_y,
+            source_x[:, np.newaxis, np.newaxis],
+            source_y[:, np.newaxis, np.newaxis],
+            phi,
         )
 
-        # In the interpolator class we can gain speed advantages by using masked arrays
-        # so we need to make sure here everything is masked
-        prediction = ma.zeros(self.image.shape)
-        prediction.mask = ma.getmask(self.image)
-
-        time_gradients = np.zeros((self.image.shape[0],2))
-
-        # Loop over all telescope types and get prediction
-        for tel_type in np.unique(self.tel_types).tolist():
-            type_mask = self.tel_types == tel_type
-            prediction[type_mask] = \
-                self.image_prediction(tel_type, energy *
-                                      np.ones_like(impact[type_mask]),
-                                      impact[type_mask], x_max_bin *
-                                      np.ones_like(impact[type_mask]),
-                                      pix_x_rot[type_mask] * (180 / math.pi) * -1,
-                                      pix_y_rot[type_mask] * (180 / math.pi))
+        n_positions, n_tels, n_pixels = pix_x_rot.shape
+        prediction = np.zeros((n_positions, n_tels, n_pixels))
+        time_gradients = np.zeros((n_positions, n_tels, 2))
+
+        # Get predictions for all telescopes and positions of a
+        # telescope type in one call, masked pixels are not evaluated
+        for tel_type, rows in self._type_rows:
+            shape = (n_positions * len(rows), n_pixels)
+            mask = np.broadcast_to(
+                self._masked[rows], (n_positions, len(rows), n_pixels)
+            ).reshape(shape)
+            type_impact = impact[:, rows].ravel()
+            type_energy = np.repeat(energy, len(rows))
+            type_x_max = np.repeat(x_max_bin, len(rows))
+
+            pix_x = ma.masked_array(
+                pix_x_rot[:, rows].reshape(shape) * (180 / math.pi) * -1,
+                mask=mask,
+            )
+            pix_y = ma.masked_array(
+                pix_y_rot[:, rows].reshape(shape) * (180 / math.pi),
+                mask=mask,
+            )
+            type_prediction = self.image_prediction(
+                tel_type, type_energy, type_impact, type_x_max, pix_x, pix_y
+            )
+            prediction[:, rows] = ma.filled(type_prediction, 0).reshape(
+                n_positions, len(rows), n_pixels
+            )
 
             if self.use_time_gradient:
-                time_gradients[type_mask] = \
-                    self.predict_time(tel_type,
-                                      energy * np.ones_like(impact[type_mask]),
-                                      impact[type_mask],
-                                      x_max_bin * np.ones_like(impact[type_mask]))
-
+                time_gradients[:, rows] = np.reshape(
+                    self.predict_time(
+                        tel_type, type_energy, type_impact, type_x_max
+                    ),
+                    (n_positions, len(rows), 2),
+                )
+
+        chi2 = None
         if self.use_time_gradient:
-            time_mask = np.logical_and(np.invert(ma.getmask(self.image)),
-                                       self.time > 0)
-            weight = np.sqrt(self.image) * time_mask
-            rv = norm()
-
-            sx = pix_x_rot * weight
-            sxx = pix_x_rot * pix_x_rot * weight
-
-            sy = self.time * weight
-            sxy = self.time * pix_x_rot * weight
-            d = weight.sum(axis=1) * sxx.sum(axis=1) - sx.sum(axis=1) * sx.sum(axis=1)
-            time_fit = (weight.sum(axis=1) * sxy.sum(axis=1) - sx.sum(axis=1) * sy.sum(
-                axis=1)) / d
+            time_mask = ~self._masked & (self._time > 0)
+            weight = np.sqrt(np.clip(self._image, 0, None)) * time_mask
+
+            sum_w = weight.sum(axis=-1)
+            sx = (pix_x_rot * weight).sum(axis=-1)
+            sxx = (pix_x_rot * pix_x_rot * weight).sum(axis=-1)
+            sy = (self._time * weight).sum(axis=-1)
+            sxy = (self._time * pix_x_rot * weight).sum(axis=-1)
+
+            d = sum_w * sxx - sx * sx
+            time_fit = (sum_w * sxy - sx * sy) / d
             time_fit /= -1 * (180 / math.pi)
-            chi2 = -2 * np.log(rv.pdf((time_fit - time_gradients.T[0])/
-                                        time_gradients.T[1]))
+            chi2 = -2 * np.log(norm.pdf(
+                (time_fit - time_gradients[..., 0]) / time_gradients[..., 1]
+            ))
 
         # Likelihood function will break if we find a NaN or a 0
         prediction[np.isnan(prediction)] = 1e-8
@@ -460,36 +528,110 @@ class ImPACTReconstructor(Reconstructor):
         prediction *= self.template_scale
 
         # Get likelihood that the prediction matched the camera image
-        like = poisson_likelihood_gaussian(self.image, prediction, self.spe, self.ped)
+        like = poisson_likelihood_gaussian(
+            self._image, prediction, self.spe, self._ped
+        )
         like[np.isnan(like)] = 1e9
-        like *= np.invert(ma.getmask(self.image))
-        like = ma.MaskedArray(like, mask=ma.getmask(self.image))
+        like *= ~self._masked
 
-        array_like = like
-        if goodness_of_fit:
-            return np.sum(like - mean_poisson_likelihood_gaussian(prediction, self.spe,
-                                                                  self.ped))
+        return like, prediction, x_max, chi2
 
-        prior_pen = 0
-        # Add prior penalities if we have them
-        array_like += 1e-8
+    def _get_prior_penalty(self, energy, x_max):
+        prior_pen = np.zeros_like(x_max)
         if "energy" in self.priors:
             prior_pen += energy_prior(energy, index=-1)
         if "xmax" in self.priors:
             prior_pen += xmax_prior(energy, x_max)
+        return prior_pen
 
-        array_like += prior_pen / float(len(array_like))
+    def get_likelihood_batch(self, params):
+        """Get the likelihood for many test positions at once, e.g. all
+        seeds of an event or the vertices of a simplex.
+        This gives the same values as calling `get_likelihood`
+        for each position, but evaluates the templates of each telescope
+        type only once for all positions.
 
-        if self.array_return:
-            array_like = array_like.ravel()
-            return array_like[np.invert(ma.getmask(array_like))]
+        Parameters
+        ----------
+        params: ndarray
+            Test positions, shape (n_positions, 6), columns are
+            source_x, source_y, core_x, core_y, energy, x_max_scale
+            (see `get_likelihood`)
 
-        final_sum = array_like.sum()
-        if self.use_time_gradient:
-            final_sum += chi2.sum() #* np.sum(ma.getmask(self.image))
+        Returns
+        -------
+        ndarray: Likelihood of each test position
+        """
+        params = np.atleast_2d(np.asarray(params, dtype=float))
+        like, _, x_max, chi2 = self._evaluate(params)
+
+        # the prior penalty is shared between the telescopes and added
+        # to every unmasked pixel
+        n_tels, n_pixels = self._masked.shape
+        n_unmasked = np.count_nonzero(~self._masked)
+        prior_pen = self._get_prior_penalty(params[:, 4], x_max)
+
+        final_sum = like.sum(axis=(1, 2))
+        final_sum += n_unmasked * (1e-8 + prior_pen / n_tels)
+        if chi2 is not None:
+            final_sum += chi2.sum(axis=1)
 
         return final_sum
 
+    def get_likelihood(self, source_x, source_y, core_x, core_y,
+                       energy, x_max_scale, goodness_of_fit=False):
+        """Get the likelihood that the image predicted at the given test
+        position matches the camera image.
+
+        Parameters
+        ----------
+        source_x: float
+            Source position of shower in the nominal system (in deg)
+        source_y: float
+            Source position of shower in the nominal system (in deg)
+        core_x: float
+            Core position of shower in tilted telescope system (in m)
+        core_y: float
+            Core position of shower in tilted telescope system (in m)
+        energy: float
+            Shower energy (in TeV)
+        x_max_scale: float
+            Scaling factor applied to geometrically calculated Xmax
+        goodness_of_fit: boolean
+            Determines whether expected likelihood should be subtracted from result
+        Returns
+        -------
+        float: Likelihood the model represents the camera image at this position
+
+        """
+        params = [[source_x, source_y, core_x, core_y, energy, x_max_scale]]
+
+        if goodness_of_fit and self.full_goodness_of_fit:
+            _, prediction, _, _ = self._evaluate(params)
+            unmasked = ~self._masked
+            prediction = prediction[0][unmasked]
+            ped = self._ped[unmasked]
+            like = poisson_likelihood_table(
+                self._image[unmasked], prediction, self.spe, ped
+            )
+            mean_like = mean_poisson_likelihood_table(prediction, self.spe, ped)
+            return np.sum(like - mean_like)
+
+        if goodness_of_fit:
+            like, prediction, _, _ = self._evaluate(params)
+            mean_like = mean_poisson_likelihood_gaussian(
+                prediction[0], self.spe, self._ped
+            )
+            return np.sum((like[0] - mean_like)[~self._masked])
+
+        if self.array_return:
+            like, _, x_max, _ = self._evaluate(params)
+            prior_pen = self._get_prior_penalty(energy, x_max)[0]
+            n_tels = len(self._masked)
+            return like[0][~self._masked] + 1e-8 + prior_pen / n_tels
+
+        return self.get_likelihood_batch(params)[0]
+
     def get_likelihood_min(self, x):
         """Wrapper class around likelihood function for use with scipy
         minimisers
@@ -612,6 +754,20 @@ class ImPACTReconstructor(Reconstructor):
         self.image[mask] = ma.masked
         self.time[mask] = ma.masked
 
+        # Plain arrays for the likelihood evaluation, which handles the
+        # masked pixels itself
+        self._masked = np.asarray(mask)
+        self._pixel_x = self.pixel_x.filled(0)
+        self._pixel_y = self.pixel_y.filled(0)
+        self._image = self.image.filled(0)
+        self._time = self.time.filled(0)
+        self._ped = np.asarray(self.ped)
+        self._type_rows = [
+            (tel_type, np.flatnonzero(self.tel_types == tel_type))
+            for tel_type in np.unique(self.tel_types).tolist()
+        ]
+        self._zenith = None
+
         # Finally run some functions to get ready for the event
         self.get_hillas_mean()
         self.initialise_templates(type_tel)
@@ -1,9 +1,19 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
-from .HillasReconstructor import HillasReconstructor, Reconstructor
-from .ImPACT import ImPACTReconstructor
-from .energy_regressor import EnergyRegressor
-from .shower_max import ShowerMaxEstimator
+from ..core.lazy_loading import lazy_submodules
 
-
-__all__ = ['HillasReconstructor', 'Reconstructor', 'ImPACTReconstructor',
-           'EnergyRegressor', 'ShowerMaxEstimator']
+__getattr__, __dir__, __all__ = lazy_submodules(
+    __name__,
+    attributes={
+        'HillasReconstructor': ['HillasReconstructor'],
+        'reco_algorithms': ['Reconstructor'],
+        'ImPACT': ['ImPACTReconstructor'],
+        'energy_regressor': ['EnergyRegressor'],
+        'shower_max': ['ShowerMaxEstimator'],
+    },
+    submodules=[
+        'batch',
+        'event_classifier',
+        'hillas_intersection',
+        'regressor_classifier_base',
+    ],
+)
@@ -0,0 +1,107 @@
+"""
+Helpers for the reconstruction of many events at once from columnar data,
+where each row holds the parameters of one telescope image and an event
+column tells which rows belong to the same event.
+"""
+import numpy as np
+
+__all__ = ['group_events', 'event_pairs', 'sum_by_event']
+
+
+def group_events(event_ids):
+    """
+    Find the rows belonging to each event.
+
+    Parameters
+    ----------
+    event_ids: array-like
+        event identifier of each row
+
+    Returns
+    -------
+    order: np.ndarray
+        permutation of the rows that sorts them by event,
+        keeping the original order of the rows within an event
+    events: np.ndarray
+        unique event identifiers, sorted
+    starts: np.ndarray
+        index of the first row of each event in the sorted rows
+    counts: np.ndarray
+        number of rows of each event
+    """
+    event_ids = np.asanyarray(event_ids)
+    order = np.argsort(event_ids, kind='stable')
+    events, starts, counts = np.unique(
+        event_ids[order], return_index=True, return_counts=True
+    )
+    return order, events, starts, counts
+
+
+def event_pairs(starts, counts):
+    """
+    All pairs of rows within each event, in the order of
+    `itertools.combinations` of the rows of an event.
+
+    The pair pattern is only built once for each multiplicity,
+    so the cost does not grow with the number of events in Python.
+
+    Parameters
+    ----------
+    starts: np.ndarray
+        index of the first row of each event, see `group_events`
+    counts: np.ndarray
+        number of rows of each event
+
+    Returns
+    -------
+    first: np.ndarray
+        row index of the first member of each pair
+    second: np.ndarray
+        row index of the second member of each pair
+    pair_event: np.ndarray
+        index of the event of each pair
+    """
+    starts = np.asarray(starts)
+    counts = np.asarray(counts)
+    n_pairs = counts * (counts - 1) // 2
+    pair_offsets = np.cumsum(n_pairs) - n_pairs
+
+    total = n_pairs.sum()
+    first = np.empty(total, dtype=np.int64)
+    second = np.empty(total, dtype=np.int64)
+    pair_event = np.repeat(np.arange(len(counts)), n_pairs)
+
+    for multiplicity in np.unique(counts[counts > 1]):
+        i, j = np.triu_indices(multiplicity, 1)
+        selected = np.flatnonzero(counts == multiplicity)
+
+        positions = (pair_offsets[selected, np.newaxis] + np.arange(len(i))).ravel()
+        first[positions] = (starts[selected, np.newaxis] + i).ravel()
+        second[positions] = (starts[selected, np.newaxis] + j).ravel()
+
+    return first, second, pair_event
+
+
+def sum_by_event(values, event, n_events):
+    """
+    Sum the rows of ``values`` belonging to the same event.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        array with one row per entry, any number of trailing dimensions
+    event: np.ndarray
+        event index of each row
+    n_events: int
+        number of events
+
+    Returns
+    -------
+    np.ndarray of shape ``(n_events, *values.shape[1:])``
+    """
+    values = np.asarray(values, dtype=float)
+    flat = values.reshape(len(values), -1)
+    result = np.empty((n_events, flat.shape[1]))
+    for col in range(flat.shape[1]):
+        result[:, col] = np.bincount(event, weights=flat[:, col], minlength=n_events)
+    return result.reshape((n_events, *values.shape[1:]))
@@ -9,9 +9,9 @@ performance
 
 """
 import numpy as np
-import itertools
 import astropy.units as u
 from ctapipe.reco.reco_algorithms import Reconstructor
+from ctapipe.reco.batch import group_events, event_pairs
 from ctapipe.io.containers import ReconstructedShowerContainer
 from ctapipe.instrument import get_atmosphere_profile_functions
 
@@ -141,53 +141,21 @@ class HillasIntersection(Reconstructor):
         if len(hillas_parameters) < 2:
             return None  # Throw away events with < 2 images
 
-        # Find all pairs of Hillas parameters
-        combos = itertools.combinations(list(hillas_parameters.values()), 2)
-        hillas_pairs = list(combos)
-
         # Copy parameters we need to a numpy array to speed things up
-        h1 = list(
-            map(
-                lambda h: [h[0].psi.to(u.rad).value,
-                           h[0].x.value,
-                           h[0].y.value,
-                           h[0].intensity], hillas_pairs
-            )
-        )
-        h1 = np.array(h1)
-        h1 = np.transpose(h1)
-
-        h2 = list(
-            map(lambda h: [h[1].psi.to(u.rad).value,
-                           h[1].x.value,
-                           h[1].y.value,
-                           h[1].intensity], hillas_pairs)
+        h = list(hillas_parameters.values())
+        x = np.array([p.x.value for p in h])
+        y = np.array([p.y.value for p in h])
+        psi = np.array([p.psi.to_value(u.rad) for p in h])
+        intensity = np.array([p.intensity for p in h])
+
+        result = self._intersect_events(
+            np.zeros(len(h), dtype=int), x, y, psi, intensity, weighting
         )
-        h2 = np.array(h2)
-        h2 = np.transpose(h2)
-
-        # Perform intersection
-        sx, sy = self.intersect_lines(h1[1], h1[2], h1[0],
-                                      h2[1], h2[2], h2[0])
-        if weighting == "Konrad":
-            weight_fn = self.weight_konrad
-        elif weighting == "HESS":
-            weight_fn = self.weight_HESS
-
-        # Weight by chosen method
-        weight = weight_fn(h1[3], h2[3])
-        # And sin of interception angle
-        weight *= self.weight_sin(h1[0], h2[0])
-
-        # Make weighted average of all possible pairs
-        x_pos = np.average(sx, weights=weight)
-        y_pos = np.average(sy, weights=weight)
-        var_x = np.average((sx - x_pos) ** 2, weights=weight)
-        var_y = np.average((sy - y_pos) ** 2, weights=weight)
+        x_pos, y_pos, err_x, err_y = (r[0] for r in result[1:])
 
         # Copy into nominal coordinate
 
-        return x_pos, y_pos, np.sqrt(var_x), np.sqrt(var_y)
+        return x_pos, y_pos, err_x, err_y
 
     def reconstruct_tilted(self, hillas_parameters, tel_x, tel_y,
                            weighting="Konrad"):
@@ -214,60 +182,145 @@ class HillasIntersection(Reconstructor):
         """
         if len(hillas_parameters) < 2:
             return None  # Throw away events with < 2 images
-        h = list()
-        tx = list()
-        ty = list()
 
         # Need to loop here as dict is unordered
-        for tel in hillas_parameters.keys():
-            h.append(hillas_parameters[tel])
-            tx.append(tel_x[tel])
-            ty.append(tel_y[tel])
+        tels = list(hillas_parameters.keys())
+        tx = np.array([tel_x[tel].value for tel in tels])
+        ty = np.array([tel_y[tel].value for tel in tels])
+        psi = np.array([hillas_parameters[tel].psi.to_value(u.rad) for tel in tels])
+        intensity = np.array([hillas_parameters[tel].intensity for tel in tels])
+
+        result = self._intersect_events(
+            np.zeros(len(tels), dtype=int), tx, ty, psi, intensity, weighting
+        )
+        x_pos, y_pos, err_x, err_y = (r[0] for r in result[1:])
 
-        # Find all pairs of Hillas parameters
-        hillas_pairs = list(itertools.combinations(h, 2))
-        tel_x = list(itertools.combinations(tx, 2))
-        tel_y = list(itertools.combinations(ty, 2))
+        return x_pos, y_pos, err_x, err_y
 
-        tx = np.zeros((len(tel_x), 2))
-        ty = np.zeros((len(tel_y), 2))
-        for i, _ in enumerate(tel_x):
-            tx[i][0], tx[i][1] = tel_x[i][0].value, tel_x[i][1].value
-            ty[i][0], ty[i][1] = tel_y[i][0].value, tel_y[i][1].value
+    def reconstruct_nominal_table(self, hillas_table, weighting="Konrad",
+                                  event_column="event_id"):
+        """
+        Direction reconstruction of many events at once, see `reconstruct_nominal`
 
-        tel_x = np.array(tx)
-        tel_y = np.array(ty)
+        Parameters
+        ----------
+        hillas_table: astropy.table.Table
+            Table with one row per image, with the columns ``event_column``,
+            ``x``, ``y`` (in the nominal system, radians), ``psi`` and
+            ``intensity``
+        weighting: str
+            Weighting scheme for averaging of crossing points
+        event_column: str
+            Name of the column identifying the events
 
-        # Copy parameters we need to a numpy array to speed things up
-        h1 = map(lambda h: [h[0].psi.to(u.rad).value, h[0].intensity], hillas_pairs)
-        h1 = np.array(list(h1))
-        h1 = np.transpose(h1)
+        Returns
+        -------
+        (ndarray, ndarray, ndarray, ndarray, ndarray):
+            event ids (sorted), source position X, source position Y and
+            uncertainties X and Y. Events with less than two images are nan.
+        """
+        return self._intersect_events(
+            np.asanyarray(hillas_table[event_column]),
+            u.Quantity(hillas_table['x']).value,
+            u.Quantity(hillas_table['y']).value,
+            u.Quantity(hillas_table['psi'], u.rad).to_value(u.rad),
+            np.asarray(hillas_table['intensity'], dtype=float),
+            weighting,
+        )
 
-        h2 = map(lambda h: [h[1].psi.to(u.rad).value, h[1].intensity], hillas_pairs)
-        h2 = np.array(list(h2))
-        h2 = np.transpose(h2)
+    def reconstruct_tilted_table(self, hillas_table, tel_x, tel_y,
+                                 weighting="Konrad", event_column="event_id"):
+        """
+        Core position reconstruction of many events at once,
+        see `reconstruct_tilted`
 
-        # Perform intersection
-        cx, cy = self.intersect_lines(tel_x[:, 0], tel_y[:, 0], h1[0],
-                                      tel_x[:, 1], tel_y[:, 1], h2[0])
+        Parameters
+        ----------
+        hillas_table: astropy.table.Table
+            Table with one row per image, with the columns ``event_column``,
+            ``tel_id``, ``psi`` and ``intensity``
+        tel_x: dict
+            Telescope X positions, tilted system
+        tel_y: dict
+            Telescope Y positions, tilted system
+        weighting: str
+            Weighting scheme for averaging of crossing points
+        event_column: str
+            Name of the column identifying the events
+
+        Returns
+        -------
+        (ndarray, ndarray, ndarray, ndarray, ndarray):
+            event ids (sorted), core position X, core position Y and
+            uncertainties X and Y. Events with less than two images are nan.
+        """
+        tel_ids, tel_index = np.unique(
+            np.asarray(hillas_table['tel_id']), return_inverse=True
+        )
+        tx = u.Quantity([tel_x[tel] for tel in tel_ids]).value[tel_index]
+        ty = u.Quantity([tel_y[tel] for tel in tel_ids]).value[tel_index]
+
+        return self._intersect_events(
+            np.asanyarray(hillas_table[event_column]),
+            tx,
+            ty,
+            u.Quantity(hillas_table['psi'], u.rad).to_value(u.rad),
+            np.asarray(hillas_table['intensity'], dtype=float),
+            weighting,
+        )
 
+    def _intersect_events(self, event_ids, x, y, psi, intensity, weighting):
+        """
+        Weighted average of the crossing points of the image axes of all
+        pairs of images of each event.
+
+        All events are intersected and averaged in one vectorized pass
+        over the pairs of `~ctapipe.reco.batch.event_pairs`.
+
+        Returns
+        -------
+        (ndarray, ndarray, ndarray, ndarray, ndarray):
+            event ids, x and y positions and their uncertainties
+        """
         if weighting == "Konrad":
             weight_fn = self.weight_konrad
         elif weighting == "HESS":
-            weight_fn = self.weight_HESS
+            weight_fn = self.weight_hess
+        else:
+            raise ValueError("Unknown weighting {}".format(weighting))
+
+        order, events, starts, counts = group_events(event_ids)
+        first, second, pair_event = event_pairs(starts, counts)
+        first = order[first]
+        second = order[second]
+
+        # Perform intersection
+        sx, sy = self.intersect_lines(x[first], y[first], psi[first],
+                                      x[second], y[second], psi[second])
 
         # Weight by chosen method
-        weight = weight_fn(h1[1], h2[1])
+        weight = weight_fn(intensity[first], intensity[second])
         # And sin of interception angle
-        weight *= self.weight_sin(h1[0], h2[0])
+        weight *= self.weight_sin(psi[first], psi[second])
 
         # Make weighted average of all possible pairs
-        x_pos = np.average(cx, weights=weight)
-        y_pos = np.average(cy, weights=weight)
-        var_x = np.average((cx - x_pos) ** 2, weights=weight)
-        var_y = np.average((cy - y_pos) ** 2, weights=weight)
-
-        return x_pos, y_pos, np.sqrt(var_x), np.sqrt(var_y)
+        n_events = len(events)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sum_weights = np.bincount(pair_event, weights=weight, minlength=n_events)
+            x_pos = np.bincount(pair_event, weights=weight * sx,
+                                minlength=n_events) / sum_weights
+            y_pos = np.bincount(pair_event, weights=weight * sy,
+                                minlength=n_events) / sum_weights
+            var_x = np.bincount(
+                pair_event, weights=weight * (sx - x_pos[pair_event]) ** 2,
+                minlength=n_events,
+            ) / sum_weights
+            var_y = np.bincount(
+                pair_event, weights=weight * (sy - y_pos[pair_event]) ** 2,
+                minlength=n_events,
+            ) / sum_weights
+
+        return events, x_pos, y_pos, np.sqrt(var_x), np.sqrt(var_y)
 
     def reconstruct_xmax(self, source_x, source_y, core_x, core_y,
                          hillas_parameters, tel_x, tel_y, zen):
@@ -8,6 +8,8 @@ class Reconstructor(Component):
     """This is the base class from which all direction reconstruction
 algorithms should inherit from"""
 
+    profiled_methods = ('predict', )
+
     def predict(self, tels_dict):
         """overwrite this method with your favourite direction reconstruction
         algorithm
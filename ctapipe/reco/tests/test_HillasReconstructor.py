@@ -7,6 +7,14 @@ from ctapipe.io import event_source
 from ctapipe.reco.HillasReconstructor import HillasReconstructor, HillasPlane
 from ctapipe.utils import get_dataset_path
 from astropy.coordinates import SkyCoord, AltAz
+from astropy.table import Table
+
+from ctapipe.instrument import (
+    SubarrayDescription,
+    TelescopeDescription,
+    OpticsDescription,
+)
+from ctapipe.io.containers import HillasParametersContainer
 
 
 def test_estimator_results():
@@ -132,3 +140,83 @@ def test_reconstruction():
         fit_result.az.to(u.deg)
         fit_result.core_x.to(u.m)
         assert fit_result.is_valid
+
+
+def test_predict_table():
+    """
+    the batched reconstruction has to match the reconstruction
+    of the single events
+    """
+    rng = np.random.RandomState(0)
+
+    optics = OpticsDescription(
+        name='test', num_mirrors=1, equivalent_focal_length=28 * u.m,
+    )
+    tel_positions = {
+        tel_id: [x, y, 0.5 * tel_id] * u.m
+        for tel_id, (x, y) in enumerate(rng.uniform(-300, 300, (6, 2)), start=1)
+    }
+    subarray = SubarrayDescription(
+        'test',
+        tel_positions=tel_positions,
+        tel_descriptions={
+            tel_id: TelescopeDescription('test', 'LST', optics, camera=None)
+            for tel_id in tel_positions
+        },
+    )
+    inst = type('Instrument', (), {'subarray': subarray})
+    alt, az = 70 * u.deg, 10 * u.deg
+
+    rows = []
+    expected = {}
+    fit = HillasReconstructor()
+    for event_id in range(8):
+        # also events with a single telescope, which are not valid
+        n_tels = 1 if event_id == 3 else rng.randint(2, 7)
+        tel_ids = rng.choice(list(tel_positions), n_tels, replace=False)
+
+        hillas_dict = {}
+        for tel_id in tel_ids:
+            hillas = HillasParametersContainer(
+                x=rng.uniform(-1, 1) * u.m,
+                y=rng.uniform(-1, 1) * u.m,
+                psi=rng.uniform(-90, 90) * u.deg,
+                intensity=rng.uniform(50, 1000),
+                length=rng.uniform(0.05, 0.2) * u.m,
+                width=rng.uniform(0.01, 0.05) * u.m,
+            )
+            hillas_dict[tel_id] = hillas
+            rows.append({'event_id': event_id, 'tel_id': tel_id, **{
+                k: hillas[k]
+                for k in ('x', 'y', 'psi', 'intensity', 'length', 'width')
+            }})
+
+        if n_tels > 1:
+            pointing_alt = {tel_id: alt for tel_id in tel_ids}
+            pointing_az = {tel_id: az for tel_id in tel_ids}
+            expected[event_id] = fit.predict(hillas_dict, inst, pointing_alt, pointing_az)
+
+    # events do not have to be sorted
+    rows = rows[::-1]
+    table = Table({
+        col: u.Quantity([row[col] for row in rows])
+        if isinstance(rows[0][col], u.Quantity) else [row[col] for row in rows]
+        for col in rows[0]
+    })
+
+    result = fit.predict_table(table, subarray, alt, az)
+    assert len(result) == 8
+    assert not result['is_valid'][3]
+    assert np.isnan(result['alt'][3])
+
+    for row in result:
+        if not row['is_valid']:
+            continue
+        reco = expected[row['event_id']]
+        for key, unit in [('alt', u.rad), ('az', u.rad), ('alt_uncert', u.rad),
+                          ('core_x', u.m), ('core_y', u.m), ('h_max', u.m)]:
+            np.testing.assert_allclose(
+                row[key].to_value(unit), reco[key].to_value(unit),
+                rtol=1e-7, atol=1e-7, err_msg=key,
+            )
+        assert np.isclose(row['average_intensity'], reco.average_intensity)
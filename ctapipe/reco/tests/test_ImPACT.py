@@ -7,7 +7,7 @@ from ctapipe.io.containers import (ReconstructedShowerContainer,
                                    ReconstructedEnergyContainer)
 from ctapipe.reco.ImPACT import ImPACTReconstructor
 from ctapipe.io.containers import HillasParametersContainer
-from astropy.coordinates import Angle
+from astropy.coordinates import Angle, AltAz
 
 
 class TestImPACT():
@@ -144,3 +144,46 @@ class TestImPACT():
 
         like = self.impact_reco.get_likelihood(0, 0, 0, 100, 1, 0)
         assert like is not np.nan and like > 0
+
+    def test_likelihood_batch(self):
+        """Test the batched likelihood against values of the scalar
+        implementation it replaced"""
+
+        def template(energy, impact, x_max, pix_x, pix_y):
+            amplitude = 100 * energy / (1 + impact / 100)
+            return amplitude[:, np.newaxis] * np.exp(-pix_x**2 - pix_y**2)
+
+        reco = ImPACTReconstructor(root_dir=".", prior="energy")
+        reco.prediction["DUMMY"] = template
+
+        n_pixels = 50
+        pixel_x = np.linspace(-1, 1, n_pixels) * u.deg
+        pixel_y = np.linspace(-0.5, 0.5, n_pixels) * u.deg
+        image = np.random.RandomState(0).poisson(5, n_pixels).astype(float)
+        image[:10] = 0  # masked pixels
+
+        tels = [1, 2, 3]
+        reco.set_event_properties(
+            {t: image for t in tels}, {t: image for t in tels},
+            {t: pixel_x for t in tels}, {t: pixel_y for t in tels},
+            {t: "DUMMY" for t in tels},
+            {1: 0 * u.m, 2: 100 * u.m, 3: -50 * u.m},
+            {1: 0 * u.m, 2: 50 * u.m, 3: 100 * u.m},
+            array_direction=AltAz(alt=70 * u.deg, az=0 * u.deg),
+            hillas={t: self.h1 for t in tels},
+        )
+
+        params = np.array([
+            [0, 0, 0, 100, 1, 1],
+            [0.001, -0.002, 20, 80, 2, 0.9],
+            [-0.003, 0.001, -30, 120, 0.5, 1.1],
+        ])
+        # computed with the previous per-position get_likelihood,
+        # the dummy template and the energy prior do not depend on x_max
+        expected = [3783.6174766716763, 7854.162729199254, 1647.6475910634272]
+
+        like = reco.get_likelihood_batch(params)
+        assert like.shape == (3, )
+        assert_allclose(like, expected, rtol=1e-12)
+        for p, e in zip(params, expected):
+            assert_allclose(reco.get_likelihood(*p), e, rtol=1e-12)
@@ -1,7 +1,11 @@
+import itertools
+
 from ctapipe.reco.hillas_intersection import HillasIntersection
 import astropy.units as u
 from numpy.testing import assert_allclose
 import numpy as np
+from astropy.table import Table
+from ctapipe.io.containers import HillasParametersContainer
 
 
 def test_intersect():
@@ -42,5 +46,94 @@ def test_parallel():
     assert_allclose(sx, np.nan, atol=1e-6)
     assert_allclose(sy, np.nan, atol=1e-6)
 
+
+def pairwise_intersection(x, y, psi, intensity):
+    """
+    Weighted average of the crossings of all pairs of image axes,
+    computed pair by pair as reference for the vectorized implementation
+    """
+    crossings = []
+    weights = []
+    for i, j in itertools.combinations(range(len(x)), 2):
+        crossings.append(HillasIntersection.intersect_lines(
+            x[i], y[i], psi[i], x[j], y[j], psi[j]
+        ))
+        weights.append(
+            HillasIntersection.weight_konrad(intensity[i], intensity[j])
+            * HillasIntersection.weight_sin(psi[i], psi[j])
+        )
+
+    sx, sy = np.array(crossings).T
+    x_pos = np.average(sx, weights=weights)
+    y_pos = np.average(sy, weights=weights)
+    err_x = np.sqrt(np.average((sx - x_pos) ** 2, weights=weights))
+    err_y = np.sqrt(np.average((sy - y_pos) ** 2, weights=weights))
+    return x_pos, y_pos, err_x, err_y
+
+
+def test_table_reconstruction():
+    """
+    Reconstructing a table of several events has to give the same result
+    as intersecting the image axes of each event pair by pair
+    """
+    hill = HillasIntersection()
+    rng = np.random.RandomState(1)
+
+    tel_x = {tel_id: tel_id * 10 * u.m for tel_id in range(10)}
+    tel_y = {tel_id: -tel_id * 3. * u.m for tel_id in range(10)}
+
+    rows = []
+    expected = {}
+    for event_id in range(10):
+        n_tels = 1 if event_id == 0 else rng.randint(2, 8)
+        hillas_parameters = {}
+        for tel_id in rng.choice(10, n_tels, replace=False):
+            hillas_parameters[tel_id] = HillasParametersContainer(
+                x=rng.normal(0, 0.02) * u.rad,
+                y=rng.normal(0, 0.02) * u.rad,
+                psi=rng.uniform(-90, 90) * u.deg,
+                intensity=rng.uniform(10, 1000),
+            )
+            h = hillas_parameters[tel_id]
+            rows.append((event_id, tel_id, h.x.value, h.y.value, h.psi.value,
+                         h.intensity))
+
+        if n_tels > 1:
+            tels = list(hillas_parameters)
+            h = list(hillas_parameters.values())
+            psi = [p.psi.to_value(u.rad) for p in h]
+            intensity = [p.intensity for p in h]
+            expected[event_id] = (
+                pairwise_intersection(
+                    [p.x.value for p in h], [p.y.value for p in h],
+                    psi, intensity,
+                ),
+                pairwise_intersection(
+                    [tel_x[t].value for t in tels], [tel_y[t].value for t in tels],
+                    psi, intensity,
+                ),
+            )
+            assert_allclose(
+                hill.reconstruct_nominal(hillas_parameters), expected[event_id][0]
+            )
+            assert_allclose(
+                hill.reconstruct_tilted(hillas_parameters, tel_x, tel_y),
+                expected[event_id][1],
+            )
+
+    table = Table(rows=rows, names=['event_id', 'tel_id', 'x', 'y', 'psi', 'intensity'])
+    table['psi'].unit = u.deg
+
+    nominal = hill.reconstruct_nominal_table(table)
+    tilted = hill.reconstruct_tilted_table(table, tel_x, tel_y)
+
+    assert np.all(nominal[0] == np.arange(10))
+    assert np.all(np.isnan([v[0] for v in nominal[1:]]))
+
+    for i, event_id in enumerate(nominal[0][1:], start=1):
+        assert_allclose([v[i] for v in nominal[1:]], expected[event_id][0])
+        assert_allclose([v[i] for v in tilted[1:]], expected[event_id][1])
+
+
 test_intersect()
 test_parallel()
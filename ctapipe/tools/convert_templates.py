@@ -0,0 +1,68 @@
+"""
+Convert gzipped pickle ImPACT template files to memory-mapped template
+stores, which load in milliseconds and are shared between processes.
+"""
+import os
+import shutil
+
+from ctapipe.core import Provenance, Tool, ToolConfigurationError
+from ctapipe.core.traits import Bool, Dict, List, Unicode
+from ctapipe.utils.template_network_interpolator import (
+    convert_template_file,
+    template_store_path,
+)
+
+
+class ConvertTemplatesTool(Tool):
+    name = 'ctapipe-convert-templates'
+    description = Unicode(__doc__)
+
+    infiles = List(
+        Unicode(), help='gzipped pickle template files to convert',
+    ).tag(config=True)
+
+    overwrite = Bool(
+        False, help='Replace existing template stores',
+    ).tag(config=True)
+
+    aliases = Dict({'infiles': 'ConvertTemplatesTool.infiles'})
+
+    flags = Dict({'overwrite': ({'ConvertTemplatesTool': {'overwrite': True}},
+                                'Replace existing template stores')})
+
+    examples = (
+        'ctapipe-convert-templates '
+        '--infiles LST_05deg.template.gz --infiles LST_05deg_time.template.gz'
+        '\n\n'
+        'The stores are written next to the input files, e.g. to '
+        'LST_05deg.template.store, where ImPACTReconstructor finds them.'
+    )
+
+    def setup(self):
+        if not self.infiles:
+            raise ToolConfigurationError('No template files given')
+
+    def start(self):
+        for infile in self.infiles:
+            output_path = template_store_path(infile)
+
+            if os.path.exists(output_path):
+                if not self.overwrite:
+                    raise ToolConfigurationError(
+                        f'Template store {output_path} exists, '
+                        'use --overwrite to replace it'
+                    )
+                shutil.rmtree(output_path)
+
+            self.log.info('Converting %s to %s', infile, output_path)
+            Provenance().add_input_file(infile, role='ImPACT templates')
+            convert_template_file(infile, output_path)
+            Provenance().add_output_file(output_path, role='ImPACT templates')
+
+    def finish(self):
+        pass
+
+
+def main():
+    tool = ConvertTemplatesTool()
+    tool.run()
@@ -3,6 +3,7 @@
 import importlib
 import logging
 import os
+import subprocess
 import sys
 
 from .utils import get_parser
@@ -29,6 +30,18 @@ _optional_dependencies = sorted([
     'matplotlib'
 ])
 
+# subpackages whose import time is reported by --import-times
+_packages = [
+    'ctapipe.core',
+    'ctapipe.instrument',
+    'ctapipe.io',
+    'ctapipe.image',
+    'ctapipe.calib',
+    'ctapipe.reco',
+    'ctapipe.visualization',
+    'ctapipe.image.extractor',
+]
+
 
 def main(args=None):
     parser = get_parser(info)
@@ -42,6 +55,8 @@ def main(args=None):
                         help='Print available versions of dependencies')
     parser.add_argument('--system', action='store_true',
                         help='Print system info')
+    parser.add_argument('--import-times', action='store_true',
+                        help='Print the import time of the ctapipe subpackages')
     parser.add_argument('--all', dest='show_all', action='store_true',
                         help='show all info')
     args = parser.parse_args(args)
@@ -54,10 +69,13 @@ def main(args=None):
 
 
 def info(version=False, tools=False, dependencies=False,
-         resources=False, system=False, show_all=False):
+         resources=False, system=False, import_times=False, show_all=False):
     """Print various info to the console.
 
     TODO: explain.
+
+    The import times are not part of ``show_all``, as they are measured
+    by importing each subpackage in a new python process.
     """
     logging.basicConfig(level=logging.INFO,
                         format='%(levelname)s - %(message)s')
@@ -77,6 +95,9 @@ def info(version=False, tools=False, dependencies=False,
     if system or show_all:
         _info_system()
 
+    if import_times:
+        _info_import_times()
+
 
 def _info_version():
     """Print version info."""
@@ -180,5 +201,33 @@ def _info_system():
             print("{:>20.20s} -- {:<60.60s}".format(name, str(val)))
 
 
+def _import_time(module):
+    """ time to import ``module`` in a new python process, in seconds """
+    code = (
+        'import time\n'
+        'start = time.perf_counter()\n'
+        'import {}\n'
+        'print(time.perf_counter() - start)\n'
+    ).format(module)
+    output = subprocess.check_output(
+        [sys.executable, '-W', 'ignore', '-c', code],
+        stderr=subprocess.DEVNULL,
+    )
+    return float(output.decode().split()[-1])
+
+
+def _info_import_times():
+    """Print the import time of the subpackages."""
+    print('\n*** ctapipe import times ***\n')
+    # the first import compiles and caches the numba functions
+    _import_time('ctapipe.image.extractor')
+
+    for name in _packages:
+        try:
+            print(f'{name:>25s} -- {_import_time(name):.3f} s')
+        except subprocess.CalledProcessError:
+            print(f'{name:>25s} -- import failed')
+
+
 if __name__ == '__main__':
     main()
@@ -16,7 +16,10 @@ from ctapipe.core import Provenance
 from ctapipe.core import Tool, ToolConfigurationError
 from ctapipe.core import traits as t
 from ctapipe.image.muon.muon_diagnostic_plots import plot_muon_event
-from ctapipe.image.muon.muon_reco_functions import analyze_muon_event
+from ctapipe.image.muon.muon_reco_functions import (
+    analyze_muon_event,
+    analyze_muon_events,
+)
 from ctapipe.io import EventSource, event_source
 from ctapipe.io import HDF5TableWriter
 
@@ -50,6 +53,18 @@ class MuonDisplayerTool(Tool):
         help='display the camera events', default=False
     ).tag(config=True)
 
+    n_workers = t.Int(
+        1,
+        help='Number of worker processes for the muon intensity fits. '
+             'Not used together with display.'
+    ).tag(config=True)
+
+    batch_size = t.Int(
+        100,
+        help='Number of events whose muon rings are fitted together. '
+             'Not used together with display.'
+    ).tag(config=True)
+
     classes = t.List([
         CameraCalibrator, EventSource
     ])
@@ -60,6 +75,8 @@ class MuonDisplayerTool(Tool):
         'display': 'MuonDisplayerTool.display',
         'max_events': 'EventSource.max_events',
         'allowed_tels': 'EventSource.allowed_tels',
+        'n_workers': 'MuonDisplayerTool.n_workers',
+        'batch_size': 'MuonDisplayerTool.batch_size',
     })
 
     def setup(self):
@@ -72,18 +89,35 @@ class MuonDisplayerTool(Tool):
         )
         self.writer = HDF5TableWriter(self.outfile, "muons")
 
+    def _calibrated_events(self):
+        for event in tqdm(self.source, desc='detecting muons'):
+            self.calib.calibrate(event)
+            self._subarray = event.inst.subarray
+            yield event
+
+    def _analyzed_events(self):
+        """ pairs of event (only kept for the display) and muon results """
+        if self.display:
+            for event in self._calibrated_events():
+                yield event, analyze_muon_event(event)
+        else:
+            results = analyze_muon_events(
+                self._calibrated_events(),
+                n_workers=self.n_workers,
+                batch_size=self.batch_size,
+            )
+            for muon_evt in results:
+                yield None, muon_evt
+
     def start(self):
 
         numev = 0
         self.num_muons_found = defaultdict(int)
 
-        for event in tqdm(self.source, desc='detecting muons'):
-
-            self.calib.calibrate(event)
-            muon_evt = analyze_muon_event(event)
+        for event, muon_evt in self._analyzed_events():
 
             if numev == 0:
-                _exclude_some_columns(event.inst.subarray, self.writer)
+                _exclude_some_columns(self._subarray, self.writer)
 
             numev += 1
 
@@ -100,7 +134,7 @@ class MuonDisplayerTool(Tool):
 
                     if intens_params is not None:
                         ring_params = muon_evt['MuonRingParams'][idx]
-                        cam_id = str(event.inst.subarray.tel[tel_id].camera)
+                        cam_id = str(self._subarray.tel[tel_id].camera)
                         self.num_muons_found[cam_id] += 1
                         self.log.debug("INTENSITY: %s", intens_params)
                         self.log.debug("RING: %s", ring_params)
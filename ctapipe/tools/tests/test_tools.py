@@ -188,3 +188,23 @@ def test_plot_charge_resolution(tmpdir):
 
     with pytest.raises(SystemExit):
         tool.run(['--help-all'])
+
+
+def test_convert_templates(tmpdir):
+    import gzip
+    import pickle
+    import numpy as np
+    from ctapipe.tools.convert_templates import ConvertTemplatesTool
+
+    infile = tmpdir.join('test.template.gz')
+    with gzip.open(str(infile), 'wb') as f:
+        pickle.dump({(0., 0., 0.): np.zeros((3, 3))}, f)
+
+    sys.argv = ['convert_templates']
+    tool = ConvertTemplatesTool(infiles=[str(infile)])
+    tool.run(argv=[])
+
+    assert tmpdir.join('test.template.store', 'values.npy').exists()
+
+    with pytest.raises(SystemExit):
+        tool.run(['--help-all'])
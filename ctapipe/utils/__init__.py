@@ -4,6 +4,7 @@ from .json2fits import json_to_fits
 from .dynamic_class import dynamic_class_from_module
 from .table_interpolator import TableInterpolator
 from .unstructured_interpolator import UnstructuredInterpolator
+from .lru_cache import LRUCache
 from .datasets import (find_all_matching_datasets, get_table_dataset, get_dataset_path,
                        find_in_path)
 from .CutFlow import CutFlow, PureCountingCut, UndefinedCut
@@ -15,6 +16,7 @@ __all__ = [
     'dynamic_class_from_module',
     'TableInterpolator',
     'UnstructuredInterpolator',
+    'LRUCache',
     'find_all_matching_datasets',
     'get_table_dataset',
     'get_dataset_path',
@@ -0,0 +1,84 @@
+"""
+A size-bounded mapping with least-recently-used eviction and hit statistics,
+for caching expensive intermediate results inside a single object.
+"""
+from collections import OrderedDict, namedtuple
+
+__all__ = ['LRUCache', 'CacheInfo']
+
+
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize']
+)
+
+
+class LRUCache:
+    """
+    Mapping holding at most ``maxsize`` entries. When full, adding a new
+    entry removes the entry that was least recently used.
+
+    Lookups through `get` are counted as hits or misses, see `info`,
+    so the size of the cache can be tuned for a use case.
+
+    Parameters
+    ----------
+    maxsize: int
+        maximum number of entries, 0 disables the cache
+    """
+
+    def __init__(self, maxsize):
+        if maxsize < 0:
+            raise ValueError('maxsize must be >= 0')
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """ Return the entry for ``key``, or ``default`` if it is missing """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """ Add or replace the entry for ``key`` """
+        if self.maxsize == 0:
+            return
+
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        """ Remove all entries and reset the statistics """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self):
+        """ Usage statistics of the cache """
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self)
+        )
+
+    def __repr__(self):
+        return '{}({})'.format(
+            self.__class__.__name__,
+            ', '.join(f'{k}={v}' for k, v in self.info()._asdict().items())
+        )
@@ -1,27 +1,200 @@
-from .unstructured_interpolator import UnstructuredInterpolator
-import numpy as np
-import pickle
+"""
+Interpolation of the ImPACT image and time gradient templates.
+
+The templates are distributed as gzipped pickle files, which have to be
+decompressed and unpickled completely by every process using them. With
+`convert_template_file` they can be converted once to a template store, a
+directory with the uncompressed template grid as ``.npy`` files. The
+interpolators open stores memory-mapped and read-only, so opening them is
+fast and all processes using the same store share a single copy of the
+templates in the page cache.
+"""
 import gzip
+import json
+import os
+import pickle
+
+import numpy as np
 import numpy.ma as ma
 
+from .unstructured_interpolator import UnstructuredInterpolator
+
+__all__ = [
+    'TemplateNetworkInterpolator',
+    'TimeGradientInterpolator',
+    'convert_template_file',
+    'write_template_store',
+    'open_template_store',
+    'template_store_path',
+    'load_templates',
+]
+
+TEMPLATE_STORE_VERSION = 1
+
+
+def template_store_path(template_file):
+    """
+    Default location of the template store converted from ``template_file``,
+    e.g. ``LST_05deg.template.store`` for ``LST_05deg.template.gz``
+    """
+    path = str(template_file)
+    if path.endswith('.gz'):
+        path = path[:-len('.gz')]
+    return path + '.store'
+
+
+def write_template_store(path, points, values):
+    """
+    Write a template store.
+
+    Parameters
+    ----------
+    path: str
+        directory of the store, must not exist yet
+    points: array-like
+        grid points of the templates, shape ``(n_templates, n_dimensions)``
+    values: sequence of np.ndarray
+        template of each grid point, all of the same shape and dtype.
+        The templates are written one at a time, so this can be a generator.
+    """
+    points = np.asarray(points, dtype=np.float64)
+
+    os.makedirs(path)
+    np.save(os.path.join(path, 'points.npy'), points)
+
+    store = None
+    for i, value in enumerate(values):
+        value = np.asarray(value)
+        if store is None:
+            store = np.lib.format.open_memmap(
+                os.path.join(path, 'values.npy'), mode='w+',
+                dtype=value.dtype, shape=(len(points), *value.shape),
+            )
+        store[i] = value
+
+    if store is None:
+        raise ValueError('Cannot write an empty template store')
+    store.flush()
+    del store
+
+    with open(os.path.join(path, 'store.json'), 'w') as f:
+        json.dump({'version': TEMPLATE_STORE_VERSION}, f)
+
+
+def open_template_store(path, mmap_mode='r'):
+    """
+    Open a template store written by `write_template_store`.
+
+    Parameters
+    ----------
+    path: str
+        directory of the store
+    mmap_mode: str or None
+        mode of the memory map of the templates, see `numpy.load`,
+        None to read them into memory
+
+    Returns
+    -------
+    points: np.ndarray
+        grid points of the templates
+    values: np.ndarray
+        templates, memory-mapped unless ``mmap_mode`` is None
+    """
+    with open(os.path.join(path, 'store.json')) as f:
+        version = json.load(f)['version']
+    if version != TEMPLATE_STORE_VERSION:
+        raise ValueError(
+            'Template store {} has version {}, expected {}'.format(
+                path, version, TEMPLATE_STORE_VERSION
+            )
+        )
+
+    points = np.load(os.path.join(path, 'points.npy'))
+    values = np.load(os.path.join(path, 'values.npy'), mmap_mode=mmap_mode)
+    return points, values
+
+
+def convert_template_file(template_file, output_path=None):
+    """
+    Convert a gzipped pickle template file to a template store.
+
+    Parameters
+    ----------
+    template_file: str
+        path of the gzipped pickle file with a dict of grid points to templates
+    output_path: str or None
+        directory of the store, defaults to `template_store_path`
+
+    Returns
+    -------
+    output_path: str
+    """
+    if output_path is None:
+        output_path = template_store_path(template_file)
+
+    with gzip.open(template_file) as f:
+        templates = pickle.load(f)
+
+    write_template_store(output_path, list(templates.keys()), templates.values())
+    return output_path
+
+
+def load_templates(template_file):
+    """
+    Load templates for the interpolators.
+
+    Parameters
+    ----------
+    template_file: str
+        gzipped pickle template file or template store
+
+    Returns
+    -------
+    dict or tuple:
+        the dict of grid points to templates of a pickle file, or the arrays
+        ``(points, values)`` of a store with read-only memory-mapped values
+    """
+    if os.path.isdir(template_file):
+        return open_template_store(template_file)
+
+    with gzip.open(template_file) as f:
+        return pickle.load(f)
+
 
 class TemplateNetworkInterpolator:
     """
     Class for interpolating between the the predictions
     """
-    def __init__(self, template_file):
+    def __init__(self, template_file, simplex_cache_size=0,
+                 template_cache_size=0, cache_precision=None):
         """
 
         Parameters
         ----------
         template_file: str
-            Location of pickle file containing ImPACT NN templates
+            Location of pickle file containing ImPACT NN templates,
+            or of a template store (see `convert_template_file`)
+        simplex_cache_size: int
+            Size of the simplex cache of the interpolator
+        template_cache_size: int
+            Number of interpolated templates that are cached
+        cache_precision: float or array-like
+            Precision in (energy, impact, xmax) of the cached templates,
+            see `~ctapipe.utils.UnstructuredInterpolator`
         """
 
-        file_list = gzip.open(template_file)
-        input_dict = pickle.load(file_list)
-        self.interpolator = UnstructuredInterpolator(input_dict, remember_last=True,
-                                                     bounds=((-5, 1),(-1.5, 1.5)))
+        self.interpolator = UnstructuredInterpolator(
+            load_templates(template_file),
+            remember_last=True,
+            bounds=((-5, 1), (-1.5, 1.5)),
+            simplex_cache_size=simplex_cache_size,
+            template_cache_size=template_cache_size,
+            cache_precision=cache_precision,
+        )
+
+    def cache_info(self):
+        """Hit and miss statistics of the interpolation caches"""
+        return self.interpolator.cache_info()
 
     def __call__(self, energy, impact, xmax, xb, yb):
         """
@@ -64,12 +237,12 @@ class TimeGradientInterpolator:
         Parameters
         ----------
         template_file: str
-            Location of pickle file containing ImPACT NN templates
+            Location of pickle file containing ImPACT NN templates,
+            or of a template store (see `convert_template_file`)
         """
-
-        file_list = gzip.open(template_file)
-        input_dict = pickle.load(file_list)
-        self.interpolator = UnstructuredInterpolator(input_dict, remember_last=False)
+        self.interpolator = UnstructuredInterpolator(
+            load_templates(template_file), remember_last=False
+        )
 
     def __call__(self, energy, impact, xmax):
         """
@@ -0,0 +1,37 @@
+import pytest
+from ctapipe.utils import LRUCache
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+
+    assert cache.get('a') == 1
+    # b is now the least recently used entry
+    cache.put('c', 3)
+
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+    info = cache.info()
+    assert info.hits == 2
+    assert info.misses == 1
+    assert info.evictions == 1
+    assert info.currsize == 2
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.info().hits == 0
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(0)
+    cache.put('a', 1)
+    assert len(cache) == 0
+    assert cache.get('a', 5) == 5
+
+    with pytest.raises(ValueError):
+        LRUCache(-1)
@@ -0,0 +1,78 @@
+import gzip
+import pickle
+
+import numpy as np
+import pytest
+
+from ctapipe.utils.template_network_interpolator import (
+    TemplateNetworkInterpolator,
+    TimeGradientInterpolator,
+    convert_template_file,
+    open_template_store,
+    template_store_path,
+)
+
+
+def write_template_file(path, shape):
+    rng = np.random.RandomState(0)
+    templates = {
+        (energy, impact, xmax): rng.uniform(size=shape)
+        for energy in (-1., 0., 1.)
+        for impact in (0., 100., 200.)
+        for xmax in (-100., 0., 100.)
+    }
+    with gzip.open(path, 'wb') as f:
+        pickle.dump(templates, f)
+    return templates
+
+
+def test_convert_template_file(tmpdir):
+    template_file = str(tmpdir.join('test.template.gz'))
+    templates = write_template_file(template_file, (20, 30))
+
+    store = convert_template_file(template_file)
+    assert store == str(tmpdir.join('test.template.store'))
+    assert template_store_path(template_file) == store
+
+    points, values = open_template_store(store)
+    assert isinstance(values, np.memmap)
+    assert not values.flags.writeable
+    for point, value in zip(points, values):
+        assert np.array_equal(value, templates[tuple(point)])
+
+    # stores are not overwritten
+    with pytest.raises(OSError):
+        convert_template_file(template_file)
+
+
+def test_interpolation_from_store(tmpdir):
+    template_file = str(tmpdir.join('test.template.gz'))
+    write_template_file(template_file, (20, 30))
+    store = convert_template_file(template_file)
+
+    energy = np.array([-0.5, 0.2])
+    impact = np.array([50., 120.])
+    xmax = np.array([10., -20.])
+    x = np.linspace(-3, 0.5, 8)
+    y = np.linspace(-1, 1, 8)
+    pix_x = np.broadcast_to(x, (2, 8))
+    pix_y = np.broadcast_to(y, (2, 8))
+
+    expected = TemplateNetworkInterpolator(template_file)(
+        energy, impact, xmax, pix_x.copy(), pix_y.copy()
+    )
+    interpolator = TemplateNetworkInterpolator(store)
+    assert isinstance(interpolator.interpolator.values.base, np.memmap)
+    result = interpolator(energy, impact, xmax, pix_x.copy(), pix_y.copy())
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_time_gradient_from_store(tmpdir):
+    template_file = str(tmpdir.join('test_time.template.gz'))
+    write_template_file(template_file, (2, ))
+    store = convert_template_file(template_file)
+
+    energy, impact, xmax = [-0.5, 0.2], [50., 120.], [10., -20.]
+    expected = TimeGradientInterpolator(template_file)(energy, impact, xmax)
+    result = TimeGradientInterpolator(store)(energy, impact, xmax)
+    np.testing.assert_array_equal(result, expected)
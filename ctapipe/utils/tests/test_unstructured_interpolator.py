@@ -2,6 +2,7 @@ from ctapipe.utils.unstructured_interpolator import UnstructuredInterpolator
 import numpy as np
 from scipy.interpolate import LinearNDInterpolator, RegularGridInterpolator
 import numpy.ma as ma
+import pytest
 
 def test_simple_interpolation():
     """
@@ -166,6 +167,67 @@ def test_out_of_bounds():
     assert np.all(interpolated_point == [0., 1., 2.])
 
 
+def test_simplex_cache():
+    """
+    The simplex cache must not change the result, also if the cached
+    simplex does not contain the point
+    """
+    keys = np.random.rand(50, 2)
+    interpolation_points = {tuple(k): np.random.rand() for k in keys}
+
+    interpolator = UnstructuredInterpolator(interpolation_points)
+    cached = UnstructuredInterpolator(interpolation_points,
+                                      simplex_cache_size=100,
+                                      cache_precision=0.2)
+
+    # stay inside the convex hull
+    points = 0.25 + 0.5 * np.random.rand(100, 2)
+    for _ in range(2):
+        assert np.allclose(interpolator(points), cached(points), atol=1e-12)
+
+    info = cached.cache_info()['simplex']
+    assert info.hits > 0
+    assert info.misses > 0
+    assert info.currsize <= 100
+
+
+def test_template_cache():
+    """
+    Cached templates are interpolated at the rounded points
+    """
+    x = np.linspace(0, 1, 11)
+    rand_numbers = np.random.rand(4, 11, 11)
+    interpolation_points = {(0, 0): rand_numbers[0],
+                            (0, 1): rand_numbers[1],
+                            (1, 0): rand_numbers[2],
+                            (1, 1): rand_numbers[3]}
+
+    bounds = ((0, 1), (0, 1))
+    interpolator = UnstructuredInterpolator(interpolation_points, bounds=bounds)
+    cached = UnstructuredInterpolator(interpolation_points, bounds=bounds,
+                                      template_cache_size=10,
+                                      cache_precision=0.1)
+
+    pts1 = np.array([[0.3, 0.6], [0.3001, 0.6001], [0.7, 0.2]])
+    rounded = np.round(pts1, 1)
+    pts2 = np.random.rand(3, 10, 2)
+
+    expected = interpolator(rounded, pts2)
+    assert np.allclose(cached(pts1, pts2), expected, atol=1e-12)
+
+    info = cached.cache_info()['template']
+    assert info.misses == 3
+    assert info.hits == 0
+    # two points share a cell, so only two templates are stored
+    assert info.currsize == 2
+
+    assert np.allclose(cached(pts1, pts2), expected, atol=1e-12)
+    assert cached.cache_info()['template'].hits == 3
+
+    with pytest.raises(ValueError):
+        UnstructuredInterpolator(interpolation_points, template_cache_size=10)
+
+
 if __name__ == '__main__':
 
     test_simple_interpolation()
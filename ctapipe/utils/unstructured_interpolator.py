@@ -16,6 +16,8 @@ import time
 from scipy.ndimage import map_coordinates
 import numpy.ma as ma
 
+from .lru_cache import LRUCache
+
 
 class UnstructuredInterpolator:
     """
@@ -27,24 +29,55 @@ class UnstructuredInterpolator:
 
     In the case that a numpy array is passed as the interpolation values this class will
     behave exactly the same as the scipy LinearNDInterpolator
+
+    Two optional caches speed up repeated calls with similar points, e.g. during
+    a minimisation. The simplex cache remembers which simplex contains the points
+    of a small cell (of size ``cache_precision``) and only falls back to the
+    triangulation search if the point is not inside that simplex, so it does not
+    change the results. For numpy array values evaluated at ``eval_points``, the
+    template cache stores the interpolated array for the points rounded to
+    ``cache_precision``, so only a single array has to be evaluated per point.
+    This is an approximation, the precision has to be chosen fine enough for
+    the use case. The hit/miss statistics of both caches are given by
+    `cache_info`.
     """
     def __init__(self, interpolation_points, function_name=None, remember_last=False,
-                 bounds=None, dtype=None):
+                 bounds=None, dtype=None, simplex_cache_size=0,
+                 template_cache_size=0, cache_precision=None):
         """
         Parameters
         ----------
-        interpolation_points: dict
-            Dictionary of interpolation points (stored as key) and values
+        interpolation_points: dict or tuple
+            Dictionary of interpolation points (stored as key) and values,
+            or a tuple of the arrays ``(points, values)``. Arrays are used
+            without copying, so the values can e.g. be memory-mapped.
         function_name: str
             Name of class member function to call in the case we are interpolating
             between class predictions, for numpy arrays leave blank
+        simplex_cache_size: int
+            Number of cells for which the containing simplex is cached,
+            0 disables the cache
+        template_cache_size: int
+            Number of interpolated arrays that are cached,
+            0 disables the cache
+        cache_precision: float or array-like
+            Size of the cells in each dimension of the interpolation points,
+            used as key for the caches. Required for the template cache,
+            defaults to 1/1000 of the range of the interpolation points for
+            the simplex cache.
         """
 
-        self.keys = np.array(list(interpolation_points.keys()))
+        if isinstance(interpolation_points, dict):
+            self.keys = np.array(list(interpolation_points.keys()))
+            values = list(interpolation_points.values())
+        else:
+            keys, values = interpolation_points
+            self.keys = np.asarray(keys)
+
         if dtype:
-            self.values = np.array(list(interpolation_points.values()), dtype=dtype)
+            self.values = np.asarray(values, dtype=dtype)
         else:
-            self.values = np.array(list(interpolation_points.values()))
+            self.values = np.asarray(values)
 
         self._num_dimensions = len(self.keys[0])
 
@@ -63,13 +96,84 @@ class UnstructuredInterpolator:
             self._function_name = "__call__"
 
         self._remember = remember_last
-        self._previous_v = 0
+        self._previous_v = None
         self._previous_m = 0
         self._previous_shape = 0
         self._bounds = bounds
 
+        if template_cache_size > 0 and cache_precision is None:
+            raise ValueError('The template cache needs a cache_precision')
+        if cache_precision is None:
+            cache_precision = np.ptp(self.keys, axis=0) / 1000
+        self._cache_precision = np.broadcast_to(
+            np.asarray(cache_precision, dtype=float), (self._num_dimensions, )
+        )
+        self._simplex_cache = LRUCache(simplex_cache_size)
+        self._template_cache = LRUCache(template_cache_size)
+
         return None
 
+    def cache_info(self):
+        """
+        Hit and miss statistics of the simplex and template caches
+
+        Returns
+        -------
+        dict: `~ctapipe.utils.lru_cache.CacheInfo` of each cache
+        """
+        return {
+            'simplex': self._simplex_cache.info(),
+            'template': self._template_cache.info(),
+        }
+
+    def _cache_keys(self, points):
+        """Quantised points used as keys of the caches"""
+        cells = np.round(points / self._cache_precision).astype(np.int64)
+        return [tuple(cell) for cell in cells.tolist()]
+
+    def _barycentric_weights(self, m, points):
+        """Weights of the simplex vertices, given the simplex transforms"""
+        # Here comes some serious numpy magic, it could be done with a loop but would
+        # be pretty inefficient I had to rip this from stack overflow - RDP
+        # For each interpolated point, take the the transform matrix and multiply it by
+        # the vector p-r, where r=m[:,n,:] is one of the simplex vertices to which
+        # the matrix m is related to
+        b = np.einsum('ijk,ik->ij', m[:, :self._num_dimensions, :self._num_dimensions],
+                      points - m[:, self._num_dimensions, :])
+
+        # Use the above array to get the weights for the vertices; `b` contains an
+        # n-dimensional vector with weights for all but the last vertices of the simplex
+        # (note that for n-D grid, each simplex consists of n+1 vertices);
+        # the remaining weight for the last vertex can be copmuted from
+        # the condition that sum of weights must be equal to 1
+        return np.c_[b, 1 - b.sum(axis=1)]
+
+    def _inside(self, m, points):
+        """Check which points lie inside the simplices given by their transforms"""
+        eps = 100 * np.finfo(float).eps
+        return np.all(self._barycentric_weights(m, points) >= -eps, axis=1)
+
+    def _find_simplex(self, points):
+        """Index of the simplex containing each point, -1 if outside"""
+        if self._simplex_cache.maxsize == 0:
+            return self._tri.find_simplex(points)
+
+        keys = self._cache_keys(points)
+        s = np.array([self._simplex_cache.get(key, -1) for key in keys])
+
+        # the cached simplex is just a guess for the cell, check it
+        found = s >= 0
+        found[found] = self._inside(self._tri.transform[s[found]], points[found])
+
+        missing = np.flatnonzero(~found)
+        if len(missing) > 0:
+            s[missing] = self._tri.find_simplex(points[missing])
+            for i in missing:
+                if s[i] >= 0:
+                    self._simplex_cache.put(keys[i], s[i])
+
+        return s
+
     def __call__(self, points, eval_points=None):
 
         # Convert to a numpy array here incase we get a list
@@ -78,31 +182,30 @@ class UnstructuredInterpolator:
         if len(points.shape) == 1:
             points = np.array([points])
 
-        # First find simplexes that contain interpolated points
-        # In
-        if self._remember and self._previous_v is not 0:
-
-            previous_keys = self.keys[self._previous_v.ravel()]
-            hull = Delaunay(previous_keys)
+        if (self._template_cache.maxsize > 0 and self._numpy_input
+                and eval_points is not None):
+            return self._cached_template_interpolation(points, eval_points)
 
+        # First find simplexes that contain interpolated points,
+        # reusing the ones of the last call if all points are still inside them
+        reuse = False
+        if self._remember and self._previous_v is not None:
             if np.all(eval_points is not None):
                 shape_check = eval_points.shape == self._previous_shape
             else:
                 shape_check = True
 
-            if np.all(hull.find_simplex(points) >= 0) and shape_check:
-                v = self._previous_v
-                m = self._previous_m
-            else:
-                s = self._tri.find_simplex(points)
-                v = self._tri.vertices[s]
-                m = self._tri.transform[s]
-                self._previous_v = v
-                self._previous_m = m
-                if np.all(eval_points is not None):
-                    self._previous_shape = eval_points.shape
+            reuse = (
+                shape_check
+                and len(points) == len(self._previous_m)
+                and np.all(self._inside(self._previous_m, points))
+            )
+
+        if reuse:
+            v = self._previous_v
+            m = self._previous_m
         else:
-            s = self._tri.find_simplex(points)
+            s = self._find_simplex(points)
             # get the vertices for each simplex
             v = self._tri.vertices[s]
             # get transform matrices for each simplex
@@ -112,21 +215,7 @@ class UnstructuredInterpolator:
             if np.all(eval_points is not None):
                 self._previous_shape = eval_points.shape
 
-
-        # Here comes some serious numpy magic, it could be done with a loop but would
-        # be pretty inefficient I had to rip this from stack overflow - RDP
-        # For each interpolated point, take the the transform matrix and multiply it by
-        # the vector p-r, where r=m[:,n,:] is one of the simplex vertices to which
-        # the matrix m is related to
-        b = np.einsum('ijk,ik->ij', m[:, :self._num_dimensions, :self._num_dimensions],
-                      points - m[:, self._num_dimensions, :])
-
-        # Use the above array to get the weights for the vertices; `b` contains an
-        # n-dimensional vector with weights for all but the last vertices of the simplex
-        # (note that for n-D grid, each simplex consists of n+1 vertices);
-        # the remaining weight for the last vertex can be copmuted from
-        # the condition that sum of weights must be equal to 1
-        w = np.c_[b, 1 - b.sum(axis=1)]
+        w = self._barycentric_weights(m, points)
 
         if self._numpy_input:
             if eval_points is None:
@@ -187,7 +276,57 @@ class UnstructuredInterpolator:
 
         return outputs
 
-    def _numpy_interpolation(self, point_num, eval_points):
+    def _cached_template_interpolation(self, points, eval_points):
+        """
+        Interpolation of numpy array values using the template cache.
+
+        The arrays of the vertices are blended with the weights of the
+        quantised point and cached, so only a single array has to be
+        evaluated at the ``eval_points`` of each point.
+
+        Parameters
+        ----------
+        points: ndarray
+            Interpolation points
+        eval_points: ndarray
+            Positions in the arrays to evaluate
+
+        Returns
+        -------
+        ndarray: interpolated values
+        """
+        keys = self._cache_keys(points)
+        templates = [self._template_cache.get(key) for key in keys]
+
+        missing = [i for i, t in enumerate(templates) if t is None]
+        if len(missing) > 0:
+            centres = np.array([keys[i] for i in missing]) * self._cache_precision
+            s = self._find_simplex(centres)
+
+            # cells at the edge of the hull may have their centre outside,
+            # blend those with the weights of the point itself and don't cache
+            outside = s < 0
+            if np.any(outside):
+                centres[outside] = points[missing][outside]
+                s[outside] = self._find_simplex(centres[outside])
+
+            v = self._tri.vertices[s]
+            w = self._barycentric_weights(self._tri.transform[s], centres)
+            blended = np.einsum('ij...,ij->i...', self.values[v], w)
+
+            for i, template, is_outside in zip(missing, blended, outside):
+                templates[i] = template
+                if not is_outside:
+                    self._template_cache.put(keys[i], template)
+
+        point_num = np.arange(len(points))[:, np.newaxis]
+        output = self._numpy_interpolation(
+            point_num, eval_points, values=np.array(templates)
+        )
+
+        return np.asarray(output)[:, 0]
+
+    def _numpy_interpolation(self, point_num, eval_points, values=None):
         """
 
         Parameters
@@ -196,6 +335,8 @@ class UnstructuredInterpolator:
             Index of class position in values list
         eval_points: ndarray
             Inputs used to evaluate class member function
+        values: ndarray or None
+            Arrays to interpolate, defaults to the interpolation values
 
         Returns
         -------
@@ -206,7 +347,9 @@ class UnstructuredInterpolator:
         shape = point_num.shape
         ev_shape = eval_points.shape
 
-        vals = self.values[point_num.ravel()]
+        if values is None:
+            values = self.values
+        vals = values[point_num.ravel()]
         eval_points = np.repeat(eval_points, shape[1], axis=0)
         it = np.arange(eval_points.shape[0])
 
@@ -2,12 +2,12 @@
 """
 Visualization: Methods for displaying data 
 """
+from ..core.lazy_loading import lazy_submodules
 
-try:
-    from .mpl_camera import CameraDisplay
-    from .mpl_array import ArrayDisplay
-except ImportError:
-    pass
-
-
-__all__ = ['CameraDisplay', 'ArrayDisplay']
+__getattr__, __dir__, __all__ = lazy_submodules(
+    __name__,
+    attributes={
+        'mpl_camera': ['CameraDisplay'],
+        'mpl_array': ['ArrayDisplay'],
+    },
+)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark and accuracy report of the tabulated full poissonian likelihood
+(`ctapipe.image.poisson_likelihood_table`) against the exact calculation and
+the existing `poisson_likelihood_full` / `mean_poisson_likelihood_full`.
+
+The pixels are drawn like the pixels of a camera image: predictions spread
+over the tabulated range and signals fluctuating around them.
+"""
+from time import perf_counter
+
+import numpy as np
+
+from ctapipe.image import (
+    PoissonLikelihoodTable,
+    poisson_likelihood_full,
+    mean_poisson_likelihood_full,
+    poisson_likelihood_exact,
+    mean_poisson_likelihood_exact,
+)
+
+
+def timed(function, *args, repeat=3):
+    """ best time of ``repeat`` calls of ``function(*args)`` and its result """
+    best = np.inf
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function(*args)
+        best = min(best, perf_counter() - start)
+    return best, result
+
+
+def report(spe, ped, n_pixels=2000, n_mean_pixels=100):
+    rng = np.random.RandomState(0)
+    prediction = rng.exponential(10, n_pixels)
+    width = np.sqrt(ped**2 + prediction * (1 + spe**2))
+    image = prediction + width * rng.normal(size=n_pixels)
+
+    build_time, table = timed(PoissonLikelihoodTable, spe, ped, repeat=1)
+    print(f'spe width {spe}, pedestal width {ped}')
+    print(f'  table {table.likelihood_table.shape} built in {build_time:.2f} s')
+
+    t_table, like = timed(table.likelihood, image, prediction)
+    t_exact, exact = timed(poisson_likelihood_exact, image, prediction, spe, ped)
+    t_full, full = timed(poisson_likelihood_full, image, prediction, spe, ped)
+    print(f'  likelihood of {n_pixels} pixels')
+    error = np.abs(like - exact).max()
+    print(f'    table {1e3 * t_table:8.2f} ms, max error {error:.1e}')
+    print(f'    exact {1e3 * t_exact:8.2f} ms')
+    print(f'    full  {1e3 * t_full:8.2f} ms, max error {np.abs(full - exact).max():.1e}')
+
+    prediction = prediction[:n_mean_pixels]
+    t_table, mean_like = timed(table.mean_likelihood, prediction)
+    t_exact, exact = timed(mean_poisson_likelihood_exact, prediction, spe, ped)
+    t_full, full = timed(mean_poisson_likelihood_full, prediction, spe, ped, repeat=1)
+    print(f'  mean likelihood of {n_mean_pixels} pixels')
+    error = np.abs(mean_like - exact).max()
+    print(f'    table {1e3 * t_table:8.2f} ms, max error {error:.1e}')
+    print(f'    exact {1e3 * t_exact:8.2f} ms')
+    print(f'    full  {1e3 * t_full:8.2f} ms, max error {np.abs(full - exact).max():.1e}')
+
+
+if __name__ == '__main__':
+    # compile the numba kernels before timing
+    poisson_likelihood_exact(1., 1., 0.5, 1.)
+    mean_poisson_likelihood_exact(1., 0.5, 1.)
+
+    # pedestal widths of ImPACTReconstructor.ped_table
+    for ped in (2.8, 2.3, 0.5):
+        report(0.5, ped)
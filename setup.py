@@ -40,6 +40,7 @@ entry_points['console_scripts'] = [
     'ctapipe-reconstruct-muons = ctapipe.tools.muon_reconstruction:main',
     'ctapipe-display-integration = ctapipe.tools.display_integrator:main',
     'ctapipe-display-dl1 = ctapipe.tools.display_dl1:main',
+    'ctapipe-convert-templates = ctapipe.tools.convert_templates:main',
 
 ]
 